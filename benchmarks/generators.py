@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+"""Generators of synthetic, but valid, input data for the parser benchmarks.
+
+The generators write the data to disk incrementally, such that the memory
+usage of the generator does not depend on the number of records.
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import struct
+
+
+# Date and time values used as the base of the synthetic timestamps.
+_POSIX_TIMESTAMP = 1500000000
+_FILETIME = 131000000000000000
+_WEBKIT_TIMESTAMP = 13100000000000000
+
+
+def _GetHashString(value):
+  """Retrieves an upper case hexadecimal MD5 hash string of a value.
+
+  Args:
+    value (int): value.
+
+  Returns:
+    str: hash string.
+  """
+  value_string = '{0:d}'.format(value).encode('ascii')
+  return hashlib.md5(value_string).hexdigest().upper()
+
+
+def WriteBSMFile(path, number_of_records):
+  """Writes a BSM event auditing file.
+
+  Every event record consists of a header32, subject32, text, return32 and
+  trailer token.
+
+  Args:
+    path (str): path of the file.
+    number_of_records (int): number of event records.
+  """
+  with open(path, 'wb') as file_object:
+    for record_index in range(number_of_records):
+      text = 'synthetic event record: {0:d}'.format(record_index).encode(
+          'ascii')
+      text += b'\x00'
+
+      # Token type followed by the token data.
+      subject_token = b''.join([
+          b'\x24', struct.pack(
+              '>iiiiiIII4s', 501, 501, 20, 501, 20, 1000 + record_index, 100,
+              0, b'\x7f\x00\x00\x01')])
+      text_token = b''.join([
+          b'\x28', struct.pack('>H', len(text)), text])
+      return_token = b''.join([b'\x27', struct.pack('>BI', 0, 0)])
+
+      record_size = (
+          18 + len(subject_token) + len(text_token) + len(return_token) + 7)
+
+      header_token = b''.join([
+          b'\x14', struct.pack(
+              '>IBHHII', record_size, 11, 45029, 0,
+              _POSIX_TIMESTAMP + record_index, record_index % 1000)])
+      trailer_token = b''.join([
+          b'\x13', struct.pack('>HI', 0xb105, record_size)])
+
+      file_object.write(b''.join([
+          header_token, subject_token, text_token, return_token,
+          trailer_token]))
+
+
+def WriteChromeCacheDirectory(path, number_of_entries):
+  """Writes a Chrome Cache directory.
+
+  The directory contains an index file and the data block files with
+  256-byte blocks that contain the cache entries.
+
+  Args:
+    path (str): path of the directory.
+    number_of_entries (int): number of cache entries.
+  """
+  if not os.path.exists(path):
+    os.makedirs(path)
+
+  maximum_number_of_blocks = 0x10000
+
+  table_size = 0x10000
+  while table_size < number_of_entries:
+    table_size *= 2
+
+  # Note that the first data block file is data_1 and that data_0 is not
+  # used, since it normally contains the rankings blocks.
+  number_of_data_block_files = (
+      (number_of_entries + maximum_number_of_blocks - 1) //
+      maximum_number_of_blocks)
+
+  index_file_path = os.path.join(path, 'index')
+  with open(index_file_path, 'wb') as file_object:
+    file_object.write(struct.pack(
+        '<IHHIIIIIIIIQ208s', 0xc103cac3, 1, 2, number_of_entries, 0,
+        number_of_data_block_files, 0, 0, table_size, 0, 0,
+        _WEBKIT_TIMESTAMP, b''))
+
+    # LRU data.
+    file_object.write(b'\x00' * 112)
+
+    table_entries = []
+    for entry_index in range(table_size):
+      cache_address = 0
+      if entry_index < number_of_entries:
+        file_number = 1 + (entry_index // maximum_number_of_blocks)
+        block_number = entry_index % maximum_number_of_blocks
+        # Initialized, 256-byte block file, 1 block.
+        cache_address = (
+            0xa0000000 | (1 << 24) | (file_number << 16) | block_number)
+
+      table_entries.append(cache_address)
+      if len(table_entries) == 4096:
+        file_object.write(struct.pack(
+            '<{0:d}I'.format(len(table_entries)), *table_entries))
+        table_entries = []
+
+  for file_index in range(number_of_data_block_files):
+    first_entry_index = file_index * maximum_number_of_blocks
+    number_of_blocks = min(
+        number_of_entries - first_entry_index, maximum_number_of_blocks)
+
+    data_block_file_path = os.path.join(
+        path, 'data_{0:d}'.format(file_index + 1))
+    with open(data_block_file_path, 'wb') as file_object:
+      next_file_number = 0
+      if file_index + 1 < number_of_data_block_files:
+        next_file_number = file_index + 2
+
+      file_object.write(struct.pack(
+          '<IHHHHIII16s16sI20s8112s', 0xc104cac3, 0, 2, file_index + 1,
+          next_file_number, 256, number_of_blocks, maximum_number_of_blocks,
+          b'', b'', 0, b'', b''))
+
+      for block_number in range(number_of_blocks):
+        entry_index = first_entry_index + block_number
+        key = 'https://www.example.com/{0:d}/index.html'.format(
+            entry_index).encode('ascii')
+
+        file_object.write(struct.pack(
+            '<IIIIIIQII4I4II16sI160s', entry_index, 0, 0, 1, 0, 0,
+            _WEBKIT_TIMESTAMP + entry_index, len(key), 0, 0, 0, 0, 0,
+            0, 0, 0, 0, 0, b'', 0, key))
+
+
+def _GetCIMIndexPageData(
+    page_type, mapped_page_number, root_page_number, keys=None,
+    sub_page_numbers=None):
+  """Retrieves the data of a CIM index binary-tree page.
+
+  Args:
+    page_type (int): page type.
+    mapped_page_number (int): mapped page number.
+    root_page_number (int): root page number.
+    keys (Optional[list[str]]): keys stored in the page.
+    sub_page_numbers (Optional[list[int]]): sub page numbers, where there is
+        one more sub page number than keys.
+
+  Returns:
+    bytes: page data.
+  """
+  page_data = [struct.pack(
+      '<IIII', page_type, mapped_page_number, 0, root_page_number)]
+
+  if keys is not None:
+    number_of_keys = len(keys)
+    if not sub_page_numbers:
+      sub_page_numbers = [0xffffffff] * (number_of_keys + 1)
+
+    values = []
+    value_indexes = {}
+    key_data = []
+    key_offsets = []
+    for key in keys:
+      segment_indexes = []
+      for segment in key.split('\\')[1:]:
+        value_index = value_indexes.get(segment, None)
+        if value_index is None:
+          value_index = len(values)
+          value_indexes[segment] = value_index
+          values.append(segment)
+
+        segment_indexes.append(value_index)
+
+      key_offsets.append(len(key_data))
+      key_data.append(len(segment_indexes))
+      key_data.extend(segment_indexes)
+
+    value_data = []
+    value_offsets = []
+    value_data_size = 0
+    for value in values:
+      value_offsets.append(value_data_size)
+      value = value.encode('ascii') + b'\x00'
+      value_data.append(value)
+      value_data_size += len(value)
+
+    page_data.extend([
+        struct.pack('<I', number_of_keys),
+        struct.pack('<{0:d}I'.format(number_of_keys), *([0] * number_of_keys)),
+        struct.pack(
+            '<{0:d}I'.format(number_of_keys + 1), *sub_page_numbers),
+        struct.pack('<{0:d}H'.format(number_of_keys), *key_offsets),
+        struct.pack('<H', len(key_data)),
+        struct.pack('<{0:d}H'.format(len(key_data)), *key_data),
+        struct.pack('<H', len(value_offsets)),
+        struct.pack('<{0:d}H'.format(len(value_offsets)), *value_offsets),
+        struct.pack('<H', value_data_size)])
+    page_data.extend(value_data)
+
+  page_data = b''.join(page_data)
+  if len(page_data) > 8192:
+    raise ValueError('Page data too large.')
+
+  return page_data + b'\x00' * (8192 - len(page_data))
+
+
+def _WriteCIMMappingFile(path, number_of_pages):
+  """Writes a CIM mapping file with an identity mapping.
+
+  Args:
+    path (str): path of the file.
+    number_of_pages (int): number of pages.
+  """
+  with open(path, 'wb') as file_object:
+    file_object.write(struct.pack('<III', 0x0000abcd, 1, number_of_pages))
+    file_object.write(struct.pack('<I', number_of_pages))
+    file_object.write(struct.pack(
+        '<{0:d}I'.format(number_of_pages), *range(number_of_pages)))
+    # Unknown entries.
+    file_object.write(struct.pack('<I', 0))
+    file_object.write(struct.pack('<I', 0x0000dcba))
+
+
+def WriteCIMRepository(path, number_of_keys):
+  """Writes a CIM repository.
+
+  The repository contains an index binary-tree with the keys in sorted order
+  and an objects data file with an interface object record per key.
+
+  Args:
+    path (str): path of the directory.
+    number_of_keys (int): number of keys.
+  """
+  if not os.path.exists(path):
+    os.makedirs(path)
+
+  # Every objects data page contains 32 object descriptors, the terminator
+  # and 32 object records of 128 bytes.
+  number_of_records_per_page = 32
+  object_record_data_size = 128
+
+  name_space = 'NS_{0:s}'.format(_GetHashString(0))
+
+  keys = []
+  with open(os.path.join(path, 'OBJECTS.DATA'), 'wb') as file_object:
+    page_number = 0
+    for first_key_index in range(
+        0, number_of_keys, number_of_records_per_page):
+      key_indexes = range(first_key_index, min(
+          first_key_index + number_of_records_per_page, number_of_keys))
+
+      data_offset = (len(key_indexes) + 1) * 16
+      object_descriptors = []
+      object_records = []
+      for key_index in key_indexes:
+        record_identifier = key_index + 1
+
+        object_descriptors.append(struct.pack(
+            '<IIII', record_identifier, data_offset, object_record_data_size,
+            0))
+        object_records.append(struct.pack(
+            '<64sQQI44s', _GetHashString(key_index).encode('utf-16-le'),
+            _FILETIME + key_index, _FILETIME + key_index, 48, b''))
+        data_offset += object_record_data_size
+
+        keys.append('\\{0:s}\\I_{1:s}.{2:d}.{3:d}.{4:d}'.format(
+            name_space, _GetHashString(key_index), page_number,
+            record_identifier, object_record_data_size))
+
+      page_data = b''.join(
+          object_descriptors + [b'\x00' * 16] + object_records)
+      file_object.write(page_data + b'\x00' * (8192 - len(page_data)))
+      page_number += 1
+
+  _WriteCIMMappingFile(os.path.join(path, 'OBJECTS.MAP'), page_number)
+
+  keys = sorted(keys)
+
+  # The index binary-tree pages, where page 0 is the administrative page.
+  index_pages = [None]
+
+  def _AddIndexPage(keys):
+    """Adds the pages of a (sub) tree with sorted keys.
+
+    Args:
+      keys (list[str]): sorted keys.
+
+    Returns:
+      int: page number of the root page of the (sub) tree.
+    """
+    maximum_number_of_keys = 32
+
+    page_number = len(index_pages)
+    index_pages.append(None)
+
+    if len(keys) <= maximum_number_of_keys:
+      index_pages[page_number] = (keys, None)
+      return page_number
+
+    number_of_sub_pages = min(
+        maximum_number_of_keys + 1,
+        (len(keys) + maximum_number_of_keys) // (maximum_number_of_keys + 1))
+    number_of_sub_pages = max(number_of_sub_pages, 2)
+
+    number_of_sub_page_keys = len(keys) - (number_of_sub_pages - 1)
+
+    page_keys = []
+    sub_page_numbers = []
+    key_index = 0
+    for sub_page_index in range(number_of_sub_pages):
+      sub_page_size = number_of_sub_page_keys // number_of_sub_pages
+      if sub_page_index < number_of_sub_page_keys % number_of_sub_pages:
+        sub_page_size += 1
+
+      sub_page_numbers.append(_AddIndexPage(
+          keys[key_index:key_index + sub_page_size]))
+      key_index += sub_page_size
+
+      if sub_page_index + 1 < number_of_sub_pages:
+        page_keys.append(keys[key_index])
+        key_index += 1
+
+    index_pages[page_number] = (page_keys, sub_page_numbers)
+    return page_number
+
+  root_page_number = _AddIndexPage(keys)
+
+  with open(os.path.join(path, 'INDEX.BTR'), 'wb') as file_object:
+    file_object.write(_GetCIMIndexPageData(0xaddd, 0, root_page_number))
+
+    for page_number, (page_keys, sub_page_numbers) in enumerate(
+        index_pages[1:], start=1):
+      file_object.write(_GetCIMIndexPageData(
+          0xaccc, page_number, root_page_number, keys=page_keys,
+          sub_page_numbers=sub_page_numbers))
+
+  _WriteCIMMappingFile(os.path.join(path, 'INDEX.MAP'), len(index_pages))
+
+  with open(os.path.join(path, 'MAPPING.VER'), 'wb') as file_object:
+    file_object.write(struct.pack('<I', 1))
+
+
+def WriteSystemdJournalFile(path, number_of_entries):
+  """Writes a systemd journal file.
+
+  Every entry refers to 3 data objects: a per entry message and shared
+  hostname and syslog identifier data objects. The entry objects are
+  referenced by a chain of entry array objects.
+
+  Args:
+    path (str): path of the file.
+    number_of_entries (int): number of entries.
+  """
+  header_size = 208
+  entry_array_size = 4096
+  boot_identifier = b'\x01' * 16
+
+  with open(path, 'wb') as file_object:
+    file_object.write(b'\x00' * header_size)
+
+    file_offset = header_size
+    number_of_objects = 0
+
+    def _WriteObject(object_type, object_data):
+      """Writes an object.
+
+      Args:
+        object_type (int): object type.
+        object_data (bytes): object data without the object header.
+
+      Returns:
+        tuple[int, int]: offset and size of the object.
+      """
+      data_size = 16 + len(object_data)
+      object_offset = file_offset
+
+      padding_size = (8 - (data_size % 8)) % 8
+      file_object.write(b''.join([
+          struct.pack('<BB6sQ', object_type, 0, b'', data_size), object_data,
+          b'\x00' * padding_size]))
+
+      return object_offset, data_size + padding_size
+
+    def _WriteDataObject(data):
+      """Writes a data object.
+
+      Args:
+        data (bytes): data.
+
+      Returns:
+        tuple[int, int]: offset and size of the object.
+      """
+      return _WriteObject(1, struct.pack('<6Q', 0, 0, 0, 0, 0, 1) + data)
+
+    shared_data_offsets = []
+    for data in (b'_HOSTNAME=localhost', b'SYSLOG_IDENTIFIER=benchmark'):
+      object_offset, object_size = _WriteDataObject(data)
+      shared_data_offsets.append(object_offset)
+      file_offset += object_size
+      number_of_objects += 1
+
+    entry_array_offset = 0
+    previous_entry_array_offset = None
+    for first_entry_index in range(0, number_of_entries, entry_array_size):
+      entry_object_offsets = []
+      for entry_index in range(first_entry_index, min(
+          first_entry_index + entry_array_size, number_of_entries)):
+        data = 'MESSAGE=synthetic journal entry: {0:d}'.format(
+            entry_index).encode('ascii')
+        message_data_offset, object_size = _WriteDataObject(data)
+        file_offset += object_size
+
+        entry_items = b''.join([
+            struct.pack('<QQ', data_offset, 0) for data_offset in [
+                message_data_offset] + shared_data_offsets])
+
+        entry_object_offset, object_size = _WriteObject(3, struct.pack(
+            '<QQQ16sQ', entry_index + 1,
+            (_POSIX_TIMESTAMP + entry_index) * 1000000, entry_index * 1000,
+            boot_identifier, 0) + entry_items)
+        file_offset += object_size
+        number_of_objects += 2
+
+        entry_object_offsets.append(entry_object_offset)
+
+      object_offset, object_size = _WriteObject(6, struct.pack(
+          '<Q{0:d}Q'.format(len(entry_object_offsets)), 0,
+          *entry_object_offsets))
+      number_of_objects += 1
+
+      if previous_entry_array_offset is None:
+        entry_array_offset = object_offset
+      else:
+        # Update the next entry array offset of the previous entry array.
+        file_object.seek(previous_entry_array_offset + 16, os.SEEK_SET)
+        file_object.write(struct.pack('<Q', object_offset))
+        file_object.seek(0, os.SEEK_END)
+
+      previous_entry_array_offset = object_offset
+      file_offset += object_size
+
+    file_object.seek(0, os.SEEK_SET)
+    file_object.write(struct.pack(
+        '<8sIIB7s16s16s16s16s15Q', b'LPKSHHRH', 0, 0, 0, b'',
+        b'\x02' * 16, b'\x03' * 16, boot_identifier, b'\x04' * 16,
+        header_size, file_offset - header_size, 0, 0, 0, 0,
+        previous_entry_array_offset or 0, number_of_objects,
+        number_of_entries, number_of_entries, 1, entry_array_offset,
+        _POSIX_TIMESTAMP * 1000000,
+        (_POSIX_TIMESTAMP + number_of_entries) * 1000000,
+        number_of_entries * 1000))
+
+
+def WriteUtmpFile(path, number_of_records):
+  """Writes a Linux libc6 utmp file.
+
+  Args:
+    path (str): path of the file.
+    number_of_records (int): number of entries.
+  """
+  with open(path, 'wb') as file_object:
+    entries = []
+    for record_index in range(number_of_records):
+      terminal = 'pts/{0:d}'.format(record_index % 64).encode('ascii')
+      username = 'user{0:d}'.format(record_index % 1000).encode('ascii')
+      hostname = '10.0.{0:d}.{1:d}'.format(
+          (record_index // 256) % 256, record_index % 256).encode('ascii')
+
+      entries.append(struct.pack(
+          '<iI32sI32s256shhiii16s20s', 7, 1000 + record_index, terminal,
+          record_index % 64, username, hostname, 0, 0, record_index,
+          _POSIX_TIMESTAMP + record_index, record_index % 1000000, b'', b''))
+
+      if len(entries) == 1024:
+        file_object.write(b''.join(entries))
+        entries = []
+
+    file_object.write(b''.join(entries))
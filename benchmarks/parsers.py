@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the parsers with synthetic input data.
+
+Every benchmark is run in a separate process, such that the peak resident
+set size (RSS) of the process is that of the benchmark. The results are
+written as JSON, such that the results of different commits can be compared.
+"""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+  import queue
+except ImportError:
+  import Queue as queue  # pylint: disable=import-error
+
+try:
+  import resource
+except ImportError:
+  resource = None
+
+# Change PYTHONPATH to include dtformats.
+sys.path.insert(0, '.')
+
+# pylint: disable=wrong-import-position
+from benchmarks import generators
+
+from dtformats import bsm
+from dtformats import chrome_cache
+from dtformats import systemd
+from dtformats import utmp
+from dtformats import wmi_repository
+# pylint: enable=wrong-import-position
+
+
+def _GetPeakRSS():
+  """Retrieves the peak resident set size of the current process.
+
+  Returns:
+    int: peak resident set size in bytes or None if not available.
+  """
+  if not resource:
+    return None
+
+  peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+  # Note that on Mac OS the peak resident set size is in bytes and in
+  # kilobytes on other platforms.
+  if sys.platform != 'darwin':
+    peak_rss *= 1024
+
+  return peak_rss
+
+
+def _GetSize(path):
+  """Retrieves the size of a file or the files in a directory.
+
+  Args:
+    path (str): path of the file or directory.
+
+  Returns:
+    int: size in bytes.
+  """
+  if not os.path.isdir(path):
+    return os.path.getsize(path)
+
+  size = 0
+  for directory_path, _, filenames in os.walk(path):
+    for filename in filenames:
+      size += os.path.getsize(os.path.join(directory_path, filename))
+
+  return size
+
+
+def ParseBSMFile(path):
+  """Parses a BSM event auditing file.
+
+  Args:
+    path (str): path of the file.
+
+  Returns:
+    int: number of records.
+  """
+  bsm_file = bsm.BSMEventAuditingFile()
+  bsm_file.Open(path)
+
+  try:
+    return sum(1 for _ in bsm_file.ReadRecords())
+  finally:
+    bsm_file.Close()
+
+
+def ParseChromeCacheDirectory(path):
+  """Parses a Chrome Cache directory.
+
+  Args:
+    path (str): path of the directory.
+
+  Returns:
+    int: number of records.
+  """
+  index_file = chrome_cache.IndexFile()
+  index_file.Open(os.path.join(path, 'index'))
+
+  data_block_files = {}
+  number_of_records = 0
+  try:
+    for cache_address in index_file.ReadRecords():
+      data_block_file = data_block_files.get(cache_address.filename, None)
+      if not data_block_file:
+        data_block_file = chrome_cache.DataBlockFile()
+        data_block_file.Open(os.path.join(path, cache_address.filename))
+        data_block_files[cache_address.filename] = data_block_file
+
+      data_block_file.ReadCacheEntry(cache_address.block_offset)
+      number_of_records += 1
+
+  finally:
+    for data_block_file in data_block_files.values():
+      data_block_file.Close()
+
+    index_file.Close()
+
+  return number_of_records
+
+
+def ParseCIMRepository(path):
+  """Parses a CIM repository.
+
+  Args:
+    path (str): path of the directory.
+
+  Returns:
+    int: number of records.
+  """
+  cim_repository = wmi_repository.CIMRepository()
+  cim_repository.Open(path)
+
+  number_of_records = 0
+  try:
+    for key in cim_repository.GetKeys():
+      object_record = cim_repository.GetObjectRecordByKey(key)
+      object_record.Read()
+      number_of_records += 1
+
+  finally:
+    cim_repository.Close()
+
+  return number_of_records
+
+
+def ParseSystemdJournalFile(path):
+  """Parses a systemd journal file.
+
+  Args:
+    path (str): path of the file.
+
+  Returns:
+    int: number of records.
+  """
+  journal_file = systemd.SystemdJournalFile()
+  journal_file.Open(path)
+
+  try:
+    return sum(1 for _ in journal_file.ReadRecords())
+  finally:
+    journal_file.Close()
+
+
+def ParseUtmpFile(path):
+  """Parses a Linux libc6 utmp file.
+
+  Args:
+    path (str): path of the file.
+
+  Returns:
+    int: number of records.
+  """
+  utmp_file = utmp.LinuxLibc6UtmpFile()
+  utmp_file.Open(path)
+
+  try:
+    return sum(1 for _ in utmp_file.ReadRecords())
+  finally:
+    utmp_file.Close()
+
+
+# Parser benchmarks, as tuples of name, input data generator and parse
+# function.
+BENCHMARKS = [
+    ('bsm', generators.WriteBSMFile, ParseBSMFile),
+    ('chrome_cache', generators.WriteChromeCacheDirectory,
+     ParseChromeCacheDirectory),
+    ('cim_repository', generators.WriteCIMRepository, ParseCIMRepository),
+    ('systemd_journal', generators.WriteSystemdJournalFile,
+     ParseSystemdJournalFile),
+    ('utmp', generators.WriteUtmpFile, ParseUtmpFile)]
+
+
+# Number of seconds to wait for the result of a benchmark process, before
+# checking if the process is still running.
+_RESULT_QUEUE_TIMEOUT = 1.0
+
+
+def _GetBenchmarkResult(process, result_queue):
+  """Retrieves the result of a benchmark process.
+
+  Args:
+    process (multiprocessing.Process): benchmark process.
+    result_queue (multiprocessing.Queue): queue to which the number of
+        records, duration in seconds and peak resident set size are written.
+
+  Returns:
+    tuple[int, float, int]: number of records, duration in seconds and peak
+        resident set size.
+
+  Raises:
+    RuntimeError: if the benchmark process exited without a result.
+  """
+  is_alive = True
+  while is_alive:
+    # Note that the process can have written the result just before it
+    # exited, hence the queue is read once more after the process exited.
+    is_alive = process.is_alive()
+
+    try:
+      return result_queue.get(timeout=_RESULT_QUEUE_TIMEOUT)
+    except queue.Empty:
+      pass
+
+  raise RuntimeError(
+      'Benchmark process exited with code: {0!s} without a result.'.format(
+          process.exitcode))
+
+
+def _RunParseFunction(parse_function, path, result_queue):
+  """Runs a parse function in a benchmark process.
+
+  Args:
+    parse_function (function): parse function.
+    path (str): path of the input data.
+    result_queue (multiprocessing.Queue): queue to which the number of
+        records, duration in seconds and peak resident set size are written.
+  """
+  start_time = time.time()
+  number_of_records = parse_function(path)
+  duration = time.time() - start_time
+
+  result_queue.put((number_of_records, duration, _GetPeakRSS()))
+
+
+def RunBenchmark(name, generator_function, parse_function, number_of_records):
+  """Runs a parser benchmark.
+
+  Args:
+    name (str): name of the benchmark.
+    generator_function (function): input data generator function.
+    parse_function (function): parse function.
+    number_of_records (int): number of records in the input data.
+
+  Returns:
+    dict[str, object]: benchmark result.
+
+  Raises:
+    RuntimeError: if the benchmark process exited without a result.
+  """
+  temporary_directory = tempfile.mkdtemp()
+  try:
+    path = os.path.join(temporary_directory, name)
+    generator_function(path, number_of_records)
+    input_size = _GetSize(path)
+
+    result_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_RunParseFunction, args=(parse_function, path, result_queue))
+    process.start()
+
+    try:
+      number_of_parsed_records, duration, peak_rss = _GetBenchmarkResult(
+          process, result_queue)
+    finally:
+      process.join()
+
+  finally:
+    shutil.rmtree(temporary_directory, True)
+
+  duration = max(duration, 0.000001)
+
+  return {
+      'bytes_per_second': input_size / duration,
+      'duration': duration,
+      'input_size': input_size,
+      'name': name,
+      'number_of_records': number_of_parsed_records,
+      'peak_rss': peak_rss,
+      'records_per_second': number_of_parsed_records / duration}
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks the parsers with synthetic input data.'))
+
+  argument_parser.add_argument(
+      '-b', '--benchmarks', dest='benchmarks', action='store', default='all',
+      metavar='NAMES', help=(
+          'comma separated names of the benchmarks to run, supported '
+          'benchmarks are: {0:s}.').format(', '.join([
+              name for name, _, _ in BENCHMARKS])))
+
+  argument_parser.add_argument(
+      '-c', '--compare', dest='compare', action='store', default=None,
+      metavar='PATH', help=(
+          'path of a JSON file with the results of a previous run to '
+          'compare with.'))
+
+  argument_parser.add_argument(
+      '-n', '--records', dest='records', type=int, action='store',
+      default=100000, metavar='NUMBER', help=(
+          'number of records in the synthetic input data of each benchmark.'))
+
+  argument_parser.add_argument(
+      '-w', '--write', dest='output_file', action='store', default=None,
+      metavar='PATH', help='path of the JSON file to write the results to.')
+
+  options = argument_parser.parse_args()
+
+  if options.benchmarks == 'all':
+    benchmark_names = [name for name, _, _ in BENCHMARKS]
+  else:
+    benchmark_names = options.benchmarks.split(',')
+
+  previous_results = {}
+  if options.compare:
+    with open(options.compare, 'r') as file_object:
+      previous_results = {
+          result['name']: result
+          for result in json.load(file_object)['results']}
+
+  print('{0:s}\t{1:s}\t{2:s}\t{3:s}\t{4:s}\t{5:s}'.format(
+      'Benchmark', 'Records', 'MB/s', 'Records/s', 'Peak RSS (MiB)',
+      'Change'))
+
+  successful = True
+  results = []
+  for name, generator_function, parse_function in BENCHMARKS:
+    if name not in benchmark_names:
+      continue
+
+    try:
+      result = RunBenchmark(
+          name, generator_function, parse_function, options.records)
+    except RuntimeError as exception:
+      print('Unable to run benchmark: {0:s} with error: {1!s}'.format(
+          name, exception))
+      successful = False
+      continue
+
+    results.append(result)
+
+    peak_rss_string = 'N/A'
+    if result['peak_rss'] is not None:
+      peak_rss_string = '{0:.1f}'.format(result['peak_rss'] / (1024 * 1024))
+
+    change_string = ''
+    previous_result = previous_results.get(name, None)
+    if previous_result and previous_result['records_per_second']:
+      change_string = '{0:+.1f}%'.format(100 * (
+          result['records_per_second'] /
+          previous_result['records_per_second'] - 1))
+
+    print('{0:s}\t{1:d}\t{2:.1f}\t{3:.0f}\t{4:s}\t{5:s}'.format(
+        name, result['number_of_records'],
+        result['bytes_per_second'] / (1000 * 1000),
+        result['records_per_second'], peak_rss_string, change_string))
+
+  if options.output_file:
+    benchmark_results = {
+        'platform': platform.platform(),
+        'python_version': platform.python_version(),
+        'number_of_records': options.records,
+        'results': results,
+        'time': time.time()}
+
+    with open(options.output_file, 'w') as file_object:
+      json.dump(benchmark_results, file_object, indent=2, sort_keys=True)
+
+  return successful
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to benchmark mapping fixed-size structures with compiled maps."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import os
+import sys
+import timeit
+
+# Change PYTHONPATH to include dtformats.
+sys.path.insert(0, '.')
+
+from dtformats import fabric_registry  # pylint: disable=wrong-import-position
+from dtformats import structure_compiler  # pylint: disable=wrong-import-position
+
+
+# Fixed-size structures that are mapped per record, as tuples of format,
+# dtFabric definition file and structure data type name.
+BENCHMARK_STRUCTURES = [
+    ('ASL', 'asl.yaml', 'asl_record'),
+    ('BSM', 'bsm.yaml', 'bsm_token_data_subject32'),
+    ('Chrome cache', 'chrome_cache.yaml', 'chrome_cache_index_file_header'),
+    ('Firefox cache 1', 'firefox_cache1.yaml', 'firefox_cache1_map_record'),
+    ('INFO2', 'recycler.yaml', 'recycler_info2_file_entry'),
+    ('utmp', 'utmp.yaml', 'linux_libc6_utmp_entry'),
+    ('WMI CIM repository', 'wmi_repository.yaml', 'cim_object_descriptor')]
+
+
+def BenchmarkStructure(path, name, number_of_iterations):
+  """Benchmarks mapping a structure with dtFabric and a compiled map.
+
+  Args:
+    path (str): path of the dtFabric definition file.
+    name (str): name of the structure data type.
+    number_of_iterations (int): number of times to map the structure.
+
+  Returns:
+    tuple[int, float, float]: size of the structure and number of structures
+        mapped per second by dtFabric and the compiled map or None if the
+        structure cannot be compiled.
+  """
+  data_type_map = fabric_registry.DataTypeFabricRegistry.GetDataTypeMap(
+      path, name)
+  compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+      data_type_map)
+  if not compiled_map:
+    return None
+
+  byte_stream = b'\x00' * compiled_map.byte_size
+
+  dtfabric_time = timeit.timeit(
+      lambda: data_type_map.MapByteStream(byte_stream),
+      number=number_of_iterations)
+  compiled_time = timeit.timeit(
+      lambda: compiled_map.MapByteStream(byte_stream),
+      number=number_of_iterations)
+
+  return (
+      compiled_map.byte_size, number_of_iterations / dtfabric_time,
+      number_of_iterations / compiled_time)
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Benchmarks mapping fixed-size structures with dtFabric and compiled '
+      'structure maps.'))
+
+  argument_parser.add_argument(
+      '-n', '--iterations', dest='iterations', type=int, action='store',
+      default=100000, metavar='NUMBER', help=(
+          'number of times each structure is mapped.'))
+
+  options = argument_parser.parse_args()
+
+  definitions_path = os.path.join(
+      os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dtformats')
+
+  print('{0:s}\t{1:s}\t{2:s}\t{3:s}\t{4:s}\t{5:s}'.format(
+      'Format', 'Structure', 'Size', 'dtFabric (records/s)',
+      'Compiled (records/s)', 'Speedup'))
+
+  result = True
+  for format_name, filename, name in BENCHMARK_STRUCTURES:
+    path = os.path.join(definitions_path, filename)
+    benchmark_result = BenchmarkStructure(path, name, options.iterations)
+    if not benchmark_result:
+      print('{0:s}\t{1:s}\tunable to compile structure'.format(
+          format_name, name))
+      result = False
+      continue
+
+    byte_size, dtfabric_rate, compiled_rate = benchmark_result
+    print('{0:s}\t{1:s}\t{2:d}\t{3:.0f}\t{4:.0f}\t{5:.1f}x'.format(
+        format_name, name, byte_size, dtfabric_rate, compiled_rate,
+        compiled_rate / dtfabric_rate))
+
+  return result
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
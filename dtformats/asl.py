@@ -3,8 +3,58 @@
 
 from __future__ import unicode_literals
 
+import hashlib
+import os
+
 from dtformats import data_format
 from dtformats import errors
+from dtformats import follow
+from dtformats import format_registry
+from dtformats import timestamps
+
+
+class AppleSystemLogRecord(object):
+  """Apple System Log (ASL) record.
+
+  Attributes:
+    alert_level (int): alert level.
+    extra_fields (dict[str, str]): values of the extra fields per name.
+    facility (str): facility.
+    flags (int): flags.
+    group_identifier (int): group identifier (GID).
+    hostname (str): hostname.
+    message (str): message.
+    message_identifier (int): message identifier.
+    process_identifier (int): process identifier (PID).
+    real_group_identifier (int): real group identifier (GID).
+    real_user_identifier (int): real user identifier (UID).
+    reference_process_identifier (int): reference process identifier (PID).
+    sender (str): sender.
+    user_identifier (int): user identifier (UID).
+    written_time (int): number of seconds since January 1, 1970 00:00:00 UTC
+        the record was written.
+    written_time_nanoseconds (int): nanoseconds part of the written time.
+  """
+
+  def __init__(self):
+    """Initializes an ASL record."""
+    super(AppleSystemLogRecord, self).__init__()
+    self.alert_level = None
+    self.extra_fields = {}
+    self.facility = None
+    self.flags = None
+    self.group_identifier = None
+    self.hostname = None
+    self.message = None
+    self.message_identifier = None
+    self.process_identifier = None
+    self.real_group_identifier = None
+    self.real_user_identifier = None
+    self.reference_process_identifier = None
+    self.sender = None
+    self.user_identifier = None
+    self.written_time = None
+    self.written_time_nanoseconds = None
 
 
 class AppleSystemLogFile(data_format.BinaryDataFile):
@@ -14,6 +64,11 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
 
   _FILE_SIGNATURE = b'ASL DB\x00\x00\x00\x00\x00\x00'
 
+  SIGNATURES = [(0, _FILE_SIGNATURE)]
+
+  RECORD_TIMESTAMP_TYPES = {
+      'written_time': timestamps.TIMESTAMP_TYPE_POSIX}
+
   # Most significant bit of a 64-bit string offset.
   _STRING_OFFSET_MSB = 1 << 63
 
@@ -105,6 +160,115 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
     """
     return string.rstrip('\x00')
 
+  def _GetFollowFingerprint(self, file_object, follow_state):
+    """Retrieves the fingerprint of a followed file.
+
+    The last log entry offset in the file header and the next record offset
+    of the last record change when records are appended, hence only the file
+    header values that do not change are used.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Returns:
+      str: fingerprint of the file.
+
+    Raises:
+      ParseError: if the file header cannot be read.
+    """
+    file_header = self._ReadFileHeader(file_object)
+
+    hash_context = hashlib.sha256()
+    hash_context.update(file_header.signature)
+    hash_context.update('{0:d}:{1:d}:{2:d}'.format(
+        file_header.format_version, file_header.first_log_entry_offset,
+        file_header.creation_time).encode('ascii'))
+
+    return hash_context.hexdigest()
+
+  def _IsValidFollowState(self, file_object, follow_state):
+    """Determines if the follow state is valid for the file.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Returns:
+      bool: True if the records appended since the follow state can be read,
+          False if the file has not been parsed before or has been truncated,
+          rotated or rewritten since.
+    """
+    if not super(AppleSystemLogFile, self)._IsValidFollowState(
+        file_object, follow_state):
+      return False
+
+    last_record_offset = follow_state.values.get('last_record_offset', 0)
+    if not last_record_offset:
+      return True
+
+    data_type_map = self._GetDataTypeMap('asl_record')
+
+    try:
+      record, _ = self._ReadStructureFromFileObject(
+          file_object, last_record_offset, data_type_map, 'record')
+    except errors.ParseError:
+      return False
+
+    # Records are only appended after the last fully parsed record.
+    return (
+        record.next_record_offset == 0 or
+        record.next_record_offset >= follow_state.offset)
+
+  def _ReadAppendedRecords(self, file_object, follow_state):
+    """Reads the records appended since a follow state.
+
+    The records are appended by updating the next record offset of the last
+    record, hence reading is continued from the last fully parsed record.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Yields:
+      AppleSystemLogRecord: record.
+
+    Raises:
+      ParseError: if a record cannot be read.
+    """
+    file_header = self._ReadFileHeader(file_object)
+
+    last_record_offset = follow_state.values.get('last_record_offset', 0)
+    if follow_state.offset is None or not last_record_offset:
+      # The record strings are stored between the end of the previous record,
+      # or the file header, and the start of the record.
+      record_strings_data_offset = file_object.tell()
+      file_offset = file_header.first_log_entry_offset
+
+    else:
+      data_type_map = self._GetDataTypeMap('asl_record')
+
+      record, _ = self._ReadStructureFromFileObject(
+          file_object, last_record_offset, data_type_map, 'record')
+
+      record_strings_data_offset = follow_state.offset
+      file_offset = record.next_record_offset
+
+    follow_state.offset = record_strings_data_offset
+
+    while 0 < file_offset < self._file_size:
+      file_object.seek(record_strings_data_offset, os.SEEK_SET)
+
+      asl_record, next_record_offset = self._ReadRecord(
+          file_object, file_offset)
+      record_strings_data_offset = file_object.tell()
+
+      follow_state.offset = record_strings_data_offset
+      follow_state.values['last_record_offset'] = file_offset
+      yield asl_record
+
+      file_offset = next_record_offset
+
   def _ReadFileHeader(self, file_object):
     """Reads the file header.
 
@@ -138,7 +302,7 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
       file_offset (int): offset of the record relative to the start of the file.
 
     Returns:
-      int: next record offset.
+      tuple[AppleSystemLogRecord, int]: record and next record offset.
 
     Raises:
       ParseError: if the record cannot be read.
@@ -221,7 +385,26 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
 
     # TODO: implement print previous record offset
 
-    return record.next_record_offset
+    asl_record = AppleSystemLogRecord()
+    asl_record.alert_level = record.alert_level
+    asl_record.extra_fields = extra_fields
+    asl_record.facility = facility
+    asl_record.flags = record.flags
+    asl_record.group_identifier = record.group_identifier
+    asl_record.hostname = hostname
+    asl_record.message = message
+    asl_record.message_identifier = record.message_identifier
+    asl_record.process_identifier = record.process_identifier
+    asl_record.real_group_identifier = record.real_group_identifier
+    asl_record.real_user_identifier = record.real_user_identifier
+    asl_record.reference_process_identifier = (
+        record.reference_process_identifier)
+    asl_record.sender = sender
+    asl_record.user_identifier = record.user_identifier
+    asl_record.written_time = record.written_time
+    asl_record.written_time_nanoseconds = record.written_time_nanoseconds
+
+    return asl_record, record.next_record_offset
 
   def _ReadRecordExtraField(self, byte_stream, file_offset):
     """Reads a record extra field.
@@ -323,6 +506,22 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
 
     return record_string.string.rstrip('\x00')
 
+  def _ReadRecords(self, file_object):
+    """Reads the records.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      AppleSystemLogRecord: record.
+
+    Raises:
+      ParseError: if a record cannot be read.
+    """
+    follow_state = follow.FollowState()
+    for asl_record in self._ReadAppendedRecords(file_object, follow_state):
+      yield asl_record
+
   def ReadFileObject(self, file_object):
     """Reads an Apple System Log file-like object.
 
@@ -332,11 +531,11 @@ class AppleSystemLogFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file cannot be read.
     """
-    file_header = self._ReadFileHeader(file_object)
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
+    else:
+      self._ReadFileHeader(file_object)
 
-    if file_header.first_log_entry_offset > 0:
-      file_offset = file_header.first_log_entry_offset
-      while file_offset < self._file_size:
-        file_offset = self._ReadRecord(file_object, file_offset)
-        if file_offset == 0:
-          break
+
+format_registry.FormatRegistry.RegisterFormat('asl', AppleSystemLogFile)
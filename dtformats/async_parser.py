@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""Asynchronous (asyncio) parsing of files.
+
+The blocking reads and the parsing are offloaded to an executor, such that
+parsing files does not block the event loop.
+
+Note that this module requires Python 3.6 or later.
+"""
+
+from __future__ import unicode_literals
+
+import asyncio
+import threading
+
+from concurrent import futures
+
+from dtformats import errors
+from dtformats import format_registry
+from dtformats import output_writers
+
+# The modules of the supported formats are imported to register the formats
+# with the format registry.
+# pylint: disable=unused-import
+from dtformats import asl
+from dtformats import bsm
+from dtformats import chrome_cache
+from dtformats import systemd
+from dtformats import utmp
+# pylint: enable=unused-import
+
+
+def ReadRecordValues(path, format_class=None):
+  """Reads the values of the records of a file.
+
+  Args:
+    path (str): path of the file.
+    format_class (Optional[type]): binary data file class of the format of
+        the file, where None represents the format with the most specific
+        signature in the format registry.
+
+  Yields:
+    dict[str, object]: values of a record.
+
+  Raises:
+    ParseError: if the format of the file is not supported, the format does
+        not support reading records or a record cannot be read.
+  """
+  if not format_class:
+    format_names = format_registry.FormatRegistry.IdentifyFile(path)
+    if not format_names:
+      raise errors.ParseError('Unsupported format of file: {0:s}'.format(path))
+
+    format_class = format_registry.FormatRegistry.GetFormatClass(
+        format_names[0])
+
+  parser = format_class()
+  parser.Open(path)
+
+  try:
+    for record in parser.ReadRecords():
+      yield dict(output_writers.GetRecordValues(record))
+
+  except NotImplementedError as exception:
+    raise errors.ParseError(
+        'Unsupported format of file: {0:s} with error: {1!s}'.format(
+            path, exception))
+
+  finally:
+    parser.Close()
+
+
+def ParseFile(path, format_class=None):
+  """Parses a file.
+
+  This function is run by the executor of the asynchronous parser.
+
+  Args:
+    path (str): path of the file.
+    format_class (Optional[type]): binary data file class of the format of
+        the file, where None represents the format with the most specific
+        signature in the format registry.
+
+  Returns:
+    list[dict[str, object]]: values of the records.
+
+  Raises:
+    ParseError: if the format of the file is not supported or a record
+        cannot be read.
+  """
+  return list(ReadRecordValues(path, format_class=format_class))
+
+
+class AsyncParser(object):
+  """Asynchronous parser.
+
+  The number of files that are parsed concurrently is bounded. When the
+  records of a file are streamed, the number of pending batches of records
+  is bounded as well, such that a slow consumer pauses the parsing instead
+  of the records piling up in memory.
+
+  Note that a thread executor is sufficient to not block the event loop,
+  but a process executor is needed to parse files in parallel. With a
+  process executor the records of a file are parsed in the worker process
+  and passed to the event loop once the file has been parsed.
+  """
+
+  _DEFAULT_BATCH_SIZE = 256
+
+  _DEFAULT_MAXIMUM_NUMBER_OF_CONCURRENT_FILES = 8
+
+  _DEFAULT_MAXIMUM_NUMBER_OF_PENDING_BATCHES = 16
+
+  def __init__(
+      self, batch_size=_DEFAULT_BATCH_SIZE, executor=None,
+      maximum_number_of_concurrent_files=(
+          _DEFAULT_MAXIMUM_NUMBER_OF_CONCURRENT_FILES),
+      maximum_number_of_pending_batches=(
+          _DEFAULT_MAXIMUM_NUMBER_OF_PENDING_BATCHES)):
+    """Initializes an asynchronous parser.
+
+    Args:
+      batch_size (Optional[int]): number of records that are passed from
+          the executor to the event loop at once.
+      executor (Optional[concurrent.futures.Executor]): thread or process
+          executor, where None represents the default executor of the event
+          loop.
+      maximum_number_of_concurrent_files (Optional[int]): maximum number of
+          files that are parsed concurrently.
+      maximum_number_of_pending_batches (Optional[int]): maximum number of
+          batches of records, per file, that have been parsed but not yet
+          consumed.
+
+    Raises:
+      ValueError: if the batch size, maximum number of concurrent files or
+          maximum number of pending batches is out of bounds.
+    """
+    if batch_size <= 0:
+      raise ValueError('Batch size value out of bounds.')
+
+    if maximum_number_of_concurrent_files <= 0:
+      raise ValueError(
+          'Maximum number of concurrent files value out of bounds.')
+
+    if maximum_number_of_pending_batches <= 0:
+      raise ValueError('Maximum number of pending batches value out of bounds.')
+
+    super(AsyncParser, self).__init__()
+    self._batch_size = batch_size
+    self._executor = executor
+    self._maximum_number_of_concurrent_files = (
+        maximum_number_of_concurrent_files)
+    self._maximum_number_of_pending_batches = maximum_number_of_pending_batches
+    self._semaphore = None
+
+  def _GetSemaphore(self):
+    """Retrieves the semaphore that bounds the number of concurrent files.
+
+    The semaphore is created on first use, since it is bound to the event
+    loop on older versions of Python.
+
+    Returns:
+      asyncio.Semaphore: semaphore.
+    """
+    if not self._semaphore:
+      self._semaphore = asyncio.Semaphore(
+          self._maximum_number_of_concurrent_files)
+
+    return self._semaphore
+
+  def _ReadRecordValueBatches(
+      self, path, format_class, event_loop, queue, abort_event):
+    """Reads batches of record values onto a queue.
+
+    This method is run by a thread of the executor. Putting a batch on the
+    queue blocks while the queue is full. A None value is put on the queue
+    once all the batches have been put or if reading failed.
+
+    Args:
+      path (str): path of the file.
+      format_class (type): binary data file class of the format of the file
+          or None.
+      event_loop (asyncio.AbstractEventLoop): event loop of the queue.
+      queue (asyncio.Queue): queue to put the batches of record values on.
+      abort_event (threading.Event): event that signals that the consumer
+          has stopped reading the queue.
+    """
+    try:
+      batch = []
+      for record_values in ReadRecordValues(path, format_class=format_class):
+        batch.append(record_values)
+        if len(batch) >= self._batch_size:
+          asyncio.run_coroutine_threadsafe(
+              queue.put(batch), event_loop).result()
+          batch = []
+
+          if abort_event.is_set():
+            return
+
+      if batch:
+        asyncio.run_coroutine_threadsafe(queue.put(batch), event_loop).result()
+
+    finally:
+      asyncio.run_coroutine_threadsafe(queue.put(None), event_loop).result()
+
+  async def ParseFileAsync(self, path, format_class=None):
+    """Parses a file.
+
+    Args:
+      path (str): path of the file.
+      format_class (Optional[type]): binary data file class of the format of
+          the file, where None represents the format with the most specific
+          signature in the format registry.
+
+    Returns:
+      list[dict[str, object]]: values of the records.
+
+    Raises:
+      ParseError: if the format of the file is not supported or a record
+          cannot be read.
+    """
+    async with self._GetSemaphore():
+      event_loop = asyncio.get_event_loop()
+      return await event_loop.run_in_executor(
+          self._executor, ParseFile, path, format_class)
+
+  async def ParseRecordsAsync(self, path, format_class=None):
+    """Parses the records of a file.
+
+    Args:
+      path (str): path of the file.
+      format_class (Optional[type]): binary data file class of the format of
+          the file, where None represents the format with the most specific
+          signature in the format registry.
+
+    Yields:
+      dict[str, object]: values of a record.
+
+    Raises:
+      ParseError: if the format of the file is not supported or a record
+          cannot be read.
+    """
+    # Records cannot be streamed from a worker process.
+    if isinstance(self._executor, futures.ProcessPoolExecutor):
+      records = await self.ParseFileAsync(path, format_class=format_class)
+      for record_values in records:
+        yield record_values
+      return
+
+    async with self._GetSemaphore():
+      event_loop = asyncio.get_event_loop()
+      queue = asyncio.Queue(maxsize=self._maximum_number_of_pending_batches)
+      abort_event = threading.Event()
+
+      producer = event_loop.run_in_executor(
+          self._executor, self._ReadRecordValueBatches, path, format_class,
+          event_loop, queue, abort_event)
+
+      try:
+        batch = await queue.get()
+        while batch is not None:
+          for record_values in batch:
+            yield record_values
+
+          batch = await queue.get()
+
+        # Raises the exception of the producer if reading failed.
+        await producer
+
+      finally:
+        # Empty the queue until the producer has stopped, since the producer
+        # blocks while the queue is full.
+        abort_event.set()
+        while not producer.done():
+          while not queue.empty():
+            queue.get_nowait()
+
+          await asyncio.wait([producer], timeout=0.01)
@@ -5,6 +5,33 @@ from __future__ import unicode_literals
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import timestamps
+
+
+class BSMEventRecord(object):
+  """Basic Security Module (BSM) event record.
+
+  Attributes:
+    event_type (int): event type.
+    microseconds (int): microseconds part of the timestamp.
+    modifier (int): event type modifier.
+    offset (int): offset of the event record relative to the start of
+        the file.
+    size (int): size of the event record.
+    timestamp (int): number of seconds since January 1, 1970 00:00:00 UTC.
+    token_types (list[int]): types of the tokens in the event record.
+  """
+
+  def __init__(self):
+    """Initializes a BSM event record."""
+    super(BSMEventRecord, self).__init__()
+    self.event_type = None
+    self.microseconds = None
+    self.modifier = None
+    self.offset = None
+    self.size = None
+    self.timestamp = None
+    self.token_types = []
 
 
 class BSMEventAuditingFile(data_format.BinaryDataFile):
@@ -12,6 +39,9 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
 
   _DEFINITION_FILE = 'bsm.yaml'
 
+  RECORD_TIMESTAMP_TYPES = {
+      'timestamp': timestamps.TIMESTAMP_TYPE_POSIX}
+
   _EVENT_TYPES = {
       0: 'indir system call',
       1: 'exit(2)',
@@ -1120,6 +1150,41 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
     """
     return string.rstrip('\x00')
 
+  def _ReadAppendedRecords(self, file_object, follow_state):
+    """Reads the event records appended since a follow state.
+
+    An event record that is not fully written yet is read when the file is
+    followed the next time.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Yields:
+      BSMEventRecord: event record.
+
+    Raises:
+      ParseError: if an event record cannot be read.
+    """
+    file_offset = follow_state.offset or 0
+    follow_state.offset = file_offset
+
+    while file_offset < self._file_size:
+      try:
+        token_type, token_data = self._ReadToken(file_object, file_offset)
+      except errors.ParseError:
+        break
+
+      if (token_type in self._HEADER_TOKEN_TYPES and
+          file_offset + token_data.record_size > self._file_size):
+        break
+
+      event_record = self._ReadRecord(file_object, file_offset)
+      file_offset = file_object.tell()
+
+      follow_state.offset = file_offset
+      yield event_record
+
   def _ReadRecord(self, file_object, file_offset):
     """Reads an event record.
 
@@ -1128,9 +1193,15 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
       file_offset (int): offset of the token relative to the start of
           the file-like object.
 
+    Returns:
+      BSMEventRecord: event record.
+
     Raises:
       ParseError: if the event record cannot be read.
     """
+    event_record = BSMEventRecord()
+    event_record.offset = file_offset
+
     token_type, token_data = self._ReadToken(file_object, file_offset)
 
     if self._debug:
@@ -1146,6 +1217,12 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
       raise errors.ParseError('Unsupported format version type: {0:d}'.format(
           token_data.format_version))
 
+    event_record.event_type = token_data.event_type
+    event_record.microseconds = token_data.microseconds
+    event_record.modifier = token_data.modifier
+    event_record.size = token_data.record_size
+    event_record.timestamp = token_data.timestamp
+
     header_record_size = token_data.record_size
     record_end_offset = file_offset + header_record_size
     while file_offset < record_end_offset:
@@ -1154,6 +1231,8 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
         raise errors.ParseError('Unsupported token type: 0x{0:02x}'.format(
             token_type))
 
+      event_record.token_types.append(token_type)
+
       # TODO: add callback for validation (trailer) and read of more complex
       # structures.
 
@@ -1174,6 +1253,8 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
       raise errors.ParseError(
           'Mismatch of event record size between header and trailer token.')
 
+    return event_record
+
   def _ReadToken(self, file_object, file_offset):
     """Reads a token.
 
@@ -1208,6 +1289,25 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
 
     return token_type, token_data
 
+  def _ReadRecords(self, file_object):
+    """Reads the event records.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      BSMEventRecord: event record.
+
+    Raises:
+      ParseError: if an event record cannot be read.
+    """
+    file_offset = 0
+    while file_offset < self._file_size:
+      event_record = self._ReadRecord(file_object, file_offset)
+      file_offset = file_object.tell()
+
+      yield event_record
+
   def ReadFileObject(self, file_object):
     """Reads a BSM event auditing file.
 
@@ -1217,7 +1317,6 @@ class BSMEventAuditingFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file cannot be read.
     """
-    file_offset = file_object.tell()
-    while file_offset < self._file_size:
-      self._ReadRecord(file_object, file_offset)
-      file_offset = file_object.tell()
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
@@ -0,0 +1,874 @@
+# -*- coding: utf-8 -*-
+"""Signature based carving of records from raw data, such as storage media
+images, unallocated data or memory dumps."""
+
+from __future__ import unicode_literals
+
+import abc
+import collections
+import mmap
+import multiprocessing
+import os
+import re
+
+try:
+  from concurrent import futures
+except ImportError:
+  futures = None
+
+from dtformats import asl
+from dtformats import bsm
+from dtformats import chrome_cache
+from dtformats import data_format
+from dtformats import data_range
+from dtformats import errors
+from dtformats import follow
+from dtformats import memory_mapped_file
+from dtformats import output_writers
+from dtformats import systemd
+from dtformats import timestamps
+from dtformats import utmp
+from dtformats import wmi_repository
+
+
+# Maximum size of the data that matches a signature pattern, which is used
+# as the overlap between the scans of successive chunks.
+MAXIMUM_SIGNATURE_SIZE = 64
+
+
+class LNKFileHeader(object):
+  """Windows Shortcut (LNK) file header.
+
+  Attributes:
+    access_time (int): access time, as a FILETIME timestamp.
+    creation_time (int): creation time, as a FILETIME timestamp.
+    data_flags (int): data flags.
+    file_attribute_flags (int): file attribute flags of the link target.
+    file_size (int): size of the link target.
+    modification_time (int): modification time, as a FILETIME timestamp.
+  """
+
+  def __init__(self):
+    """Initializes a Windows Shortcut (LNK) file header."""
+    super(LNKFileHeader, self).__init__()
+    self.access_time = None
+    self.creation_time = None
+    self.data_flags = None
+    self.file_attribute_flags = None
+    self.file_size = None
+    self.modification_time = None
+
+
+class RecordCarver(data_format.BinaryDataFormat):
+  """Record carver.
+
+  A record carver validates the data at a signature hit and carves the
+  records it contains.
+  """
+
+  # Name of the format of the carved records.
+  NAME = None
+
+  # Timestamp types of the record attributes that contain a timestamp, see
+  # the timestamps module.
+  RECORD_TIMESTAMP_TYPES = {}
+
+  # Regular expression of the signature and offset of the signature relative
+  # to the start of the carved data.
+  SIGNATURE_PATTERN = None
+  SIGNATURE_OFFSET = 0
+
+  # Alignment of the start of the carved data, relative to the start of
+  # the raw data.
+  ALIGNMENT = 1
+
+  @abc.abstractmethod
+  def CarveRecords(self, file_object, file_offset, data_size):
+    """Carves the records at a signature hit.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the carved data relative to the start
+          of the raw data.
+      data_size (int): maximum size of the carved data.
+
+    Returns:
+      tuple[int, list[object]]: size of the carved data and the carved
+          records, where no records represents that the data at the signature
+          hit is not valid.
+    """
+
+
+class FileRecordCarver(RecordCarver):
+  """Record carver of a file format that has a file header signature.
+
+  The carved data is read as a file of the format, until a record cannot
+  be read.
+  """
+
+  # The binary data file class of the format, which must be overwritten by
+  # a subclass.
+  _FORMAT_CLASS = None
+
+  # Maximum number of successive empty records, after which the remaining
+  # data is considered to not be part of the file.
+  _MAXIMUM_NUMBER_OF_EMPTY_RECORDS = 0
+
+  def _IsEmptyRecord(self, record):  # pylint: disable=unused-argument
+    """Determines if a record read from the carved data is empty.
+
+    Empty records are only carved when followed by a record that is not
+    empty. Subclasses of formats with empty records, that cannot be
+    distinguished from zero-filled data, override this method.
+
+    Args:
+      record (object): record.
+
+    Returns:
+      bool: True if the record is empty.
+    """
+    return False
+
+  def _IsValidRecord(self, record):  # pylint: disable=unused-argument
+    """Determines if a record read from the carved data is valid.
+
+    Subclasses of formats of which the records cannot be distinguished from
+    data that follows the file, such as fixed-size entries, override this
+    method.
+
+    Args:
+      record (object): record.
+
+    Returns:
+      bool: True if the record is valid.
+    """
+    return True
+
+  def CarveRecords(self, file_object, file_offset, data_size):
+    """Carves the records at a signature hit.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the carved data relative to the start
+          of the raw data.
+      data_size (int): maximum size of the carved data.
+
+    Returns:
+      tuple[int, list[object]]: size of the carved data and the carved
+          records, where no records represents that the data at the signature
+          hit is not valid.
+    """
+    carved_file_object = data_range.DataRange(
+        file_object, data_offset=file_offset, data_size=data_size)
+
+    parser = self._FORMAT_CLASS()
+
+    try:
+      parser.OpenFileObject(carved_file_object)
+    except (errors.ParseError, IOError, OSError):
+      return 0, []
+
+    # The follow state is used to determine the end of the last fully parsed
+    # record, hence the size of the carved data.
+    follow_state = follow.FollowState()
+
+    carved_data_size = 0
+    empty_records = []
+    records = []
+
+    records_generator = parser.ReadAppendedRecords(follow_state)
+
+    # Note that reading data that is not of the format, such as the data that
+    # follows the file, can result in various exceptions, while the records
+    # read before remain valid.
+    try:
+      for record in records_generator:
+        if not self._IsValidRecord(record):
+          break
+
+        if self._IsEmptyRecord(record):
+          if len(empty_records) >= self._MAXIMUM_NUMBER_OF_EMPTY_RECORDS:
+            break
+
+          empty_records.append(record)
+          continue
+
+        carved_data_size = follow_state.offset
+        records.extend(empty_records)
+        records.append(record)
+        empty_records = []
+
+    except Exception:  # pylint: disable=broad-except
+      pass
+
+    finally:
+      try:
+        records_generator.close()
+      except errors.ParseError:
+        pass
+
+      parser.Close()
+
+    return carved_data_size, records
+
+
+class AppleSystemLogFileCarver(FileRecordCarver):
+  """Apple System Log (ASL) file carver."""
+
+  NAME = 'asl'
+
+  RECORD_TIMESTAMP_TYPES = asl.AppleSystemLogFile.RECORD_TIMESTAMP_TYPES
+
+  SIGNATURE_PATTERN = re.escape(asl.AppleSystemLogFile.SIGNATURES[0][1])
+
+  _FORMAT_CLASS = asl.AppleSystemLogFile
+
+
+class BSMEventRecordCarver(FileRecordCarver):
+  """Basic Security Module (BSM) event record carver.
+
+  The signature is the header token of an event record, with format version
+  11, after which successive event records are carved. The record size in
+  the header token is validated against the trailer token, before the tokens
+  of an event record are read.
+  """
+
+  _DEFINITION_FILE = 'carver.yaml'
+
+  NAME = 'bsm'
+
+  RECORD_TIMESTAMP_TYPES = bsm.BSMEventAuditingFile.RECORD_TIMESTAMP_TYPES
+
+  SIGNATURE_PATTERN = br'[\x14\x15\x74\x79][\x00-\xff]{4}\x0b'
+
+  _FORMAT_CLASS = bsm.BSMEventAuditingFile
+
+  # pylint: disable=protected-access
+  _HEADER_TOKEN_TYPES = bsm.BSMEventAuditingFile._HEADER_TOKEN_TYPES
+
+  # Size of the smallest header token (AUT_HEADER32).
+  _MINIMUM_HEADER_TOKEN_SIZE = 18
+
+  # pylint: disable=protected-access
+  _TRAILER_TOKEN_SIGNATURE = bsm.BSMEventAuditingFile._TRAILER_TOKEN_SIGNATURE
+
+  _TRAILER_TOKEN_SIZE = 7
+
+  # pylint: disable=protected-access
+  _TRAILER_TOKEN_TYPE = bsm.BSMEventAuditingFile._TRAILER_TOKEN_TYPE
+
+  def _GetEventRecordSize(self, file_object, file_offset, data_size):
+    """Determines the size of an event record without reading its tokens.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the event record relative to the start
+          of the raw data.
+      data_size (int): maximum size of the event record.
+
+    Returns:
+      int: size of the event record or 0 if the header and trailer token do
+          not describe a valid event record.
+    """
+    data_type_map = self._GetDataTypeMap('bsm_record_header')
+
+    try:
+      record_header, _ = self._ReadStructureFromFileObject(
+          file_object, file_offset, data_type_map, 'event record header')
+    except errors.ParseError:
+      return 0
+
+    if record_header.token_type not in self._HEADER_TOKEN_TYPES:
+      return 0
+
+    record_size = record_header.record_size
+    if record_size < (
+        self._MINIMUM_HEADER_TOKEN_SIZE + self._TRAILER_TOKEN_SIZE):
+      return 0
+
+    if record_size > data_size:
+      return 0
+
+    data_type_map = self._GetDataTypeMap('bsm_trailer_token')
+
+    try:
+      trailer_token, _ = self._ReadStructureFromFileObject(
+          file_object, file_offset + record_size - self._TRAILER_TOKEN_SIZE,
+          data_type_map, 'trailer token')
+    except errors.ParseError:
+      return 0
+
+    if (trailer_token.token_type != self._TRAILER_TOKEN_TYPE or
+        trailer_token.signature != self._TRAILER_TOKEN_SIGNATURE or
+        trailer_token.record_size != record_size):
+      return 0
+
+    return record_size
+
+  def CarveRecords(self, file_object, file_offset, data_size):
+    """Carves the records at a signature hit.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the carved data relative to the start
+          of the raw data.
+      data_size (int): maximum size of the carved data.
+
+    Returns:
+      tuple[int, list[object]]: size of the carved data and the carved
+          records, where no records represents that the data at the signature
+          hit is not valid.
+    """
+    # Only the successive event records with a matching trailer token are
+    # read, which limits the data read on signature hits in random data.
+    validated_data_size = 0
+    while validated_data_size < data_size:
+      record_size = self._GetEventRecordSize(
+          file_object, file_offset + validated_data_size,
+          data_size - validated_data_size)
+      if not record_size:
+        break
+
+      validated_data_size += record_size
+
+    if not validated_data_size:
+      return 0, []
+
+    return super(BSMEventRecordCarver, self).CarveRecords(
+        file_object, file_offset, validated_data_size)
+
+
+class ChromeCacheEntryCarver(RecordCarver):
+  """Chrome Cache entry carver.
+
+  The signature is the start of the key, which is a URL, and the entry is
+  validated with the super fast hash of the key. Entries with a key that
+  is not stored in the entry itself are not carved.
+  """
+
+  NAME = 'chrome_cache_entry'
+
+  RECORD_TIMESTAMP_TYPES = {
+      'creation_time': timestamps.TIMESTAMP_TYPE_WEBKIT}
+
+  SIGNATURE_PATTERN = b'(?:1/0/_dk_|https?://)'
+  SIGNATURE_OFFSET = 96
+
+  # The entries are stored in blocks of 256 bytes after the 8192 bytes of
+  # the data block file header.
+  ALIGNMENT = 256
+
+  _CACHE_ENTRY_SIZE = 256
+
+  def __init__(self, debug=False, output_writer=None):
+    """Initializes a Chrome Cache entry carver.
+
+    Args:
+      debug (Optional[bool]): True if debug information should be written.
+      output_writer (Optional[OutputWriter]): output writer.
+    """
+    super(ChromeCacheEntryCarver, self).__init__(
+        debug=debug, output_writer=output_writer)
+    self._data_block_file = chrome_cache.DataBlockFile(
+        debug=debug, output_writer=output_writer)
+
+  def CarveRecords(self, file_object, file_offset, data_size):
+    """Carves the records at a signature hit.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the carved data relative to the start
+          of the raw data.
+      data_size (int): maximum size of the carved data.
+
+    Returns:
+      tuple[int, list[object]]: size of the carved data and the carved
+          records, where no records represents that the data at the signature
+          hit is not valid.
+    """
+    if data_size < self._CACHE_ENTRY_SIZE:
+      return 0, []
+
+    try:
+      # pylint: disable=protected-access
+      cache_entry = self._data_block_file._ReadCacheEntry(
+          file_object, file_offset)
+    except errors.ParseError:
+      return 0, []
+
+    try:
+      key = cache_entry.key.encode('ascii')
+    except UnicodeEncodeError:
+      return 0, []
+
+    if cache_entry.hash != chrome_cache.SuperFastHash(key):
+      return 0, []
+
+    return self._CACHE_ENTRY_SIZE, [cache_entry]
+
+
+class IndexBinaryTreePageCarver(RecordCarver):
+  """WMI CIM repository index binary-tree page carver.
+
+  Only active pages are carved, since the administrative and deleted pages
+  do not contain data that can be validated.
+  """
+
+  NAME = 'wmi_index_page'
+
+  SIGNATURE_PATTERN = b'\xcc\xac\x00\x00'
+
+  # The pages are stored at multitudes of the 8192 bytes page size in
+  # the index binary-tree file.
+  ALIGNMENT = 512
+
+  _PAGE_SIZE = 8192
+
+  def __init__(self, debug=False, output_writer=None):
+    """Initializes an index binary-tree page carver.
+
+    Args:
+      debug (Optional[bool]): True if debug information should be written.
+      output_writer (Optional[OutputWriter]): output writer.
+    """
+    super(IndexBinaryTreePageCarver, self).__init__(
+        debug=debug, output_writer=output_writer)
+    self._index_binary_tree_file = wmi_repository.IndexBinaryTreeFile(
+        None, debug=debug, output_writer=output_writer)
+
+  def CarveRecords(self, file_object, file_offset, data_size):
+    """Carves the records at a signature hit.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the carved data relative to the start
+          of the raw data.
+      data_size (int): maximum size of the carved data.
+
+    Returns:
+      tuple[int, list[object]]: size of the carved data and the carved
+          records, where no records represents that the data at the signature
+          hit is not valid.
+    """
+    if data_size < self._PAGE_SIZE:
+      return 0, []
+
+    try:
+      # pylint: disable=protected-access
+      index_binary_tree_page = self._index_binary_tree_file._ReadPage(
+          file_object, file_offset)
+    except errors.ParseError:
+      return 0, []
+
+    if not index_binary_tree_page.number_of_keys:
+      return 0, []
+
+    return self._PAGE_SIZE, [index_binary_tree_page]
+
+
+class LNKFileHeaderCarver(RecordCarver):
+  """Windows Shortcut (LNK) file header carver.
+
+  Only the file header is carved, since reading the remainder of the LNK
+  data requires pylnk.
+  """
+
+  _DEFINITION_FILE = 'carver.yaml'
+
+  NAME = 'lnk'
+
+  RECORD_TIMESTAMP_TYPES = {
+      'access_time': timestamps.TIMESTAMP_TYPE_FILETIME,
+      'creation_time': timestamps.TIMESTAMP_TYPE_FILETIME,
+      'modification_time': timestamps.TIMESTAMP_TYPE_FILETIME}
+
+  # The header size followed by the LNK class identifier (GUID).
+  SIGNATURE_PATTERN = re.escape(
+      b'\x4c\x00\x00\x00\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00\x00\x00'
+      b'\x00\x00\x00\x46')
+
+  def CarveRecords(self, file_object, file_offset, data_size):
+    """Carves the records at a signature hit.
+
+    Args:
+      file_object (file): file-like object of the raw data.
+      file_offset (int): offset of the carved data relative to the start
+          of the raw data.
+      data_size (int): maximum size of the carved data.
+
+    Returns:
+      tuple[int, list[object]]: size of the carved data and the carved
+          records, where no records represents that the data at the signature
+          hit is not valid.
+    """
+    data_type_map = self._GetDataTypeMap('lnk_file_header')
+
+    try:
+      file_header, file_header_data_size = self._ReadStructureFromFileObject(
+          file_object, file_offset, data_type_map, 'LNK file header')
+    except errors.ParseError:
+      return 0, []
+
+    if file_header_data_size > data_size:
+      return 0, []
+
+    if file_header.unknown1 != b'\x00' * 10:
+      return 0, []
+
+    lnk_file_header = LNKFileHeader()
+    lnk_file_header.access_time = file_header.access_time
+    lnk_file_header.creation_time = file_header.creation_time
+    lnk_file_header.data_flags = file_header.data_flags
+    lnk_file_header.file_attribute_flags = file_header.file_attribute_flags
+    lnk_file_header.file_size = file_header.file_size
+    lnk_file_header.modification_time = file_header.modification_time
+
+    return file_header_data_size, [lnk_file_header]
+
+
+class MacOSXUtmpxFileCarver(FileRecordCarver):
+  """Mac OS X 10.5 utmpx file carver."""
+
+  NAME = 'utmpx'
+
+  RECORD_TIMESTAMP_TYPES = utmp.MacOSXUtmpxFile.RECORD_TIMESTAMP_TYPES
+
+  SIGNATURE_PATTERN = re.escape(utmp.MacOSXUtmpxFile.SIGNATURES[0][1])
+
+  _FORMAT_CLASS = utmp.MacOSXUtmpxFile
+
+  _MAXIMUM_NUMBER_OF_EMPTY_RECORDS = 16
+
+  def _IsEmptyRecord(self, record):
+    """Determines if a record read from the carved data is empty.
+
+    Args:
+      record (UtmpEntry): entry.
+
+    Returns:
+      bool: True if the record is empty.
+    """
+    return record.type == 0
+
+  def _IsValidRecord(self, record):
+    """Determines if a record read from the carved data is valid.
+
+    Args:
+      record (UtmpEntry): entry.
+
+    Returns:
+      bool: True if the record is valid.
+    """
+    return 0 <= record.type <= 11
+
+
+class SystemdJournalFileCarver(FileRecordCarver):
+  """Systemd journal file carver.
+
+  Note that the size of the carved data extends to the last carved entry
+  object, since entry objects are read by their offsets.
+  """
+
+  NAME = 'systemd_journal'
+
+  RECORD_TIMESTAMP_TYPES = systemd.SystemdJournalFile.RECORD_TIMESTAMP_TYPES
+
+  SIGNATURE_PATTERN = re.escape(systemd.SystemdJournalFile.SIGNATURES[0][1])
+
+  _FORMAT_CLASS = systemd.SystemdJournalFile
+
+
+CARVER_CLASSES = {
+    'asl': AppleSystemLogFileCarver,
+    'bsm': BSMEventRecordCarver,
+    'chrome_cache_entry': ChromeCacheEntryCarver,
+    'lnk': LNKFileHeaderCarver,
+    'systemd_journal': SystemdJournalFileCarver,
+    'utmpx': MacOSXUtmpxFileCarver,
+    'wmi_index_page': IndexBinaryTreePageCarver}
+
+
+# Record carvers per name and signature patterns per combination of names,
+# which are created once per (worker) process and reused for every chunk.
+_carvers = {}
+_signature_patterns = {}
+
+
+def _GetSignaturePattern(carver_names):
+  """Retrieves the combined signature pattern of record carvers.
+
+  The signature pattern of every record carver is a named group within
+  a lookahead assertion, such that signatures that overlap are all matched.
+
+  Args:
+    carver_names (list[str]): names of the record carvers.
+
+  Returns:
+    re.RegexObject: signature pattern, of which the name of the matched group
+        is the name of the record carver.
+  """
+  key = tuple(carver_names)
+  signature_pattern = _signature_patterns.get(key, None)
+  if not signature_pattern:
+    signature_patterns = []
+    for index, carver_name in enumerate(carver_names):
+      carver_class = CARVER_CLASSES[carver_name]
+      group_name = 'carver{0:d}'.format(index).encode('ascii')
+      signature_patterns.append(b''.join([
+          b'(?=(?P<', group_name, b'>', carver_class.SIGNATURE_PATTERN,
+          b'))']))
+
+    signature_pattern = re.compile(b'|'.join(signature_patterns))
+    _signature_patterns[key] = signature_pattern
+
+  return signature_pattern
+
+
+def CarveChunk(path, chunk_offset, chunk_size, carver_names):
+  """Carves the records of which the signature starts in a chunk.
+
+  This function is run by the worker processes of the carving runner. The
+  scan of the chunk overlaps with the next chunk, such that a signature that
+  crosses the end of the chunk is matched. The carved data can extend beyond
+  the end of the chunk. Signatures within data that was carved before are
+  ignored.
+
+  Args:
+    path (str): path of the raw data, such as a storage media image or
+        a memory dump.
+    chunk_offset (int): offset of the chunk relative to the start of the raw
+        data.
+    chunk_size (int): size of the chunk.
+    carver_names (list[str]): names of the record carvers.
+
+  Returns:
+    list[tuple[str, int, int, list[dict[str, object]]]]: name of the record
+        carver, offset and size of the carved data and values of the carved
+        records, per valid signature hit in order of offset.
+  """
+  carvers = []
+  for carver_name in carver_names:
+    carver = _carvers.get(carver_name, None)
+    if not carver:
+      carver = CARVER_CLASSES[carver_name]()
+      _carvers[carver_name] = carver
+    carvers.append(carver)
+
+  signature_pattern = _GetSignaturePattern(carver_names)
+
+  carved_end_offsets = {}
+  hits = []
+
+  with open(path, 'rb') as file_object:
+    file_object.seek(0, os.SEEK_END)
+    file_size = file_object.tell()
+
+    chunk_end_offset = min(chunk_offset + chunk_size, file_size)
+    scan_end_offset = min(
+        chunk_end_offset + MAXIMUM_SIGNATURE_SIZE - 1, file_size)
+
+    try:
+      memory_mapped_file_object = memory_mapped_file.MemoryMappedFile(
+          file_object)
+    except (IOError, OSError, ValueError, mmap.error):
+      memory_mapped_file_object = None
+
+    # Raw data that cannot be memory mapped, such as a device, is read per
+    # chunk instead.
+    if memory_mapped_file_object:
+      carve_file_object = memory_mapped_file_object
+      scan_data = memory_mapped_file_object.GetView(0, scan_end_offset)
+      scan_data_offset = 0
+    else:
+      carve_file_object = file_object
+      file_object.seek(chunk_offset, os.SEEK_SET)
+      scan_data = file_object.read(scan_end_offset - chunk_offset)
+      scan_data_offset = chunk_offset
+
+    try:
+      for match in signature_pattern.finditer(
+          scan_data, chunk_offset - scan_data_offset,
+          scan_end_offset - scan_data_offset):
+        signature_offset = scan_data_offset + match.start()
+        if signature_offset >= chunk_end_offset:
+          break
+
+        carver = carvers[int(match.lastgroup[6:], 10)]
+
+        carved_data_offset = signature_offset - carver.SIGNATURE_OFFSET
+        if carved_data_offset < 0 or carved_data_offset % carver.ALIGNMENT:
+          continue
+
+        if carved_data_offset < carved_end_offsets.get(carver.NAME, 0):
+          continue
+
+        # Note that carving data that is not of the expected format can
+        # result in various exceptions, which should not stop the carving
+        # of other signature hits.
+        try:
+          carved_data_size, records = carver.CarveRecords(
+              carve_file_object, carved_data_offset,
+              file_size - carved_data_offset)
+        except Exception:  # pylint: disable=broad-except
+          continue
+
+        if not records:
+          continue
+
+        carved_end_offsets[carver.NAME] = carved_data_offset + carved_data_size
+
+        records_values = []
+        for record in records:
+          record_values = [
+              ('carved_format', carver.NAME),
+              ('carved_offset', carved_data_offset)]
+          record_values.extend(output_writers.GetRecordValues(record))
+          records_values.append(dict(record_values))
+
+        timestamps.CopyRecordTimestampsToDateTimeStrings(
+            records_values, carver.RECORD_TIMESTAMP_TYPES)
+
+        hits.append((
+            carver.NAME, carved_data_offset, carved_data_size, records_values))
+
+    finally:
+      scan_data = None
+      if memory_mapped_file_object:
+        memory_mapped_file_object.close()
+
+  return hits
+
+
+class CarvingRunner(object):
+  """Runner that carves records from raw data.
+
+  The raw data is carved in chunks by a pool of worker processes. A signature
+  hit is carved by the worker of the chunk in which the signature starts and
+  the hits of which the carved data overlaps with the carved data of
+  a preceding hit of the same format are ignored. The number of pending chunks
+  is bounded, such that the memory usage does not depend on the size of the
+  raw data.
+
+  Attributes:
+    number_of_hits (int): number of valid signature hits.
+    number_of_records (int): number of records written.
+  """
+
+  _DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+  def __init__(
+      self, carver_names=None, chunk_size=_DEFAULT_CHUNK_SIZE,
+      number_of_workers=None):
+    """Initializes a carving runner.
+
+    Args:
+      carver_names (Optional[list[str]]): names of the record carvers, where
+          None represents all record carvers.
+      chunk_size (Optional[int]): size of the chunks.
+      number_of_workers (Optional[int]): number of worker processes, where
+          None represents the number of CPUs and 1 or less carves the chunks
+          in the current process.
+
+    Raises:
+      ValueError: if a record carver or the chunk size is not supported.
+    """
+    if carver_names is None:
+      carver_names = CARVER_CLASSES.keys()
+
+    for carver_name in carver_names:
+      if carver_name not in CARVER_CLASSES:
+        raise ValueError('Unsupported record carver: {0:s}'.format(
+            carver_name))
+
+    if chunk_size <= 0:
+      raise ValueError('Unsupported chunk size: {0:d}'.format(chunk_size))
+
+    if number_of_workers is None:
+      number_of_workers = multiprocessing.cpu_count()
+
+    super(CarvingRunner, self).__init__()
+    self._carved_end_offsets = {}
+    self._carver_names = sorted(carver_names)
+    self._chunk_size = chunk_size
+    self._number_of_workers = number_of_workers
+    self.number_of_hits = 0
+    self.number_of_records = 0
+
+  def _GetChunks(self, path):
+    """Retrieves the chunks of the raw data.
+
+    Args:
+      path (str): path of the raw data.
+
+    Yields:
+      tuple[int, int]: offset and size of the chunk.
+    """
+    with open(path, 'rb') as file_object:
+      file_object.seek(0, os.SEEK_END)
+      file_size = file_object.tell()
+
+    for chunk_offset in range(0, file_size, self._chunk_size):
+      yield chunk_offset, min(self._chunk_size, file_size - chunk_offset)
+
+  def _WriteHits(self, hits, record_writer):
+    """Writes the records of the signature hits of a chunk.
+
+    Args:
+      hits (list[tuple[str, int, int, list[dict[str, object]]]]): name of
+          the record carver, offset and size of the carved data and values of
+          the carved records, per valid signature hit in order of offset.
+      record_writer (BufferedRecordWriter): record output writer.
+    """
+    for carver_name, carved_data_offset, carved_data_size, records in hits:
+      if carved_data_offset < self._carved_end_offsets.get(carver_name, 0):
+        continue
+
+      self._carved_end_offsets[carver_name] = (
+          carved_data_offset + carved_data_size)
+
+      self.number_of_hits += 1
+      self.number_of_records += len(records)
+
+      record_writer.WriteRecords(records)
+
+  def Carve(self, path, record_writer):
+    """Carves records from raw data.
+
+    Args:
+      path (str): path of the raw data, such as a storage media image or
+          a memory dump.
+      record_writer (BufferedRecordWriter): record output writer to which
+          the carved records are written in order of offset.
+    """
+    self._carved_end_offsets = {}
+
+    if self._number_of_workers <= 1 or futures is None:
+      for chunk_offset, chunk_size in self._GetChunks(path):
+        hits = CarveChunk(path, chunk_offset, chunk_size, self._carver_names)
+        self._WriteHits(hits, record_writer)
+      return
+
+    maximum_number_of_pending_chunks = self._number_of_workers * 2
+
+    executor = futures.ProcessPoolExecutor(
+        max_workers=self._number_of_workers)
+
+    try:
+      # The results are written in order of the chunks, such that the carved
+      # data of a preceding chunk is known when the hits of a chunk are
+      # written.
+      pending_futures = collections.deque()
+      for chunk_offset, chunk_size in self._GetChunks(path):
+        if len(pending_futures) >= maximum_number_of_pending_chunks:
+          future = pending_futures.popleft()
+          self._WriteHits(future.result(), record_writer)
+
+        pending_futures.append(executor.submit(
+            CarveChunk, path, chunk_offset, chunk_size, self._carver_names))
+
+      while pending_futures:
+        future = pending_futures.popleft()
+        self._WriteHits(future.result(), record_writer)
+
+    finally:
+      executor.shutdown(wait=True)
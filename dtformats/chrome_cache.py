@@ -4,16 +4,16 @@
 from __future__ import print_function
 from __future__ import unicode_literals
 
-import datetime
 import logging
 import os
-
-from dtfabric import errors as dtfabric_errors
-from dtfabric.runtime import fabric as dtfabric_fabric
+import struct
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
+from dtformats import memory
 from dtformats import py2to3
+from dtformats import timestamps
 
 
 def SuperFastHash(key):
@@ -207,6 +207,8 @@ class DataBlockFile(data_format.BinaryDataFile):
 
   SIGNATURE = 0xc104cac3
 
+  SIGNATURES = [(0, struct.pack('<I', SIGNATURE))]
+
   _DEBUG_INFO_FILE_HEADER = [
       ('signature', 'Signature', '_FormatIntegerAsHexadecimal8'),
       ('minor_version', 'Minor version', '_FormatIntegerAsDecimal'),
@@ -358,10 +360,57 @@ class DataBlockFile(data_format.BinaryDataFile):
     Returns:
       str: integer formatted as a Chrome timestamp.
     """
-    date_string = (datetime.datetime(1601, 1, 1) +
-                   datetime.timedelta(microseconds=integer))
+    date_string = timestamps.CopyToDateTimeStrings(
+        [integer], timestamps.TIMESTAMP_TYPE_WEBKIT)[0]
     return '{0!s} (0x{1:08x})'.format(date_string, integer)
 
+  def _ReadCacheEntry(self, file_object, block_offset):
+    """Reads a cache entry.
+
+    Args:
+      file_object (file): file-like object.
+      block_offset (int): offset of the block that contains the cache entry.
+
+    Returns:
+      CacheEntry: a cache entry.
+
+    Raises:
+      ParseError: if the cache entry cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('chrome_cache_entry')
+
+    cache_entry, _ = self._ReadStructureFromFileObject(
+        file_object, block_offset, data_type_map, 'data block cache entry')
+
+    byte_string = bytes(cache_entry.key)
+    cache_entry_key, _, _ = byte_string.partition(b'\x00')
+
+    try:
+      cache_entry_key = cache_entry_key.decode('ascii')
+    except UnicodeDecodeError:
+      logging.warning((
+          'Unable to decode cache entry key at block offset: '
+          '0x{0:08x}. Characters that cannot be decoded will be '
+          'replaced with "?" or "\\ufffd".').format(block_offset))
+      cache_entry_key = cache_entry_key.decode('ascii', errors='replace')
+
+    cache_entry.key = cache_entry_key
+
+    if self._debug:
+      self._DebugPrintCacheEntry(cache_entry)
+
+    # TODO: calculate and verify hash.
+
+    cache_entry_object = CacheEntry()
+    cache_entry_object.creation_time = cache_entry.creation_time
+    cache_entry_object.hash = cache_entry.hash
+    cache_entry_object.key = cache_entry.key
+    cache_entry_object.next = CacheAddress(cache_entry.next_address)
+    cache_entry_object.rankings_node = CacheAddress(
+        cache_entry.rankings_node_address)
+
+    return cache_entry_object
+
   def _ReadFileHeader(self, file_object):
     """Reads the file header.
 
@@ -407,40 +456,7 @@ class DataBlockFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the cache entry cannot be read.
     """
-    data_type_map = self._GetDataTypeMap('chrome_cache_entry')
-
-    cache_entry, _ = self._ReadStructureFromFileObject(
-        self._file_object, block_offset, data_type_map,
-        'data block cache entry')
-
-    byte_string = bytes(cache_entry.key)
-    cache_entry_key, _, _ = byte_string.partition(b'\x00')
-
-    try:
-      cache_entry_key = cache_entry_key.decode('ascii')
-    except UnicodeDecodeError:
-      logging.warning((
-          'Unable to decode cache entry key at block offset: '
-          '0x{0:08x}. Characters that cannot be decoded will be '
-          'replaced with "?" or "\\ufffd".').format(block_offset))
-      cache_entry_key = cache_entry_key.decode('ascii', errors='replace')
-
-    cache_entry.key = cache_entry_key
-
-    if self._debug:
-      self._DebugPrintCacheEntry(cache_entry)
-
-    # TODO: calculate and verify hash.
-
-    cache_entry_object = CacheEntry()
-    cache_entry_object.creation_time = cache_entry.creation_time
-    cache_entry_object.hash = cache_entry.hash
-    cache_entry_object.key = cache_entry.key
-    cache_entry_object.next = CacheAddress(cache_entry.next_address)
-    cache_entry_object.rankings_node = CacheAddress(
-        cache_entry.rankings_node_address)
-
-    return cache_entry_object
+    return self._ReadCacheEntry(self._file_object, block_offset)
 
   def ReadFileObject(self, file_object):
     """Reads a Chrome Cache data block file-like object.
@@ -460,7 +476,7 @@ class IndexFile(data_format.BinaryDataFile):
   Attributes:
     creation_time (int): date and time the file was created.
     format_version (str): format version.
-    index_table (dict[str, object]): index table.
+    index_table (SpillableDict[int, CacheAddress]): index table.
   """
 
   _DEFINITION_FILE = 'chrome_cache.yaml'
@@ -482,6 +498,8 @@ class IndexFile(data_format.BinaryDataFile):
 
   SIGNATURE = 0xc103cac3
 
+  SIGNATURES = [(0, struct.pack('<I', SIGNATURE))]
+
   def __init__(self, debug=False, output_writer=None):
     """Initializes a Chrome Cache index file.
 
@@ -492,7 +510,7 @@ class IndexFile(data_format.BinaryDataFile):
     super(IndexFile, self).__init__(debug=debug, output_writer=output_writer)
     self.creation_time = None
     self.format_version = None
-    self.index_table = {}
+    self.index_table = memory.SpillableDict()
 
   def _DebugPrintLRUData(self, lru_data):
     """Prints LRU data debug information.
@@ -551,8 +569,8 @@ class IndexFile(data_format.BinaryDataFile):
     Returns:
       str: integer formatted as a Chrome timestamp.
     """
-    date_string = (datetime.datetime(1601, 1, 1) +
-                   datetime.timedelta(microseconds=integer))
+    date_string = timestamps.CopyToDateTimeStrings(
+        [integer], timestamps.TIMESTAMP_TYPE_WEBKIT)[0]
     return '{0!s} (0x{1:08x})'.format(date_string, integer)
 
   def _ReadFileHeader(self, file_object):
@@ -610,6 +628,9 @@ class IndexFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the index table cannot be read.
     """
+    self.index_table.Close()
+    self.index_table = memory.SpillableDict(memory_budget=self._memory_budget)
+
     file_offset = file_object.tell()
     data_type_map = self._GetDataTypeMap('uint32le')
 
@@ -643,6 +664,23 @@ class IndexFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintText('\n')
 
+  def _ReadRecords(self, file_object):  # pylint: disable=unused-argument
+    """Reads the cache addresses of the index table.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      CacheAddress: cache address.
+    """
+    for cache_address_index in sorted(self.index_table.keys()):
+      yield self.index_table[cache_address_index]
+
+  def Close(self):
+    """Closes the Chrome Cache index file."""
+    super(IndexFile, self).Close()
+    self.index_table.Close()
+
   def ReadFileObject(self, file_object):
     """Reads a Chrome Cache index file-like object.
 
@@ -660,19 +698,6 @@ class IndexFile(data_format.BinaryDataFile):
 class ChromeCacheParser(object):
   """Chrome Cache parser."""
 
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'chrome_cache.yaml')
-
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
-
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
-
-  _UINT32LE = _DATA_TYPE_FABRIC.CreateDataTypeMap('uint32le')
-
-  _UINT32LE_SIZE = _UINT32LE.GetByteSize()
-
   def __init__(self, debug=False, output_writer=None):
     """Initializes a Chrome Cache parser.
 
@@ -753,8 +778,8 @@ class ChromeCacheParser(object):
           # TODO: print('Url\t\t: {0:s}'.format(cache_entry_key))
           _ = cache_entry_key
 
-          date_string = (datetime.datetime(1601, 1, 1) + datetime.timedelta(
-              microseconds=cache_entry.creation_time))
+          date_string = timestamps.CopyToDateTimeStrings(
+              [cache_entry.creation_time], timestamps.TIMESTAMP_TYPE_WEBKIT)[0]
 
           # print('Creation time\t: {0!s}'.format(date_string))
 
@@ -783,24 +808,30 @@ class ChromeCacheParser(object):
       ParseError: if the file cannot be read.
     """
     with open(path, 'rb') as file_object:
-      signature_data = file_object.read(self._UINT32LE_SIZE)
-
-      try:
-        signature = self._UINT32LE.MapByteStream(signature_data)
-      except dtfabric_errors.MappingError as exception:
-        raise errors.ParseError(
-            'Unable to signature with error: {0!s}'.format(exception))
-
-      if signature not in (DataBlockFile.SIGNATURE, IndexFile.SIGNATURE):
-        raise errors.ParseError(
-            'Unsupported signature: 0x{0:08x}'.format(signature))
+      format_names = format_registry.FormatRegistry.IdentifyFileObject(
+          file_object)
 
-      if signature == DataBlockFile.SIGNATURE:
+      if 'chrome_cache_data_block' in format_names:
         chrome_cache_file = DataBlockFile(
             debug=self._debug, output_writer=self._output_writer)
 
-      elif signature == IndexFile.SIGNATURE:
+      elif 'chrome_cache_index' in format_names:
         chrome_cache_file = IndexFile(
             debug=self._debug, output_writer=self._output_writer)
 
+      else:
+        file_object.seek(0, os.SEEK_SET)
+        signature_data = file_object.read(4)
+        if len(signature_data) != 4:
+          raise errors.ParseError('Unable to read signature.')
+
+        signature = struct.unpack('<I', signature_data)[0]
+        raise errors.ParseError(
+            'Unsupported signature: 0x{0:08x}'.format(signature))
+
       chrome_cache_file.ReadFileObject(file_object)
+
+
+format_registry.FormatRegistry.RegisterFormat(
+    'chrome_cache_data_block', DataBlockFile)
+format_registry.FormatRegistry.RegisterFormat('chrome_cache_index', IndexFile)
@@ -8,6 +8,10 @@ import os
 from dtformats import data_format
 from dtformats import data_range
 from dtformats import errors
+from dtformats import format_registry
+from dtformats import memory
+from dtformats import py2to3
+from dtformats import timestamps
 
 
 class CPIOArchiveFileEntry(data_range.DataRange):
@@ -63,6 +67,16 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
   _CPIO_SIGNATURE_NEW_ASCII = b'070701'
   _CPIO_SIGNATURE_NEW_ASCII_WITH_CHECKSUM = b'070702'
 
+  SIGNATURES = [
+      (0, _CPIO_SIGNATURE_BINARY_BIG_ENDIAN),
+      (0, _CPIO_SIGNATURE_BINARY_LITTLE_ENDIAN),
+      (0, _CPIO_SIGNATURE_NEW_ASCII),
+      (0, _CPIO_SIGNATURE_NEW_ASCII_WITH_CHECKSUM),
+      (0, _CPIO_SIGNATURE_PORTABLE_ASCII)]
+
+  RECORD_TIMESTAMP_TYPES = {
+      'modification_time': timestamps.TIMESTAMP_TYPE_POSIX}
+
   _CPIO_ATTRIBUTE_NAMES_ODC = (
       'device_number', 'inode_number', 'mode', 'user_identifier',
       'group_identifier', 'number_of_links', 'special_device_number',
@@ -85,6 +99,7 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
     super(CPIOArchiveFile, self).__init__(
         debug=debug, output_writer=output_writer)
     self._file_entries = None
+    self._file_entries_allocated_size = 0
 
     self.file_format = None
     self.size = None
@@ -154,6 +169,24 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
       value_string = '0x{0:08x}'.format(file_entry.checksum)
       self._DebugPrintValue('Checksum', value_string)
 
+  def _GetFileEntry(self, file_entry):
+    """Retrieves a file entry of the file entries table.
+
+    Args:
+      file_entry (CPIOArchiveFileEntry|int): file entry or file offset of
+          the file entry if it was not kept in memory.
+
+    Returns:
+      CPIOArchiveFileEntry: CPIO archive file entry.
+
+    Raises:
+      ParseError: if the file entry cannot be read.
+    """
+    if isinstance(file_entry, py2to3.INTEGER_TYPES):
+      file_entry = self._ReadFileEntry(self._file_object, file_entry)
+
+    return file_entry
+
   def _ReadFileEntry(self, file_object, file_offset):
     """Reads a file entry.
 
@@ -305,6 +338,7 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
     file_offset = 0
     while file_offset < self._file_size or self._file_size == 0:
       file_entry = self._ReadFileEntry(file_object, file_offset)
+      file_entry_offset = file_offset
       file_offset += file_entry.size
       if file_entry.path == 'TRAILER!!!':
         break
@@ -313,15 +347,53 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
         # TODO: alert on file entries with duplicate paths?
         continue
 
+      # When the memory budget is exhausted only the file offset of the file
+      # entry is kept and the file entry is read again when it is retrieved.
+      if self._memory_budget:
+        file_entry_size = memory.GetObjectSize(file_entry)
+        if not self._memory_budget.Allocate(file_entry_size):
+          self._file_entries[file_entry.path] = file_entry_offset
+          continue
+
+        self._file_entries_allocated_size += file_entry_size
+
       self._file_entries[file_entry.path] = file_entry
 
     self.size = file_offset
 
+  def _ReadRecords(self, file_object):
+    """Reads the file entries in the order they are stored in the archive.
+
+    Contrary to GetFileEntries() the file entries are not kept in memory and
+    file entries with duplicate paths are included.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      CPIOArchiveFileEntry: CPIO archive file entry.
+
+    Raises:
+      ParseError: if a file entry cannot be read.
+    """
+    file_offset = 0
+    while file_offset < self._file_size or self._file_size == 0:
+      file_entry = self._ReadFileEntry(file_object, file_offset)
+      file_offset += file_entry.size
+      if file_entry.path == 'TRAILER!!!':
+        break
+
+      yield file_entry
+
   def Close(self):
     """Closes the CPIO archive file."""
     super(CPIOArchiveFile, self).Close()
     self._file_entries = None
 
+    if self._memory_budget:
+      self._memory_budget.Release(self._file_entries_allocated_size)
+    self._file_entries_allocated_size = 0
+
   def FileEntryExistsByPath(self, path):
     """Determines if file entry for a specific path exists.
 
@@ -348,7 +420,7 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
     if self._file_entries:
       for path, file_entry in iter(self._file_entries.items()):
         if path.startswith(path_prefix):
-          yield file_entry
+          yield self._GetFileEntry(file_entry)
 
   def GetFileEntryByPath(self, path):
     """Retrieves a file entry for a specific path.
@@ -362,7 +434,11 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
     if not self._file_entries:
       return False
 
-    return self._file_entries.get(path, None)
+    file_entry = self._file_entries.get(path, None)
+    if file_entry is None:
+      return None
+
+    return self._GetFileEntry(file_entry)
 
   def ReadFileObject(self, file_object):
     """Reads binary data from a file-like object.
@@ -395,3 +471,6 @@ class CPIOArchiveFile(data_format.BinaryDataFile):
     self._ReadFileEntries(file_object)
 
     # TODO: print trailing data
+
+
+format_registry.FormatRegistry.RegisterFormat('cpio', CPIOArchiveFile)
@@ -4,17 +4,22 @@
 from __future__ import unicode_literals
 
 import abc
+import binascii
+import hashlib
+import mmap
 import os
-
-from dfdatetime import filetime as dfdatetime_filetime
-from dfdatetime import posix_time as dfdatetime_posix_time
+import sys
 
 from dtfabric import errors as dtfabric_errors
 from dtfabric.runtime import data_maps as dtfabric_data_maps
-from dtfabric.runtime import fabric as dtfabric_fabric
 
 from dtformats import errors
+from dtformats import fabric_registry
+from dtformats import memory_mapped_file
+from dtformats import output_writers
 from dtformats import py2to3
+from dtformats import structure_compiler
+from dtformats import timestamps
 
 
 class BinaryDataFormat(object):
@@ -27,8 +32,36 @@ class BinaryDataFormat(object):
   # at run-time.
   _DEFINITION_FILES_PATH = os.path.dirname(__file__)
 
-  _HEXDUMP_CHARACTER_MAP = [
-      '.' if byte < 0x20 or byte > 0x7e else chr(byte) for byte in range(256)]
+  # Translation table for bytes.translate() that maps non-printable byte
+  # values onto '.'.
+  _HEXDUMP_CHARACTER_TABLE = bytes(bytearray([
+      0x2e if byte < 0x20 or byte > 0x7e else byte for byte in range(256)]))
+
+  # Number of lines of a hexadecimal representation that are formatted
+  # and written as a single chunk.
+  _HEXDUMP_LINES_PER_CHUNK = 1024
+
+  # Format of a 16-byte row of a hexadecimal representation of which
+  # the arguments are the individual hexadecimal digits.
+  _HEXDUMP_ROW_FORMAT = (
+      '{0:s}{1:s} {2:s}{3:s} {4:s}{5:s} {6:s}{7:s} '
+      '{8:s}{9:s} {10:s}{11:s} {12:s}{13:s} {14:s}{15:s}  '
+      '{16:s}{17:s} {18:s}{19:s} {20:s}{21:s} {22:s}{23:s} '
+      '{24:s}{25:s} {26:s}{27:s} {28:s}{29:s} {30:s}{31:s}')
+
+  # binascii.hexlify() supports a separator as of Python 3.8.
+  _HEXLIFY_SUPPORTS_SEPARATOR = sys.version_info[0:2] >= (3, 8)
+
+  # The default size of the read-ahead window.
+  _READ_AHEAD_WINDOW_SIZE = 64 * 1024
+
+  # The memory budget shared by the parsers, which is None when the memory
+  # usage of the parsers is not bounded.
+  _memory_budget = None
+
+  # The read profiler, which is None when profiling is disabled, so that
+  # profiling costs a single attribute lookup per read when disabled.
+  _profiler = None
 
   def __init__(self, debug=False, output_writer=None):
     """Initializes a binary data format.
@@ -42,6 +75,10 @@ class BinaryDataFormat(object):
     self._debug = debug
     self._fabric = self._ReadDefinitionFile(self._DEFINITION_FILE)
     self._output_writer = output_writer
+    self._read_ahead_buffer = b''
+    self._read_ahead_buffer_offset = 0
+    self._read_ahead_file_object = None
+    self._read_ahead_window_size = self._READ_AHEAD_WINDOW_SIZE
 
   def _DebugPrintData(self, description, data):
     """Prints data for debugging.
@@ -52,7 +89,8 @@ class BinaryDataFormat(object):
     """
     if self._output_writer:
       self._output_writer.WriteText('{0:s}:\n'.format(description))
-      self._output_writer.WriteText(self._FormatDataInHexadecimal(data))
+      for text in self._FormatDataInHexadecimalChunks(data):
+        self._output_writer.WriteText(text)
 
   def _DebugPrintDecimalValue(self, description, value):
     """Prints a decimal value for debugging.
@@ -76,8 +114,8 @@ class BinaryDataFormat(object):
     elif value == 0x7fffffffffffffff:
       date_time_string = 'Never (0x7fffffffffffffff)'
     else:
-      date_time = dfdatetime_filetime.Filetime(timestamp=value)
-      date_time_string = date_time.CopyToDateTimeString()
+      date_time_string = timestamps.CopyToDateTimeStrings(
+          [value], timestamps.TIMESTAMP_TYPE_FILETIME)[0]
       if date_time_string:
         date_time_string = '{0:s} UTC'.format(date_time_string)
       else:
@@ -124,8 +162,8 @@ class BinaryDataFormat(object):
     if value == 0:
       date_time_string = 'Not set (0)'
     else:
-      date_time = dfdatetime_posix_time.PosixTime(timestamp=value)
-      date_time_string = date_time.CopyToDateTimeString()
+      date_time_string = timestamps.CopyToDateTimeStrings(
+          [value], timestamps.TIMESTAMP_TYPE_POSIX)[0]
       if date_time_string:
         date_time_string = '{0:s} UTC'.format(date_time_string)
       else:
@@ -162,59 +200,108 @@ class BinaryDataFormat(object):
     Returns:
       str: hexadecimal representation of the data.
     """
-    in_group = False
-    previous_hexadecimal_string = None
+    return ''.join(self._FormatDataInHexadecimalChunks(data))
+
+  def _FormatDataInHexadecimalChunks(self, data):
+    """Formats data in a hexadecimal representation in chunks.
+
+    The data is formatted in rows of 16 bytes, where successive rows with
+    the same data are represented by "...". To limit memory usage with large
+    data the representation is generated in chunks of multiple rows.
+
+    Args:
+      data (bytes): data.
+
+    Yields:
+      str: hexadecimal representation of a chunk of the data.
+    """
+    if isinstance(data, memoryview):
+      data = data.tobytes()
 
-    lines = []
     data_size = len(data)
-    for block_index in range(0, data_size, 16):
-      data_string = data[block_index:block_index + 16]
-
-      hexadecimal_byte_values = []
-      printable_values = []
-      for byte_value in data_string:
-        if isinstance(byte_value, py2to3.STRING_TYPES):
-          byte_value = ord(byte_value)
-
-        hexadecimal_byte_value = '{0:02x}'.format(byte_value)
-        hexadecimal_byte_values.append(hexadecimal_byte_value)
-
-        printable_value = self._HEXDUMP_CHARACTER_MAP[byte_value]
-        printable_values.append(printable_value)
-
-      remaining_size = 16 - len(data_string)
-      if remaining_size == 0:
-        whitespace = ''
-      elif remaining_size >= 8:
-        whitespace = ' ' * ((3 * remaining_size) - 1)
+    chunk_size = self._HEXDUMP_LINES_PER_CHUNK * 16
+
+    in_group = False
+    previous_row_data = None
+
+    for chunk_offset in range(0, data_size, chunk_size):
+      chunk_data = data[chunk_offset:chunk_offset + chunk_size]
+
+      if self._HEXLIFY_SUPPORTS_SEPARATOR:
+        hexadecimal_data = binascii.hexlify(chunk_data, b' ')
       else:
-        whitespace = ' ' * (3 * remaining_size)
+        hexadecimal_data = binascii.hexlify(chunk_data)
 
-      hexadecimal_string_part1 = ' '.join(hexadecimal_byte_values[0:8])
-      hexadecimal_string_part2 = ' '.join(hexadecimal_byte_values[8:16])
-      hexadecimal_string = '{0:s}  {1:s}{2:s}'.format(
-          hexadecimal_string_part1, hexadecimal_string_part2, whitespace)
+      hexadecimal_data = hexadecimal_data.decode('ascii')
+      printable_data = chunk_data.translate(
+          self._HEXDUMP_CHARACTER_TABLE).decode('ascii')
 
-      if (previous_hexadecimal_string is not None and
-          previous_hexadecimal_string == hexadecimal_string and
-          block_index + 16 < data_size):
+      lines = []
+      for row_offset in range(0, len(chunk_data), 16):
+        block_index = chunk_offset + row_offset
+        row_data = chunk_data[row_offset:row_offset + 16]
 
-        if not in_group:
-          in_group = True
+        # Note that the last row is always printed.
+        if row_data == previous_row_data and block_index + 16 < data_size:
+          if not in_group:
+            in_group = True
 
-          lines.append('...')
+            lines.append('...\n')
 
-      else:
-        printable_string = ''.join(printable_values)
+          continue
+
+        row_size = len(row_data)
+        if row_size < 16:
+          hexadecimal_string = self._FormatPartialRowInHexadecimal(row_data)
+
+        elif self._HEXLIFY_SUPPORTS_SEPARATOR:
+          hexadecimal_offset = row_offset * 3
+          hexadecimal_string = '{0:s}  {1:s}'.format(
+              hexadecimal_data[hexadecimal_offset:hexadecimal_offset + 23],
+              hexadecimal_data[hexadecimal_offset + 24:hexadecimal_offset + 47])
 
-        lines.append('0x{0:08x}  {1:s}  {2:s}'.format(
-            block_index, hexadecimal_string, printable_string))
+        else:
+          hexadecimal_offset = row_offset * 2
+          hexadecimal_string = self._HEXDUMP_ROW_FORMAT.format(
+              *hexadecimal_data[hexadecimal_offset:hexadecimal_offset + 32])
+
+        lines.append('0x{0:08x}  {1:s}  {2:s}\n'.format(
+            block_index, hexadecimal_string,
+            printable_data[row_offset:row_offset + row_size]))
 
         in_group = False
-        previous_hexadecimal_string = hexadecimal_string
+        previous_row_data = row_data
+
+      if chunk_offset + chunk_size >= data_size:
+        lines.append('\n')
 
-    lines.extend(['', ''])
-    return '\n'.join(lines)
+      yield ''.join(lines)
+
+    if not data_size:
+      yield '\n'
+
+  def _FormatPartialRowInHexadecimal(self, row_data):
+    """Formats a row of less than 16 bytes in a hexadecimal representation.
+
+    Args:
+      row_data (bytes): data of the row.
+
+    Returns:
+      str: hexadecimal representation of the row, padded with whitespace.
+    """
+    hexadecimal_byte_values = [
+        '{0:02x}'.format(byte_value) for byte_value in bytearray(row_data)]
+
+    remaining_size = 16 - len(row_data)
+    if remaining_size >= 8:
+      whitespace = ' ' * ((3 * remaining_size) - 1)
+    else:
+      whitespace = ' ' * (3 * remaining_size)
+
+    hexadecimal_string_part1 = ' '.join(hexadecimal_byte_values[0:8])
+    hexadecimal_string_part2 = ' '.join(hexadecimal_byte_values[8:16])
+    return '{0:s}  {1:s}{2:s}'.format(
+        hexadecimal_string_part1, hexadecimal_string_part2, whitespace)
 
   def _FormatArrayOfIntegersAsDecimals(self, array_of_integers):
     """Formats an array of integers as decimals.
@@ -298,8 +385,8 @@ class BinaryDataFormat(object):
     if integer == 0x7fffffffffffffff:
       return 'Never (0x7fffffffffffffff)'
 
-    date_time = dfdatetime_filetime.Filetime(timestamp=integer)
-    date_time_string = date_time.CopyToDateTimeString()
+    date_time_string = timestamps.CopyToDateTimeStrings(
+        [integer], timestamps.TIMESTAMP_TYPE_FILETIME)[0]
     if not date_time_string:
       return '0x{0:08x}'.format(integer)
 
@@ -350,8 +437,8 @@ class BinaryDataFormat(object):
     if integer == 0:
       return 'Not set (0)'
 
-    date_time = dfdatetime_posix_time.PosixTime(timestamp=integer)
-    date_time_string = date_time.CopyToDateTimeString()
+    date_time_string = timestamps.CopyToDateTimeStrings(
+        [integer], timestamps.TIMESTAMP_TYPE_POSIX)[0]
     if not date_time_string:
       return '0x{0:08x}'.format(integer)
 
@@ -369,8 +456,8 @@ class BinaryDataFormat(object):
     if integer == 0:
       return 'Not set (0)'
 
-    date_time = dfdatetime_posix_time.PosixTimeInMicroseconds(timestamp=integer)
-    date_time_string = date_time.CopyToDateTimeString()
+    date_time_string = timestamps.CopyToDateTimeStrings(
+        [integer], timestamps.TIMESTAMP_TYPE_POSIX_MICROSECONDS)[0]
     if not date_time_string:
       return '0x{0:08x}'.format(integer)
 
@@ -433,7 +520,8 @@ class BinaryDataFormat(object):
   def _GetDataTypeMap(self, name):
     """Retrieves a data type map defined by the definition file.
 
-    The data type maps are cached for reuse.
+    The data type maps are shared process-wide by the data type fabric
+    registry and cached per instance for reuse.
 
     Args:
       name (str): name of the data type as defined by the definition file.
@@ -444,7 +532,9 @@ class BinaryDataFormat(object):
     """
     data_type_map = self._data_type_maps.get(name, None)
     if not data_type_map:
-      data_type_map = self._fabric.CreateDataTypeMap(name)
+      path = os.path.join(self._DEFINITION_FILES_PATH, self._DEFINITION_FILE)
+      data_type_map = fabric_registry.DataTypeFabricRegistry.GetDataTypeMap(
+          path, name)
       self._data_type_maps[name] = data_type_map
 
     return data_type_map
@@ -469,29 +559,111 @@ class BinaryDataFormat(object):
     if not file_object:
       raise ValueError('Missing file-like object.')
 
-    file_object.seek(file_offset, os.SEEK_SET)
+    if isinstance(file_object, memory_mapped_file.MemoryMappedFile):
+      # The data is copied directly from the memory mapped data, instead of
+      # into the read-ahead buffer and from the read-ahead buffer.
+      try:
+        data = file_object.GetView(file_offset, data_size).tobytes()
+      except IOError as exception:
+        raise errors.ParseError((
+            'Unable to read {0:s} data at offset: 0x{1:08x} with error: '
+            '{2!s}').format(description, file_offset, exception))
 
-    read_error = ''
+      # Set the current offset as if the data was read directly.
+      file_object.seek(file_offset + len(data), os.SEEK_SET)
 
-    try:
-      data = file_object.read(data_size)
+    elif data_size > self._read_ahead_window_size:
+      file_object.seek(file_offset, os.SEEK_SET)
 
-      if len(data) != data_size:
-        read_error = 'missing data'
+      try:
+        data = file_object.read(data_size)
+      except IOError as exception:
+        raise errors.ParseError((
+            'Unable to read {0:s} data at offset: 0x{1:08x} with error: '
+            '{2!s}').format(description, file_offset, exception))
 
-    except IOError as exception:
-      read_error = '{0!s}'.format(exception)
+    else:
+      buffer_data_offset = self._ReadDataIntoReadAheadBuffer(
+          file_object, file_offset, data_size, description)
+      data = self._read_ahead_buffer[
+          buffer_data_offset:buffer_data_offset + data_size]
+
+      # Set the current offset as if the data was read directly.
+      file_object.seek(file_offset + len(data), os.SEEK_SET)
 
-    if read_error:
+    if len(data) != data_size:
       raise errors.ParseError((
           'Unable to read {0:s} data at offset: 0x{1:08x} with error: '
-          '{2:s}').format(description, file_offset, read_error))
+          'missing data').format(description, file_offset))
+
+    if self._profiler:
+      self._profiler.AddRead(None, description, data_size)
 
     return data
 
+  def _ReadDataIntoReadAheadBuffer(
+      self, file_object, file_offset, data_size, description):
+    """Reads data into the read-ahead buffer.
+
+    The read-ahead buffer contains the data of a window of the file-like
+    object, so that successive reads of small amounts of data, such as
+    structures, can be served by a single read of the file-like object. If
+    the requested data is partially in the read-ahead buffer only the missing
+    data is read.
+
+    Args:
+      file_object (file): a file-like object.
+      file_offset (int): offset of the data relative to the start of
+          the file-like object.
+      data_size (int): size of the data.
+      description (str): description of the data.
+
+    Returns:
+      int: offset of the data relative to the start of the read-ahead buffer.
+          Note that the read-ahead buffer contains less than the requested data
+          size if the end of the file-like object was reached.
+
+    Raises:
+      ParseError: if the data cannot be read.
+    """
+    buffer_offset = self._read_ahead_buffer_offset
+    buffer_end_offset = buffer_offset + len(self._read_ahead_buffer)
+
+    read_size = max(data_size, self._read_ahead_window_size)
+
+    try:
+      if (file_object is not self._read_ahead_file_object or
+          file_offset < buffer_offset or file_offset > buffer_end_offset):
+        file_object.seek(file_offset, os.SEEK_SET)
+        self._read_ahead_buffer = file_object.read(read_size)
+        self._read_ahead_buffer_offset = file_offset
+        self._read_ahead_file_object = file_object
+
+      elif file_offset + data_size > buffer_end_offset:
+        file_object.seek(buffer_end_offset, os.SEEK_SET)
+        buffer_data = file_object.read(
+            file_offset + read_size - buffer_end_offset)
+        if buffer_data:
+          buffer_data_offset = file_offset - buffer_offset
+          self._read_ahead_buffer = b''.join([
+              self._read_ahead_buffer[buffer_data_offset:], buffer_data])
+          self._read_ahead_buffer_offset = file_offset
+
+    except IOError as exception:
+      self._ResetReadAheadBuffer()
+
+      raise errors.ParseError((
+          'Unable to read {0:s} data at offset: 0x{1:08x} with error: '
+          '{2!s}').format(description, file_offset, exception))
+
+    return file_offset - self._read_ahead_buffer_offset
+
   def _ReadDefinitionFile(self, filename):
     """Reads a dtFabric definition file.
 
+    The definition file is only read and parsed once per process, subsequent
+    calls return the data type fabric from the data type fabric registry.
+
     Args:
       filename (str): name of the dtFabric definition file.
 
@@ -504,10 +676,7 @@ class BinaryDataFormat(object):
       return None
 
     path = os.path.join(self._DEFINITION_FILES_PATH, filename)
-    with open(path, 'rb') as file_object:
-      definition = file_object.read()
-
-    return dtfabric_fabric.DataTypeFabric(yaml_definition=definition)
+    return fabric_registry.DataTypeFabricRegistry.GetDataTypeFabric(path)
 
   # TODO: deprecate in favor of _ReadStructureFromFileObject
   def _ReadStructure(
@@ -546,6 +715,9 @@ class BinaryDataFormat(object):
       self, byte_stream, file_offset, data_type_map, description, context=None):
     """Reads a structure from a byte stream.
 
+    Structures with a fixed size are mapped using a precompiled Python struct
+    if supported by the structure compiler.
+
     Args:
       byte_stream (bytes): byte stream.
       file_offset (int): offset of the structure data relative to the start
@@ -567,14 +739,104 @@ class BinaryDataFormat(object):
     if not data_type_map:
       raise ValueError('Missing data type map.')
 
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+    if compiled_map:
+      data_type_map = compiled_map
+
+    elif isinstance(byte_stream, memoryview):
+      # dtFabric maps streams onto slices of the byte stream, hence the byte
+      # stream is copied to prevent views from being returned.
+      byte_stream = byte_stream.tobytes()
+
+    profiler = self._profiler
+    if profiler:
+      if context is None:
+        context = dtfabric_data_maps.DataTypeMapContext()
+
+      start_time = profiler.GetTime()
+
     try:
-      return data_type_map.MapByteStream(byte_stream, context=context)
+      structure_values_object = data_type_map.MapByteStream(
+          byte_stream, context=context)
     except (dtfabric_errors.ByteStreamTooSmallError,
             dtfabric_errors.MappingError) as exception:
       raise errors.ParseError((
           'Unable to map {0:s} data at offset: 0x{1:08x} with error: '
           '{2!s}').format(description, file_offset, exception))
 
+    if profiler:
+      profiler.AddRead(
+          data_type_map.name, description, context.byte_size or 0,
+          mapping_time=profiler.GetTime() - start_time)
+
+    return structure_values_object
+
+  def _ReadStructureFromMemoryMappedFile(
+      self, file_object, file_offset, data_type_map, description):
+    """Reads a fixed-size structure from a memory mapped file-like object.
+
+    The structure is mapped directly onto the memory mapped data, without
+    copying the data.
+
+    Args:
+      file_object (MemoryMappedFile): a memory mapped file-like object.
+      file_offset (int): offset of the structure data relative to the start
+          of the file-like object.
+      data_type_map (CompiledStructureMap): compiled data type map of
+          the structure.
+      description (str): description of the structure.
+
+    Returns:
+      tuple[object, int]: structure values object and data size of
+          the structure.
+
+    Raises:
+      ParseError: if the structure cannot be read.
+    """
+    data_size = data_type_map.GetByteSize()
+
+    if self._debug:
+      self._DebugPrintText('Reading {0:s} at offset: 0x{1:08x}\n'.format(
+          description, file_offset))
+
+    try:
+      data = file_object.GetView(file_offset, data_size)
+    except IOError as exception:
+      raise errors.ParseError((
+          'Unable to read {0:s} data at offset: 0x{1:08x} with error: '
+          '{2!s}').format(description, file_offset, exception))
+
+    if len(data) != data_size:
+      raise errors.ParseError((
+          'Unable to read {0:s} data at offset: 0x{1:08x} with error: '
+          'missing data').format(description, file_offset))
+
+    # Set the current offset as if the structure data was read.
+    file_object.seek(file_offset + data_size, os.SEEK_SET)
+
+    profiler = self._profiler
+    if profiler:
+      start_time = profiler.GetTime()
+
+    try:
+      structure_values_object = data_type_map.MapByteStream(data)
+    except dtfabric_errors.MappingError as exception:
+      raise errors.ParseError((
+          'Unable to map {0:s} data at offset: 0x{1:08x} with error: '
+          '{2!s}').format(description, file_offset, exception))
+
+    if profiler:
+      profiler.AddRead(
+          data_type_map.name, description, data_size,
+          mapping_time=profiler.GetTime() - start_time)
+
+    if self._debug:
+      data_description = '{0:s} data'.format(description.title())
+      self._DebugPrintData(data_description, data.tobytes())
+
+    return structure_values_object, data_size
+
   def _ReadStructureFromFileObject(
       self, file_object, file_offset, data_type_map, description):
     """Reads a structure from a file-like object.
@@ -585,6 +847,12 @@ class BinaryDataFormat(object):
     continue to read from the file-like object until the data type map can be
     successfully mapped onto the byte stream or until an error occurs.
 
+    Structures with a fixed size are mapped using a precompiled Python struct
+    if supported by the structure compiler.
+
+    The data is read using the read-ahead buffer, so that successive reads
+    of structures are served by a single read of the file-like object.
+
     Args:
       file_object (file): a file-like object to parse.
       file_offset (int): offset of the structure data relative to the start
@@ -600,36 +868,61 @@ class BinaryDataFormat(object):
       ParseError: if the structure cannot be read.
       ValueError: if file-like object or data type map is missing.
     """
-    context = None
-    data = b''
-    last_data_size = 0
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+    if compiled_map:
+      if isinstance(file_object, memory_mapped_file.MemoryMappedFile):
+        return self._ReadStructureFromMemoryMappedFile(
+            file_object, file_offset, compiled_map, description)
+
+      data_type_map = compiled_map
 
     data_size = data_type_map.GetByteSize()
-    if not data_size:
+    is_variable_size = not data_size
+    if is_variable_size:
       data_size = data_type_map.GetSizeHint()
 
     if self._debug:
       self._DebugPrintText('Reading {0:s} at offset: 0x{1:08x}\n'.format(
           description, file_offset))
 
-    while data_size != last_data_size:
-      read_offset = file_offset + last_data_size
-      read_size = data_size - last_data_size
-      data_segment = self._ReadData(
-          file_object, read_offset, read_size, description)
+    # Variable-size structures are mapped onto the read-ahead buffer, which
+    # typically contains sufficient data to map the structure at the first
+    # attempt. If not, the read size is at least doubled on every attempt so
+    # that the number of attempts grows logarithmically with the size of the
+    # structure.
+    read_size = data_size
+
+    profiler = self._profiler
+    mapping_time = 0.0
+    number_of_retries = 0
 
-      data = b''.join([data, data_segment])
+    while True:
+      buffer_data_offset = self._ReadDataIntoReadAheadBuffer(
+          file_object, file_offset, read_size, description)
+
+      buffer_data_size = len(self._read_ahead_buffer) - buffer_data_offset
+      if buffer_data_size < data_size:
+        raise errors.ParseError((
+            'Unable to read {0:s} data at offset: 0x{1:08x} with error: '
+            'missing data').format(description, file_offset))
+
+      if compiled_map or is_variable_size:
+        byte_stream = self._read_ahead_buffer
+        byte_offset = buffer_data_offset
+      else:
+        byte_stream = self._read_ahead_buffer[
+            buffer_data_offset:buffer_data_offset + data_size]
+        byte_offset = 0
+
+      if profiler:
+        start_time = profiler.GetTime()
 
       try:
         context = dtfabric_data_maps.DataTypeMapContext()
         structure_values_object = data_type_map.MapByteStream(
-            data, context=context)
-
-        if self._debug:
-          data_description = '{0:s} data'.format(description.title())
-          self._DebugPrintData(data_description, data)
-
-        return structure_values_object, data_size
+            byte_stream, byte_offset=byte_offset, context=context)
+        break
 
       except dtfabric_errors.ByteStreamTooSmallError:
         pass
@@ -639,17 +932,103 @@ class BinaryDataFormat(object):
             'Unable to map {0:s} data at offset: 0x{1:08x} with error: '
             '{2!s}').format(description, file_offset, exception))
 
-      last_data_size = data_size
-      data_size = data_type_map.GetSizeHint(context=context)
+      finally:
+        if profiler:
+          mapping_time += profiler.GetTime() - start_time
+
+      number_of_retries += 1
+
+      size_hint = data_type_map.GetSizeHint(context=context)
+      if not size_hint or size_hint <= data_size:
+        raise errors.ParseError(
+            'Unable to read {0:s} at offset: 0x{1:08x}'.format(
+                description, file_offset))
 
-    raise errors.ParseError(
-        'Unable to read {0:s} at offset: 0x{1:08x}'.format(
-            description, file_offset))
+      data_size = size_hint
+      read_size = max(size_hint, buffer_data_size * 2)
+
+    data_size = context.byte_size
+
+    # Set the current offset as if only the structure data was read.
+    file_object.seek(file_offset + data_size, os.SEEK_SET)
+
+    if profiler:
+      profiler.AddRead(
+          data_type_map.name, description, data_size,
+          mapping_time=mapping_time, number_of_retries=number_of_retries)
+
+    if self._debug:
+      data = self._read_ahead_buffer[
+          buffer_data_offset:buffer_data_offset + data_size]
+      data_description = '{0:s} data'.format(description.title())
+      self._DebugPrintData(data_description, data)
+
+    return structure_values_object, data_size
+
+  def _ResetReadAheadBuffer(self):
+    """Resets the read-ahead buffer."""
+    self._read_ahead_buffer = b''
+    self._read_ahead_buffer_offset = 0
+    self._read_ahead_file_object = None
+
+  def SetReadAheadWindowSize(self, window_size):
+    """Sets the size of the read-ahead window.
+
+    Args:
+      window_size (int): size of the read-ahead window in bytes, where 0
+          disables the read-ahead buffer.
+
+    Raises:
+      ValueError: if the window size is invalid.
+    """
+    if window_size < 0:
+      raise ValueError('Invalid read-ahead window size value out of bounds.')
+
+    self._read_ahead_window_size = window_size
+    self._ResetReadAheadBuffer()
+
+  @classmethod
+  def SetMemoryBudget(cls, memory_budget):
+    """Sets the memory budget.
+
+    The memory budget is shared by all instances of the class and its
+    subclasses, such that the state of all parsers in a process is bounded
+    by a single budget.
+
+    Args:
+      memory_budget (MemoryBudget): memory budget or None to not bound the
+          memory usage.
+    """
+    cls._memory_budget = memory_budget
+
+  @classmethod
+  def SetProfiler(cls, profiler):
+    """Sets the read profiler.
+
+    The read profiler is used by all instances of the class and its
+    subclasses, such that profiling BinaryDataFormat profiles all formats.
+
+    Args:
+      profiler (ReadProfiler): read profiler or None to disable profiling.
+    """
+    cls._profiler = profiler
 
 
 class BinaryDataFile(BinaryDataFormat):
   """Binary data file."""
 
+  # Signatures of the format, as tuples of offset and value, that are used
+  # to identify the format, see FormatRegistry.
+  SIGNATURES = []
+
+  # Timestamp types of the record attributes that contain a timestamp, see
+  # the timestamps module.
+  RECORD_TIMESTAMP_TYPES = {}
+
+  # Maximum size of the data at the start of the file and directly before
+  # the follow offset that is used to fingerprint a followed file.
+  _FOLLOW_FINGERPRINT_SIZE = 512
+
   def __init__(self, debug=False, output_writer=None):
     """Initializes a binary data file.
 
@@ -680,11 +1059,16 @@ class BinaryDataFile(BinaryDataFormat):
     self._file_object = None
     self._path = None
 
-  def Open(self, path):
+    self._ResetReadAheadBuffer()
+
+  def Open(self, path, use_mmap=False):
     """Opens a binary data file.
 
     Args:
       path (str): path to the file.
+      use_mmap (Optional[bool]): True if the file should be memory mapped.
+          If the file cannot be memory mapped, for example because it is
+          empty or not a regular file, it is read instead.
 
     Raises:
       IOError: if the file is already opened.
@@ -697,14 +1081,180 @@ class BinaryDataFile(BinaryDataFormat):
 
     file_object = open(path, 'rb')
 
+    if use_mmap:
+      try:
+        memory_mapped_file_object = memory_mapped_file.MemoryMappedFile(
+            file_object)
+      except (IOError, OSError, ValueError, mmap.error):
+        memory_mapped_file_object = None
+
+      if memory_mapped_file_object:
+        # The memory map remains valid after the file has been closed.
+        file_object.close()
+        file_object = memory_mapped_file_object
+
     self._file_size = stat_object.st_size
     self._path = path
 
-    self.ReadFileObject(file_object)
+    # Note that the file-like object is closed if the file cannot be read,
+    # since it is not kept by the binary data file.
+    try:
+      self.ReadFileObject(file_object)
+    except Exception:  # pylint: disable=broad-except
+      file_object.close()
+      raise
 
     self._file_object = file_object
     self._file_object_opened_in_object = True
 
+  def OpenFileObject(self, file_object):
+    """Opens a binary data file-like object.
+
+    The file-like object is not closed when the binary data file is closed.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      IOError: if the file is already opened.
+      OSError: if the file is already opened.
+    """
+    if self._file_object:
+      raise IOError('File already opened')
+
+    file_object.seek(0, os.SEEK_END)
+    self._file_size = file_object.tell()
+    file_object.seek(0, os.SEEK_SET)
+
+    self.ReadFileObject(file_object)
+
+    self._file_object = file_object
+    self._file_object_opened_in_object = False
+
+  def _GetFollowFingerprint(self, file_object, follow_state):
+    """Retrieves the fingerprint of a followed file.
+
+    The fingerprint is a SHA-256 of the data at the start of the file and
+    the data directly before the follow offset, which do not change when
+    records are appended. Subclasses of formats with a file header that is
+    updated when records are appended override this method.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Returns:
+      str: fingerprint of the file.
+    """
+    file_offset = follow_state.offset or 0
+    data_size = min(file_offset, self._FOLLOW_FINGERPRINT_SIZE)
+
+    hash_context = hashlib.sha256()
+    hash_context.update(self._ReadData(
+        file_object, 0, data_size, 'follow fingerprint data'))
+    hash_context.update(self._ReadData(
+        file_object, file_offset - data_size, data_size,
+        'follow fingerprint data'))
+
+    return hash_context.hexdigest()
+
+  def _IsValidFollowState(self, file_object, follow_state):
+    """Determines if the follow state is valid for the file.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Returns:
+      bool: True if the records appended since the follow state can be read,
+          False if the file has not been parsed before or has been truncated,
+          rotated or rewritten since.
+    """
+    if follow_state.offset is None:
+      return False
+
+    if (self._file_size < follow_state.file_size or
+        self._file_size < follow_state.offset):
+      return False
+
+    try:
+      fingerprint = self._GetFollowFingerprint(file_object, follow_state)
+    except errors.ParseError:
+      return False
+
+    return fingerprint == follow_state.fingerprint
+
+  def _ReadAppendedRecords(  # pylint: disable=unused-argument
+      self, file_object, follow_state):
+    """Reads the records appended since a follow state.
+
+    Subclasses of append-only formats override this method with a generator
+    that yields the records after the follow state and updates the follow
+    state after every record. A follow state without offset represents that
+    all records should be read.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Raises:
+      NotImplementedError: if the format does not support follow mode.
+    """
+    raise NotImplementedError(
+        'Follow mode is not supported by: {0:s}.'.format(
+            self.__class__.__name__))
+
+  def _ReadRecords(self, file_object):  # pylint: disable=unused-argument
+    """Reads the records from a file-like object.
+
+    Subclasses of formats that consist of records override this method with
+    a generator that yields the records.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      NotImplementedError: if the format does not support reading records.
+    """
+    raise NotImplementedError(
+        'Reading records is not supported by: {0:s}.'.format(
+            self.__class__.__name__))
+
+  def ReadAppendedRecords(self, follow_state):
+    """Reads the records appended since the file was last followed.
+
+    If the follow state is not valid for the file, for example because the
+    file was truncated or rotated, all records are read. The follow state is
+    updated with the last fully parsed record.
+
+    Args:
+      follow_state (FollowState): follow state, which is updated in place.
+
+    Yields:
+      object: record.
+
+    Raises:
+      IOError: if the file is not opened.
+      NotImplementedError: if the format does not support follow mode.
+      OSError: if the file is not opened.
+      ParseError: if a record cannot be read.
+    """
+    if not self._file_object:
+      raise IOError('File not opened')
+
+    if not self._IsValidFollowState(self._file_object, follow_state):
+      follow_state.Reset()
+
+    try:
+      for record in self._ReadAppendedRecords(self._file_object, follow_state):
+        yield record
+
+    finally:
+      if follow_state.offset is not None:
+        follow_state.file_size = self._file_size
+        follow_state.fingerprint = self._GetFollowFingerprint(
+            self._file_object, follow_state)
+
   @abc.abstractmethod
   def ReadFileObject(self, file_object):
     """Reads binary data from a file-like object.
@@ -712,3 +1262,58 @@ class BinaryDataFile(BinaryDataFormat):
     Args:
       file_object (file): file-like object.
     """
+
+  def ReadRecords(self):
+    """Reads the records.
+
+    The records are read on demand, so that only the current record is kept
+    in memory, regardless of the size of the file.
+
+    Yields:
+      object: record.
+
+    Raises:
+      IOError: if the file is not opened.
+      OSError: if the file is not opened.
+      ParseError: if a record cannot be read.
+    """
+    if not self._file_object:
+      raise IOError('File not opened')
+
+    for record in self._ReadRecords(self._file_object):
+      yield record
+
+  def ReadRecordBatches(self, batch_size=1024):
+    """Reads the records in batches.
+
+    The timestamps of the records, as defined by RECORD_TIMESTAMP_TYPES,
+    are converted into date and time strings for a whole batch at once.
+
+    Args:
+      batch_size (Optional[int]): maximum number of records per batch.
+
+    Yields:
+      list[dict[str, object]]: values of the records in the batch.
+
+    Raises:
+      IOError: if the file is not opened.
+      OSError: if the file is not opened.
+      ParseError: if a record cannot be read.
+      ValueError: if the batch size is not supported.
+    """
+    if batch_size < 1:
+      raise ValueError('Unsupported batch size: {0:d}.'.format(batch_size))
+
+    records_values = []
+    for record in self.ReadRecords():
+      records_values.append(dict(output_writers.GetRecordValues(record)))
+      if len(records_values) >= batch_size:
+        timestamps.CopyRecordTimestampsToDateTimeStrings(
+            records_values, self.RECORD_TIMESTAMP_TYPES)
+        yield records_values
+        records_values = []
+
+    if records_values:
+      timestamps.CopyRecordTimestampsToDateTimeStrings(
+          records_values, self.RECORD_TIMESTAMP_TYPES)
+      yield records_values
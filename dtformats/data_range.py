@@ -9,11 +9,18 @@ import os
 class DataRange(object):
   """In-file data range file-like object.
 
+  Small reads are served from a read-ahead buffer, such that reading a data
+  range in small chunks does not require a seek and read of the parent
+  file-like object per chunk. A data range of a data range is flattened into
+  a single data range of the innermost parent file-like object.
+
   Attributes:
     data_offset (int): offset of the data.
     data_size (int): size of the data.
   """
 
+  _READ_AHEAD_SIZE = 65536
+
   def __init__(self, file_object, data_offset=0, data_size=0):
     """Initializes a file-like object.
 
@@ -22,16 +29,125 @@ class DataRange(object):
       data_offset (Optional[int]): offset of the data.
       data_size (Optional[int]): size of the data.
     """
+    parent_offset = 0
+    parent_size = None
+
+    # Note that the offset and size of a parent data range are determined
+    # at initialization.
+    if isinstance(file_object, DataRange):
+      parent_offset = file_object._GetAbsoluteOffset(0)
+      parent_size = file_object.data_size
+      if file_object._parent_size is not None:
+        parent_size = min(parent_size, (
+            file_object._parent_size - file_object.data_offset))
+
+      file_object = file_object._file_object
+
     super(DataRange, self).__init__()
+    self._buffer = b''
+    self._buffer_offset = 0
     self._current_offset = 0
     self._file_object = file_object
+    self._parent_offset = parent_offset
+    self._parent_size = parent_size
 
     self.data_offset = data_offset
     self.data_size = data_size
 
+  def _GetAbsoluteOffset(self, offset):
+    """Retrieves the offset in the parent file-like object.
+
+    Args:
+      offset (int): offset relative to the start of the data range.
+
+    Returns:
+      int: offset relative to the start of the parent file-like object.
+    """
+    return self._parent_offset + self.data_offset + offset
+
+  def _GetReadSize(self, size):
+    """Retrieves the number of bytes that can be read at the current offset.
+
+    Args:
+      size (int): number of bytes to read, where None or a negative value
+          represents all remaining data.
+
+    Returns:
+      int: number of bytes that can be read.
+
+    Raises:
+      IOError: if the data offset or size is out of bounds.
+    """
+    if self.data_offset < 0:
+      raise IOError('Invalid data offset: {0:d} value out of bounds.'.format(
+          self.data_offset))
+
+    if self.data_size < 0:
+      raise IOError('Invalid data size: {0:d} value out of bounds.'.format(
+          self.data_size))
+
+    data_size = self.data_size
+    if self._parent_size is not None:
+      data_size = min(data_size, self._parent_size - self.data_offset)
+
+    if self._current_offset >= data_size:
+      return 0
+
+    remaining_size = data_size - self._current_offset
+    if size is None or size < 0 or size > remaining_size:
+      return remaining_size
+
+    return size
+
+  def _ReadFromBuffer(self, size):
+    """Reads data from the read-ahead buffer.
+
+    The read-ahead buffer is filled from the current offset if it does not
+    contain the data.
+
+    Args:
+      size (int): number of bytes to read, which should be smaller than
+          the read-ahead size.
+
+    Returns:
+      bytes: data read.
+    """
+    absolute_offset = self._GetAbsoluteOffset(self._current_offset)
+    buffer_offset = absolute_offset - self._buffer_offset
+
+    if buffer_offset < 0 or buffer_offset + size > len(self._buffer):
+      read_ahead_size = self._GetReadSize(self._READ_AHEAD_SIZE)
+
+      self._file_object.seek(absolute_offset, os.SEEK_SET)
+      self._buffer = self._file_object.read(read_ahead_size)
+      self._buffer_offset = absolute_offset
+      buffer_offset = 0
+
+    return self._buffer[buffer_offset:buffer_offset + size]
+
   # The following methods are part of the file-like object interface.
   # pylint: disable=invalid-name
 
+  def peek(self, size=1):
+    """Reads a byte string from the file-like object without moving the offset.
+
+    Args:
+      size (Optional[int]): number of bytes to read, which is bounded by
+          the read-ahead size.
+
+    Returns:
+      bytes: data read.
+
+    Raises:
+      IOError: if the read failed.
+      OSError: if the read failed.
+    """
+    size = self._GetReadSize(min(size, self._READ_AHEAD_SIZE))
+    if size == 0:
+      return b''
+
+    return self._ReadFromBuffer(size)
+
   def read(self, size=None):
     """Reads a byte string from the file-like object at the current offset.
 
@@ -49,30 +165,54 @@ class DataRange(object):
       IOError: if the read failed.
       OSError: if the read failed.
     """
-    if self.data_offset < 0:
-      raise IOError('Invalid data offset: {0:d} value out of bounds.'.format(
-          self.data_offset))
+    size = self._GetReadSize(size)
+    if size == 0:
+      return b''
 
-    if self.data_size < 0:
-      raise IOError('Invalid data size: {0:d} value out of bounds.'.format(
-          self.data_size))
+    if size < self._READ_AHEAD_SIZE:
+      data = self._ReadFromBuffer(size)
+    else:
+      self._file_object.seek(
+          self._GetAbsoluteOffset(self._current_offset), os.SEEK_SET)
+      data = self._file_object.read(size)
 
-    if self._current_offset >= self.data_size:
-      return b''
+    self._current_offset += len(data)
 
-    if size is None:
-      size = self.data_size
-    if self._current_offset + size > self.data_size:
-      size = self.data_size - self._current_offset
+    return data
 
-    self._file_object.seek(
-        self.data_offset + self._current_offset, os.SEEK_SET)
+  def readinto(self, buffer_object):
+    """Reads data from the file-like object into a pre-allocated buffer.
 
-    data = self._file_object.read(size)
+    Args:
+      buffer_object (bytearray): buffer to read into, where the size of
+          the buffer determines the number of bytes to read.
 
-    self._current_offset += len(data)
+    Returns:
+      int: number of bytes read.
 
-    return data
+    Raises:
+      IOError: if the read failed.
+      OSError: if the read failed.
+    """
+    buffer_view = memoryview(buffer_object)
+
+    size = self._GetReadSize(len(buffer_view))
+    if size == 0:
+      return 0
+
+    readinto_function = getattr(self._file_object, 'readinto', None)
+    if size < self._READ_AHEAD_SIZE or not readinto_function:
+      data = self.read(size)
+      number_of_bytes = len(data)
+      buffer_view[:number_of_bytes] = data
+
+    else:
+      self._file_object.seek(
+          self._GetAbsoluteOffset(self._current_offset), os.SEEK_SET)
+      number_of_bytes = readinto_function(buffer_view[:size]) or 0
+      self._current_offset += number_of_bytes
+
+    return number_of_bytes
 
   def seek(self, offset, whence=os.SEEK_SET):
     """Seeks an offset within the file-like object.
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""Process-wide registry of dtFabric data type fabrics and maps."""
+
+from __future__ import unicode_literals
+
+import hashlib
+import hmac
+import logging
+import os
+import pickle
+import stat
+import sys
+import tempfile
+import threading
+
+import dtfabric
+
+from dtfabric.runtime import fabric as dtfabric_fabric
+
+
+def _GetDefaultCacheDirectory():
+  """Retrieves the default directory of the compiled definitions cache.
+
+  The cache is opt-in and only used when the DTFORMATS_CACHE_DIR environment
+  variable contains the path of the cache directory.
+
+  Returns:
+    str: path of the cache directory or None if not available.
+  """
+  return os.environ.get('DTFORMATS_CACHE_DIR', None) or None
+
+
+def _IsSecurePath(path):
+  """Determines if a path can only be changed by the current user.
+
+  Args:
+    path (str): path of a file or directory.
+
+  Returns:
+    bool: True if the path is owned by the current user and is not writable
+        by the group or others.
+  """
+  try:
+    stat_object = os.stat(path)
+  except (IOError, OSError):
+    return False
+
+  # Note that on Windows the ownership is not checked.
+  if hasattr(os, 'getuid') and stat_object.st_uid != os.getuid():
+    return False
+
+  return not stat_object.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+class DataTypeFabricRegistry(object):
+  """Registry of dtFabric data type fabrics and maps.
+
+  The registry ensures that a dtFabric definition file is read and parsed
+  only once per process and that every data type map is created only once
+  per definition file. The fabrics and maps are shared by all users within
+  the process.
+
+  Since parsing the YAML of a definition file dominates the start-up time,
+  the parsed data type fabrics can also be stored in an on-disk cache, keyed
+  by a hash of the definition file content, such that subsequent processes
+  can load the fabric instead of parsing the YAML again.
+
+  Since the cache files are unpickled, the cache is only used when it was
+  explicitly enabled and the cache directory and files are owned by, and
+  only writable by, the current user. The cache files are authenticated with
+  a HMAC of which the key is stored in the cache directory.
+  """
+
+  _CACHE_FILE_SIGNATURE = b'dtfcache'
+
+  # Version of the format of the cache files, which is changed when the
+  # format or the authentication changes.
+  _CACHE_FILE_FORMAT_VERSION = b'\x01'
+
+  _CACHE_FILE_HEADER = _CACHE_FILE_SIGNATURE + _CACHE_FILE_FORMAT_VERSION
+
+  _CACHE_KEY_FILENAME = 'cache.key'
+
+  _CACHE_KEY_SIZE = 32
+
+  # Pickle protocol 2 is supported by both Python 2 and 3.
+  _CACHE_PICKLE_PROTOCOL = 2
+
+  _cache_directory = _GetDefaultCacheDirectory()
+
+  _data_type_maps = {}
+  _fabrics = {}
+
+  # Note that a re-entrant lock is used since creating a data type map can
+  # require the data type fabric to be read.
+  _lock = threading.RLock()
+
+  @classmethod
+  def _GetCacheFileDigest(cls, key, data):
+    """Calculates the digest that authenticates the data of a cache file.
+
+    Args:
+      key (bytes): key of the cache.
+      data (bytes): pickled data type fabric.
+
+    Returns:
+      bytes: digest of the data.
+    """
+    hmac_context = hmac.new(key, digestmod=hashlib.sha256)
+    hmac_context.update(cls._CACHE_FILE_HEADER)
+    hmac_context.update(data)
+    return hmac_context.digest()
+
+  @classmethod
+  def _GetCacheFilePath(cls, definition):
+    """Retrieves the path of the cache file of a definition.
+
+    Args:
+      definition (bytes): content of the dtFabric definition file.
+
+    Returns:
+      str: path of the cache file or None if the cache is disabled.
+    """
+    if not cls._cache_directory:
+      return None
+
+    # The dtFabric and Python versions are part of the key since the pickled
+    # data type fabric depends on both.
+    hash_context = hashlib.sha256()
+    hash_context.update(definition)
+    hash_context.update('{0:s}:{1:d}.{2:d}'.format(
+        dtfabric.__version__, sys.version_info[0],
+        sys.version_info[1]).encode('ascii'))
+
+    filename = '{0:s}.pickle'.format(hash_context.hexdigest())
+    return os.path.join(cls._cache_directory, filename)
+
+  @classmethod
+  def _GetCacheKey(cls, cache_directory, create=False):
+    """Retrieves the key of the cache.
+
+    Args:
+      cache_directory (str): path of the cache directory.
+      create (Optional[bool]): True if the key should be created when
+          the cache directory does not contain a key.
+
+    Returns:
+      bytes: key of the cache or None if not available.
+    """
+    path = os.path.join(cache_directory, cls._CACHE_KEY_FILENAME)
+
+    if create and not os.path.exists(path):
+      try:
+        file_descriptor = os.open(
+            path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(file_descriptor, 'wb') as file_object:
+          file_object.write(os.urandom(cls._CACHE_KEY_SIZE))
+
+      except (IOError, OSError) as exception:
+        # Note that the key file can be created by a concurrent process.
+        logging.debug((
+            'Unable to create cache key: {0:s} with error: {1!s}').format(
+                path, exception))
+
+    if not _IsSecurePath(path):
+      return None
+
+    try:
+      with open(path, 'rb') as file_object:
+        key = file_object.read()
+
+    except IOError:
+      return None
+
+    if len(key) != cls._CACHE_KEY_SIZE:
+      return None
+
+    return key
+
+  @classmethod
+  def _ReadCacheFile(cls, path):
+    """Reads a data type fabric from a cache file.
+
+    The cache file is only unpickled if the cache directory and file can
+    only be changed by the current user and the data is authenticated by
+    the key of the cache.
+
+    Args:
+      path (str): path of the cache file.
+
+    Returns:
+      dtfabric.DataTypeFabric: data type fabric or None if not available.
+    """
+    cache_directory = os.path.dirname(path)
+    if not _IsSecurePath(cache_directory) or not _IsSecurePath(path):
+      return None
+
+    key = cls._GetCacheKey(cache_directory)
+    if not key:
+      return None
+
+    try:
+      with open(path, 'rb') as file_object:
+        data = file_object.read()
+
+    except IOError:
+      return None
+
+    header_size = len(cls._CACHE_FILE_HEADER)
+    if data[:header_size] != cls._CACHE_FILE_HEADER:
+      return None
+
+    digest_size = hashlib.sha256().digest_size
+    digest = data[header_size:header_size + digest_size]
+    data = data[header_size + digest_size:]
+
+    if not hmac.compare_digest(digest, cls._GetCacheFileDigest(key, data)):
+      logging.debug('Unable to authenticate cache file: {0:s}'.format(path))
+      return None
+
+    # Note that an invalid cache file can result in various exceptions, which
+    # should not prevent the definition file from being read.
+    try:
+      data_type_fabric = pickle.loads(data)
+
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.debug('Unable to read cache file: {0:s} with error: {1!s}'.format(
+          path, exception))
+      return None
+
+    if not isinstance(data_type_fabric, dtfabric_fabric.DataTypeFabric):
+      return None
+
+    return data_type_fabric
+
+  @classmethod
+  def _ReadDefinitionFile(cls, path):
+    """Reads a dtFabric definition file.
+
+    Args:
+      path (str): path of the dtFabric definition file.
+
+    Returns:
+      dtfabric.DataTypeFabric: data type fabric which contains the data format
+          data type maps of the data type definition, such as a structure, that
+          can be mapped onto binary data.
+    """
+    with open(path, 'rb') as file_object:
+      definition = file_object.read()
+
+    cache_file_path = cls._GetCacheFilePath(definition)
+    if cache_file_path:
+      data_type_fabric = cls._ReadCacheFile(cache_file_path)
+      if data_type_fabric:
+        return data_type_fabric
+
+    data_type_fabric = dtfabric_fabric.DataTypeFabric(
+        yaml_definition=definition)
+
+    if cache_file_path:
+      cls._WriteCacheFile(cache_file_path, data_type_fabric)
+
+    return data_type_fabric
+
+  @classmethod
+  def _WriteCacheFile(cls, path, data_type_fabric):
+    """Writes a data type fabric to a cache file.
+
+    The cache file is written to a temporary file first and then renamed,
+    such that concurrent processes never read a partially written cache file.
+    Failing to write the cache file is not an error.
+
+    Args:
+      path (str): path of the cache file.
+      data_type_fabric (dtfabric.DataTypeFabric): data type fabric.
+    """
+    cache_directory = os.path.dirname(path)
+
+    try:
+      if not os.path.isdir(cache_directory):
+        os.makedirs(cache_directory, 0o700)
+
+    except (IOError, OSError) as exception:
+      logging.debug((
+          'Unable to create cache directory: {0:s} with error: '
+          '{1!s}').format(cache_directory, exception))
+      return
+
+    if not _IsSecurePath(cache_directory):
+      logging.debug('Unsupported cache directory: {0:s} not secure.'.format(
+          cache_directory))
+      return
+
+    key = cls._GetCacheKey(cache_directory, create=True)
+    if not key:
+      return
+
+    try:
+      data = pickle.dumps(
+          data_type_fabric, protocol=cls._CACHE_PICKLE_PROTOCOL)
+
+    except pickle.PicklingError as exception:
+      logging.debug((
+          'Unable to pickle data type fabric with error: {0!s}').format(
+              exception))
+      return
+
+    try:
+      file_descriptor, temporary_path = tempfile.mkstemp(
+          dir=cache_directory, suffix='.tmp')
+
+    except (IOError, OSError) as exception:
+      logging.debug((
+          'Unable to create cache file in: {0:s} with error: '
+          '{1!s}').format(cache_directory, exception))
+      return
+
+    try:
+      with os.fdopen(file_descriptor, 'wb') as file_object:
+        file_object.write(cls._CACHE_FILE_HEADER)
+        file_object.write(cls._GetCacheFileDigest(key, data))
+        file_object.write(data)
+
+      os.rename(temporary_path, path)
+      temporary_path = None
+
+    except (IOError, OSError) as exception:
+      logging.debug((
+          'Unable to write cache file: {0:s} with error: {1!s}').format(
+              path, exception))
+
+    finally:
+      if temporary_path:
+        try:
+          os.remove(temporary_path)
+        except OSError:
+          pass
+
+  @classmethod
+  def Clear(cls):
+    """Removes all data type fabrics and maps from the registry."""
+    with cls._lock:
+      cls._data_type_maps = {}
+      cls._fabrics = {}
+
+  @classmethod
+  def GetCacheDirectory(cls):
+    """Retrieves the directory of the compiled definitions cache.
+
+    Returns:
+      str: path of the cache directory or None if the cache is disabled.
+    """
+    return cls._cache_directory
+
+  @classmethod
+  def GetDataTypeFabric(cls, path):
+    """Retrieves the data type fabric of a dtFabric definition file.
+
+    Args:
+      path (str): path of the dtFabric definition file.
+
+    Returns:
+      dtfabric.DataTypeFabric: data type fabric.
+    """
+    path = os.path.abspath(path)
+
+    data_type_fabric = cls._fabrics.get(path, None)
+    if not data_type_fabric:
+      with cls._lock:
+        # Check again in case another thread created the fabric while this
+        # thread was waiting for the lock.
+        data_type_fabric = cls._fabrics.get(path, None)
+        if not data_type_fabric:
+          data_type_fabric = cls._ReadDefinitionFile(path)
+          cls._fabrics[path] = data_type_fabric
+
+    return data_type_fabric
+
+  @classmethod
+  def GetDataTypeMap(cls, path, name):
+    """Retrieves a data type map defined by a dtFabric definition file.
+
+    Args:
+      path (str): path of the dtFabric definition file.
+      name (str): name of the data type as defined by the definition file.
+
+    Returns:
+      dtfabric.DataTypeMap: data type map which contains a data type definition,
+          such as a structure, that can be mapped onto binary data.
+    """
+    path = os.path.abspath(path)
+    lookup_key = (path, name)
+
+    data_type_map = cls._data_type_maps.get(lookup_key, None)
+    if not data_type_map:
+      with cls._lock:
+        data_type_map = cls._data_type_maps.get(lookup_key, None)
+        if not data_type_map:
+          data_type_fabric = cls.GetDataTypeFabric(path)
+          data_type_map = data_type_fabric.CreateDataTypeMap(name)
+          cls._data_type_maps[lookup_key] = data_type_map
+
+    return data_type_map
+
+  @classmethod
+  def SetCacheDirectory(cls, path):
+    """Sets the directory of the compiled definitions cache.
+
+    Args:
+      path (str): path of the cache directory or None to disable the cache.
+    """
+    with cls._lock:
+      cls._cache_directory = path or None
@@ -7,6 +7,54 @@ import os
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import timestamps
+
+
+class CacheEntry(object):
+  """Firefox cache version 1 cache entry.
+
+  Attributes:
+    cached_data_size (int): size of the cached data.
+    expiration_time (int): number of seconds since January 1, 1970 00:00:00
+        UTC the cache entry expires.
+    fetch_count (int): number of times the cache entry was fetched.
+    last_fetched_time (int): number of seconds since January 1, 1970 00:00:00
+        UTC the cache entry was last fetched.
+    last_modified_time (int): number of seconds since January 1, 1970
+        00:00:00 UTC the cache entry was last modified.
+    offset (int): offset of the cache entry relative to the start of the file.
+    request (str): request, such as the URL.
+  """
+
+  def __init__(self):
+    """Initializes a Firefox cache version 1 cache entry."""
+    super(CacheEntry, self).__init__()
+    self.cached_data_size = None
+    self.expiration_time = None
+    self.fetch_count = None
+    self.last_fetched_time = None
+    self.last_modified_time = None
+    self.offset = None
+    self.request = None
+
+
+class CacheMapRecord(object):
+  """Firefox cache version 1 map record.
+
+  Attributes:
+    data_location (int): location of the data.
+    eviction_rank (int): eviction rank.
+    hash_number (int): hash number.
+    metadata_location (int): location of the metadata.
+  """
+
+  def __init__(self):
+    """Initializes a Firefox cache version 1 map record."""
+    super(CacheMapRecord, self).__init__()
+    self.data_location = None
+    self.eviction_rank = None
+    self.hash_number = None
+    self.metadata_location = None
 
 
 class CacheMapFile(data_format.BinaryDataFile):
@@ -64,6 +112,9 @@ class CacheMapFile(data_format.BinaryDataFile):
     Args:
       file_object (file): file-like object.
 
+    Returns:
+      int: size of the file header.
+
     Raises:
       ParseError: if the file header cannot be read.
     """
@@ -82,6 +133,8 @@ class CacheMapFile(data_format.BinaryDataFile):
     if file_header.data_size != (self._file_size - file_header_data_size):
       raise errors.ParseError('Data size does not correspond with file size.')
 
+    return file_header_data_size
+
   def _ReadRecord(self, file_object, file_offset):
     """Reads a record.
 
@@ -90,17 +143,49 @@ class CacheMapFile(data_format.BinaryDataFile):
       file_offset (int): offset of the data relative to the start of
           the file-like object.
 
+    Returns:
+      tuple[CacheMapRecord, int]: record and size of the record.
+
     Raises:
       ParseError: if the record cannot be read.
     """
     data_type_map = self._GetDataTypeMap('firefox_cache1_map_record')
 
-    record, _ = self._ReadStructureFromFileObject(
+    record, record_data_size = self._ReadStructureFromFileObject(
         file_object, file_offset, data_type_map, 'record')
 
     if self._debug:
       self._DebugPrintStructureObject(record, self._DEBUG_INFO_RECORD)
 
+    cache_map_record = CacheMapRecord()
+    cache_map_record.data_location = record.data_location
+    cache_map_record.eviction_rank = record.eviction_rank
+    cache_map_record.hash_number = record.hash_number
+    cache_map_record.metadata_location = record.metadata_location
+
+    return cache_map_record, record_data_size
+
+  def _ReadRecords(self, file_object):
+    """Reads the records.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      CacheMapRecord: record.
+
+    Raises:
+      ParseError: if a record cannot be read.
+    """
+    file_offset = self._ReadFileHeader(file_object)
+
+    while file_offset < self._file_size:
+      cache_map_record, record_data_size = self._ReadRecord(
+          file_object, file_offset)
+      file_offset += record_data_size
+
+      yield cache_map_record
+
   def ReadFileObject(self, file_object):
     """Reads a Firefox cache map file-like object.
 
@@ -110,12 +195,11 @@ class CacheMapFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file cannot be read.
     """
-    self._ReadFileHeader(file_object)
-
-    file_offset = file_object.tell()
-    while file_offset < self._file_size:
-      self._ReadRecord(file_object, file_offset)
-      file_offset = file_object.tell()
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
+    else:
+      self._ReadFileHeader(file_object)
 
 
 class CacheBlockFile(data_format.BinaryDataFile):
@@ -123,6 +207,11 @@ class CacheBlockFile(data_format.BinaryDataFile):
 
   _DEFINITION_FILE = 'firefox_cache1.yaml'
 
+  RECORD_TIMESTAMP_TYPES = {
+      'expiration_time': timestamps.TIMESTAMP_TYPE_POSIX,
+      'last_fetched_time': timestamps.TIMESTAMP_TYPE_POSIX,
+      'last_modified_time': timestamps.TIMESTAMP_TYPE_POSIX}
+
   _DEBUG_INFO_CACHE_ENTRY = [
       ('major_format_version', 'Major format version',
        '_FormatIntegerAsDecimal'),
@@ -174,6 +263,10 @@ class CacheBlockFile(data_format.BinaryDataFile):
       file_offset (int): offset of the data relative to the start of
           the file-like object.
 
+    Returns:
+      tuple[CacheEntry, int]: cache entry or None if the block does not
+          contain a cache entry and the offset of the next block.
+
     Raises:
       ParseError: if the cache entry cannot be read.
     """
@@ -184,15 +277,46 @@ class CacheBlockFile(data_format.BinaryDataFile):
           file_object, file_offset, data_type_map, 'cache_entry')
     except errors.ParseError:
       file_object.seek(file_offset + self._block_size, os.SEEK_SET)
-      return
+      return None, file_offset + self._block_size
 
     if self._debug and cache_entry.major_format_version == 1:
       self._DebugPrintStructureObject(cache_entry, self._DEBUG_INFO_CACHE_ENTRY)
 
+    next_block_offset = file_offset + cache_entry_data_size
+
     _, trailing_data_size = divmod(cache_entry_data_size, self._block_size)
     if trailing_data_size > 0:
-      next_block_offset = self._block_size - trailing_data_size
-      file_object.seek(next_block_offset, os.SEEK_CUR)
+      next_block_offset += self._block_size - trailing_data_size
+      file_object.seek(next_block_offset, os.SEEK_SET)
+
+    firefox_cache_entry = CacheEntry()
+    firefox_cache_entry.cached_data_size = cache_entry.cached_data_size
+    firefox_cache_entry.expiration_time = cache_entry.expiration_time
+    firefox_cache_entry.fetch_count = cache_entry.fetch_count
+    firefox_cache_entry.last_fetched_time = cache_entry.last_fetched_time
+    firefox_cache_entry.last_modified_time = cache_entry.last_modified_time
+    firefox_cache_entry.offset = file_offset
+    firefox_cache_entry.request = cache_entry.request.rstrip('\x00')
+
+    return firefox_cache_entry, next_block_offset
+
+  def _ReadRecords(self, file_object):
+    """Reads the cache entries.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      CacheEntry: cache entry.
+
+    Raises:
+      ParseError: if a cache entry cannot be read.
+    """
+    file_offset = 0
+    while file_offset < self._file_size:
+      cache_entry, file_offset = self._ReadCacheEntry(file_object, file_offset)
+      if cache_entry:
+        yield cache_entry
 
   def ReadFileObject(self, file_object):
     """Reads a Firefox cache block file-like object.
@@ -214,7 +338,6 @@ class CacheBlockFile(data_format.BinaryDataFile):
       raise errors.ParseError('Unsupported cache block filename: {0:s}'.format(
           filename))
 
-    file_offset = 0
-    while file_offset < self._file_size:
-      self._ReadCacheEntry(file_object, file_offset)
-      file_offset = file_object.tell()
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
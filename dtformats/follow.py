@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Follow mode for append-only log files.
+
+In follow mode only the records appended to a file since it was last parsed
+are read. The state of the last parse is stored per file and contains the
+offset directly after the last fully parsed record and a fingerprint that is
+used to detect that the file was truncated, rotated or otherwise rewritten,
+in which case the file is parsed from the start again.
+"""
+
+from __future__ import unicode_literals
+
+import io
+import json
+import logging
+import os
+import tempfile
+
+
+class FollowState(object):
+  """State of following a file.
+
+  Attributes:
+    file_size (int): size of the file when it was last parsed.
+    fingerprint (str): fingerprint of the data of the file that is not
+        expected to change when records are appended, such as the file header
+        and the last fully parsed record.
+    offset (int): offset directly after the last fully parsed record or None
+        if the file has not been parsed.
+    values (dict[str, int]): format specific values, such as the offset of
+        the last fully parsed record.
+  """
+
+  def __init__(self):
+    """Initializes a follow state."""
+    super(FollowState, self).__init__()
+    self.file_size = 0
+    self.fingerprint = None
+    self.offset = None
+    self.values = {}
+
+  def CopyFromDict(self, json_dict):
+    """Copies the follow state from a JSON dictionary.
+
+    Args:
+      json_dict (dict[str, object]): JSON dictionary of the follow state.
+    """
+    self.file_size = json_dict.get('file_size', 0)
+    self.fingerprint = json_dict.get('fingerprint', None)
+    self.offset = json_dict.get('offset', None)
+    self.values = dict(json_dict.get('values', {}))
+
+  def CopyToDict(self):
+    """Copies the follow state to a JSON dictionary.
+
+    Returns:
+      dict[str, object]: JSON dictionary of the follow state.
+    """
+    return {
+        'file_size': self.file_size,
+        'fingerprint': self.fingerprint,
+        'offset': self.offset,
+        'values': dict(self.values)}
+
+  def Reset(self):
+    """Resets the follow state, such that the file is parsed from the start."""
+    self.file_size = 0
+    self.fingerprint = None
+    self.offset = None
+    self.values = {}
+
+
+class FollowStateStore(object):
+  """Store of follow states.
+
+  The follow states are stored per path and format in a JSON file.
+  """
+
+  def __init__(self, path):
+    """Initializes a follow state store.
+
+    Args:
+      path (str): path of the JSON file that contains the follow states.
+    """
+    super(FollowStateStore, self).__init__()
+    self._json_dicts = {}
+    self._path = path
+
+  def _GetKey(self, path, format_name):
+    """Retrieves the key of a follow state.
+
+    Args:
+      path (str): path of the followed file.
+      format_name (str): name of the format of the followed file.
+
+    Returns:
+      str: key of the follow state.
+    """
+    return '{0:s}:{1:s}'.format(format_name, os.path.abspath(path))
+
+  def GetState(self, path, format_name):
+    """Retrieves a follow state.
+
+    Args:
+      path (str): path of the followed file.
+      format_name (str): name of the format of the followed file.
+
+    Returns:
+      FollowState: follow state, which is a new follow state if the file
+          was not followed before.
+    """
+    follow_state = FollowState()
+
+    json_dict = self._json_dicts.get(self._GetKey(path, format_name), None)
+    if json_dict:
+      follow_state.CopyFromDict(json_dict)
+
+    return follow_state
+
+  def Read(self):
+    """Reads the follow states.
+
+    A missing or invalid JSON file results in an empty store, such that all
+    files are parsed from the start.
+    """
+    self._json_dicts = {}
+
+    try:
+      with io.open(self._path, 'r', encoding='utf-8') as file_object:
+        json_dicts = json.load(file_object)
+
+    except (IOError, OSError, ValueError) as exception:
+      if os.path.exists(self._path):
+        logging.warning((
+            'Unable to read follow states from: {0:s} with error: '
+            '{1!s}').format(self._path, exception))
+      return
+
+    if isinstance(json_dicts, dict):
+      self._json_dicts = json_dicts
+
+  def SetState(self, path, format_name, follow_state):
+    """Sets a follow state.
+
+    Args:
+      path (str): path of the followed file.
+      format_name (str): name of the format of the followed file.
+      follow_state (FollowState): follow state.
+    """
+    key = self._GetKey(path, format_name)
+    self._json_dicts[key] = follow_state.CopyToDict()
+
+  def Write(self):
+    """Writes the follow states.
+
+    The JSON file is written to a temporary file first and then renamed,
+    such that an interrupted write does not corrupt the follow states.
+
+    Raises:
+      IOError: if the follow states cannot be written.
+      OSError: if the follow states cannot be written.
+    """
+    directory = os.path.dirname(os.path.abspath(self._path))
+
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=directory, suffix='.tmp')
+
+    try:
+      with io.open(file_descriptor, 'w', encoding='utf-8') as file_object:
+        file_object.write('{0!s}'.format(json.dumps(
+            self._json_dicts, indent=2, sort_keys=True)))
+
+      # os.replace() is not available in Python 2, where os.rename() does not
+      # replace an existing file on Windows.
+      if hasattr(os, 'replace'):
+        os.replace(temporary_path, self._path)
+      else:
+        if os.path.exists(self._path):
+          os.remove(self._path)
+        os.rename(temporary_path, self._path)
+      temporary_path = None
+
+    finally:
+      if temporary_path:
+        try:
+          os.remove(temporary_path)
+        except OSError:
+          pass
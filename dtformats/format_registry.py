@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Registry of data formats that can be identified by signatures."""
+
+from __future__ import unicode_literals
+
+import os
+import threading
+
+
+class FormatRegistry(object):
+  """Registry of data formats that can be identified by signatures.
+
+  A format class declares its signatures in the SIGNATURES class attribute,
+  as tuples of offset and value, where the offset is relative to the start
+  of the file. Any of the signatures identifies the format.
+
+  The signatures are stored in lookup tables per offset and size, such that
+  a format is identified with a single read of the first PREFIX_SIZE bytes
+  of a file and a dictionary lookup per offset and size.
+  """
+
+  # Size of the data needed to identify a format, which is the maximum
+  # offset plus size of a signature.
+  PREFIX_SIZE = 64
+
+  _format_classes = {}
+
+  # Lookup tables of format names per signature value, as tuples of offset,
+  # size and table, where the tables with larger signatures are checked
+  # first since these are more specific.
+  _signature_tables = []
+
+  _lock = threading.Lock()
+
+  @classmethod
+  def _BuildSignatureTables(cls):
+    """Builds the signature lookup tables of the registered formats."""
+    lookup_tables = {}
+    for name, format_class in sorted(cls._format_classes.items()):
+      for offset, signature in format_class.SIGNATURES:
+        lookup_key = (offset, len(signature))
+        lookup_table = lookup_tables.setdefault(lookup_key, {})
+        lookup_table.setdefault(signature, []).append(name)
+
+    cls._signature_tables = [
+        (offset, size, lookup_tables[(offset, size)])
+        for offset, size in sorted(
+            lookup_tables.keys(), key=lambda key: (-key[1], key[0]))]
+
+  @classmethod
+  def DeregisterFormat(cls, name):
+    """Deregisters a format.
+
+    Args:
+      name (str): name of the format.
+
+    Raises:
+      KeyError: if the format is not registered.
+    """
+    with cls._lock:
+      if name not in cls._format_classes:
+        raise KeyError('Format: {0:s} not registered.'.format(name))
+
+      del cls._format_classes[name]
+      cls._BuildSignatureTables()
+
+  @classmethod
+  def GetFormatClass(cls, name):
+    """Retrieves the class of a format.
+
+    Args:
+      name (str): name of the format.
+
+    Returns:
+      type: class of the format or None if the format is not registered.
+    """
+    return cls._format_classes.get(name, None)
+
+  @classmethod
+  def GetFormatNames(cls):
+    """Retrieves the names of the registered formats.
+
+    Returns:
+      list[str]: names of the registered formats.
+    """
+    return sorted(cls._format_classes.keys())
+
+  @classmethod
+  def IdentifyData(cls, data):
+    """Identifies the format of data by its signatures.
+
+    Args:
+      data (bytes): data at the start of the file, which should contain at
+          least the first PREFIX_SIZE bytes if available.
+
+    Returns:
+      list[str]: names of the formats whose signatures match the data, where
+          formats with larger signatures are listed first.
+    """
+    names = []
+    data_size = len(data)
+    for offset, size, lookup_table in cls._signature_tables:
+      if offset + size > data_size:
+        continue
+
+      matching_names = lookup_table.get(data[offset:offset + size], None)
+      if matching_names:
+        names.extend([name for name in matching_names if name not in names])
+
+    return names
+
+  @classmethod
+  def IdentifyFile(cls, path):
+    """Identifies the format of a file by its signatures.
+
+    Args:
+      path (str): path of the file.
+
+    Returns:
+      list[str]: names of the formats whose signatures match the file, where
+          formats with larger signatures are listed first.
+
+    Raises:
+      IOError: if the file cannot be read.
+      OSError: if the file cannot be read.
+    """
+    with open(path, 'rb') as file_object:
+      data = file_object.read(cls.PREFIX_SIZE)
+
+    return cls.IdentifyData(data)
+
+  @classmethod
+  def IdentifyFileObject(cls, file_object):
+    """Identifies the format of a file-like object by its signatures.
+
+    The current offset of the file-like object is restored afterwards.
+
+    Args:
+      file_object (file): file-like object.
+
+    Returns:
+      list[str]: names of the formats whose signatures match the file-like
+          object, where formats with larger signatures are listed first.
+
+    Raises:
+      IOError: if the file-like object cannot be read.
+      OSError: if the file-like object cannot be read.
+    """
+    file_offset = file_object.tell()
+
+    file_object.seek(0, os.SEEK_SET)
+    data = file_object.read(cls.PREFIX_SIZE)
+    file_object.seek(file_offset, os.SEEK_SET)
+
+    return cls.IdentifyData(data)
+
+  @classmethod
+  def RegisterFormat(cls, name, format_class):
+    """Registers a format.
+
+    Args:
+      name (str): name of the format.
+      format_class (type): class of the format, which defines the signatures
+          of the format in the SIGNATURES class attribute.
+
+    Raises:
+      KeyError: if the format is already registered.
+      ValueError: if a signature is not supported.
+    """
+    for offset, signature in format_class.SIGNATURES:
+      if not signature or offset < 0 or offset + len(signature) > (
+          cls.PREFIX_SIZE):
+        raise ValueError(
+            'Unsupported signature of format: {0:s} at offset: {1:d}.'.format(
+                name, offset))
+
+    with cls._lock:
+      if name in cls._format_classes:
+        raise KeyError('Format: {0:s} already registered.'.format(name))
+
+      cls._format_classes[name] = format_class
+      cls._BuildSignatureTables()
@@ -12,6 +12,7 @@ import zlib
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
 
 
 class GZipFile(data_format.BinaryDataFile):
@@ -21,6 +22,8 @@ class GZipFile(data_format.BinaryDataFile):
 
   _GZIP_SIGNATURE = 0x8b1f
 
+  SIGNATURES = [(0, b'\x1f\x8b')]
+
   _COMPRESSION_METHOD_DEFLATE = 8
 
   _FLAG_FTEXT = 0x01
@@ -180,3 +183,6 @@ class GZipFile(data_format.BinaryDataFile):
       self._ReadMemberFooter(file_object)
 
       file_offset = file_object.tell()
+
+
+format_registry.FormatRegistry.RegisterFormat('gzip', GZipFile)
@@ -3,21 +3,13 @@
 
 from __future__ import unicode_literals
 
-import os
-
-from dtfabric.runtime import fabric as dtfabric_fabric
-
 from dtformats import data_format
 
 
 class WindowsTaskSchedularJobFile(data_format.BinaryDataFile):
   """Windows Task Scheduler job (.job) file."""
 
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'job.yaml')
-
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
+  _DEFINITION_FILE = 'job.yaml'
 
   # TODO: add format definition.
   # https://msdn.microsoft.com/en-us/library/cc248285.aspx
@@ -25,17 +17,6 @@ class WindowsTaskSchedularJobFile(data_format.BinaryDataFile):
   # TODO: add job signature
   # https://msdn.microsoft.com/en-us/library/cc248299.aspx
 
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
-
-  _FIXED_LENGTH_DATA_SECTION = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'job_fixed_length_data_section')
-
-  _FIXED_LENGTH_DATA_SECTION_SIZE = _FIXED_LENGTH_DATA_SECTION.GetByteSize()
-
-  _VARIABLE_LENGTH_DATA_SECTION = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'job_variable_length_data_section')
-
   _DEBUG_INFO_FIXED_LENGTH_DATA_SECTION = [
       ('signature', 'Signature', '_FormatIntegerAsProductVersion'),
       ('format_version', 'Format version', '_FormatIntegerAsDecimal'),
@@ -193,9 +174,10 @@ class WindowsTaskSchedularJobFile(data_format.BinaryDataFile):
       IOError: if the fixed-length data section cannot be read.
     """
     file_offset = file_object.tell()
-    data_section = self._ReadStructure(
-        file_object, file_offset, self._FIXED_LENGTH_DATA_SECTION_SIZE,
-        self._FIXED_LENGTH_DATA_SECTION, 'fixed-length data section')
+    data_type_map = self._GetDataTypeMap('job_fixed_length_data_section')
+
+    data_section, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'fixed-length data section')
 
     if self._debug:
       self._DebugPrintStructureObject(
@@ -212,9 +194,11 @@ class WindowsTaskSchedularJobFile(data_format.BinaryDataFile):
     """
     file_offset = file_object.tell()
     data_size = self._file_size - file_offset
+    data_type_map = self._GetDataTypeMap('job_variable_length_data_section')
+
     data_section = self._ReadStructure(
-        file_object, file_offset, data_size,
-        self._VARIABLE_LENGTH_DATA_SECTION, 'variable-length data section')
+        file_object, file_offset, data_size, data_type_map,
+        'variable-length data section')
 
     if self._debug:
       self._DebugPrintStructureObject(
@@ -9,6 +9,8 @@ from dtfabric.runtime import data_maps as dtfabric_data_maps
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
+from dtformats import memory
 
 
 class KeychainDatabaseColumn(object):
@@ -33,16 +35,22 @@ class KeychainDatabaseTable(object):
 
   Attributes:
     columns (list[KeychainDatabaseColumn]): columns.
-    records (list[dict[str, object]]): records.
+    records (SpillableList[dict[str, object]]): records.
     relation_identifier (int): relation identifier.
     relation_name (str): relation name.
   """
 
-  def __init__(self):
-    """Initializes a MacOS keychain database table."""
+  def __init__(self, memory_budget=None):
+    """Initializes a MacOS keychain database table.
+
+    Args:
+      memory_budget (Optional[MemoryBudget]): memory budget of the records,
+          where None represents an unbounded budget.
+    """
     super(KeychainDatabaseTable, self).__init__()
     self.columns = []
-    self.records = []
+    self.records = memory.SpillableList(
+        memory_budget=memory_budget)
     self.relation_identifier = None
     self.relation_name = None
 
@@ -54,6 +62,8 @@ class KeychainDatabaseFile(data_format.BinaryDataFile):
 
   _FILE_SIGNATURE = b'kych'
 
+  SIGNATURES = [(0, _FILE_SIGNATURE)]
+
   _RECORD_TYPE_CSSM_DL_DB_SCHEMA_INFO = 0x00000000
   _RECORD_TYPE_CSSM_DL_DB_SCHEMA_INDEXES = 0x00000001
   _RECORD_TYPE_CSSM_DL_DB_SCHEMA_ATTRIBUTES = 0x00000002
@@ -815,7 +825,7 @@ class KeychainDatabaseFile(data_format.BinaryDataFile):
         trailing_data = file_object.read(trailing_data_size)
         self._DebugPrintData('Record trailing data', trailing_data)
 
-    table = KeychainDatabaseTable()
+    table = KeychainDatabaseTable(memory_budget=self._memory_budget)
     table.relation_identifier = record_values.relation_identifier
     table.relation_name = relation_name
 
@@ -928,6 +938,15 @@ class KeychainDatabaseFile(data_format.BinaryDataFile):
 
     return tables
 
+  def Close(self):
+    """Closes the MacOS keychain database file."""
+    super(KeychainDatabaseFile, self).Close()
+
+    for table in self._tables.values():
+      table.records.Close()
+
+    self._tables = collections.OrderedDict()
+
   def ReadFileObject(self, file_object):
     """Reads a MacOS keychain database file-like object.
 
@@ -941,3 +960,6 @@ class KeychainDatabaseFile(data_format.BinaryDataFile):
 
     self._tables = self._ReadTablesArray(
         file_object, file_header.tables_array_offset)
+
+
+format_registry.FormatRegistry.RegisterFormat('keychain', KeychainDatabaseFile)
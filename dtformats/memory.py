@@ -0,0 +1,508 @@
+# -*- coding: utf-8 -*-
+"""Memory budget and collections that are bounded by a memory budget."""
+
+from __future__ import unicode_literals
+
+import collections
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+
+def GetObjectSize(value):
+  """Estimates the size of an object in memory.
+
+  The estimate includes the direct members of containers and the attributes
+  of objects, but not values that are nested more deeply, which is
+  sufficient for the records and file entries of the parsers.
+
+  Args:
+    value (object): value.
+
+  Returns:
+    int: estimated size of the object in bytes.
+  """
+  size = sys.getsizeof(value)
+
+  if isinstance(value, dict):
+    for key, member_value in value.items():
+      size += sys.getsizeof(key) + sys.getsizeof(member_value)
+
+  elif isinstance(value, (list, set, tuple)):
+    for member_value in value:
+      size += sys.getsizeof(member_value)
+
+  elif hasattr(value, '__dict__'):
+    size += sys.getsizeof(value.__dict__)
+    for member_value in value.__dict__.values():
+      size += sys.getsizeof(member_value)
+
+  return size
+
+
+class LRUCache(object):
+  """Cache that evicts the least recently used values.
+
+  The number of values in the cache is bounded by a maximum number of values
+  and, if set, by the memory budget.
+
+  Attributes:
+    maximum_number_of_values (int): maximum number of values in the cache,
+        where 0 disables the cache.
+    number_of_hits (int): number of times a value was found in the cache.
+    number_of_misses (int): number of times a value was not found in
+        the cache.
+  """
+
+  def __init__(self, maximum_number_of_values, memory_budget=None):
+    """Initializes a least recently used (LRU) cache.
+
+    Args:
+      maximum_number_of_values (int): maximum number of values in the cache,
+          where 0 disables the cache.
+      memory_budget (Optional[MemoryBudget]): memory budget, where None
+          represents an unbounded budget.
+
+    Raises:
+      ValueError: if the maximum number of values is invalid.
+    """
+    if maximum_number_of_values < 0:
+      raise ValueError(
+          'Invalid maximum number of values value out of bounds.')
+
+    super(LRUCache, self).__init__()
+    self._memory_budget = memory_budget
+    self._values = collections.OrderedDict()
+    self.maximum_number_of_values = maximum_number_of_values
+    self.number_of_hits = 0
+    self.number_of_misses = 0
+
+  def __len__(self):
+    """Retrieves the number of values in the cache.
+
+    Returns:
+      int: number of values in the cache.
+    """
+    return len(self._values)
+
+  def _EvictValue(self):
+    """Evicts the least recently used value."""
+    _, (_, size) = self._values.popitem(last=False)
+    if self._memory_budget:
+      self._memory_budget.Release(size)
+
+  def Clear(self):
+    """Removes all values from the cache."""
+    while self._values:
+      self._EvictValue()
+
+  def GetValue(self, key):
+    """Retrieves a value from the cache.
+
+    Args:
+      key (object): key of the value.
+
+    Returns:
+      object: value or None if the value is not in the cache.
+    """
+    cached_value = self._values.pop(key, None)
+    if cached_value is None:
+      self.number_of_misses += 1
+      return None
+
+    # Re-insert the value to mark it as the most recently used value.
+    self._values[key] = cached_value
+    self.number_of_hits += 1
+    return cached_value[0]
+
+  def SetValue(self, key, value, size=None):
+    """Stores a value in the cache.
+
+    Args:
+      key (object): key of the value.
+      value (object): value.
+      size (Optional[int]): size of the value in bytes, where None represents
+          the estimated size of the value.
+    """
+    if not self.maximum_number_of_values:
+      return
+
+    if key in self._values:
+      _, previous_size = self._values.pop(key)
+      if self._memory_budget:
+        self._memory_budget.Release(previous_size)
+
+    while len(self._values) >= self.maximum_number_of_values:
+      self._EvictValue()
+
+    if size is None:
+      size = GetObjectSize(value)
+
+    if self._memory_budget:
+      while not self._memory_budget.Allocate(size):
+        if not self._values:
+          return
+
+        self._EvictValue()
+
+    self._values[key] = (value, size)
+
+
+class MemoryBudget(object):
+  """Memory budget shared by the parsers of a process.
+
+  The memory budget accounts for the estimated size of the state that
+  parsers keep in memory, such as file entries and records. A parser that
+  cannot allocate from the budget evicts, spills or streams its state
+  instead.
+
+  Attributes:
+    maximum_size (int): maximum size of the budget in bytes.
+    used_size (int): size of the budget that is in use in bytes.
+  """
+
+  def __init__(self, maximum_size):
+    """Initializes a memory budget.
+
+    Args:
+      maximum_size (int): maximum size of the budget in bytes.
+
+    Raises:
+      ValueError: if the maximum size is invalid.
+    """
+    if maximum_size <= 0:
+      raise ValueError('Invalid maximum size value out of bounds.')
+
+    super(MemoryBudget, self).__init__()
+    self._lock = threading.Lock()
+    self.maximum_size = maximum_size
+    self.used_size = 0
+
+  @property
+  def available_size(self):
+    """int: size of the budget that is available in bytes."""
+    return self.maximum_size - self.used_size
+
+  def Allocate(self, size):
+    """Allocates a part of the budget.
+
+    Args:
+      size (int): size to allocate in bytes.
+
+    Returns:
+      bool: True if the size was allocated or False if the allocation would
+          exceed the budget.
+    """
+    with self._lock:
+      if self.used_size + size > self.maximum_size:
+        return False
+
+      self.used_size += size
+
+    return True
+
+  def Release(self, size):
+    """Releases a previously allocated part of the budget.
+
+    Args:
+      size (int): size to release in bytes.
+    """
+    with self._lock:
+      self.used_size = max(self.used_size - size, 0)
+
+
+class SpillableCollection(object):
+  """Collection that spills its values to a temporary file.
+
+  Values are kept in memory as long as their estimated size can be allocated
+  from the memory budget, otherwise they are pickled to a temporary file.
+  """
+
+  def __init__(self, memory_budget=None):
+    """Initializes a spillable collection.
+
+    Args:
+      memory_budget (Optional[MemoryBudget]): memory budget, where None
+          represents an unbounded budget.
+    """
+    super(SpillableCollection, self).__init__()
+    self._allocated_size = 0
+    self._memory_budget = memory_budget
+    self._spill_file = None
+
+  def _AllocateValue(self, value):
+    """Allocates the estimated size of a value from the memory budget.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      int: size allocated from the memory budget or None if the value cannot
+          be kept in memory.
+    """
+    if not self._memory_budget:
+      return 0
+
+    size = GetObjectSize(value)
+    if not self._memory_budget.Allocate(size):
+      return None
+
+    self._allocated_size += size
+    return size
+
+  def _ReadSpilledValue(self, spill_offset):
+    """Reads a value from the temporary file.
+
+    Args:
+      spill_offset (int): offset of the value in the temporary file.
+
+    Returns:
+      tuple[object, int]: value and offset of the next value in the temporary
+          file.
+    """
+    self._spill_file.seek(spill_offset, os.SEEK_SET)
+    value = pickle.load(self._spill_file)
+    return value, self._spill_file.tell()
+
+  def _ReleaseValue(self, size):
+    """Releases the size of a value that is no longer kept in memory.
+
+    Args:
+      size (int): size allocated from the memory budget.
+    """
+    if self._memory_budget and size:
+      self._memory_budget.Release(size)
+      self._allocated_size -= size
+
+  def _WriteSpilledValue(self, value):
+    """Writes a value to the temporary file.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      int: offset of the value in the temporary file.
+    """
+    if not self._spill_file:
+      self._spill_file = tempfile.TemporaryFile()
+
+    self._spill_file.seek(0, os.SEEK_END)
+    spill_offset = self._spill_file.tell()
+    pickle.dump(value, self._spill_file, pickle.HIGHEST_PROTOCOL)
+    return spill_offset
+
+  @property
+  def is_spilled(self):
+    """bool: True if values were spilled to a temporary file."""
+    return self._spill_file is not None
+
+  def Close(self):
+    """Releases the memory budget and removes the temporary file."""
+    if self._memory_budget:
+      self._memory_budget.Release(self._allocated_size)
+    self._allocated_size = 0
+
+    if self._spill_file:
+      self._spill_file.close()
+      self._spill_file = None
+
+
+class SpillableDict(SpillableCollection):
+  """Dictionary that spills its values to a temporary file.
+
+  The keys are always kept in memory, the values only while the memory budget
+  allows it. Spilled values are read back from the temporary file on access.
+  """
+
+  def __init__(self, memory_budget=None):
+    """Initializes a spillable dictionary.
+
+    Args:
+      memory_budget (Optional[MemoryBudget]): memory budget, where None
+          represents an unbounded budget.
+    """
+    super(SpillableDict, self).__init__(memory_budget=memory_budget)
+    self._spill_offsets = {}
+    self._value_sizes = {}
+    self._values = {}
+
+  def __contains__(self, key):
+    """Determines if the dictionary contains a key.
+
+    Args:
+      key (object): key.
+
+    Returns:
+      bool: True if the dictionary contains the key.
+    """
+    return key in self._values or key in self._spill_offsets
+
+  def __getitem__(self, key):
+    """Retrieves the value of a key.
+
+    Args:
+      key (object): key.
+
+    Returns:
+      object: value.
+
+    Raises:
+      KeyError: if the dictionary does not contain the key.
+    """
+    if key in self._values:
+      return self._values[key]
+
+    spill_offset = self._spill_offsets[key]
+    value, _ = self._ReadSpilledValue(spill_offset)
+    return value
+
+  def __iter__(self):
+    """Retrieves the keys.
+
+    Yields:
+      object: key.
+    """
+    for key in list(self._values.keys()):
+      yield key
+
+    for key in list(self._spill_offsets.keys()):
+      yield key
+
+  def __len__(self):
+    """Retrieves the number of keys.
+
+    Returns:
+      int: number of keys.
+    """
+    return len(self._values) + len(self._spill_offsets)
+
+  def __setitem__(self, key, value):
+    """Sets the value of a key.
+
+    Args:
+      key (object): key.
+      value (object): value.
+    """
+    if key in self._values:
+      del self._values[key]
+      self._ReleaseValue(self._value_sizes.pop(key))
+    else:
+      self._spill_offsets.pop(key, None)
+
+    size = self._AllocateValue(value)
+    if size is not None:
+      self._value_sizes[key] = size
+      self._values[key] = value
+    else:
+      self._spill_offsets[key] = self._WriteSpilledValue(value)
+
+  def Close(self):
+    """Removes the values and releases the budget and the temporary file."""
+    super(SpillableDict, self).Close()
+    self._spill_offsets = {}
+    self._value_sizes = {}
+    self._values = {}
+
+  def get(self, key, default_value=None):  # pylint: disable=invalid-name
+    """Retrieves the value of a key.
+
+    Args:
+      key (object): key.
+      default_value (Optional[object]): value to return if the dictionary
+          does not contain the key.
+
+    Returns:
+      object: value or the default value.
+    """
+    if key not in self:
+      return default_value
+
+    return self[key]
+
+  def items(self):  # pylint: disable=invalid-name
+    """Retrieves the keys and values.
+
+    Yields:
+      tuple[object, object]: key and value.
+    """
+    for key in self:
+      yield key, self[key]
+
+  def keys(self):  # pylint: disable=invalid-name
+    """Retrieves the keys.
+
+    Returns:
+      list[object]: keys.
+    """
+    return list(self)
+
+  def values(self):  # pylint: disable=invalid-name
+    """Retrieves the values.
+
+    Yields:
+      object: value.
+    """
+    for key in self:
+      yield self[key]
+
+
+class SpillableList(SpillableCollection):
+  """List that spills its values to a temporary file.
+
+  Values are appended in memory until the memory budget is exhausted, from
+  then on values are appended to the temporary file, such that iterating
+  the list preserves the order in which the values were appended.
+  """
+
+  def __init__(self, memory_budget=None):
+    """Initializes a spillable list.
+
+    Args:
+      memory_budget (Optional[MemoryBudget]): memory budget, where None
+          represents an unbounded budget.
+    """
+    super(SpillableList, self).__init__(memory_budget=memory_budget)
+    self._number_of_spilled_values = 0
+    self._values = []
+
+  def __iter__(self):
+    """Retrieves the values.
+
+    Yields:
+      object: value.
+    """
+    for value in list(self._values):
+      yield value
+
+    spill_offset = 0
+    for _ in range(self._number_of_spilled_values):
+      value, spill_offset = self._ReadSpilledValue(spill_offset)
+      yield value
+
+  def __len__(self):
+    """Retrieves the number of values.
+
+    Returns:
+      int: number of values.
+    """
+    return len(self._values) + self._number_of_spilled_values
+
+  def append(self, value):  # pylint: disable=invalid-name
+    """Appends a value.
+
+    Args:
+      value (object): value.
+    """
+    if not self._spill_file and self._AllocateValue(value) is not None:
+      self._values.append(value)
+    else:
+      self._WriteSpilledValue(value)
+      self._number_of_spilled_values += 1
+
+  def Close(self):
+    """Removes the values and releases the budget and the temporary file."""
+    super(SpillableList, self).Close()
+    self._number_of_spilled_values = 0
+    self._values = []
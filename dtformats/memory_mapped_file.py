@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""Memory mapped file-like object."""
+
+from __future__ import unicode_literals
+
+import mmap
+import os
+
+
+class MemoryMappedFile(object):
+  """Memory mapped file-like object.
+
+  The file-like object provides read-only access to the data of a file that
+  is mapped into memory. Data can be read as bytes, using read(), or without
+  copying as memoryview, using GetView().
+  """
+
+  def __init__(self, file_object):
+    """Initializes a memory mapped file-like object.
+
+    Args:
+      file_object (file): file-like object of the file to map into memory.
+          The file-like object must be backed by a file descriptor and is
+          not closed by the memory mapped file-like object.
+
+    Raises:
+      IOError: if the file-like object cannot be mapped into memory.
+      OSError: if the file-like object cannot be mapped into memory.
+      ValueError: if the file-like object cannot be mapped into memory, such
+          as an empty file.
+    """
+    file_descriptor = file_object.fileno()
+
+    super(MemoryMappedFile, self).__init__()
+    self._current_offset = 0
+    self._mmap = mmap.mmap(file_descriptor, 0, access=mmap.ACCESS_READ)
+    self._size = len(self._mmap)
+    self._view = memoryview(self._mmap)
+
+  # The following methods are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def close(self):
+    """Closes the file-like object.
+
+    If views of the data are still in use the memory map is released when
+    the last view is no longer referenced.
+    """
+    if self._mmap is not None:
+      self._view.release()
+      self._view = None
+
+      try:
+        self._mmap.close()
+      except BufferError:
+        pass
+
+      self._mmap = None
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object at the current offset.
+
+    The function will read a byte string of the specified size or
+    all of the remaining data if no size was specified.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None is all
+          remaining data.
+
+    Returns:
+      bytes: data read.
+
+    Raises:
+      IOError: if the read failed.
+      OSError: if the read failed.
+    """
+    if self._mmap is None:
+      raise IOError('Not opened.')
+
+    if self._current_offset >= self._size:
+      return b''
+
+    if size is None or size < 0:
+      size = self._size - self._current_offset
+
+    end_offset = self._current_offset + size
+    data = self._mmap[self._current_offset:end_offset]
+
+    self._current_offset += len(data)
+
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks to an offset within the file-like object.
+
+    Args:
+      offset (int): offset to seek to.
+      whence (Optional(int)): value that indicates whether offset is an absolute
+          or relative position within the file.
+
+    Raises:
+      IOError: if the seek failed.
+      OSError: if the seek failed.
+    """
+    if self._mmap is None:
+      raise IOError('Not opened.')
+
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._size
+    elif whence != os.SEEK_SET:
+      raise IOError('Unsupported whence.')
+
+    if offset < 0:
+      raise IOError('Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def get_offset(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: offset.
+    """
+    return self._current_offset
+
+  # Pythonesque alias for get_offset().
+  def tell(self):
+    """Retrieves the current offset into the file-like object.
+
+    Returns:
+      int: offset.
+    """
+    return self.get_offset()
+
+  def get_size(self):
+    """Retrieves the size of the file-like object.
+
+    Returns:
+      int: size.
+    """
+    return self._size
+
+  def seekable(self):
+    """Determines if a file-like object is seekable.
+
+    Returns:
+      bool: True if seekable.
+    """
+    return True
+
+  # pylint: enable=invalid-name
+
+  def GetView(self, offset, size):
+    """Retrieves a view of the data without copying it.
+
+    Note that the view can be smaller than the requested size if the data
+    exceeds the end of the file.
+
+    Args:
+      offset (int): offset of the data relative to the start of the file.
+      size (int): size of the data.
+
+    Returns:
+      memoryview: view of the data.
+
+    Raises:
+      IOError: if the file-like object is not opened.
+      OSError: if the file-like object is not opened.
+    """
+    if self._mmap is None:
+      raise IOError('Not opened.')
+
+    return self._view[offset:offset + size]
@@ -1,10 +1,17 @@
 # -*- coding: utf-8 -*-
-"""Output writer."""
+"""Output writers."""
 
 from __future__ import print_function
 from __future__ import unicode_literals
 
 import abc
+import binascii
+import json
+import struct
+import sys
+
+from dtformats import py2to3
+from dtformats import timestamps
 
 
 class OutputWriter(object):
@@ -35,6 +42,26 @@ class OutputWriter(object):
     """
 
 
+class StderrWriter(OutputWriter):
+  """Stderr output writer."""
+
+  def Close(self):
+    """Closes the output writer object."""
+    return
+
+  def Open(self):
+    """Opens the output writer object."""
+    return
+
+  def WriteText(self, text):
+    """Writes text to the output.
+
+    Args:
+      text (str): text to write.
+    """
+    print(text, end='', file=sys.stderr)
+
+
 class StdoutWriter(OutputWriter):
   """Stdout output writer."""
 
@@ -53,3 +80,521 @@ class StdoutWriter(OutputWriter):
       text (str): text to write.
     """
     print(text, end='')
+
+
+class BufferedRecordWriter(object):
+  """Buffered record output writer.
+
+  Records are formatted per batch and the formatted data is buffered in
+  memory until the buffer exceeds the flush size, such that the output is
+  written in large blocks.
+
+  A record is either a dictionary or an object, of which the public
+  attributes are written. Timestamps are converted into date and time strings
+  per batch, if their timestamp types are specified.
+  """
+
+  DEFAULT_BATCH_SIZE = 1024
+
+  DEFAULT_FLUSH_SIZE = 1024 * 1024
+
+  def __init__(
+      self, path=None, batch_size=DEFAULT_BATCH_SIZE,
+      flush_size=DEFAULT_FLUSH_SIZE, timestamp_types=None):
+    """Initializes a buffered record output writer.
+
+    Args:
+      path (Optional[str]): path of the output file, where None represents
+          stdout.
+      batch_size (Optional[int]): maximum number of records to format at once.
+      flush_size (Optional[int]): size of the formatted data, in bytes, from
+          which the buffer is written to the output.
+      timestamp_types (Optional[dict[str, str]]): timestamp types per name of
+          the record values that contain a timestamp, such as
+          RECORD_TIMESTAMP_TYPES of a binary data file, where None represents
+          that timestamps are written as-is.
+
+    Raises:
+      ValueError: if the batch size or flush size is not supported.
+    """
+    if batch_size < 1:
+      raise ValueError('Unsupported batch size: {0:d}.'.format(batch_size))
+
+    if flush_size < 0:
+      raise ValueError('Unsupported flush size: {0:d}.'.format(flush_size))
+
+    super(BufferedRecordWriter, self).__init__()
+    self._batch_size = batch_size
+    self._buffer = []
+    self._buffer_size = 0
+    self._file_object = None
+    self._file_object_opened_in_object = False
+    self._flush_size = flush_size
+    self._path = path
+    self._records = []
+    self._timestamp_types = timestamp_types
+
+  def _FormatBufferedRecords(self):
+    """Formats the buffered records into the buffer."""
+    if self._records:
+      if self._timestamp_types:
+        self._records = [
+            dict(GetRecordValues(record)) for record in self._records]
+        timestamps.CopyRecordTimestampsToDateTimeStrings(
+            self._records, self._timestamp_types)
+
+      data = self._FormatRecords(self._records)
+      self._records = []
+
+      self._buffer.append(data)
+      self._buffer_size += len(data)
+
+  @abc.abstractmethod
+  def _FormatRecords(self, records):
+    """Formats records.
+
+    Args:
+      records (list[object]): records.
+
+    Returns:
+      bytes: formatted records.
+    """
+
+  def _FormatValueAsString(self, value):
+    """Formats a value as a string.
+
+    Byte strings are formatted in hexadecimal and composite values, such as
+    lists and dictionaries, in JSON.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      str: formatted value.
+    """
+    if value is None:
+      return ''
+
+    if isinstance(value, py2to3.STRING_TYPES) and not isinstance(
+        value, py2to3.BYTES_TYPE):
+      return value
+
+    if isinstance(value, (dict, list, set, tuple)):
+      return json.dumps(self._GetJSONValue(value), sort_keys=True)
+
+    return '{0!s}'.format(self._GetJSONValue(value))
+
+  def _GetJSONValue(self, value):
+    """Retrieves a JSON serializable representation of a value.
+
+    Args:
+      value (object): value.
+
+    Returns:
+      object: JSON serializable representation of the value.
+    """
+    if value is None or isinstance(value, (bool, float)):
+      return value
+
+    if isinstance(value, py2to3.INTEGER_TYPES):
+      return value
+
+    if isinstance(value, py2to3.BYTES_TYPE):
+      return binascii.hexlify(value).decode('ascii')
+
+    if isinstance(value, py2to3.STRING_TYPES):
+      return value
+
+    if isinstance(value, dict):
+      return {
+          '{0!s}'.format(key): self._GetJSONValue(dict_value)
+          for key, dict_value in value.items()}
+
+    if isinstance(value, (list, set, tuple)):
+      return [self._GetJSONValue(element) for element in value]
+
+    return '{0!s}'.format(value)
+
+  def _WriteBuffer(self):
+    """Writes the buffered data to the output."""
+    if self._buffer:
+      self._file_object.write(b''.join(self._buffer))
+      self._buffer = []
+      self._buffer_size = 0
+
+  def _WriteHeader(self):
+    """Writes the file header, if any, to the output."""
+    return
+
+  def Close(self):
+    """Closes the output writer object.
+
+    Raises:
+      IOError: if the output writer is not opened.
+    """
+    if not self._file_object:
+      raise IOError('Output writer not opened.')
+
+    self.Flush()
+
+    if self._file_object_opened_in_object:
+      self._file_object.close()
+
+    self._file_object = None
+    self._file_object_opened_in_object = False
+
+  def Flush(self):
+    """Writes the buffered records to the output.
+
+    Raises:
+      IOError: if the output writer is not opened.
+    """
+    if not self._file_object:
+      raise IOError('Output writer not opened.')
+
+    self._FormatBufferedRecords()
+    self._WriteBuffer()
+    self._file_object.flush()
+
+  def Open(self):
+    """Opens the output writer object.
+
+    Raises:
+      IOError: if the output writer is already opened or cannot be opened.
+    """
+    if self._file_object:
+      raise IOError('Output writer already opened.')
+
+    if self._path:
+      self._file_object = open(self._path, 'wb')
+      self._file_object_opened_in_object = True
+    else:
+      # Note that sys.stdout only has a binary buffer in Python 3.
+      self._file_object = getattr(sys.stdout, 'buffer', sys.stdout)
+
+    self._WriteHeader()
+
+  def WriteRecord(self, record):
+    """Writes a record.
+
+    Args:
+      record (dict[str, object]|object): record.
+    """
+    self._records.append(record)
+    if len(self._records) >= self._batch_size:
+      self._FormatBufferedRecords()
+      if self._buffer_size >= self._flush_size:
+        self._WriteBuffer()
+
+  def WriteRecords(self, records):
+    """Writes a batch of records.
+
+    Args:
+      records (iterable[dict[str, object]|object]): records.
+    """
+    for record in records:
+      self._records.append(record)
+      if len(self._records) >= self._batch_size:
+        self._FormatBufferedRecords()
+        if self._buffer_size >= self._flush_size:
+          self._WriteBuffer()
+
+
+class ColumnarRecordWriter(BufferedRecordWriter):
+  """Binary columnar record output writer.
+
+  The output consists of a file header followed by a block per batch of
+  records. The file header consists of an 8-byte signature "dtcolumn"
+  followed by a 32-bit format version. All integers are stored in
+  little-endian.
+
+  A block consists of the 32-bit number of records and the 32-bit number
+  of columns followed by the columns. A column consists of:
+  * 16-bit size of the name, followed by the UTF-8 encoded name;
+  * 8-bit value type, see VALUE_TYPE_*;
+  * bitmap, of 1 bit per record, that indicates which records have a value;
+  * the values of the records that have a value, where integers are stored
+    as 64-bit signed integers, floating-points as 64-bit IEEE 754, booleans
+    as 8-bit integers and binary data and strings as an array of 32-bit sizes
+    followed by the data. Strings are UTF-8 encoded.
+  """
+
+  FORMAT_VERSION = 1
+
+  SIGNATURE = b'dtcolumn'
+
+  VALUE_TYPE_NONE = 0
+  VALUE_TYPE_INTEGER = 1
+  VALUE_TYPE_FLOATING_POINT = 2
+  VALUE_TYPE_BOOLEAN = 3
+  VALUE_TYPE_BINARY_DATA = 4
+  VALUE_TYPE_STRING = 5
+
+  _INT64_MAXIMUM = (1 << 63) - 1
+  _INT64_MINIMUM = -(1 << 63)
+
+  def _FormatColumn(self, name, values):
+    """Formats a column.
+
+    Args:
+      name (str): name of the column.
+      values (list[object]): values of the column per record, where None
+          represents a record without value.
+
+    Returns:
+      bytes: formatted column.
+    """
+    bitmap = bytearray((len(values) + 7) // 8)
+    present_values = []
+    for index, value in enumerate(values):
+      if value is not None:
+        bitmap[index // 8] |= 1 << (index % 8)
+        present_values.append(value)
+
+    value_type = self._GetColumnValueType(present_values)
+
+    encoded_name = name.encode('utf-8')
+    column_data = [
+        struct.pack('<H', len(encoded_name)), encoded_name,
+        struct.pack('<B', value_type), bytes(bitmap)]
+
+    number_of_values = len(present_values)
+    if value_type == self.VALUE_TYPE_INTEGER:
+      column_data.append(struct.pack(
+          '<{0:d}q'.format(number_of_values), *present_values))
+
+    elif value_type == self.VALUE_TYPE_FLOATING_POINT:
+      column_data.append(struct.pack(
+          '<{0:d}d'.format(number_of_values), *present_values))
+
+    elif value_type == self.VALUE_TYPE_BOOLEAN:
+      column_data.append(struct.pack(
+          '<{0:d}B'.format(number_of_values), *present_values))
+
+    elif value_type in (self.VALUE_TYPE_BINARY_DATA, self.VALUE_TYPE_STRING):
+      if value_type == self.VALUE_TYPE_STRING:
+        present_values = [
+            self._FormatValueAsString(value).encode('utf-8')
+            for value in present_values]
+
+      column_data.append(struct.pack(
+          '<{0:d}I'.format(number_of_values),
+          *[len(value) for value in present_values]))
+      column_data.extend(present_values)
+
+    return b''.join(column_data)
+
+  def _FormatRecords(self, records):
+    """Formats records.
+
+    Args:
+      records (list[object]): records.
+
+    Returns:
+      bytes: formatted records.
+    """
+    column_names = []
+    columns = {}
+    for index, record in enumerate(records):
+      for name, value in GetRecordValues(record):
+        column = columns.get(name, None)
+        if column is None:
+          column = [None] * len(records)
+          column_names.append(name)
+          columns[name] = column
+
+        column[index] = value
+
+    block_data = [struct.pack('<II', len(records), len(column_names))]
+    for name in column_names:
+      block_data.append(self._FormatColumn(name, columns[name]))
+
+    return b''.join(block_data)
+
+  def _GetColumnValueType(self, values):
+    """Determines the value type of a column.
+
+    Args:
+      values (list[object]): values of the column, without None values.
+
+    Returns:
+      int: value type of the column.
+    """
+    if not values:
+      return self.VALUE_TYPE_NONE
+
+    if all(isinstance(value, bool) for value in values):
+      return self.VALUE_TYPE_BOOLEAN
+
+    if all(
+        isinstance(value, py2to3.INTEGER_TYPES) and
+        not isinstance(value, bool) for value in values):
+      if all(
+          self._INT64_MINIMUM <= value <= self._INT64_MAXIMUM
+          for value in values):
+        return self.VALUE_TYPE_INTEGER
+
+      return self.VALUE_TYPE_STRING
+
+    if all(
+        isinstance(value, py2to3.INTEGER_TYPES + (float, )) and
+        not isinstance(value, bool) for value in values):
+      return self.VALUE_TYPE_FLOATING_POINT
+
+    if all(isinstance(value, py2to3.BYTES_TYPE) for value in values):
+      return self.VALUE_TYPE_BINARY_DATA
+
+    return self.VALUE_TYPE_STRING
+
+  def _WriteHeader(self):
+    """Writes the file header to the output."""
+    self._file_object.write(
+        self.SIGNATURE + struct.pack('<I', self.FORMAT_VERSION))
+
+
+class CSVRecordWriter(BufferedRecordWriter):
+  """Comma-separated values (CSV) record output writer.
+
+  The columns are determined by the first record, unless specified. Values
+  that contain a separator, quote or line break are quoted, as defined by
+  RFC 4180.
+  """
+
+  def __init__(self, field_names=None, **kwargs):
+    """Initializes a CSV record output writer.
+
+    Args:
+      field_names (Optional[list[str]]): names of the fields to write as
+          columns, where None represents the fields of the first record.
+      kwargs (dict[str, object]): keyword arguments of the buffered record
+          output writer.
+    """
+    super(CSVRecordWriter, self).__init__(**kwargs)
+    self._field_names = field_names
+
+  def _FormatRecords(self, records):
+    """Formats records.
+
+    Args:
+      records (list[object]): records.
+
+    Returns:
+      bytes: formatted records.
+    """
+    lines = []
+    if self._field_names is None:
+      self._field_names = [
+          name for name, _ in GetRecordValues(records[0])]
+      lines.append(self._FormatRow(self._field_names))
+
+    for record in records:
+      record_values = dict(GetRecordValues(record))
+      lines.append(self._FormatRow([
+          self._FormatValueAsString(record_values.get(name, None))
+          for name in self._field_names]))
+
+    return ''.join(lines).encode('utf-8')
+
+  def _FormatRow(self, values):
+    """Formats a row.
+
+    Args:
+      values (list[str]): values of the row.
+
+    Returns:
+      str: formatted row, including the line terminator.
+    """
+    formatted_values = []
+    for value in values:
+      if '"' in value:
+        value = '"{0:s}"'.format(value.replace('"', '""'))
+      elif ',' in value or '\n' in value or '\r' in value:
+        value = '"{0:s}"'.format(value)
+
+      formatted_values.append(value)
+
+    return '{0:s}\r\n'.format(','.join(formatted_values))
+
+  def _WriteHeader(self):
+    """Writes the column names, if specified, to the output."""
+    if self._field_names is not None:
+      self._file_object.write(
+          self._FormatRow(self._field_names).encode('utf-8'))
+
+
+class JSONLinesRecordWriter(BufferedRecordWriter):
+  """JSON Lines record output writer.
+
+  Every record is written as a JSON object on a separate line. Byte strings
+  are written in hexadecimal.
+  """
+
+  def _FormatRecords(self, records):
+    """Formats records.
+
+    Args:
+      records (list[object]): records.
+
+    Returns:
+      bytes: formatted records.
+    """
+    lines = []
+    for record in records:
+      json_dict = {
+          '{0!s}'.format(name): self._GetJSONValue(value)
+          for name, value in GetRecordValues(record)}
+      lines.append(json.dumps(json_dict, sort_keys=True))
+      lines.append('\n')
+
+    return ''.join(lines).encode('utf-8')
+
+
+RECORD_WRITER_CLASSES = {
+    'columnar': ColumnarRecordWriter,
+    'csv': CSVRecordWriter,
+    'jsonl': JSONLinesRecordWriter}
+
+
+def CreateRecordWriter(output_format, path=None, **kwargs):
+  """Creates a buffered record output writer.
+
+  Args:
+    output_format (str): output format, such as "columnar", "csv" or "jsonl".
+    path (Optional[str]): path of the output file, where None represents
+        stdout.
+    kwargs (dict[str, object]): keyword arguments of the record output writer.
+
+  Returns:
+    BufferedRecordWriter: record output writer.
+
+  Raises:
+    ValueError: if the output format is not supported.
+  """
+  record_writer_class = RECORD_WRITER_CLASSES.get(output_format, None)
+  if not record_writer_class:
+    raise ValueError('Unsupported output format: {0!s}.'.format(
+        output_format))
+
+  return record_writer_class(path=path, **kwargs)
+
+
+def GetRecordValues(record):
+  """Retrieves the values of a record.
+
+  Args:
+    record (dict[str, object]|object): record, which is either a dictionary
+        or an object of which the public attributes are the values.
+
+  Returns:
+    list[tuple[str, object]]: names and values of the record.
+  """
+  if isinstance(record, dict):
+    return list(record.items())
+
+  attribute_names = getattr(record, '__slots__', None)
+  if attribute_names is None:
+    return [
+        (name, value) for name, value in vars(record).items()
+        if not name.startswith('_')]
+
+  return [(name, getattr(record, name, None)) for name in attribute_names]
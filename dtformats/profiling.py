@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Profiling of the reads of data and structures by the binary data formats."""
+
+from __future__ import unicode_literals
+
+import threading
+import timeit
+
+
+class ReadStatistics(object):
+  """Statistics of the reads of data or a structure.
+
+  Attributes:
+    data_type (str): name of the data type of the structure or None if
+        the statistics are of reads of data.
+    description (str): description of the data or structure.
+    mapping_time (float): time spent mapping the structure, in seconds.
+    number_of_bytes (int): number of bytes read or mapped.
+    number_of_calls (int): number of reads.
+    number_of_retries (int): number of times more data had to be read to
+        map a variable-size structure.
+  """
+
+  def __init__(self, data_type, description):
+    """Initializes read statistics.
+
+    Args:
+      data_type (str): name of the data type of the structure or None if
+          the statistics are of reads of data.
+      description (str): description of the data or structure.
+    """
+    super(ReadStatistics, self).__init__()
+    self.data_type = data_type
+    self.description = description
+    self.mapping_time = 0.0
+    self.number_of_bytes = 0
+    self.number_of_calls = 0
+    self.number_of_retries = 0
+
+
+class ReadProfiler(object):
+  """Profiler of the reads of data and structures.
+
+  The statistics are kept per data type and description, such that it can be
+  determined which structures dominate the time needed to parse a file.
+  """
+
+  def __init__(self):
+    """Initializes a read profiler."""
+    super(ReadProfiler, self).__init__()
+    self._lock = threading.Lock()
+    self._statistics = {}
+
+  def AddRead(
+      self, data_type, description, number_of_bytes, mapping_time=0.0,
+      number_of_retries=0):
+    """Adds a read of data or a structure.
+
+    Args:
+      data_type (str): name of the data type of the structure or None if
+          data was read.
+      description (str): description of the data or structure.
+      number_of_bytes (int): number of bytes read or mapped.
+      mapping_time (Optional[float]): time spent mapping the structure, in
+          seconds.
+      number_of_retries (Optional[int]): number of times more data had to be
+          read to map a variable-size structure.
+    """
+    lookup_key = (data_type or '', description)
+
+    with self._lock:
+      statistics = self._statistics.get(lookup_key, None)
+      if not statistics:
+        statistics = ReadStatistics(data_type, description)
+        self._statistics[lookup_key] = statistics
+
+      statistics.mapping_time += mapping_time
+      statistics.number_of_bytes += number_of_bytes
+      statistics.number_of_calls += 1
+      statistics.number_of_retries += number_of_retries
+
+  def GetStatistics(self):
+    """Retrieves the read statistics.
+
+    Returns:
+      list[ReadStatistics]: read statistics, sorted by mapping time and
+          number of calls, with the largest first.
+    """
+    with self._lock:
+      statistics = list(self._statistics.values())
+
+    return sorted(statistics, key=lambda statistics: (
+        -statistics.mapping_time, -statistics.number_of_calls,
+        statistics.data_type or '', statistics.description))
+
+  @staticmethod
+  def GetTime():
+    """Retrieves the current time of the most precise clock available.
+
+    Returns:
+      float: current time in seconds.
+    """
+    return timeit.default_timer()
+
+  def Reset(self):
+    """Removes all the read statistics."""
+    with self._lock:
+      self._statistics = {}
+
+  def WriteStatistics(self, output_writer):
+    """Writes the read statistics.
+
+    Args:
+      output_writer (OutputWriter): output writer.
+    """
+    output_writer.WriteText('Read statistics:\n')
+    output_writer.WriteText(
+        '{0:s}\t{1:s}\t{2:s}\t{3:s}\t{4:s}\t{5:s}\n'.format(
+            'Data type', 'Description', 'Calls', 'Bytes', 'Mapping time (s)',
+            'Retries'))
+
+    for statistics in self.GetStatistics():
+      output_writer.WriteText(
+          '{0:s}\t{1:s}\t{2:d}\t{3:d}\t{4:.6f}\t{5:d}\n'.format(
+              statistics.data_type or '-', statistics.description,
+              statistics.number_of_calls, statistics.number_of_bytes,
+              statistics.mapping_time, statistics.number_of_retries))
+
+    output_writer.WriteText('\n')
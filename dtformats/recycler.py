@@ -3,8 +3,32 @@
 
 from __future__ import unicode_literals
 
+import os
+
 from dtformats import data_format
 from dtformats import errors
+from dtformats import timestamps
+
+
+class RecyclerInfo2FileEntry(object):
+  """Windows Recycler INFO2 file entry.
+
+  Attributes:
+    deletion_time (int): FILETIME timestamp of the deletion.
+    drive_number (int): drive number.
+    index (int): index of the deleted file.
+    original_file_size (int): original size of the deleted file.
+    original_filename (str): original filename of the deleted file.
+  """
+
+  def __init__(self):
+    """Initializes a Windows Recycler INFO2 file entry."""
+    super(RecyclerInfo2FileEntry, self).__init__()
+    self.deletion_time = None
+    self.drive_number = None
+    self.index = None
+    self.original_file_size = None
+    self.original_filename = None
 
 
 class RecyclerInfo2File(data_format.BinaryDataFile):
@@ -12,6 +36,9 @@ class RecyclerInfo2File(data_format.BinaryDataFile):
 
   _DEFINITION_FILE = 'recycler.yaml'
 
+  RECORD_TIMESTAMP_TYPES = {
+      'deletion_time': timestamps.TIMESTAMP_TYPE_FILETIME}
+
   _DEBUG_INFO_FILE_ENTRY = [
       ('original_filename', 'Original filename (ANSI)', '_FormatANSIString'),
       ('index', 'Index', '_FormatIntegerAsDecimal'),
@@ -66,6 +93,9 @@ class RecyclerInfo2File(data_format.BinaryDataFile):
     Args:
       file_object (file): file-like object.
 
+    Returns:
+      RecyclerInfo2FileEntry: file entry.
+
     Raises:
       ParseError: if the file entry cannot be read.
     """
@@ -87,6 +117,14 @@ class RecyclerInfo2File(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintStructureObject(file_entry, self._DEBUG_INFO_FILE_ENTRY)
 
+    recycler_file_entry = RecyclerInfo2FileEntry()
+    recycler_file_entry.deletion_time = file_entry.deletion_time
+    recycler_file_entry.drive_number = file_entry.drive_number
+    recycler_file_entry.index = file_entry.index
+    recycler_file_entry.original_file_size = file_entry.original_file_size
+    recycler_file_entry.original_filename = self._FormatANSIString(
+        file_entry.original_filename)
+
     if self._file_entry_data_size > 280:
       file_offset += 280
 
@@ -104,9 +142,13 @@ class RecyclerInfo2File(data_format.BinaryDataFile):
       if self._debug:
         self._DebugPrintValue('Original filename (Unicode)', original_filename)
 
+      recycler_file_entry.original_filename = original_filename
+
     if self._debug:
       self._DebugPrintText('\n')
 
+    return recycler_file_entry
+
   def _ReadFileHeader(self, file_object):
     """Reads the file header.
 
@@ -130,20 +172,40 @@ class RecyclerInfo2File(data_format.BinaryDataFile):
 
     self._file_entry_data_size = file_header.file_entry_size
 
-  def ReadFileObject(self, file_object):
-    """Reads a Windows Recycler INFO2 file-like object.
+  def _ReadRecords(self, file_object):
+    """Reads the file entries.
 
     Args:
       file_object (file): file-like object.
 
+    Yields:
+      RecyclerInfo2FileEntry: file entry.
+
     Raises:
-      ParseError: if the file cannot be read.
+      ParseError: if a file entry cannot be read.
     """
     self._ReadFileHeader(file_object)
 
     file_offset = file_object.tell()
 
     while file_offset < self._file_size:
-      self._ReadFileEntry(file_object)
+      file_object.seek(file_offset, os.SEEK_SET)
+
+      yield self._ReadFileEntry(file_object)
 
       file_offset += self._file_entry_data_size
+
+  def ReadFileObject(self, file_object):
+    """Reads a Windows Recycler INFO2 file-like object.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file cannot be read.
+    """
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
+    else:
+      self._ReadFileHeader(file_object)
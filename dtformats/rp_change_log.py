@@ -3,10 +3,13 @@
 
 from __future__ import unicode_literals
 
+import os
+
 from dtfabric.runtime import data_maps as dtfabric_data_maps
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
 
 
 class ChangeLogEntry(object):
@@ -40,6 +43,8 @@ class RestorePointChangeLogFile(data_format.BinaryDataFile):
 
   _RECORD_SIGNATURE = 0xabcdef12
 
+  SIGNATURES = [(8, b'\x12\xef\xcd\xab')]
+
   # TODO: implement an item based lookup.
   LOG_ENTRY_FLAGS = {
       0x00000001: 'CHANGE_LOG_ENTRYFLAGS_TEMPPATH',
@@ -82,7 +87,6 @@ class RestorePointChangeLogFile(data_format.BinaryDataFile):
     """
     super(RestorePointChangeLogFile, self).__init__(
         debug=debug, output_writer=output_writer)
-    self.entries = []
     self.volume_path = None
 
   def _DebugPrintChangeLogEntryRecord(self, change_log_entry_record):
@@ -164,21 +168,6 @@ class RestorePointChangeLogFile(data_format.BinaryDataFile):
         record_header.record_type, record_type_string or 'UNKNOWN')
     self._DebugPrintValue('Record type', value_string)
 
-  def _ReadChangeLogEntries(self, file_object):
-    """Reads the change log entries.
-
-    Args:
-      file_object (file): file-like object.
-    """
-    self.entries = []
-
-    file_offset = file_object.tell()
-    while file_offset < self._file_size:
-      change_log_entry = self._ReadChangeLogEntry(file_object)
-      file_offset = file_object.tell()
-
-      self.entries.append(change_log_entry)
-
   def _ReadChangeLogEntry(self, file_object):
     """Reads a change log entry.
 
@@ -444,6 +433,29 @@ class RestorePointChangeLogFile(data_format.BinaryDataFile):
       raise errors.ParseError('Unsupported record type: {0:d}'.format(
           volume_path_record.record_type))
 
+  def _ReadRecords(self, file_object):
+    """Reads the change log entries.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      ChangeLogEntry: change log entry.
+
+    Raises:
+      ParseError: if a change log entry cannot be read.
+    """
+    self._ReadFileHeader(file_object)
+
+    file_offset = file_object.tell()
+    while file_offset < self._file_size:
+      file_object.seek(file_offset, os.SEEK_SET)
+
+      change_log_entry = self._ReadChangeLogEntry(file_object)
+      file_offset = file_object.tell()
+
+      yield change_log_entry
+
   def ReadFileObject(self, file_object):
     """Reads a Windows Restore Point change.log file-like object.
 
@@ -453,5 +465,12 @@ class RestorePointChangeLogFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file cannot be read.
     """
-    self._ReadFileHeader(file_object)
-    self._ReadChangeLogEntries(file_object)
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
+    else:
+      self._ReadFileHeader(file_object)
+
+
+format_registry.FormatRegistry.RegisterFormat(
+    'rp_change_log', RestorePointChangeLogFile)
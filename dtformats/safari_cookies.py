@@ -9,6 +9,34 @@ from dtfabric.runtime import data_maps as dtfabric_data_maps
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
+
+
+class BinaryCookieRecord(object):
+  """Safari binary cookie record.
+
+  Attributes:
+    creation_time (float): number of seconds since January 1, 2001 00:00:00
+        UTC the cookie was created.
+    expiration_time (float): number of seconds since January 1, 2001 00:00:00
+        UTC the cookie expires.
+    flags (int): flags.
+    name (str): name of the cookie.
+    path (str): path of the cookie.
+    url (str): URL of the cookie.
+    value (str): value of the cookie.
+  """
+
+  def __init__(self):
+    """Initializes a Safari binary cookie record."""
+    super(BinaryCookieRecord, self).__init__()
+    self.creation_time = None
+    self.expiration_time = None
+    self.flags = None
+    self.name = None
+    self.path = None
+    self.url = None
+    self.value = None
 
 
 class BinaryCookiesFile(data_format.BinaryDataFile):
@@ -18,6 +46,8 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
 
   _SIGNATURE = b'cook'
 
+  SIGNATURES = [(0, _SIGNATURE)]
+
   def __init__(self, debug=False, output_writer=None):
     """Initializes a Safari Cookies (Cookies.binarycookies) file.
 
@@ -202,6 +232,9 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
           the file-like object.
       page_size (int): page size.
 
+    Returns:
+      list[BinaryCookieRecord]: records of the page.
+
     Raises:
       ParseError: if the page cannot be read.
     """
@@ -244,8 +277,9 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
       if self._debug:
         self._DebugPrintText('\n')
 
-    for record_offset in iter(record_offsets):
-      self._ReadRecord(page_data, record_offset)
+    return [
+        self._ReadRecord(page_data, record_offset)
+        for record_offset in record_offsets]
 
   def _ReadPages(self, file_object):
     """Reads the pages.
@@ -266,6 +300,9 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
       record_offset (int): offset of the record relative to the start
           of the page.
 
+    Returns:
+      BinaryCookieRecord: record.
+
     Raises:
       ParseError: if the record cannot be read.
     """
@@ -289,6 +326,11 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintRecordHeader(record_header)
 
+    cookie_record = BinaryCookieRecord()
+    cookie_record.creation_time = record_header.creation_time
+    cookie_record.expiration_time = record_header.expiration_time
+    cookie_record.flags = record_header.flags
+
     value_string = ''
     if record_header.url_offset:
       data_offset = record_offset + record_header.url_offset
@@ -297,6 +339,8 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintValue('URL', value_string)
 
+    cookie_record.url = value_string
+
     value_string = ''
     if record_header.name_offset:
       data_offset = record_offset + record_header.name_offset
@@ -305,6 +349,8 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintValue('Name', value_string)
 
+    cookie_record.name = value_string
+
     value_string = ''
     if record_header.path_offset:
       data_offset = record_offset + record_header.path_offset
@@ -313,6 +359,8 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintValue('Path', value_string)
 
+    cookie_record.path = value_string
+
     value_string = ''
     if record_header.value_offset:
       data_offset = record_offset + record_header.value_offset
@@ -321,15 +369,52 @@ class BinaryCookiesFile(data_format.BinaryDataFile):
     if self._debug:
       self._DebugPrintValue('Value', value_string)
 
+    cookie_record.value = value_string
+
     if self._debug:
       self._DebugPrintText('\n')
 
+    return cookie_record
+
+  def _ReadRecords(self, file_object):
+    """Reads the records.
+
+    The records are read per page, so that only the records of the current
+    page are kept in memory.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      BinaryCookieRecord: record.
+
+    Raises:
+      ParseError: if a record cannot be read.
+    """
+    self._ReadFileHeader(file_object)
+
+    file_offset = file_object.tell()
+    for page_size in iter(self._page_sizes):
+      for cookie_record in self._ReadPage(file_object, file_offset, page_size):
+        yield cookie_record
+
+      file_offset += page_size
+
   def ReadFileObject(self, file_object):
     """Reads a Safari Cookies (Cookies.binarycookies) file-like object.
 
     Args:
       file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file cannot be read.
     """
     self._ReadFileHeader(file_object)
-    self._ReadPages(file_object)
-    self._ReadFileFooter(file_object)
+
+    if self._debug:
+      self._ReadPages(file_object)
+      self._ReadFileFooter(file_object)
+
+
+format_registry.FormatRegistry.RegisterFormat(
+    'safari_cookies', BinaryCookiesFile)
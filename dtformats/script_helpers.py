@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Helper functions shared by the scripts."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from dtformats import data_format
+from dtformats import follow
+from dtformats import output_writers
+from dtformats import profiling
+
+
+def AddProfileOption(argument_parser):
+  """Adds the profile option to an argument parser.
+
+  Args:
+    argument_parser (argparse.ArgumentParser): argument parser.
+  """
+  argument_parser.add_argument(
+      '--profile', dest='profile', action='store_true', default=False,
+      help=(
+          'enable profiling of the reads of data and structures and write '
+          'the read statistics.'))
+
+
+def AddRecordOutputOptions(argument_parser, follow_mode=False):
+  """Adds the record output options to an argument parser.
+
+  Args:
+    argument_parser (argparse.ArgumentParser): argument parser.
+    follow_mode (Optional[bool]): True if the follow option should be added.
+  """
+  argument_parser.add_argument(
+      '--format', dest='output_format', action='store', metavar='FORMAT',
+      choices=sorted(output_writers.RECORD_WRITER_CLASSES.keys()),
+      default=None, help=(
+          'write the records in a structured output format, supported '
+          'formats are: columnar, csv and jsonl.'))
+
+  if follow_mode:
+    argument_parser.add_argument(
+        '--follow', dest='follow_state_file', action='store', metavar='PATH',
+        default=None, help=(
+            'path of the file that contains the follow state, in follow mode '
+            'only the records appended since the previous run are written '
+            'unless the file was truncated or rotated. Requires --format.'))
+
+  argument_parser.add_argument(
+      '-w', '--write', dest='output_file', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the file to write the records to, by default the records '
+          'are written to stdout.'))
+
+
+def CheckRecordOutputOptions(options):
+  """Checks the record output options.
+
+  Args:
+    options (argparse.Namespace): command line options.
+
+  Returns:
+    bool: True if the record output options are valid, False if not.
+  """
+  follow_state_file = getattr(options, 'follow_state_file', None)
+  if follow_state_file and not options.output_format:
+    print('Follow mode requires a structured output format.')
+    print('')
+    return False
+
+  return True
+
+
+def EnableProfiling(options):
+  """Enables profiling of the reads of data and structures if requested.
+
+  Args:
+    options (argparse.Namespace): command line options.
+
+  Returns:
+    ReadProfiler: read profiler or None if profiling is not enabled.
+  """
+  if not options.profile:
+    return None
+
+  profiler = profiling.ReadProfiler()
+  data_format.BinaryDataFormat.SetProfiler(profiler)
+  return profiler
+
+
+def OpenRecordWriter(output_format, path=None, timestamp_types=None):
+  """Creates and opens a buffered record output writer.
+
+  Args:
+    output_format (str): output format, such as "columnar", "csv" or "jsonl".
+    path (Optional[str]): path of the output file, where None represents
+        stdout.
+    timestamp_types (Optional[dict[str, str]]): timestamp types per name of
+        the record values.
+
+  Returns:
+    BufferedRecordWriter: record output writer or None if the record output
+        writer could not be opened.
+  """
+  record_writer = output_writers.CreateRecordWriter(
+      output_format, path=path, timestamp_types=timestamp_types)
+
+  try:
+    record_writer.Open()
+  except IOError as exception:
+    print('Unable to open record writer with error: {0!s}'.format(exception))
+    print('')
+    return None
+
+  return record_writer
+
+
+def WriteRecords(
+    binary_data_file, source_path, output_format, path=None,
+    follow_state_file=None):
+  """Writes the records of a binary data file in a structured output format.
+
+  Args:
+    binary_data_file (BinaryDataFile): opened binary data file.
+    source_path (str): path of the binary data file, which identifies the
+        file in the follow state store.
+    output_format (str): output format, such as "columnar", "csv" or "jsonl".
+    path (Optional[str]): path of the output file, where None represents
+        stdout.
+    follow_state_file (Optional[str]): path of the file that contains the
+        follow state, where None represents that all records are written.
+
+  Returns:
+    bool: True if successful or False if the record output writer could not
+        be opened.
+  """
+  record_writer = OpenRecordWriter(
+      output_format, path=path,
+      timestamp_types=binary_data_file.RECORD_TIMESTAMP_TYPES)
+  if not record_writer:
+    return False
+
+  follow_state_store = None
+  if follow_state_file:
+    format_name = binary_data_file.__class__.__name__
+
+    follow_state_store = follow.FollowStateStore(follow_state_file)
+    follow_state_store.Read()
+    follow_state = follow_state_store.GetState(source_path, format_name)
+
+    records = binary_data_file.ReadAppendedRecords(follow_state)
+  else:
+    records = binary_data_file.ReadRecords()
+
+  try:
+    record_writer.WriteRecords(records)
+  finally:
+    record_writer.Close()
+
+  if follow_state_store:
+    follow_state_store.SetState(source_path, format_name, follow_state)
+    follow_state_store.Write()
+
+  return True
+
+
+def WriteStatistics(profiler, output_writer, output_format=None, path=None):
+  """Writes the read statistics of a read profiler.
+
+  The read statistics are written to stderr when the records are written to
+  stdout in a structured output format, such that the output remains valid.
+
+  Args:
+    profiler (ReadProfiler): read profiler or None if profiling is not
+        enabled.
+    output_writer (OutputWriter): output writer.
+    output_format (Optional[str]): structured output format of the records,
+        where None represents that no records are written.
+    path (Optional[str]): path of the output file of the records, where None
+        represents stdout.
+  """
+  if not profiler:
+    return
+
+  if output_format and not path:
+    output_writer = output_writers.StderrWriter()
+
+  profiler.WriteStatistics(output_writer)
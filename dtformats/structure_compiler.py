@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+"""Compiler of fixed-size dtFabric structure data type maps."""
+
+from __future__ import unicode_literals
+
+import keyword
+import struct
+import sys
+import threading
+import uuid
+import weakref
+
+from dtfabric import data_types as dtfabric_data_types
+from dtfabric import definitions as dtfabric_definitions
+from dtfabric import errors as dtfabric_errors
+from dtfabric.runtime import data_maps as dtfabric_data_maps
+
+
+class CompiledStructureValues(object):
+  """Base class of compiled structure values.
+
+  The attribute (or field) names are defined by __slots__ of the subclass,
+  which is generated by the structure compiler.
+  """
+
+  __slots__ = ()
+
+  def __init__(self, *args, **kwargs):
+    """Initializes structure values.
+
+    Args:
+      args (list[object]): values of the attributes in order of definition.
+      kwargs (dict[str, object]): values of the attributes by name.
+    """
+    super(CompiledStructureValues, self).__init__()
+    for index, attribute_name in enumerate(self.__slots__):
+      if index < len(args):
+        value = args[index]
+      else:
+        value = kwargs.get(attribute_name, None)
+
+      setattr(self, attribute_name, value)
+
+  def __repr__(self):
+    """Retrieves a string representation of the structure values.
+
+    Returns:
+      str: string representation of the structure values.
+    """
+    attributes = ', '.join([
+        '{0:s}={1!r}'.format(attribute_name, getattr(self, attribute_name))
+        for attribute_name in self.__slots__])
+    return '{0:s}({1:s})'.format(type(self).__name__, attributes)
+
+
+class CompiledStructureMap(object):
+  """Structure data type map backed by a precompiled Python struct.
+
+  Attributes:
+    byte_size (int): size of the structure in bytes.
+    name (str): name of the structure data type.
+  """
+
+  # Member value conversions.
+  _CONVERSION_NONE = 0
+  _CONVERSION_STRING = 1
+  _CONVERSION_TUPLE = 2
+  _CONVERSION_UUID_BIG_ENDIAN = 3
+  _CONVERSION_UUID_LITTLE_ENDIAN = 4
+
+  def __init__(
+      self, name, format_string, structure_values_class, conversions):
+    """Initializes a compiled structure map.
+
+    Args:
+      name (str): name of the structure data type.
+      format_string (str): Python struct format string, including the byte
+          order.
+      structure_values_class (type): structure values class.
+      conversions (list[tuple[int, object]]): value conversion and argument
+          of the conversion per member.
+    """
+    super(CompiledStructureMap, self).__init__()
+    self._conversions = conversions
+    self._has_conversions = bool([
+        conversion for conversion, _ in conversions
+        if conversion != self._CONVERSION_NONE])
+    self._struct = struct.Struct(format_string)
+    self._structure_values_class = structure_values_class
+    self.byte_size = self._struct.size
+    self.name = name
+
+  def _ConvertValues(self, struct_tuple):
+    """Converts the values read by Python struct into member values.
+
+    Args:
+      struct_tuple (tuple[object, ...]): values read by Python struct.
+
+    Returns:
+      list[object]: member values.
+
+    Raises:
+      ValueError: if a value cannot be converted.
+    """
+    values = []
+    struct_index = 0
+    for conversion, argument in self._conversions:
+      if conversion == self._CONVERSION_TUPLE:
+        next_struct_index = struct_index + argument
+        values.append(struct_tuple[struct_index:next_struct_index])
+        struct_index = next_struct_index
+        continue
+
+      value = struct_tuple[struct_index]
+      struct_index += 1
+
+      if conversion == self._CONVERSION_STRING:
+        value = value.decode(argument)
+
+      elif conversion == self._CONVERSION_UUID_BIG_ENDIAN:
+        value = uuid.UUID(bytes=value)
+
+      elif conversion == self._CONVERSION_UUID_LITTLE_ENDIAN:
+        value = uuid.UUID(bytes_le=value)
+
+      values.append(value)
+
+    return values
+
+  def CreateStructureValues(self, *args, **kwargs):
+    """Creates a structure values object.
+
+    Returns:
+      object: structure values.
+    """
+    return self._structure_values_class(*args, **kwargs)
+
+  def GetByteSize(self):
+    """Retrieves the byte size of the structure.
+
+    Returns:
+      int: data type size in bytes.
+    """
+    return self.byte_size
+
+  def GetSizeHint(self, **unused_kwargs):
+    """Retrieves a hint about the size.
+
+    Returns:
+      int: hint of the number of bytes needed from the byte stream.
+    """
+    return self.byte_size
+
+  def MapByteStream(
+      self, byte_stream, byte_offset=0, context=None, **unused_kwargs):
+    """Maps the structure on a byte stream.
+
+    Args:
+      byte_stream (bytes): byte stream.
+      byte_offset (Optional[int]): offset into the byte stream where to start.
+      context (Optional[dtfabric.DataTypeMapContext]): data type map context.
+
+    Returns:
+      object: structure values object.
+
+    Raises:
+      dtfabric.ByteStreamTooSmallError: if the byte stream is too small.
+      dtfabric.MappingError: if the structure cannot be mapped on the byte
+          stream.
+    """
+    byte_stream_size = len(byte_stream) - byte_offset
+    if byte_stream_size < self.byte_size:
+      raise dtfabric_errors.ByteStreamTooSmallError(
+          'Byte stream too small requested: {0:d} available: {1:d}'.format(
+              self.byte_size, byte_stream_size))
+
+    try:
+      struct_tuple = self._struct.unpack_from(byte_stream, byte_offset)
+      if self._has_conversions:
+        struct_tuple = self._ConvertValues(struct_tuple)
+
+      mapped_value = self._structure_values_class(*struct_tuple)
+
+    except Exception as exception:
+      raise dtfabric_errors.MappingError((
+          'Unable to read: {0:s} from byte stream at offset: {1:d} with '
+          'error: {2!s}').format(self.name, byte_offset, exception))
+
+    if context:
+      context.byte_size = self.byte_size
+
+    return mapped_value
+
+
+class StructureCompiler(object):
+  """Compiler of fixed-size structure data type maps.
+
+  A structure with a fixed size, such as a structure that consists of
+  integers, floating-points, UUIDs and fixed-size streams, strings and
+  sequences of integers, is compiled into a single Python struct. Structures
+  that cannot be compiled, such as structures with a variable size, nested
+  structures or with mixed byte orders, are mapped by dtFabric.
+  """
+
+  _BYTE_ORDER_STRINGS = {
+      dtfabric_definitions.BYTE_ORDER_BIG_ENDIAN: '>',
+      dtfabric_definitions.BYTE_ORDER_LITTLE_ENDIAN: '<',
+      dtfabric_definitions.BYTE_ORDER_NATIVE: '='}
+
+  if sys.byteorder == 'big':
+    _NATIVE_BYTE_ORDER = dtfabric_definitions.BYTE_ORDER_BIG_ENDIAN
+  else:
+    _NATIVE_BYTE_ORDER = dtfabric_definitions.BYTE_ORDER_LITTLE_ENDIAN
+
+  _FLOATING_POINT_FORMAT_STRINGS = {
+      4: 'f',
+      8: 'd'}
+
+  _INTEGER_FORMAT_STRINGS_SIGNED = {
+      1: 'b',
+      2: 'h',
+      4: 'i',
+      8: 'q'}
+
+  _INTEGER_FORMAT_STRINGS_UNSIGNED = {
+      1: 'B',
+      2: 'H',
+      4: 'I',
+      8: 'Q'}
+
+  _CLASS_TEMPLATE = '\n'.join([
+      'class {type_name:s}(CompiledStructureValues):',
+      '  __slots__ = ({slots:s})',
+      '',
+      '  def __init__(self, {init_arguments:s}):',
+      '{instance_attributes:s}',
+      ''])
+
+  # Compiled structure maps per data type map, where None indicates that
+  # the data type map cannot be compiled.
+  _compiled_maps = weakref.WeakKeyDictionary()
+
+  _lock = threading.Lock()
+
+  @classmethod
+  def _CompileStructure(cls, data_type_definition):
+    """Compiles a structure data type definition.
+
+    Args:
+      data_type_definition (dtfabric.StructureDefinition): structure data type
+          definition.
+
+    Returns:
+      CompiledStructureMap: compiled structure map or None if the structure
+          cannot be compiled.
+    """
+    members = getattr(data_type_definition, 'members', None)
+    if not members or data_type_definition.GetByteSize() is None:
+      return None
+
+    attribute_names = []
+    byte_orders = set()
+    conversions = []
+    format_strings = []
+
+    for member_definition in members:
+      attribute_name = member_definition.name
+      if isinstance(
+          member_definition, dtfabric_data_types.MemberDataTypeDefinition):
+        member_definition = member_definition.member_data_type_definition
+
+      byte_order = member_definition.byte_order
+      if byte_order == dtfabric_definitions.BYTE_ORDER_NATIVE:
+        byte_order = data_type_definition.byte_order
+
+      type_indicator = member_definition.TYPE_INDICATOR
+      byte_size = member_definition.GetByteSize()
+      if not byte_size:
+        return None
+
+      if type_indicator in (
+          dtfabric_definitions.TYPE_INDICATOR_FLOATING_POINT,
+          dtfabric_definitions.TYPE_INDICATOR_INTEGER):
+        format_string = cls._GetPrimitiveFormatString(member_definition)
+        conversion = (CompiledStructureMap._CONVERSION_NONE, None)
+        if byte_size > 1:
+          byte_orders.add(byte_order)
+
+      elif type_indicator == dtfabric_definitions.TYPE_INDICATOR_SEQUENCE:
+        # Note that dtFabric maps the elements of a sequence member without
+        # an explicit byte order in native byte order.
+        if member_definition.byte_order == (
+            dtfabric_definitions.BYTE_ORDER_NATIVE):
+          byte_order = cls._NATIVE_BYTE_ORDER
+
+        element_definition = member_definition.element_data_type_definition
+        element_byte_size = element_definition.GetByteSize()
+        if not element_byte_size or byte_size % element_byte_size:
+          return None
+
+        number_of_elements = byte_size // element_byte_size
+        format_string = cls._GetPrimitiveFormatString(element_definition)
+        if format_string:
+          format_string = '{0:d}{1:s}'.format(
+              number_of_elements, format_string)
+        conversion = (
+            CompiledStructureMap._CONVERSION_TUPLE, number_of_elements)
+        if element_byte_size > 1:
+          byte_orders.add(byte_order)
+
+      elif type_indicator == dtfabric_definitions.TYPE_INDICATOR_STREAM:
+        format_string = '{0:d}s'.format(byte_size)
+        conversion = (CompiledStructureMap._CONVERSION_NONE, None)
+
+      elif type_indicator == dtfabric_definitions.TYPE_INDICATOR_STRING:
+        # Note that dtFabric does not allow a fixed-size string to have
+        # an elements terminator.
+        format_string = '{0:d}s'.format(byte_size)
+        conversion = (
+            CompiledStructureMap._CONVERSION_STRING, member_definition.encoding)
+
+      elif type_indicator == dtfabric_definitions.TYPE_INDICATOR_UUID:
+        format_string = '16s'
+        if byte_order == dtfabric_definitions.BYTE_ORDER_BIG_ENDIAN:
+          conversion = (
+              CompiledStructureMap._CONVERSION_UUID_BIG_ENDIAN, None)
+        elif byte_order == dtfabric_definitions.BYTE_ORDER_LITTLE_ENDIAN:
+          conversion = (
+              CompiledStructureMap._CONVERSION_UUID_LITTLE_ENDIAN, None)
+        else:
+          return None
+
+      else:
+        return None
+
+      if not format_string:
+        return None
+
+      attribute_names.append(attribute_name)
+      conversions.append(conversion)
+      format_strings.append(format_string)
+
+    if len(byte_orders) > 1:
+      return None
+
+    if byte_orders:
+      byte_order = byte_orders.pop()
+    else:
+      byte_order = data_type_definition.byte_order
+
+    byte_order_string = cls._BYTE_ORDER_STRINGS.get(byte_order, None)
+    if not byte_order_string:
+      return None
+
+    format_string = ''.join([byte_order_string] + format_strings)
+    if struct.calcsize(format_string) != data_type_definition.GetByteSize():
+      return None
+
+    structure_values_class = cls._CreateStructureValuesClass(
+        data_type_definition.name, attribute_names)
+
+    return CompiledStructureMap(
+        data_type_definition.name, format_string, structure_values_class,
+        conversions)
+
+  @classmethod
+  def _CreateStructureValuesClass(cls, name, attribute_names):
+    """Creates a structure values class.
+
+    The __init__ method of the class is generated, similar to the structure
+    values classes of dtFabric, since setting the attributes by name is
+    significantly faster than setting them in a loop.
+
+    Args:
+      name (str): name of the structure data type.
+      attribute_names (list[str]): attribute names of the members.
+
+    Returns:
+      type: structure values class.
+    """
+    names = [name] + attribute_names
+    if not all(cls._IsIdentifier(value) for value in names):
+      return type(str(name), (CompiledStructureValues, ), {
+          '__slots__': tuple([str(value) for value in attribute_names])})
+
+    class_definition = cls._CLASS_TEMPLATE.format(
+        type_name=name,
+        slots=''.join([
+            '\'{0:s}\', '.format(value) for value in attribute_names]),
+        init_arguments=', '.join([
+            '{0:s}=None'.format(value) for value in attribute_names]),
+        instance_attributes='\n'.join([
+            '    self.{0:s} = {0:s}'.format(value)
+            for value in attribute_names]))
+
+    namespace = {'CompiledStructureValues': CompiledStructureValues}
+    exec(class_definition, namespace)  # pylint: disable=exec-used
+
+    return namespace[name]
+
+  @classmethod
+  def _GetPrimitiveFormatString(cls, data_type_definition):
+    """Retrieves the Python struct format string of a primitive data type.
+
+    Args:
+      data_type_definition (dtfabric.DataTypeDefinition): data type
+          definition.
+
+    Returns:
+      str: Python struct format string without byte order or None if
+          not supported.
+    """
+    type_indicator = data_type_definition.TYPE_INDICATOR
+    byte_size = data_type_definition.GetByteSize()
+
+    if type_indicator == dtfabric_definitions.TYPE_INDICATOR_FLOATING_POINT:
+      return cls._FLOATING_POINT_FORMAT_STRINGS.get(byte_size, None)
+
+    if type_indicator == dtfabric_definitions.TYPE_INDICATOR_INTEGER:
+      if data_type_definition.format == dtfabric_definitions.FORMAT_UNSIGNED:
+        return cls._INTEGER_FORMAT_STRINGS_UNSIGNED.get(byte_size, None)
+
+      return cls._INTEGER_FORMAT_STRINGS_SIGNED.get(byte_size, None)
+
+    return None
+
+  @classmethod
+  def _IsIdentifier(cls, string):
+    """Checks if a string contains an identifier that is not a keyword.
+
+    Args:
+      string (str): string to check.
+
+    Returns:
+      bool: True if the string contains an identifier, False otherwise.
+    """
+    return bool(
+        string and not string[0].isdigit() and
+        all(character.isalnum() or character == '_' for character in string)
+        and not keyword.iskeyword(string))
+
+  @classmethod
+  def GetCompiledMap(cls, data_type_map):
+    """Retrieves the compiled structure map of a data type map.
+
+    Args:
+      data_type_map (dtfabric.DataTypeMap): data type map.
+
+    Returns:
+      CompiledStructureMap: compiled structure map or None if the data type
+          map cannot be compiled.
+    """
+    if not isinstance(data_type_map, dtfabric_data_maps.StructureMap):
+      return None
+
+    try:
+      return cls._compiled_maps[data_type_map]
+    except KeyError:
+      pass
+
+    with cls._lock:
+      compiled_map = cls._compiled_maps.get(data_type_map, None)
+      if compiled_map is None:
+        # pylint: disable=protected-access
+        compiled_map = cls._CompileStructure(
+            data_type_map._data_type_definition)
+        cls._compiled_maps[data_type_map] = compiled_map
+
+    return compiled_map
@@ -3,8 +3,48 @@
 
 from __future__ import unicode_literals
 
+import hashlib
+
+try:
+  import lzma
+except ImportError:
+  try:
+    from backports import lzma
+  except ImportError:
+    lzma = None
+
+try:
+  import lz4.block
+except ImportError:
+  lz4 = None
+
 from dtformats import data_format
 from dtformats import errors
+from dtformats import follow
+from dtformats import format_registry
+from dtformats import timestamps
+
+
+class SystemdJournalEntry(object):
+  """Systemd journal entry.
+
+  Attributes:
+    boot_identifier (bytes): boot identifier.
+    fields (dict[str, bytes]): values of the fields per name.
+    monotonic (int): monotonic time in microseconds since boot.
+    real_time (int): number of microseconds since January 1, 1970
+        00:00:00 UTC.
+    sequence_number (int): sequence number.
+  """
+
+  def __init__(self):
+    """Initializes a systemd journal entry."""
+    super(SystemdJournalEntry, self).__init__()
+    self.boot_identifier = None
+    self.fields = {}
+    self.monotonic = None
+    self.real_time = None
+    self.sequence_number = None
 
 
 class SystemdJournalFile(data_format.BinaryDataFile):
@@ -14,6 +54,11 @@ class SystemdJournalFile(data_format.BinaryDataFile):
 
   _FILE_SIGNATURE = b'LPKSHHRH'
 
+  SIGNATURES = [(0, _FILE_SIGNATURE)]
+
+  RECORD_TIMESTAMP_TYPES = {
+      'real_time': timestamps.TIMESTAMP_TYPE_POSIX_MICROSECONDS}
+
   _OBJECT_COMPRESSED_XZ = 1
   _OBJECT_COMPRESSED_LZ4 = 2
 
@@ -212,6 +257,171 @@ class SystemdJournalFile(data_format.BinaryDataFile):
     """
     return stream.decode('ascii')
 
+  def _DecompressData(self, data, object_flags):
+    """Decompresses the data of a data object.
+
+    Args:
+      data (bytes): data of the data object.
+      object_flags (int): object flags.
+
+    Returns:
+      bytes: decompressed data.
+
+    Raises:
+      ParseError: if the data cannot be decompressed.
+    """
+    if object_flags == self._OBJECT_COMPRESSED_XZ:
+      if not lzma:
+        raise errors.ParseError('Missing support for XZ compressed data.')
+
+      try:
+        return lzma.decompress(data)
+      except (EOFError, IOError, lzma.LZMAError) as exception:
+        raise errors.ParseError(
+            'Unable to decompress XZ data with error: {0!s}'.format(
+                exception))
+
+    if object_flags == self._OBJECT_COMPRESSED_LZ4:
+      if not lz4:
+        raise errors.ParseError('Missing support for LZ4 compressed data.')
+
+      # The LZ4 compressed data is preceded by the 64-bit little-endian
+      # uncompressed data size.
+      data_type_map = self._GetDataTypeMap('uint64le')
+
+      uncompressed_data_size = self._ReadStructureFromByteStream(
+          data[:8], 0, data_type_map, 'uncompressed data size')
+
+      try:
+        return lz4.block.decompress(
+            data[8:], uncompressed_size=uncompressed_data_size)
+      except lz4.block.LZ4BlockError as exception:
+        raise errors.ParseError(
+            'Unable to decompress LZ4 data with error: {0!s}'.format(
+                exception))
+
+    return data
+
+  def _GetFollowFingerprint(self, file_object, follow_state):
+    """Retrieves the fingerprint of a followed file.
+
+    The file header is updated when entries are appended, hence only
+    the identifiers in the file header are used.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Returns:
+      str: fingerprint of the file.
+
+    Raises:
+      ParseError: if the file header cannot be read.
+    """
+    file_header = self._ReadFileHeader(file_object)
+
+    hash_context = hashlib.sha256()
+    hash_context.update(file_header.signature)
+    hash_context.update(file_header.file_identifier)
+    hash_context.update(file_header.machine_identifier)
+    hash_context.update(file_header.sequence_number_identifier)
+
+    return hash_context.hexdigest()
+
+  def _IsValidFollowState(self, file_object, follow_state):
+    """Determines if the follow state is valid for the file.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Returns:
+      bool: True if the entries appended since the follow state can be read,
+          False if the file has not been parsed before or has been truncated,
+          rotated or rewritten since.
+    """
+    if not super(SystemdJournalFile, self)._IsValidFollowState(
+        file_object, follow_state):
+      return False
+
+    try:
+      file_header = self._ReadFileHeader(file_object)
+    except errors.ParseError:
+      return False
+
+    # The number of entries and the tail object offset only increase when
+    # entries are appended.
+    number_of_entries = follow_state.values.get('number_of_entries', 0)
+    tail_object_offset = follow_state.values.get('tail_object_offset', 0)
+
+    return (
+        file_header.number_of_entry_objects >= number_of_entries and
+        file_header.tail_object_offset >= tail_object_offset)
+
+  def _ReadAppendedRecords(self, file_object, follow_state):
+    """Reads the entries appended since a follow state.
+
+    The follow state contains the entry array object and the index in that
+    array of the next entry, such that the entry arrays of the entries that
+    were parsed before are not read again.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Yields:
+      SystemdJournalEntry: entry.
+
+    Raises:
+      ParseError: if an entry cannot be read.
+    """
+    file_header = self._ReadFileHeader(file_object)
+
+    if follow_state.offset is None:
+      follow_state.offset = file_header.header_size
+      follow_state.values = {}
+
+    number_of_entries = follow_state.values.get('number_of_entries', 0)
+    tail_object_offset = follow_state.values.get('tail_object_offset', 0)
+    if (number_of_entries == file_header.number_of_entry_objects and
+        tail_object_offset == file_header.tail_object_offset):
+      return
+
+    entry_array_offset = follow_state.values.get('entry_array_offset', 0)
+    entry_array_index = follow_state.values.get('entry_array_index', 0)
+    if not entry_array_offset:
+      entry_array_offset = file_header.entry_array_offset
+      entry_array_index = 0
+
+    # The entry array objects are read one at a time, so that only the entry
+    # object offsets of the current entry array object are kept in memory.
+    while entry_array_offset != 0:
+      follow_state.values['entry_array_offset'] = entry_array_offset
+      follow_state.values['entry_array_index'] = entry_array_index
+
+      entry_array_object = self._ReadEntryArrayObject(
+          file_object, entry_array_offset)
+
+      entry_object_offsets = entry_array_object.entry_object_offsets
+      for index in range(entry_array_index, len(entry_object_offsets)):
+        entry_object_offset = entry_object_offsets[index]
+        if entry_object_offset == 0:
+          continue
+
+        journal_entry = self._ReadJournalEntry(
+            file_object, entry_object_offset)
+        number_of_entries += 1
+
+        follow_state.offset = entry_object_offset
+        follow_state.values['entry_array_index'] = index + 1
+        follow_state.values['number_of_entries'] = number_of_entries
+        yield journal_entry
+
+      entry_array_offset = entry_array_object.next_entry_array_offset
+      entry_array_index = 0
+
+    follow_state.values['tail_object_offset'] = file_header.tail_object_offset
+
   def _ReadDataObject(self, file_object, file_offset):
     """Reads a data object.
 
@@ -358,6 +568,53 @@ class SystemdJournalFile(data_format.BinaryDataFile):
 
     return file_header
 
+  def _ReadJournalEntry(self, file_object, file_offset):
+    """Reads a journal entry.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): offset of the entry object relative to the start
+          of the file-like object.
+
+    Returns:
+      SystemdJournalEntry: entry.
+
+    Raises:
+      ParseError: if the entry cannot be read.
+    """
+    entry_object = self._ReadEntryObject(file_object, file_offset)
+
+    journal_entry = SystemdJournalEntry()
+    journal_entry.boot_identifier = entry_object.boot_identifier
+    journal_entry.monotonic = entry_object.monotonic
+    journal_entry.real_time = entry_object.real_time
+    journal_entry.sequence_number = entry_object.sequence_number
+
+    for entry_item in entry_object.entry_items:
+      data_object = self._ReadDataObject(file_object, entry_item.object_offset)
+
+      try:
+        data = self._DecompressData(
+            data_object.data, data_object.object_flags)
+
+      except errors.ParseError as exception:
+        # In debug mode the remaining data objects are still read, where
+        # the data that cannot be decompressed is printed undecoded.
+        if not self._debug:
+          raise
+
+        self._DebugPrintText((
+            'Unable to decompress data of data object at offset: 0x{0:08x} '
+            'with error: {1!s}\n').format(entry_item.object_offset, exception))
+        self._DebugPrintData('Undecoded data', data_object.data)
+        continue
+
+      name, _, value = data.partition(b'=')
+      name = name.decode('utf-8', 'replace')
+      journal_entry.fields[name] = value
+
+    return journal_entry
+
   def _ReadObjectHeader(self, file_object, file_offset):
     """Reads an object header.
 
@@ -383,31 +640,37 @@ class SystemdJournalFile(data_format.BinaryDataFile):
 
     return object_header
 
-  def ReadFileObject(self, file_object):
-    """Reads a Windows Task Scheduler job file-like object.
+  def _ReadRecords(self, file_object):
+    """Reads the entries.
 
     Args:
       file_object (file): file-like object.
 
+    Yields:
+      SystemdJournalEntry: entry.
+
     Raises:
-      ParseError: if the file cannot be read.
+      ParseError: if an entry cannot be read.
     """
-    file_header = self._ReadFileHeader(file_object)
+    follow_state = follow.FollowState()
+    for journal_entry in self._ReadAppendedRecords(file_object, follow_state):
+      yield journal_entry
 
-    entry_array_object = self._ReadEntryArrayObject(
-        file_object, file_header.entry_array_offset)
+  def ReadFileObject(self, file_object):
+    """Reads a systemd journal file-like object.
 
-    entry_object_offsets = list(entry_array_object.entry_object_offsets)
-    while entry_array_object.next_entry_array_offset != 0:
-      entry_array_object = self._ReadEntryArrayObject(
-          file_object, entry_array_object.next_entry_array_offset)
-      entry_object_offsets.extend(entry_array_object.entry_object_offsets)
+    Args:
+      file_object (file): file-like object.
 
-    for entry_object_offset in entry_object_offsets:
-      if entry_object_offset == 0:
-        continue
+    Raises:
+      ParseError: if the file cannot be read.
+    """
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
+    else:
+      self._ReadFileHeader(file_object)
 
-      entry_object = self._ReadEntryObject(file_object, entry_object_offset)
 
-      for entry_item in entry_object.entry_items:
-        self._ReadDataObject(file_object, entry_item.object_offset)
+format_registry.FormatRegistry.RegisterFormat(
+    'systemd_journal', SystemdJournalFile)
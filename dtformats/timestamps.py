@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""Batch conversion of timestamps.
+
+Converting timestamps one value at a time, for example with a dfDateTime
+object per value, dominates the time needed to format large numbers of
+records. The functions in this module convert a whole batch of timestamps
+at once, using NumPy when available and plain integer arithmetic otherwise.
+"""
+
+from __future__ import unicode_literals
+
+import datetime
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+
+TIMESTAMP_TYPE_FILETIME = 'filetime'
+TIMESTAMP_TYPE_HFS = 'hfs'
+TIMESTAMP_TYPE_POSIX = 'posix'
+TIMESTAMP_TYPE_POSIX_MICROSECONDS = 'posix_microseconds'
+TIMESTAMP_TYPE_WEBKIT = 'webkit'
+
+# Number of units per second, number of seconds between the epoch of
+# the timestamp and the POSIX epoch, number of digits of the fraction of
+# a second, minimum and maximum value per timestamp type.
+_TIMESTAMP_TYPE_DEFINITIONS = {
+    TIMESTAMP_TYPE_FILETIME: (
+        10000000, 11644473600, 7, 0, 0xffffffffffffffff),
+    TIMESTAMP_TYPE_HFS: (
+        1, 2082844800, 0, 0, 0xffffffff),
+    TIMESTAMP_TYPE_POSIX: (
+        1, 0, 0, None, None),
+    TIMESTAMP_TYPE_POSIX_MICROSECONDS: (
+        1000000, 0, 6, None, None),
+    TIMESTAMP_TYPE_WEBKIT: (
+        1000000, 11644473600, 6, None, None)}
+
+# Supported range of dates, 0001-01-01 00:00:00 through 9999-12-31 23:59:59,
+# in number of seconds since the POSIX epoch.
+_MINIMUM_POSIX_TIME = -62135596800
+_MAXIMUM_POSIX_TIME = 253402300799
+
+_POSIX_EPOCH = datetime.datetime(1970, 1, 1)
+
+_POSIX_EPOCH_ORDINAL = _POSIX_EPOCH.toordinal()
+
+
+def _GetTimestampTypeDefinition(timestamp_type):
+  """Retrieves the definition of a timestamp type.
+
+  Args:
+    timestamp_type (str): timestamp type, such as "filetime".
+
+  Returns:
+    tuple[int, int, int, int, int]: number of units per second, number of
+        seconds between the epoch of the timestamp and the POSIX epoch,
+        number of digits of the fraction of a second, minimum and maximum
+        value, where None represents no bound.
+
+  Raises:
+    ValueError: if the timestamp type is not supported.
+  """
+  definition = _TIMESTAMP_TYPE_DEFINITIONS.get(timestamp_type, None)
+  if not definition:
+    raise ValueError('Unsupported timestamp type: {0!s}.'.format(
+        timestamp_type))
+
+  return definition
+
+
+def _GetNumPyValues(timestamps, timestamp_type):
+  """Retrieves the POSIX times and fractions of timestamps with NumPy.
+
+  Args:
+    timestamps (list[int]): timestamps.
+    timestamp_type (str): timestamp type, such as "filetime".
+
+  Returns:
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: number of seconds
+        since the POSIX epoch, fraction of a second in number of units and
+        whether the timestamps are within the supported range or None if
+        the timestamps cannot be represented as 64-bit signed integers.
+  """
+  units_per_second, epoch_offset, _, minimum, maximum = (
+      _GetTimestampTypeDefinition(timestamp_type))
+
+  try:
+    values = numpy.asarray(timestamps, dtype=numpy.int64)
+  except (OverflowError, TypeError, ValueError):
+    return None
+
+  is_valid = numpy.ones(values.shape, dtype=bool)
+  if minimum is not None:
+    is_valid &= values >= minimum
+  if maximum is not None:
+    is_valid &= values <= maximum
+
+  seconds = values // units_per_second - epoch_offset
+  fractions = values % units_per_second
+
+  is_valid &= seconds >= _MINIMUM_POSIX_TIME
+  is_valid &= seconds <= _MAXIMUM_POSIX_TIME
+
+  seconds = numpy.where(is_valid, seconds, 0)
+
+  return seconds, fractions, is_valid
+
+
+def _GetPythonValues(timestamp, timestamp_type_definition):
+  """Retrieves the POSIX time and fraction of a timestamp.
+
+  Args:
+    timestamp (int): timestamp.
+    timestamp_type_definition (tuple[int, int, int, int, int]): definition
+        of the timestamp type.
+
+  Returns:
+    tuple[int, int]: number of seconds since the POSIX epoch and fraction of
+        a second in number of units or None if the timestamp is not within
+        the supported range.
+  """
+  units_per_second, epoch_offset, _, minimum, maximum = (
+      timestamp_type_definition)
+
+  if timestamp is None:
+    return None
+
+  if minimum is not None and timestamp < minimum:
+    return None
+
+  if maximum is not None and timestamp > maximum:
+    return None
+
+  seconds, fraction = divmod(timestamp, units_per_second)
+  seconds -= epoch_offset
+
+  if seconds < _MINIMUM_POSIX_TIME or seconds > _MAXIMUM_POSIX_TIME:
+    return None
+
+  return seconds, fraction
+
+
+def _CopyToDateTimeStringsWithNumPy(timestamps, timestamp_type):
+  """Copies timestamps to date and time strings with NumPy.
+
+  Args:
+    timestamps (list[int]): timestamps.
+    timestamp_type (str): timestamp type, such as "filetime".
+
+  Returns:
+    list[str]: date and time strings or None if the timestamps cannot be
+        represented as 64-bit signed integers.
+  """
+  numpy_values = _GetNumPyValues(timestamps, timestamp_type)
+  if numpy_values is None:
+    return None
+
+  seconds, fractions, is_valid = numpy_values
+  _, _, number_of_fraction_digits, _, _ = _GetTimestampTypeDefinition(
+      timestamp_type)
+
+  strings = numpy.datetime_as_string(
+      seconds.astype('datetime64[s]'), unit='s')
+  strings = numpy.char.replace(strings, 'T', ' ')
+
+  if number_of_fraction_digits:
+    fraction_strings = numpy.char.zfill(
+        fractions.astype(str), number_of_fraction_digits)
+    strings = numpy.char.add(numpy.char.add(strings, '.'), fraction_strings)
+
+  return [
+      string if valid else None
+      for string, valid in zip(strings.tolist(), is_valid.tolist())]
+
+
+def _CopyToDateTimeStringsWithPython(timestamps, timestamp_type):
+  """Copies timestamps to date and time strings with plain Python.
+
+  Args:
+    timestamps (list[int]): timestamps.
+    timestamp_type (str): timestamp type, such as "filetime".
+
+  Returns:
+    list[str]: date and time strings.
+  """
+  timestamp_type_definition = _GetTimestampTypeDefinition(timestamp_type)
+  number_of_fraction_digits = timestamp_type_definition[2]
+
+  # The timestamps of a batch typically share a limited number of days,
+  # hence the date strings are cached per day.
+  date_strings = {}
+
+  date_time_strings = []
+  for timestamp in timestamps:
+    values = _GetPythonValues(timestamp, timestamp_type_definition)
+    if values is None:
+      date_time_strings.append(None)
+      continue
+
+    seconds, fraction = values
+    number_of_days, seconds = divmod(seconds, 86400)
+
+    date_string = date_strings.get(number_of_days, None)
+    if not date_string:
+      date = datetime.date.fromordinal(_POSIX_EPOCH_ORDINAL + number_of_days)
+      date_string = '{0:04d}-{1:02d}-{2:02d}'.format(
+          date.year, date.month, date.day)
+      date_strings[number_of_days] = date_string
+
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+
+    if number_of_fraction_digits:
+      date_time_string = '{0:s} {1:02d}:{2:02d}:{3:02d}.{4:0{5:d}d}'.format(
+          date_string, hours, minutes, seconds, fraction,
+          number_of_fraction_digits)
+    else:
+      date_time_string = '{0:s} {1:02d}:{2:02d}:{3:02d}'.format(
+          date_string, hours, minutes, seconds)
+
+    date_time_strings.append(date_time_string)
+
+  return date_time_strings
+
+
+def CopyToDatetimes(timestamps, timestamp_type):
+  """Copies timestamps to date and time values.
+
+  The date and time values have a precision of microseconds.
+
+  Args:
+    timestamps (list[int]): timestamps.
+    timestamp_type (str): timestamp type, such as "filetime".
+
+  Returns:
+    numpy.ndarray|list[datetime.datetime]: NumPy array of datetime64 values,
+        with NaT for timestamps out of the supported range, if NumPy is
+        available, otherwise a list of datetime values, with None for
+        timestamps out of the supported range.
+
+  Raises:
+    ValueError: if the timestamp type is not supported.
+  """
+  timestamp_type_definition = _GetTimestampTypeDefinition(timestamp_type)
+  units_per_second = timestamp_type_definition[0]
+
+  if numpy:
+    numpy_values = _GetNumPyValues(timestamps, timestamp_type)
+    if numpy_values is not None:
+      seconds, fractions, is_valid = numpy_values
+
+      microseconds = seconds * 1000000 + (
+          fractions * 1000000 // units_per_second)
+
+      datetimes = microseconds.astype('datetime64[us]')
+      datetimes[~is_valid] = numpy.datetime64('NaT')
+      return datetimes
+
+  datetimes = []
+  for timestamp in timestamps:
+    values = _GetPythonValues(timestamp, timestamp_type_definition)
+    if values is None:
+      datetimes.append(None)
+      continue
+
+    seconds, fraction = values
+    datetimes.append(_POSIX_EPOCH + datetime.timedelta(
+        seconds=seconds,
+        microseconds=fraction * 1000000 // units_per_second))
+
+  if numpy:
+    return numpy.array(datetimes, dtype='datetime64[us]')
+
+  return datetimes
+
+
+def CopyToDateTimeStrings(timestamps, timestamp_type):
+  """Copies timestamps to date and time strings.
+
+  The date and time strings are formatted as "YYYY-MM-DD hh:mm:ss" with
+  the fraction of a second in the precision of the timestamp type, such as
+  "YYYY-MM-DD hh:mm:ss.#######" for FILETIME.
+
+  Args:
+    timestamps (list[int]): timestamps.
+    timestamp_type (str): timestamp type, such as "filetime".
+
+  Returns:
+    list[str]: date and time strings, with None for timestamps out of
+        the supported range of 0001-01-01 through 9999-12-31.
+
+  Raises:
+    ValueError: if the timestamp type is not supported.
+  """
+  # Converting a single value with NumPy is slower than with plain Python.
+  if numpy and len(timestamps) > 1:
+    date_time_strings = _CopyToDateTimeStringsWithNumPy(
+        timestamps, timestamp_type)
+    if date_time_strings is not None:
+      return date_time_strings
+
+  return _CopyToDateTimeStringsWithPython(timestamps, timestamp_type)
+
+
+def CopyRecordTimestampsToDateTimeStrings(records_values, timestamp_types):
+  """Copies the timestamps of a batch of records to date and time strings.
+
+  The timestamps are converted per attribute for all records at once.
+
+  Args:
+    records_values (list[dict[str, object]]): values of the records, which
+        are changed in place. Timestamps out of the supported range are not
+        changed.
+    timestamp_types (dict[str, str]): timestamp types per name of
+        the attributes that contain a timestamp.
+
+  Raises:
+    ValueError: if a timestamp type is not supported.
+  """
+  for name, timestamp_type in sorted(timestamp_types.items()):
+    record_values_with_timestamp = [
+        record_values for record_values in records_values
+        if record_values.get(name, None) is not None]
+    if not record_values_with_timestamp:
+      continue
+
+    date_time_strings = CopyToDateTimeStrings([
+        record_values[name] for record_values in record_values_with_timestamp],
+        timestamp_type)
+
+    # Timestamps out of the supported range are kept as-is.
+    for record_values, date_time_string in zip(
+        record_values_with_timestamp, date_time_strings):
+      if date_time_string is not None:
+        record_values[name] = date_time_string
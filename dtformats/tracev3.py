@@ -7,6 +7,7 @@ import lz4.block
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
 
 
 class TraceV3File(data_format.BinaryDataFile):
@@ -14,6 +15,9 @@ class TraceV3File(data_format.BinaryDataFile):
 
   _DEFINITION_FILE = 'tracev3.yaml'
 
+  # The signature consists of the chunk tag and sub tag of the header chunk.
+  SIGNATURES = [(0, b'\x00\x10\x00\x00\x11\x00\x00\x00')]
+
   _DEBUG_INFO_CATALOG = [
       ('sub_system_strings_offset', 'Sub system strings offset',
        '_FormatIntegerAsHexadecimal8'),
@@ -239,3 +243,6 @@ class TraceV3File(data_format.BinaryDataFile):
         alignment = 8 - alignment
 
       file_offset += alignment
+
+
+format_registry.FormatRegistry.RegisterFormat('tracev3', TraceV3File)
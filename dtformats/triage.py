@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+"""Triage of the artifacts in a directory tree, such as a mounted image."""
+
+from __future__ import unicode_literals
+
+import logging
+import multiprocessing
+import os
+import stat
+
+try:
+  import queue
+except ImportError:
+  import Queue as queue  # pylint: disable=import-error
+
+try:
+  from concurrent import futures
+except ImportError:
+  futures = None
+
+from dtformats import data_format
+from dtformats import format_registry
+from dtformats import memory
+from dtformats import output_writers
+from dtformats import timestamps
+
+# The modules of the supported formats are imported to register the formats
+# with the format registry.
+# pylint: disable=unused-import
+from dtformats import asl
+from dtformats import chrome_cache
+from dtformats import cpio
+from dtformats import gzipfile
+from dtformats import keychain
+from dtformats import rp_change_log
+from dtformats import safari_cookies
+from dtformats import systemd
+from dtformats import tzif
+from dtformats import utmp
+from dtformats import uuidtext
+from dtformats import wemf
+# pylint: enable=unused-import
+
+
+# The memory budget that is shared by the parsers of the (worker) process.
+_memory_budget = None
+
+
+# Maximum number of records per result, such that the records of a file are
+# passed on in fixed-size chunks instead of all at once.
+MAXIMUM_NUMBER_OF_RECORDS_PER_RESULT = 1024
+
+
+def _GetRecordsChunk(artifact_records, timestamp_types):
+  """Retrieves a chunk of records and removes them from the artifact records.
+
+  Args:
+    artifact_records (SpillableList[dict[str, object]]): records of
+        the artifact.
+    timestamp_types (dict[str, str]): timestamp types per name of
+        the attributes that contain a timestamp.
+
+  Returns:
+    list[dict[str, object]]: records, of which the timestamps are copied to
+        date and time strings.
+  """
+  records = list(artifact_records)
+  artifact_records.Close()
+
+  timestamps.CopyRecordTimestampsToDateTimeStrings(records, timestamp_types)
+
+  return records
+
+
+def _SetMemoryBudget(memory_budget_size):
+  """Sets the memory budget of the parsers of the process.
+
+  Args:
+    memory_budget_size (int): size of the memory budget in bytes, where None
+        represents an unbounded budget.
+  """
+  global _memory_budget  # pylint: disable=global-statement
+
+  if not memory_budget_size:
+    _memory_budget = None
+  elif (not _memory_budget or
+        _memory_budget.maximum_size != memory_budget_size):
+    _memory_budget = memory.MemoryBudget(memory_budget_size)
+
+  data_format.BinaryDataFormat.SetMemoryBudget(_memory_budget)
+
+
+def _TriageFile(path, format_name):
+  """Parses a file.
+
+  Args:
+    path (str): path of the file.
+    format_name (str): name of the format of the file.
+
+  Yields:
+    list[dict[str, object]]: records of the artifact, in chunks of at most
+        MAXIMUM_NUMBER_OF_RECORDS_PER_RESULT records. A chunk is smaller when
+        the records exceed the memory budget.
+
+  Raises:
+    Exception: if the file cannot be parsed.
+  """
+  # Note that a parser is created per file, since parsers keep the state of
+  # the file they have parsed, such as caches.
+  format_class = format_registry.FormatRegistry.GetFormatClass(format_name)
+  parser = format_class()
+
+  parser.Open(path)
+
+  artifact_records = memory.SpillableList(memory_budget=_memory_budget)
+
+  try:
+    try:
+      for record in parser.ReadRecords():
+        record_values = [
+            ('artifact_format', format_name),
+            ('artifact_path', path)]
+        record_values.extend(output_writers.GetRecordValues(record))
+        artifact_records.append(dict(record_values))
+
+        if (len(artifact_records) >= MAXIMUM_NUMBER_OF_RECORDS_PER_RESULT or
+            artifact_records.is_spilled):
+          yield _GetRecordsChunk(
+              artifact_records, parser.RECORD_TIMESTAMP_TYPES)
+
+    except NotImplementedError:
+      artifact_records.append({
+          'artifact_format': format_name,
+          'artifact_path': path})
+
+    if artifact_records:
+      yield _GetRecordsChunk(artifact_records, parser.RECORD_TIMESTAMP_TYPES)
+
+  finally:
+    artifact_records.Close()
+    parser.Close()
+
+
+def TriageFiles(paths, memory_budget_size=None):
+  """Identifies and parses files.
+
+  This function is run by the worker processes of the triage runner. The
+  records are yielded in fixed-size chunks, such that the records of a file
+  do not have to be kept in memory all at once.
+
+  Args:
+    paths (list[str]): paths of the files.
+    memory_budget_size (Optional[int]): size of the memory budget of
+        the parsers of the process in bytes, where None represents an
+        unbounded budget.
+
+  Yields:
+    tuple[int, list[dict[str, object]], list[tuple[str, str]]]: number of
+        artifacts of which the first records are part of the result, records
+        of the identified artifacts and path and description of the errors.
+  """
+  _SetMemoryBudget(memory_budget_size)
+
+  for path in paths:
+    try:
+      format_names = format_registry.FormatRegistry.IdentifyFile(path)
+    except (IOError, OSError) as exception:
+      yield 0, [], [(path, '{0!s}'.format(exception))]
+      continue
+
+    if not format_names:
+      continue
+
+    # Note that the format with the most specific signature is used.
+    format_name = format_names[0]
+
+    number_of_artifacts = 1
+
+    # Note that parsing a file with an unexpected format can result in
+    # various exceptions, which should not stop the triage of other files.
+    # The records that were yielded before the exception remain valid.
+    try:
+      for artifact_records in _TriageFile(path, format_name):
+        yield number_of_artifacts, artifact_records, []
+        number_of_artifacts = 0
+
+    except Exception as exception:  # pylint: disable=broad-except
+      yield 0, [], [(path, '{0:s}: {1!s}'.format(format_name, exception))]
+
+
+def _TriageFilesToQueue(paths, result_queue, memory_budget_size=None):
+  """Identifies and parses files and passes the results to a queue.
+
+  This function is run by the worker processes of the triage runner.
+
+  Args:
+    paths (list[str]): paths of the files.
+    result_queue (Queue): queue to which the results are passed.
+    memory_budget_size (Optional[int]): size of the memory budget of
+        the parsers of the process in bytes, where None represents an
+        unbounded budget.
+  """
+  for result in TriageFiles(paths, memory_budget_size=memory_budget_size):
+    result_queue.put(result)
+
+
+class TriageRunner(object):
+  """Runner that triages the artifacts in a directory tree.
+
+  The files are identified and parsed in batches by a pool of worker
+  processes. The number of pending batches is bounded, such that the memory
+  usage does not depend on the number of files in the directory tree.
+
+  Attributes:
+    number_of_artifacts (int): number of identified artifacts.
+    number_of_errors (int): number of files that could not be triaged.
+    number_of_records (int): number of records written.
+  """
+
+  _DEFAULT_BATCH_SIZE = 64
+
+  # Number of seconds to wait for a result of the worker processes, before
+  # checking if the batches are done.
+  _QUEUE_TIMEOUT = 0.1
+
+  def __init__(
+      self, batch_size=_DEFAULT_BATCH_SIZE, memory_budget_size=None,
+      number_of_workers=None):
+    """Initializes a triage runner.
+
+    Args:
+      batch_size (Optional[int]): number of files per batch.
+      memory_budget_size (Optional[int]): size of the memory budget of
+          the parsers of every worker process in bytes, where None represents
+          an unbounded budget.
+      number_of_workers (Optional[int]): number of worker processes, where
+          None represents the number of CPUs and 1 or less triages the files
+          in the current process.
+    """
+    if number_of_workers is None:
+      number_of_workers = multiprocessing.cpu_count()
+
+    super(TriageRunner, self).__init__()
+    self._batch_size = batch_size
+    self._memory_budget_size = memory_budget_size
+    self._number_of_workers = number_of_workers
+    self.number_of_artifacts = 0
+    self.number_of_errors = 0
+    self.number_of_records = 0
+
+  def _DiscardResultsFromQueue(self, result_queue, pending_futures):
+    """Discards the results passed by the worker processes.
+
+    Args:
+      result_queue (Queue): queue to which the results are passed.
+      pending_futures (set[Future]): futures of the pending batches, of which
+          the results are discarded until they are done.
+    """
+    while pending_futures:
+      try:
+        result_queue.get(timeout=self._QUEUE_TIMEOUT)
+      except queue.Empty:
+        pass
+      except (EOFError, IOError):
+        # The manager process is no longer available, for example when
+        # it was interrupted, hence no results can be passed.
+        break
+
+      pending_futures = set(
+          future for future in pending_futures if not future.done())
+
+  def _GetPendingFutures(self, pending_futures):
+    """Retrieves the futures of the batches that are still being triaged.
+
+    Args:
+      pending_futures (set[Future]): futures of the pending batches.
+
+    Returns:
+      set[Future]: futures of the batches that are not done.
+
+    Raises:
+      Exception: if a worker process failed to triage a batch.
+    """
+    done_futures = set()
+    for future in pending_futures:
+      if future.done():
+        # Raises the exception of a failed worker process.
+        future.result()
+        done_futures.add(future)
+
+    return pending_futures - done_futures
+
+  def _GetFilePathBatches(self, path):
+    """Retrieves batches of paths of the regular files in a directory tree.
+
+    Symbolic links are not followed.
+
+    Args:
+      path (str): path of the directory tree.
+
+    Yields:
+      list[str]: paths of the files in the batch.
+    """
+    batch = []
+    for directory_path, _, filenames in os.walk(path):
+      for filename in filenames:
+        file_path = os.path.join(directory_path, filename)
+        try:
+          stat_object = os.lstat(file_path)
+        except (IOError, OSError):
+          continue
+
+        if not stat.S_ISREG(stat_object.st_mode) or not stat_object.st_size:
+          continue
+
+        batch.append(file_path)
+        if len(batch) >= self._batch_size:
+          yield batch
+          batch = []
+
+    if batch:
+      yield batch
+
+  def _WriteResult(self, result, record_writer):
+    """Writes a result of a batch.
+
+    Args:
+      result (tuple[int, list[dict[str, object]], list[tuple[str, str]]]):
+          number of artifacts of which the first records are part of
+          the result, records of the identified artifacts and path and
+          description of the errors.
+      record_writer (BufferedRecordWriter): record output writer.
+    """
+    number_of_artifacts, records, triage_errors = result
+
+    self.number_of_artifacts += number_of_artifacts
+    self.number_of_errors += len(triage_errors)
+    self.number_of_records += len(records)
+
+    for path, description in triage_errors:
+      logging.warning('Unable to triage: {0:s} with error: {1:s}'.format(
+          path, description))
+
+    if records:
+      record_writer.WriteRecords(records)
+
+  def _WriteResultsFromQueue(self, result_queue, record_writer, timeout=None):
+    """Writes the results passed by the worker processes.
+
+    Args:
+      result_queue (Queue): queue to which the results are passed.
+      record_writer (BufferedRecordWriter): record output writer.
+      timeout (Optional[float]): number of seconds to wait for the first
+          result, where None represents that only the results already in
+          the queue are written.
+    """
+    while True:
+      try:
+        if timeout is None:
+          result = result_queue.get_nowait()
+        else:
+          result = result_queue.get(timeout=timeout)
+      except queue.Empty:
+        break
+
+      self._WriteResult(result, record_writer)
+      timeout = None
+
+  def Triage(self, path, record_writer):
+    """Triages the artifacts in a directory tree.
+
+    Args:
+      path (str): path of the directory tree.
+      record_writer (BufferedRecordWriter): record output writer to which
+          the records of all the artifacts are written.
+    """
+    if self._number_of_workers <= 1 or futures is None:
+      try:
+        for batch in self._GetFilePathBatches(path):
+          for result in TriageFiles(
+              batch, memory_budget_size=self._memory_budget_size):
+            self._WriteResult(result, record_writer)
+
+      finally:
+        # The memory budget of the current process is not used by other runs.
+        _SetMemoryBudget(None)
+
+      return
+
+    maximum_number_of_pending_batches = self._number_of_workers * 4
+
+    # The results are passed by a bounded queue, such that the worker
+    # processes stream the records of large files in chunks and wait while
+    # the records are written.
+    manager = multiprocessing.Manager()
+    executor = futures.ProcessPoolExecutor(
+        max_workers=self._number_of_workers)
+
+    is_complete = False
+    pending_futures = set()
+    result_queue = None
+
+    try:
+      result_queue = manager.Queue(
+          maxsize=maximum_number_of_pending_batches)
+
+      for batch in self._GetFilePathBatches(path):
+        while len(pending_futures) >= maximum_number_of_pending_batches:
+          self._WriteResultsFromQueue(
+              result_queue, record_writer, timeout=self._QUEUE_TIMEOUT)
+          pending_futures = self._GetPendingFutures(pending_futures)
+
+        pending_futures.add(executor.submit(
+            _TriageFilesToQueue, batch, result_queue,
+            memory_budget_size=self._memory_budget_size))
+
+      while pending_futures:
+        self._WriteResultsFromQueue(
+            result_queue, record_writer, timeout=self._QUEUE_TIMEOUT)
+        pending_futures = self._GetPendingFutures(pending_futures)
+
+      # The results of a batch are passed to the queue before its future
+      # is done.
+      self._WriteResultsFromQueue(result_queue, record_writer)
+
+      is_complete = True
+
+    finally:
+      if not is_complete:
+        # The worker processes can be waiting to pass a result to the full
+        # queue, hence the batches that have not started are cancelled and
+        # the results of the running batches are discarded, such that these
+        # do not block the shutdown of the executor.
+        for future in pending_futures:
+          future.cancel()
+
+        if result_queue is not None:
+          self._DiscardResultsFromQueue(result_queue, pending_futures)
+
+      executor.shutdown(wait=True)
+      manager.shutdown()
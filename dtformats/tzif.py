@@ -7,6 +7,7 @@ from dtfabric.runtime import data_maps as dtfabric_data_maps
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
 
 
 class TimeZoneInformationFile(data_format.BinaryDataFile):
@@ -22,6 +23,8 @@ class TimeZoneInformationFile(data_format.BinaryDataFile):
 
   _FILE_SIGNATURE = b'TZif'
 
+  SIGNATURES = [(0, _FILE_SIGNATURE)]
+
   def __init__(self, debug=False, output_writer=None):
     """Initializes a timezone information file.
 
@@ -378,3 +381,6 @@ class TimeZoneInformationFile(data_format.BinaryDataFile):
 
       if self._debug:
         self._DebugPrintData('Timezone string', data)
+
+
+format_registry.FormatRegistry.RegisterFormat('tzif', TimeZoneInformationFile)
@@ -5,6 +5,37 @@ from __future__ import unicode_literals
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
+from dtformats import timestamps
+
+
+class UtmpEntry(object):
+  """Utmp entry.
+
+  Attributes:
+    hostname (str): hostname or IP address of the remote host.
+    ip_address (str): IP address of the remote host or None if not available.
+    microseconds (int): microseconds part of the timestamp.
+    pid (int): process identifier (PID).
+    terminal (str): name of the terminal.
+    terminal_identifier (int): terminal identifier.
+    timestamp (int): number of seconds since January 1, 1970 00:00:00 UTC.
+    type (int): type of login.
+    username (str): username.
+  """
+
+  def __init__(self):
+    """Initializes an utmp entry."""
+    super(UtmpEntry, self).__init__()
+    self.hostname = None
+    self.ip_address = None
+    self.microseconds = None
+    self.pid = None
+    self.terminal = None
+    self.terminal_identifier = None
+    self.timestamp = None
+    self.type = None
+    self.username = None
 
 
 class LinuxLibc6UtmpFile(data_format.BinaryDataFile):
@@ -12,6 +43,9 @@ class LinuxLibc6UtmpFile(data_format.BinaryDataFile):
 
   _DEFINITION_FILE = 'utmp.yaml'
 
+  RECORD_TIMESTAMP_TYPES = {
+      'timestamp': timestamps.TIMESTAMP_TYPE_POSIX}
+
   _EMPTY_IP_ADDRESS = (0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
   _TYPES_OF_LOGIN = {
@@ -94,21 +128,94 @@ class LinuxLibc6UtmpFile(data_format.BinaryDataFile):
 
     return string.rstrip('\x00')
 
-  def _ReadEntries(self, file_object):
-    """Reads entries.
+  def _ReadAppendedRecords(self, file_object, follow_state):
+    """Reads the entries appended since a follow state.
+
+    The entries have a fixed size, hence an entry that is not fully written
+    yet is read when the file is followed the next time.
+
+    Args:
+      file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Yields:
+      UtmpEntry: entry.
+
+    Raises:
+      ParseError: if an entry cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('linux_libc6_utmp_entry')
+    entry_data_size = data_type_map.GetByteSize()
+
+    file_offset = follow_state.offset or 0
+    follow_state.offset = file_offset
+
+    while file_offset + entry_data_size <= self._file_size:
+      utmp_entry, _ = self._ReadEntry(file_object, file_offset, data_type_map)
+      file_offset += entry_data_size
+
+      follow_state.offset = file_offset
+      yield utmp_entry
+
+  def _ReadEntry(self, file_object, file_offset, data_type_map):
+    """Reads an entry.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): offset of the entry relative to the start of the file.
+      data_type_map (dtfabric.DataTypeMap): data type map of the entry.
+
+    Returns:
+      tuple[UtmpEntry, int]: entry and size of the entry data.
+
+    Raises:
+      ParseError: if the entry cannot be read.
+    """
+    entry, entry_data_size = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'entry')
+
+    if self._debug:
+      self._DebugPrintEntry(entry)
+
+    utmp_entry = UtmpEntry()
+    utmp_entry.hostname = self._DecodeString(entry.hostname)
+    utmp_entry.microseconds = entry.microseconds
+    utmp_entry.pid = entry.pid
+    utmp_entry.terminal = self._DecodeString(entry.terminal)
+    utmp_entry.terminal_identifier = entry.terminal_identifier
+    utmp_entry.timestamp = entry.timestamp
+    utmp_entry.type = entry.type
+    utmp_entry.username = self._DecodeString(entry.username)
+
+    if entry.ip_address[4:] == self._EMPTY_IP_ADDRESS[4:]:
+      utmp_entry.ip_address = self._FormatPackedIPv4Address(
+          entry.ip_address[:4])
+    else:
+      utmp_entry.ip_address = self._FormatPackedIPv6Address(
+          entry.ip_address)
+
+    return utmp_entry, entry_data_size
+
+  def _ReadRecords(self, file_object):
+    """Reads the entries.
 
     Args:
       file_object (file): file-like object.
+
+    Yields:
+      UtmpEntry: entry.
+
+    Raises:
+      ParseError: if an entry cannot be read.
     """
     file_offset = 0
     data_type_map = self._GetDataTypeMap('linux_libc6_utmp_entry')
 
     while file_offset < self._file_size:
-      entry, entry_data_size = self._ReadStructureFromFileObject(
-          file_object, file_offset, data_type_map, 'entry')
+      utmp_entry, entry_data_size = self._ReadEntry(
+          file_object, file_offset, data_type_map)
 
-      if self._debug:
-        self._DebugPrintEntry(entry)
+      yield utmp_entry
 
       file_offset += entry_data_size
 
@@ -117,8 +224,13 @@ class LinuxLibc6UtmpFile(data_format.BinaryDataFile):
 
     Args:
       file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file cannot be read.
     """
-    self._ReadEntries(file_object)
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
 
     # TODO: print trailing data
 
@@ -128,6 +240,13 @@ class MacOSXUtmpxFile(data_format.BinaryDataFile):
 
   _DEFINITION_FILE = 'utmp.yaml'
 
+  RECORD_TIMESTAMP_TYPES = {
+      'timestamp': timestamps.TIMESTAMP_TYPE_POSIX}
+
+  _FILE_SIGNATURE = b'utmpx-1.00\x00'
+
+  SIGNATURES = [(0, _FILE_SIGNATURE)]
+
   _TYPES_OF_LOGIN = {
       0: 'EMPTY',
       1: 'RUN_LVL',
@@ -197,38 +316,120 @@ class MacOSXUtmpxFile(data_format.BinaryDataFile):
 
     return string.rstrip('\x00')
 
-  def _ReadEntries(self, file_object):
-    """Reads entries.
+  def _ReadAppendedRecords(self, file_object, follow_state):
+    """Reads the entries appended since a follow state.
+
+    The entries have a fixed size, hence an entry that is not fully written
+    yet is read when the file is followed the next time.
 
     Args:
       file_object (file): file-like object.
+      follow_state (FollowState): follow state.
+
+    Yields:
+      UtmpEntry: entry.
 
     Raises:
-      ParseError: if the entries cannot be read.
+      ParseError: if an entry cannot be read.
     """
-    file_offset = 0
     data_type_map = self._GetDataTypeMap('macosx_utmpx_entry')
+    entry_data_size = data_type_map.GetByteSize()
 
+    # The first entry contains the file header.
+    file_offset = follow_state.offset or entry_data_size
+    follow_state.offset = file_offset
+
+    while file_offset + entry_data_size <= self._file_size:
+      utmp_entry, _ = self._ReadEntry(file_object, file_offset, data_type_map)
+      file_offset += entry_data_size
+
+      follow_state.offset = file_offset
+      yield utmp_entry
+
+  def _ReadEntry(self, file_object, file_offset, data_type_map):
+    """Reads an entry.
+
+    Args:
+      file_object (file): file-like object.
+      file_offset (int): offset of the entry relative to the start of the file.
+      data_type_map (dtfabric.DataTypeMap): data type map of the entry.
+
+    Returns:
+      tuple[UtmpEntry, int]: entry and size of the entry data.
+
+    Raises:
+      ParseError: if the entry cannot be read.
+    """
     entry, entry_data_size = self._ReadStructureFromFileObject(
         file_object, file_offset, data_type_map, 'entry')
 
     if self._debug:
       self._DebugPrintEntry(entry)
 
-    if not entry.username.startswith(b'utmpx-1.00\x00'):
+    utmp_entry = UtmpEntry()
+    utmp_entry.hostname = self._DecodeString(entry.hostname)
+    utmp_entry.microseconds = entry.microseconds
+    utmp_entry.pid = entry.pid
+    utmp_entry.terminal = self._DecodeString(entry.terminal)
+    utmp_entry.terminal_identifier = entry.terminal_identifier
+    utmp_entry.timestamp = entry.timestamp
+    utmp_entry.type = entry.type
+    utmp_entry.username = self._DecodeString(entry.username)
+
+    return utmp_entry, entry_data_size
+
+  def _ReadFileHeader(self, file_object):
+    """Reads the file header.
+
+    The file header is stored as the first entry.
+
+    Args:
+      file_object (file): file-like object.
+
+    Returns:
+      int: size of the file header.
+
+    Raises:
+      ParseError: if the file header cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('macosx_utmpx_entry')
+
+    entry, entry_data_size = self._ReadStructureFromFileObject(
+        file_object, 0, data_type_map, 'entry')
+
+    if self._debug:
+      self._DebugPrintEntry(entry)
+
+    if not entry.username.startswith(self._FILE_SIGNATURE):
       raise errors.ParseError('Unsupported file header signature.')
 
     if entry.type != 10:
       raise errors.ParseError('Unsupported file header type of login.')
 
-    file_offset += entry_data_size
+    return entry_data_size
+
+  def _ReadRecords(self, file_object):
+    """Reads the entries.
+
+    Args:
+      file_object (file): file-like object.
+
+    Yields:
+      UtmpEntry: entry.
+
+    Raises:
+      ParseError: if an entry cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('macosx_utmpx_entry')
+
+    # The first entry contains the file header.
+    file_offset = data_type_map.GetByteSize()
 
     while file_offset < self._file_size:
-      entry, entry_data_size = self._ReadStructureFromFileObject(
-          file_object, file_offset, data_type_map, 'entry')
+      utmp_entry, entry_data_size = self._ReadEntry(
+          file_object, file_offset, data_type_map)
 
-      if self._debug:
-        self._DebugPrintEntry(entry)
+      yield utmp_entry
 
       file_offset += entry_data_size
 
@@ -237,7 +438,17 @@ class MacOSXUtmpxFile(data_format.BinaryDataFile):
 
     Args:
       file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file cannot be read.
     """
-    self._ReadEntries(file_object)
+    self._ReadFileHeader(file_object)
+
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
 
     # TODO: print trailing data
+
+
+format_registry.FormatRegistry.RegisterFormat('utmpx', MacOSXUtmpxFile)
@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
 
 
 class UUIDTextFile(data_format.BinaryDataFile):
@@ -12,6 +13,8 @@ class UUIDTextFile(data_format.BinaryDataFile):
 
   _DEFINITION_FILE = 'uuidtext.yaml'
 
+  SIGNATURES = [(0, b'\x99\x88\x77\x66')]
+
   _DEBUG_INFO_FILE_FOOTER = [
       ('library_path', 'Library path', '_FormatString')]
 
@@ -122,3 +125,6 @@ class UUIDTextFile(data_format.BinaryDataFile):
       file_offset += entry_descriptor.data_size
 
     self._ReadFileFooter(file_object, file_offset)
+
+
+format_registry.FormatRegistry.RegisterFormat('uuidtext', UUIDTextFile)
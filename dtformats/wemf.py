@@ -6,10 +6,10 @@ from __future__ import unicode_literals
 import os
 
 from dtfabric import errors as dtfabric_errors
-from dtfabric.runtime import fabric as dtfabric_fabric
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import format_registry
 
 
 class Record(object):
@@ -43,33 +43,16 @@ class EMFFile(data_format.BinaryDataFile):
 
   FILE_TYPE = 'Windows Enhanced Metafile'
 
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'emf.yaml')
+  _DEFINITION_FILE = 'emf.yaml'
 
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
+  _EMF_SIGNATURE = b'\x20EMF'
 
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
+  SIGNATURES = [(40, _EMF_SIGNATURE)]
 
-  _RECORD_TYPE = _DATA_TYPE_FABRIC.CreateDataTypeMap('emf_record_type')
-
-  _FILE_HEADER = _DATA_TYPE_FABRIC.CreateDataTypeMap('emf_file_header')
-
-  _FILE_HEADER_SIZE = _FILE_HEADER.GetByteSize()
-
-  _RECORD_HEADER = _DATA_TYPE_FABRIC.CreateDataTypeMap('emf_record_header')
-
-  _RECORD_HEADER_SIZE = _RECORD_HEADER.GetByteSize()
-
-  _EMF_SIGNATURE = b'FME\x20'
-
-  # Here None represents that the record has no additional data.
+  # Names of the data types of the record data per record type.
   _EMF_RECORD_DATA_STRUCT_TYPES = {
-      0x0018: _DATA_TYPE_FABRIC.CreateDataTypeMap('emf_settextcolor'),
-      0x0025: _DATA_TYPE_FABRIC.CreateDataTypeMap('emf_selectobject')}
-
-  _EMF_STOCK_OBJECT = _DATA_TYPE_FABRIC.CreateDataTypeMap('emf_stock_object')
+      0x0018: 'emf_settextcolor',
+      0x0025: 'emf_selectobject'}
 
   def _DebugPrintFileHeader(self, file_header):
     """Prints file header debug information.
@@ -77,7 +60,8 @@ class EMFFile(data_format.BinaryDataFile):
     Args:
       file_header (emf_file_header): file header.
     """
-    record_type_string = self._RECORD_TYPE.GetName(file_header.record_type)
+    data_type_map = self._GetDataTypeMap('emf_record_type')
+    record_type_string = data_type_map.GetName(file_header.record_type)
     value_string = '0x{0:04x} ({1:s})'.format(
         file_header.record_type, record_type_string or 'UNKNOWN')
     self._DebugPrintValue('Record type', value_string)
@@ -117,7 +101,8 @@ class EMFFile(data_format.BinaryDataFile):
     Args:
       record_header (emf_record_header): record header.
     """
-    record_type_string = self._RECORD_TYPE.GetName(record_header.record_type)
+    data_type_map = self._GetDataTypeMap('emf_record_type')
+    record_type_string = data_type_map.GetName(record_header.record_type)
     value_string = '0x{0:04x} ({1:s})'.format(
         record_header.record_type, record_type_string or 'UNKNOWN')
     self._DebugPrintValue('Record type', value_string)
@@ -137,9 +122,10 @@ class EMFFile(data_format.BinaryDataFile):
       ParseError: if the file header cannot be read.
     """
     file_offset = file_object.tell()
-    file_header = self._ReadStructure(
-        file_object, file_offset, self._FILE_HEADER_SIZE, self._FILE_HEADER,
-        'file header')
+    data_type_map = self._GetDataTypeMap('emf_file_header')
+
+    file_header, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'file header')
 
     if self._debug:
       self._DebugPrintFileHeader(file_header)
@@ -162,15 +148,16 @@ class EMFFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the record cannot be read.
     """
-    record_header = self._ReadStructure(
-        file_object, file_offset, self._RECORD_HEADER_SIZE, self._RECORD_HEADER,
-        'record header')
+    data_type_map = self._GetDataTypeMap('emf_record_header')
+
+    record_header, record_header_size = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'record header')
 
     if self._debug:
       self._DebugPrintRecordHeader(record_header)
 
-    data_offset = file_offset + self._RECORD_HEADER_SIZE
-    data_size = record_header.record_size - self._RECORD_HEADER_SIZE
+    data_offset = file_offset + record_header_size
+    data_size = record_header.record_size - record_header_size
 
     if self._debug:
       self._ReadRecordData(
@@ -197,10 +184,12 @@ class EMFFile(data_format.BinaryDataFile):
       self._DebugPrintData('Record data', record_data)
 
     # TODO: use lookup dict with callback.
-    data_type_map = self._EMF_RECORD_DATA_STRUCT_TYPES.get(record_type, None)
-    if not data_type_map:
+    data_type_name = self._EMF_RECORD_DATA_STRUCT_TYPES.get(record_type, None)
+    if not data_type_name:
       return
 
+    data_type_map = self._GetDataTypeMap(data_type_name)
+
     try:
       record = data_type_map.MapByteStream(record_data)
     except dtfabric_errors.MappingError as exception:
@@ -213,7 +202,8 @@ class EMFFile(data_format.BinaryDataFile):
         self._DebugPrintValue('Color', value_string)
 
       elif record_type == 0x0025:
-        stock_object_string = self._EMF_STOCK_OBJECT.GetName(
+        data_type_map = self._GetDataTypeMap('emf_stock_object')
+        stock_object_string = data_type_map.GetName(
             record.object_identifier)
 
         if stock_object_string:
@@ -227,12 +217,19 @@ class EMFFile(data_format.BinaryDataFile):
 
       self._DebugPrintText('\n')
 
-  def ReadFileObject(self, file_object):
-    """Reads a Enhanced Metafile Format (EMF) file-like object.
+  def _ReadRecords(self, file_object):
+    """Reads the records.
 
     Args:
       file_object (file): file-like object.
+
+    Yields:
+      Record: record.
+
+    Raises:
+      ParseError: if a record cannot be read.
     """
+    file_object.seek(0, os.SEEK_SET)
     self._ReadFileHeader(file_object)
 
     file_offset = file_object.tell()
@@ -241,17 +238,30 @@ class EMFFile(data_format.BinaryDataFile):
 
       file_offset += record.size
 
+      yield record
+
+  def ReadFileObject(self, file_object):
+    """Reads a Enhanced Metafile Format (EMF) file-like object.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file cannot be read.
+    """
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
+    else:
+      self._ReadFileHeader(file_object)
+
 
 class WMFFile(data_format.BinaryDataFile):
   """Windows Metafile Format (WMF) file."""
 
   FILE_TYPE = 'Windows Metafile'
 
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'wmf.yaml')
-
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
+  _DEFINITION_FILE = 'wmf.yaml'
 
   # https://msdn.microsoft.com/en-us/library/cc250370.aspx
 
@@ -313,42 +323,31 @@ class WMFFile(data_format.BinaryDataFile):
       # TODO: map to wmf_map_mode
   ])
 
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
-
-  _HEADER = _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_header')
-
-  _HEADER_SIZE = _HEADER.GetByteSize()
-
-  _PLACEABLE = _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_placeable')
-
-  _PLACEABLE_SIZE = _PLACEABLE.GetByteSize()
-
-  _RECORD_TYPE = _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_record_type')
-
-  _RECORD_HEADER = _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_record_header')
-
-  _RECORD_HEADER_SIZE = _RECORD_HEADER.GetByteSize()
-
   _WMF_PLACEABLE_SIGNATURE = b'\xd7\xcd\xc6\x9a'
 
-  _MAP_MODE = _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_map_mode')
-
-  _STRETCH_MODE = _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_stretch_mode')
+  # The signatures consist of the placeable signature or the file type,
+  # header size and format version of the header.
+  SIGNATURES = [
+      (0, _WMF_PLACEABLE_SIGNATURE),
+      (0, b'\x01\x00\x09\x00\x00\x01'),
+      (0, b'\x01\x00\x09\x00\x00\x03'),
+      (0, b'\x02\x00\x09\x00\x00\x01'),
+      (0, b'\x02\x00\x09\x00\x00\x03')]
 
   # record_size == ((record_type >> 8) + 3)
   # DIB: https://msdn.microsoft.com/en-us/library/cc250593.aspx
 
-  # Here None represents that the record has no additional data.
+  # Names of the data types of the record data per record type, where None
+  # represents that the record has no additional data.
   _WMF_RECORD_DATA_STRUCT_TYPES = {
       0x0000: None,
       0x001e: None,
-      0x0103: _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_setmapmode'),
-      0x0107: _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_setstretchbltmode'),
-      0x0127: _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_restoredc'),
-      0x020b: _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_setwindoworg'),
-      0x020c: _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_setwindowext'),
-      0x0b41: _DATA_TYPE_FABRIC.CreateDataTypeMap('wmf_dibstretchblt')}
+      0x0103: 'wmf_setmapmode',
+      0x0107: 'wmf_setstretchbltmode',
+      0x0127: 'wmf_restoredc',
+      0x020b: 'wmf_setwindoworg',
+      0x020c: 'wmf_setwindowext',
+      0x0b41: 'wmf_dibstretchblt'}
 
   # Reverse Polish wmf_raster_operation_code
   _WMF_RASTER_OPERATIONS = {
@@ -676,7 +675,8 @@ class WMFFile(data_format.BinaryDataFile):
         record_header.record_size, record_header.record_size * 2)
     self._DebugPrintValue('Record size', value_string)
 
-    record_type_string = self._RECORD_TYPE.GetName(record_header.record_type)
+    data_type_map = self._GetDataTypeMap('wmf_record_type')
+    record_type_string = data_type_map.GetName(record_header.record_type)
     value_string = '0x{0:04x} ({1:s})'.format(
         record_header.record_type, record_type_string or 'UNKNOWN')
     self._DebugPrintValue('Record type', value_string)
@@ -693,8 +693,10 @@ class WMFFile(data_format.BinaryDataFile):
       ParseError: if the header cannot be read.
     """
     file_offset = file_object.tell()
-    file_header = self._ReadStructure(
-        file_object, file_offset, self._HEADER_SIZE, self._HEADER, 'header')
+    data_type_map = self._GetDataTypeMap('wmf_header')
+
+    file_header, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'header')
 
     if self._debug:
       self._DebugPrintHeader(file_header)
@@ -707,6 +709,28 @@ class WMFFile(data_format.BinaryDataFile):
       raise errors.ParseError('Unsupported record size: {0:d}'.format(
           file_header.record_size))
 
+  def _ReadFileHeader(self, file_object):
+    """Reads the file header.
+
+    The file header consists of an optional placeable and the header.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file header cannot be read.
+    """
+    # Note that the signature is read into the read-ahead buffer, from which
+    # the placeable or header is read subsequently.
+    file_offset = file_object.tell()
+    signature = self._ReadData(file_object, file_offset, 4, 'file signature')
+    file_object.seek(file_offset, os.SEEK_SET)
+
+    if signature == self._WMF_PLACEABLE_SIGNATURE:
+      self._ReadPlaceable(file_object)
+
+    self._ReadHeader(file_object)
+
   def _ReadPlaceable(self, file_object):
     """Reads a placeable.
 
@@ -717,9 +741,10 @@ class WMFFile(data_format.BinaryDataFile):
       ParseError: if the placeable cannot be read.
     """
     file_offset = file_object.tell()
-    placeable = self._ReadStructure(
-        file_object, file_offset, self._PLACEABLE_SIZE, self._PLACEABLE,
-        'placeable')
+    data_type_map = self._GetDataTypeMap('wmf_placeable')
+
+    placeable, _ = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'placeable')
 
     if self._debug:
       self._DebugPrintPlaceable(placeable)
@@ -738,17 +763,18 @@ class WMFFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the record cannot be read.
     """
-    record_header = self._ReadStructure(
-        file_object, file_offset, self._RECORD_HEADER_SIZE, self._RECORD_HEADER,
-        'record header')
+    data_type_map = self._GetDataTypeMap('wmf_record_header')
+
+    record_header, record_header_size = self._ReadStructureFromFileObject(
+        file_object, file_offset, data_type_map, 'record header')
 
     if self._debug:
       self._DebugPrintRecordHeader(record_header)
 
     record_size = record_header.record_size * 2
 
-    data_offset = file_offset + self._RECORD_HEADER_SIZE
-    data_size = record_size - self._RECORD_HEADER_SIZE
+    data_offset = file_offset + record_header_size
+    data_size = record_size - record_header_size
 
     if self._debug:
       self._ReadRecordData(
@@ -774,10 +800,12 @@ class WMFFile(data_format.BinaryDataFile):
       self._DebugPrintData('Record data', record_data)
 
     # TODO: use lookup dict with callback.
-    data_type_map = self._WMF_RECORD_DATA_STRUCT_TYPES.get(record_type, None)
-    if not data_type_map:
+    data_type_name = self._WMF_RECORD_DATA_STRUCT_TYPES.get(record_type, None)
+    if not data_type_name:
       return
 
+    data_type_map = self._GetDataTypeMap(data_type_name)
+
     try:
       record = data_type_map.MapByteStream(record_data)
     except dtfabric_errors.MappingError as exception:
@@ -786,13 +814,15 @@ class WMFFile(data_format.BinaryDataFile):
 
     if self._debug:
       if record_type == 0x0103:
-        map_mode_string = self._MAP_MODE.GetName(record.map_mode)
+        data_type_map = self._GetDataTypeMap('wmf_map_mode')
+        map_mode_string = data_type_map.GetName(record.map_mode)
         value_string = '0x{0:04x} ({1:s})'.format(
             record.map_mode, map_mode_string or 'UNKNOWN')
         self._DebugPrintValue('Map mode', value_string)
 
       elif record_type == 0x0107:
-        stretch_mode_string = self._MAP_MODE.GetName(
+        data_type_map = self._GetDataTypeMap('wmf_map_mode')
+        stretch_mode_string = data_type_map.GetName(
             record.stretch_mode)
         value_string = '0x{0:04x} ({1:s})'.format(
             record.stretch_mode, stretch_mode_string or 'UNKNOWN')
@@ -843,30 +873,44 @@ class WMFFile(data_format.BinaryDataFile):
 
       self._DebugPrintText('\n')
 
-  def ReadFileObject(self, file_object):
-    """Reads a Windows Metafile Format (WMF) file-like object.
+  def _ReadRecords(self, file_object):
+    """Reads the records.
 
     Args:
       file_object (file): file-like object.
 
+    Yields:
+      Record: record.
+
     Raises:
-      ParseError: if the file cannot be read.
+      ParseError: if a record cannot be read.
     """
-    try:
-      signature = file_object.read(4)
-      file_object.seek(-4, os.SEEK_CUR)
-    except IOError as exception:
-      raise errors.ParseError(
-          'Unable to read file signature with error: {0!s}'.format(
-              exception))
-
-    if signature == self._WMF_PLACEABLE_SIGNATURE:
-      self._ReadPlaceable(file_object)
-
-    self._ReadHeader(file_object)
+    file_object.seek(0, os.SEEK_SET)
+    self._ReadFileHeader(file_object)
 
     file_offset = file_object.tell()
     while file_offset < self._file_size:
       record = self._ReadRecord(file_object, file_offset)
 
       file_offset += record.size
+
+      yield record
+
+  def ReadFileObject(self, file_object):
+    """Reads a Windows Metafile Format (WMF) file-like object.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file cannot be read.
+    """
+    if self._debug:
+      for _ in self._ReadRecords(file_object):
+        pass
+    else:
+      self._ReadFileHeader(file_object)
+
+
+format_registry.FormatRegistry.RegisterFormat('emf', EMFFile)
+format_registry.FormatRegistry.RegisterFormat('wmf', WMFFile)
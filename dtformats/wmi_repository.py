@@ -3,17 +3,47 @@
 
 from __future__ import unicode_literals
 
+import array
+import bisect
+import collections
 import datetime
 import glob
+import hashlib
+import json
 import logging
+import multiprocessing
 import os
+import re
+import struct
+
+try:
+  from concurrent import futures
+except ImportError:
+  futures = None
+
+try:
+  import sqlite3
+except ImportError:
+  sqlite3 = None
 
 from dtfabric import errors as dtfabric_errors
 from dtfabric.runtime import data_maps as dtfabric_data_maps
-from dtfabric.runtime import fabric as dtfabric_fabric
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import memory
+from dtformats import py2to3
+
+
+# The default maximum number of pages in the page cache of the index
+# binary-tree and the objects data files.
+DEFAULT_PAGE_CACHE_SIZE = 256
+
+# The CIM repositories opened by a worker process of the object record
+# extraction runner, per path and whether the index is opened. Note that
+# the repositories are only cached by worker processes, which are stopped
+# when the extraction finishes.
+_cim_repositories = {}
 
 
 def FromFiletime(filetime):
@@ -68,6 +98,7 @@ class IndexBinaryTreePage(object):
     keys (list[str]): index binary-tree keys.
     number_of_keys (int): number of keys.
     page_key_segments (list[bytes]): page key segments.
+    page_number (int): page number or None if not known.
     page_type (int): page type.
     page_value_offsets (list[int]): page value offsets.
     page_values (list[bytes]): page values.
@@ -81,6 +112,7 @@ class IndexBinaryTreePage(object):
     self.keys = []
     self.number_of_keys = None
     self.page_key_segments = []
+    self.page_number = None
     self.page_type = None
     self.page_value_offsets = None
     self.page_values = []
@@ -88,51 +120,86 @@ class IndexBinaryTreePage(object):
     self.sub_pages = []
 
 
-class ObjectRecord(data_format.BinaryDataFormat):
-  """Object record.
+class ClassDefinition(object):
+  """Class definition.
+
+  The property names, types, indexes and value offsets are stored in
+  parallel arrays instead of an object per property, to keep the cached
+  class definitions compact.
 
   Attributes:
-    data (bytes): object record data.
-    data_type (str): object record data type.
+    name (str): name of the class.
+    property_indexes (array.array): indexes of the properties.
+    property_names (list[str]): names of the properties.
+    property_types (array.array): types of the properties.
+    property_value_offsets (array.array): offsets of the values of the
+        properties, relative to the start of the property values data.
+    super_class_name (str): name of the super class or None if the class
+        has no super class.
   """
 
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'wmi_repository.yaml')
-
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
-
-  # TODO: replace streams by block type
-  # TODO: add more values.
+  def __init__(self, name=None, super_class_name=None):
+    """Initializes a class definition.
 
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
-
-  _CLASS_DEFINITION_HEADER = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'class_definition_header')
+    Args:
+      name (Optional[str]): name of the class.
+      super_class_name (Optional[str]): name of the super class.
+    """
+    super(ClassDefinition, self).__init__()
+    self.name = name
+    self.property_indexes = array.array('H')
+    self.property_names = []
+    self.property_types = array.array('L')
+    self.property_value_offsets = array.array('L')
+    self.super_class_name = super_class_name
+
+  @property
+  def number_of_properties(self):
+    """int: number of properties."""
+    return len(self.property_names)
+
+  def AddProperty(self, name, property_type, index, value_offset):
+    """Adds a property.
 
-  _CLASS_DEFINITION_OBJECT_RECORD = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'class_definition_object_record')
+    Args:
+      name (str): name of the property.
+      property_type (int): type of the property.
+      index (int): index of the property.
+      value_offset (int): offset of the value of the property, relative to
+          the start of the property values data.
+    """
+    self.property_indexes.append(index)
+    self.property_names.append(name)
+    self.property_types.append(property_type)
+    self.property_value_offsets.append(value_offset)
 
-  _CLASS_DEFINITION_METHODS = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'class_definition_methods')
+  def GetProperties(self):
+    """Retrieves the properties.
 
-  _SUPER_CLASS_NAME_BLOCK = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'super_class_name_block')
+    Yields:
+      tuple[str, int, int, int]: name, type, index and value offset of
+          the property.
+    """
+    for property_index in range(len(self.property_names)):
+      yield (
+          self.property_names[property_index],
+          self.property_types[property_index],
+          self.property_indexes[property_index],
+          self.property_value_offsets[property_index])
 
-  _PROPERTY_NAME = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'property_name')
 
-  _PROPERTY_DEFINITION = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'property_definition')
+class ObjectRecord(data_format.BinaryDataFormat):
+  """Object record.
 
-  _INTERFACE_OBJECT_RECORD = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'interface_object_record')
+  Attributes:
+    data (bytes): object record data.
+    data_type (str): object record data type.
+  """
 
-  _REGISTRATION_OBJECT_RECORD = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'registration_object_record')
+  _DEFINITION_FILE = 'wmi_repository.yaml'
 
-  _PROPERTY_TYPES = _DATA_TYPE_FABRIC.CreateDataTypeMap('cim_property_types')
+  # TODO: replace streams by block type
+  # TODO: add more values.
 
   # A size of 0 indicates variable of size.
   _PROPERTY_TYPE_VALUE_SIZES = {
@@ -154,8 +221,36 @@ class ObjectRecord(data_format.BinaryDataFormat):
       0x00000067: 2,
   }
 
+  # Struct formats of the property values that are stored in the property
+  # values data. Values of the other property types are stored in the
+  # property heap and referenced by a 32-bit offset.
+  _PROPERTY_TYPE_STRUCT_FORMATS = {
+      0x00000002: '<h',
+      0x00000003: '<i',
+      0x00000004: '<f',
+      0x00000005: '<d',
+      0x0000000b: '<H',
+      0x00000010: '<b',
+      0x00000011: '<B',
+      0x00000012: '<H',
+      0x00000013: '<I',
+      0x00000014: '<q',
+      0x00000015: '<Q',
+      0x00000067: '<H',
+  }
+
+  _PROPERTY_TYPE_ARRAY_FLAG = 0x00002000
+
+  _PROPERTY_TYPE_BOOLEAN = 0x0000000b
+
+  _PROPERTY_TYPE_CHAR16 = 0x00000067
+
+  _PROPERTY_TYPE_OBJECT = 0x0000000d
+
   DATA_TYPE_CLASS_DEFINITION = 'CD'
 
+  DATA_TYPES_INSTANCE = frozenset(['I', 'IL'])
+
   def __init__(self, data_type, data, debug=False, output_writer=None):
     """Initializes an object record.
 
@@ -169,32 +264,64 @@ class ObjectRecord(data_format.BinaryDataFormat):
     self.data = data
     self.data_type = data_type
 
+  def _FormatPropertyValue(self, property_type, value):
+    """Formats a property value stored in the property values data.
+
+    Args:
+      property_type (int): property type, without the array flag.
+      value (int|float): value as unpacked from the property values data.
+
+    Returns:
+      object: property value.
+    """
+    if property_type == self._PROPERTY_TYPE_BOOLEAN:
+      return value != 0
+
+    if property_type == self._PROPERTY_TYPE_CHAR16:
+      return py2to3.UNICHR(value)
+
+    return value
+
+  def _GetPropertyValueStructFormat(self, property_type):
+    """Retrieves the struct format of a property value.
+
+    Args:
+      property_type (int): property type.
+
+    Returns:
+      str: struct format of the value stored in the property values data.
+    """
+    if property_type & self._PROPERTY_TYPE_ARRAY_FLAG:
+      return '<I'
+
+    return self._PROPERTY_TYPE_STRUCT_FORMATS.get(
+        property_type & 0x00001fff, '<I')
+
   def _ReadClassDefinition(self, object_record_data):
     """Reads a class definition object record.
 
     Args:
       object_record_data (bytes): object record data.
 
+    Returns:
+      ClassDefinition: class definition.
+
     Raises:
       ParseError: if the object record cannot be read.
     """
     if self._debug:
       self._DebugPrintText('Reading class definition object record.\n')
 
+    data_type_map = self._GetDataTypeMap('class_definition_object_record')
+
     try:
-      class_definition = self._CLASS_DEFINITION_OBJECT_RECORD.MapByteStream(
-          object_record_data)
+      class_definition = data_type_map.MapByteStream(object_record_data)
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
           'Unable to parse class definition object record with '
-          'error: {0:s}').format(exception))
-
-    try:
-      utf16_stream = class_definition.super_class_name
-      super_class_name = utf16_stream.decode('utf-16-le')
-    except UnicodeDecodeError as exception:
-      super_class_name = ''
+          'error: {0!s}').format(exception))
 
+    super_class_name = class_definition.super_class_name
     super_class_name_size = class_definition.super_class_name_size
     date_time = class_definition.date_time
     data_size = class_definition.data_size
@@ -212,7 +339,9 @@ class ObjectRecord(data_format.BinaryDataFormat):
 
       self._DebugPrintData('Data', class_definition.data)
 
-    self._ReadClassDefinitionHeader(class_definition.data)
+    class_definition_object = self._ReadClassDefinitionHeader(
+        class_definition.data)
+    class_definition_object.super_class_name = super_class_name or None
 
     data_offset = 12 + (super_class_name_size * 2) + data_size
     if data_offset < len(object_record_data):
@@ -221,24 +350,31 @@ class ObjectRecord(data_format.BinaryDataFormat):
 
       self._ReadClassDefinitionMethods(object_record_data[data_offset:])
 
+    return class_definition_object
+
   def _ReadClassDefinitionHeader(self, class_definition_data):
     """Reads a class definition header.
 
     Args:
       class_definition_data (bytes): class definition data.
 
+    Returns:
+      ClassDefinition: class definition without super class name.
+
     Raises:
       ParseError: if the class definition cannot be read.
     """
     if self._debug:
       self._DebugPrintText('Reading class definition header.\n')
 
+    data_type_map = self._GetDataTypeMap('class_definition_header')
+
     try:
-      class_definition_header = self._CLASS_DEFINITION_HEADER.MapByteStream(
+      class_definition_header = data_type_map.MapByteStream(
           class_definition_data)
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
-          'Unable to parse class definition header with error: {0:s}').format(
+          'Unable to parse class definition header with error: {0!s}').format(
               exception))
 
     number_of_property_descriptors = (
@@ -330,8 +466,21 @@ class ObjectRecord(data_format.BinaryDataFormat):
 
     properties_block_data = (
         class_definition_header.properties_block_data)
+
+    class_name = self._ReadHeapString(
+        properties_block_data,
+        class_definition_header.class_name_offset & 0x7fffffff)
+
+    if self._debug:
+      self._DebugPrintValue('Class name', class_name)
+      self._DebugPrintText('\n')
+
+    class_definition = ClassDefinition(name=class_name)
+
     self._ReadClassDefinitionProperties(
-        properties_block_data, property_descriptors)
+        properties_block_data, property_descriptors, class_definition)
+
+    return class_definition
 
   def _ReadClassDefinitionMethods(self, class_definition_data):
     """Reads a class definition methods.
@@ -345,12 +494,14 @@ class ObjectRecord(data_format.BinaryDataFormat):
     if self._debug:
       self._DebugPrintText('Reading class definition methods.\n')
 
+    data_type_map = self._GetDataTypeMap('class_definition_methods')
+
     try:
-      class_definition_methods = self._CLASS_DEFINITION_METHODS.MapByteStream(
+      class_definition_methods = data_type_map.MapByteStream(
           class_definition_data)
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
-          'Unable to parse class definition methods with error: {0:s}').format(
+          'Unable to parse class definition methods with error: {0!s}').format(
               exception))
 
     methods_block_size = class_definition_methods.methods_block_size
@@ -362,15 +513,17 @@ class ObjectRecord(data_format.BinaryDataFormat):
 
       self._DebugPrintData(
           'Methods block data',
-          class_definition_methods.methods_block_data)
+          class_definition_methods.data)
 
   def _ReadClassDefinitionProperties(
-      self, properties_data, property_descriptors):
+      self, properties_data, property_descriptors, class_definition):
     """Reads class definition properties.
 
     Args:
       properties_data (bytes): class definition properties data.
       property_descriptors (list[PropertyDescriptor]): property descriptors.
+      class_definition (ClassDefinition): class definition to which
+          the properties are added.
 
     Raises:
       ParseError: if the class definition properties cannot be read.
@@ -381,15 +534,19 @@ class ObjectRecord(data_format.BinaryDataFormat):
     if self._debug:
       self._DebugPrintData('Properties data', properties_data)
 
+    property_name_map = self._GetDataTypeMap('property_name')
+    property_definition_map = self._GetDataTypeMap('property_definition')
+    property_types_map = self._GetDataTypeMap('cim_property_types')
+
     for index, property_descriptor in enumerate(property_descriptors):
       name_offset = property_descriptor.name_offset & 0x7fffffff
       property_name_data = properties_data[name_offset:]
 
       try:
-        property_name = self._PROPERTY_NAME.MapByteStream(property_name_data)
+        property_name = property_name_map.MapByteStream(property_name_data)
       except dtfabric_errors.MappingError as exception:
         raise errors.ParseError(
-            'Unable to parse property name with error: {0:s}'.format(
+            'Unable to parse property name with error: {0!s}'.format(
                 exception))
 
       string_flags = property_name.string_flags
@@ -409,15 +566,19 @@ class ObjectRecord(data_format.BinaryDataFormat):
       property_definition_data = properties_data[definition_offset:]
 
       try:
-        property_definition = self._PROPERTY_DEFINITION.MapByteStream(
+        property_definition = property_definition_map.MapByteStream(
             property_definition_data)
       except dtfabric_errors.MappingError as exception:
         raise errors.ParseError(
-            'Unable to parse property definition with error: {0:s}'.format(
+            'Unable to parse property definition with error: {0!s}'.format(
                 exception))
 
+      class_definition.AddProperty(
+          property_name.string, property_definition.type,
+          property_definition.index, property_definition.offset)
+
       if self._debug:
-        property_type_string = self._PROPERTY_TYPES.GetName(
+        property_type_string = property_types_map.GetName(
             property_definition.type)
         description = 'Property: {0:d} type'.format(index)
         value_string = '0x{0:08x} ({1:s})'.format(
@@ -461,6 +622,211 @@ class ObjectRecord(data_format.BinaryDataFormat):
           self._DebugPrintData(
               description, property_value_data[:property_value_size])
 
+  def _ReadHeapArray(self, property_type, heap_data, heap_offset):
+    """Reads an array property value from the property heap.
+
+    Args:
+      property_type (int): property type of the array elements.
+      heap_data (bytes): property heap data.
+      heap_offset (int): offset of the array relative to the start of
+          the property heap.
+
+    Returns:
+      list[object]: array values or None if not supported.
+
+    Raises:
+      ParseError: if the array cannot be read.
+    """
+    if property_type == self._PROPERTY_TYPE_OBJECT:
+      # TODO: add support for embedded objects.
+      return None
+
+    heap_data_size = len(heap_data)
+    if heap_offset + 4 > heap_data_size:
+      raise errors.ParseError(
+          'Array offset: 0x{0:08x} exceeds property heap size.'.format(
+              heap_offset))
+
+    number_of_elements = struct.unpack_from('<I', heap_data, heap_offset)[0]
+
+    struct_format = self._GetPropertyValueStructFormat(property_type)
+    element_size = struct.calcsize(struct_format)
+
+    elements_offset = heap_offset + 4
+    if elements_offset + (number_of_elements * element_size) > heap_data_size:
+      raise errors.ParseError(
+          'Array: 0x{0:08x} elements exceed property heap size.'.format(
+              heap_offset))
+
+    values = []
+    for element_index in range(number_of_elements):
+      value = struct.unpack_from(
+          struct_format, heap_data,
+          elements_offset + (element_index * element_size))[0]
+
+      if property_type in self._PROPERTY_TYPE_STRUCT_FORMATS:
+        value = self._FormatPropertyValue(property_type, value)
+      else:
+        value = self._ReadHeapString(heap_data, value)
+
+      values.append(value)
+
+    return values
+
+  def _ReadHeapString(self, heap_data, heap_offset):
+    """Reads a string from the property heap.
+
+    A string is stored as a flags byte followed by an end-of-string
+    terminated string, which is a 16-bit little-endian Unicode string if
+    the flags are 1 and an 8-bit extended ASCII string otherwise.
+
+    Args:
+      heap_data (bytes): property heap data.
+      heap_offset (int): offset of the string relative to the start of
+          the property heap.
+
+    Returns:
+      str: string.
+
+    Raises:
+      ParseError: if the string cannot be read.
+    """
+    if heap_offset >= len(heap_data):
+      raise errors.ParseError(
+          'String offset: 0x{0:08x} exceeds property heap size.'.format(
+              heap_offset))
+
+    string_flags = bytearray(heap_data[heap_offset:heap_offset + 1])[0]
+    string_offset = heap_offset + 1
+
+    if string_flags == 1:
+      string_end_offset = string_offset
+      while string_end_offset + 1 < len(heap_data):
+        if heap_data[string_end_offset:string_end_offset + 2] == b'\x00\x00':
+          break
+        string_end_offset += 2
+
+      string_data = heap_data[string_offset:string_end_offset]
+      encoding = 'utf-16-le'
+
+    else:
+      string_end_offset = heap_data.find(b'\x00', string_offset)
+      if string_end_offset == -1:
+        string_end_offset = len(heap_data)
+
+      string_data = heap_data[string_offset:string_end_offset]
+      encoding = 'latin-1'
+
+    try:
+      return string_data.decode(encoding)
+    except UnicodeDecodeError as exception:
+      raise errors.ParseError(
+          'Unable to decode string at offset: 0x{0:08x} with error: '
+          '{1!s}'.format(heap_offset, exception))
+
+  def _ReadInstance(self, object_record_data, class_definition):
+    """Reads an instance object record.
+
+    Args:
+      object_record_data (bytes): object record data.
+      class_definition (ClassDefinition): class definition of the instance,
+          including the properties of the super classes.
+
+    Returns:
+      collections.OrderedDict[str, object]: property values of the instance
+          per property name, in order of property index, where None
+          represents a NULL or unsupported value.
+
+    Raises:
+      ParseError: if the object record cannot be read.
+    """
+    data_type_map = self._GetDataTypeMap('interface_object_record')
+
+    instance = self._ReadStructureFromByteStream(
+        object_record_data, 0, data_type_map, 'instance object record')
+
+    instance_block_data = instance.data
+
+    data_type_map = self._GetDataTypeMap('instance_block_header')
+    context = dtfabric_data_maps.DataTypeMapContext()
+
+    instance_block_header = self._ReadStructureFromByteStream(
+        instance_block_data, 0, data_type_map, 'instance block header',
+        context=context)
+
+    properties = sorted(
+        class_definition.GetProperties(),
+        key=lambda property_values: property_values[2])
+
+    # Every property has 2 state bits, which are stored in a byte aligned
+    # block that precedes the property values data.
+    property_states_offset = context.byte_size
+    property_states_size = ((len(properties) * 2) + 7) // 8
+    property_states_data = bytearray(instance_block_data[
+        property_states_offset:property_states_offset + property_states_size])
+
+    property_values_offset = property_states_offset + property_states_size
+    property_values_size = 0
+    for _, property_type, _, value_offset in properties:
+      struct_format = self._GetPropertyValueStructFormat(property_type)
+      property_values_size = max(
+          property_values_size, value_offset + struct.calcsize(struct_format))
+
+    property_values_data = instance_block_data[
+        property_values_offset:property_values_offset + property_values_size]
+
+    data_offset = property_values_offset + property_values_size
+    if data_offset + 4 > len(instance_block_data):
+      raise errors.ParseError('Instance block data too small.')
+
+    qualifiers_block_size = struct.unpack_from(
+        '<I', instance_block_data, data_offset)[0]
+
+    # The qualifiers block is followed by an unknown byte and the property
+    # heap size.
+    data_offset += qualifiers_block_size + 1
+    if data_offset + 4 > len(instance_block_data):
+      raise errors.ParseError('Instance block data too small.')
+
+    property_heap_size = struct.unpack_from(
+        '<I', instance_block_data, data_offset)[0] & 0x7fffffff
+    data_offset += 4
+
+    property_heap_data = instance_block_data[
+        data_offset:data_offset + property_heap_size]
+
+    if self._debug:
+      class_name = self._ReadHeapString(
+          property_heap_data,
+          instance_block_header.class_name_offset & 0x7fffffff)
+      self._DebugPrintValue('Class name', class_name)
+
+      self._DebugPrintData('Property states data', property_states_data)
+      self._DebugPrintData('Property values data', property_values_data)
+      self._DebugPrintData('Property heap data', property_heap_data)
+
+    property_values = collections.OrderedDict()
+    for index, (name, property_type, _, value_offset) in enumerate(
+        properties):
+      property_state_byte_index, property_state_bit_index = divmod(
+          index * 2, 8)
+
+      property_state = 0
+      if property_state_byte_index < len(property_states_data):
+        property_state = (
+            property_states_data[property_state_byte_index] >>
+            property_state_bit_index) & 0x03
+
+      if property_state & 0x01:
+        property_values[name] = None
+        continue
+
+      property_values[name] = self._ReadPropertyValue(
+          property_type, property_values_data, value_offset,
+          property_heap_data)
+
+    return property_values
+
   def _ReadInterface(self, object_record_data):
     """Reads an interface object record.
 
@@ -473,12 +839,14 @@ class ObjectRecord(data_format.BinaryDataFormat):
     if self._debug:
       self._DebugPrintText('Reading interface object record.\n')
 
+    data_type_map = self._GetDataTypeMap('interface_object_record')
+
     try:
-      interface = self._INTERFACE_OBJECT_RECORD.MapByteStream(
+      interface = data_type_map.MapByteStream(
           object_record_data)
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError(
-          'Unable to parse interace object record with error: {0:s}'.format(
+          'Unable to parse interace object record with error: {0!s}'.format(
               exception))
 
     try:
@@ -502,6 +870,49 @@ class ObjectRecord(data_format.BinaryDataFormat):
 
       self._DebugPrintData('Data', interface.data)
 
+  def _ReadPropertyValue(
+      self, property_type, property_values_data, value_offset, heap_data):
+    """Reads a property value.
+
+    Args:
+      property_type (int): property type.
+      property_values_data (bytes): property values data.
+      value_offset (int): offset of the property value relative to the start
+          of the property values data.
+      heap_data (bytes): property heap data.
+
+    Returns:
+      object: property value or None if not supported.
+
+    Raises:
+      ParseError: if the property value cannot be read.
+    """
+    struct_format = self._GetPropertyValueStructFormat(property_type)
+    value_size = struct.calcsize(struct_format)
+
+    value_data = property_values_data[value_offset:value_offset + value_size]
+    if len(value_data) != value_size:
+      raise errors.ParseError(
+          'Property value offset: 0x{0:08x} exceeds values data size.'.format(
+              value_offset))
+
+    value = struct.unpack(struct_format, value_data)[0]
+
+    value_type = property_type & 0x00001fff
+    if property_type & self._PROPERTY_TYPE_ARRAY_FLAG:
+      return self._ReadHeapArray(value_type, heap_data, value)
+
+    if value_type in self._PROPERTY_TYPE_STRUCT_FORMATS:
+      return self._FormatPropertyValue(value_type, value)
+
+    if value_type == self._PROPERTY_TYPE_OBJECT:
+      # TODO: add support for embedded objects.
+      return None
+
+    # Strings, date and time strings and references are stored in
+    # the property heap.
+    return self._ReadHeapString(heap_data, value)
+
   def _ReadRegistration(self, object_record_data):
     """Reads a registration object record.
 
@@ -514,13 +925,15 @@ class ObjectRecord(data_format.BinaryDataFormat):
     if self._debug:
       self._DebugPrintText('Reading registration object record.\n')
 
+    data_type_map = self._GetDataTypeMap('registration_object_record')
+
     try:
-      registration = self._REGISTRATION_OBJECT_RECORD.MapByteStream(
+      registration = data_type_map.MapByteStream(
           object_record_data)
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
           'Unable to parse registration object record with '
-          'error: {0:s}').format(exception))
+          'error: {0!s}').format(exception))
 
     try:
       utf16_stream = registration.name_space_string
@@ -579,34 +992,58 @@ class ObjectRecord(data_format.BinaryDataFormat):
     if self._debug:
       if self.data_type == self.DATA_TYPE_CLASS_DEFINITION:
         self._ReadClassDefinition(self.data)
-      elif self.data_type in ('I', 'IL'):
+      elif self.data_type in self.DATA_TYPES_INSTANCE:
         self._ReadInterface(self.data)
       elif self.data_type == 'R':
         self._ReadRegistration(self.data)
 
+  def ReadClassDefinition(self):
+    """Reads the class definition of a class definition object record.
 
-class ObjectsDataPage(data_format.BinaryDataFormat):
-  """An objects data page.
+    Returns:
+      ClassDefinition: class definition, which only contains the properties
+          defined by the class and not those of its super classes.
 
-  Attributes:
-    page_offset (int): page offset or None.
-  """
+    Raises:
+      ParseError: if the object record is not a class definition or
+          cannot be read.
+    """
+    if self.data_type != self.DATA_TYPE_CLASS_DEFINITION:
+      raise errors.ParseError(
+          'Unsupported object record data type: {0:s}'.format(self.data_type))
+
+    return self._ReadClassDefinition(self.data)
+
+  def ReadInstance(self, class_definition):
+    """Reads the property values of an instance object record.
+
+    Args:
+      class_definition (ClassDefinition): class definition of the instance,
+          including the properties of the super classes.
+
+    Returns:
+      collections.OrderedDict[str, object]: property values of the instance
+          per property name, in order of property index, where None
+          represents a NULL or unsupported value.
 
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'wmi_repository.yaml')
+    Raises:
+      ParseError: if the object record is not an instance or cannot be read.
+    """
+    if self.data_type not in self.DATA_TYPES_INSTANCE:
+      raise errors.ParseError(
+          'Unsupported object record data type: {0:s}'.format(self.data_type))
 
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
+    return self._ReadInstance(self.data, class_definition)
 
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
 
-  _OBJECT_DESCRIPTOR = _DATA_TYPE_FABRIC.CreateDataTypeMap(
-      'cim_object_descriptor')
+class ObjectsDataPage(data_format.BinaryDataFormat):
+  """An objects data page.
 
-  _OBJECT_DESCRIPTOR_SIZE = _OBJECT_DESCRIPTOR.GetByteSize()
+  Attributes:
+    page_offset (int): page offset or None.
+  """
 
-  _EMPTY_OBJECT_DESCRIPTOR = b'\x00' * _OBJECT_DESCRIPTOR_SIZE
+  _DEFINITION_FILE = 'wmi_repository.yaml'
 
   PAGE_SIZE = 8192
 
@@ -619,7 +1056,7 @@ class ObjectsDataPage(data_format.BinaryDataFormat):
     """
     super(ObjectsDataPage, self).__init__(
         debug=debug, output_writer=output_writer)
-    self._object_descriptors = []
+    self._object_descriptors = {}
 
     self.page_offset = None
 
@@ -641,21 +1078,24 @@ class ObjectsDataPage(data_format.BinaryDataFormat):
           'Reading object descriptor at offset: 0x{0:08x}\n'.format(
               file_offset))
 
-    object_descriptor_data = file_object.read(self._OBJECT_DESCRIPTOR_SIZE)
+    data_type_map = self._GetDataTypeMap('cim_object_descriptor')
+    object_descriptor_size = data_type_map.GetByteSize()
+
+    object_descriptor_data = file_object.read(object_descriptor_size)
 
     if self._debug:
       self._DebugPrintData('Object descriptor data', object_descriptor_data)
 
     # The last object descriptor (terminator) is filled with 0-byte values.
-    if object_descriptor_data == self._EMPTY_OBJECT_DESCRIPTOR:
+    if object_descriptor_data == b'\x00' * object_descriptor_size:
       return None
 
     try:
-      object_descriptor = self._OBJECT_DESCRIPTOR.MapByteStream(
+      object_descriptor = data_type_map.MapByteStream(
           object_descriptor_data)
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError(
-          'Unable to parse object descriptor with error: {0:s}'.format(
+          'Unable to parse object descriptor with error: {0!s}'.format(
               exception))
 
     if self._debug:
@@ -679,6 +1119,10 @@ class ObjectsDataPage(data_format.BinaryDataFormat):
   def _ReadObjectDescriptors(self, file_object):
     """Reads object descriptors.
 
+    The object descriptors are stored by record identifier, where the first
+    object descriptor is used if a record identifier is defined more than
+    once.
+
     Args:
       file_object (file): a file-like object.
 
@@ -690,7 +1134,8 @@ class ObjectsDataPage(data_format.BinaryDataFormat):
       if not object_descriptor:
         break
 
-      self._object_descriptors.append(object_descriptor)
+      self._object_descriptors.setdefault(
+          object_descriptor.identifier, object_descriptor)
 
   def GetObjectDescriptor(self, record_identifier, data_size):
     """Retrieves a specific object descriptor.
@@ -702,21 +1147,16 @@ class ObjectsDataPage(data_format.BinaryDataFormat):
     Returns:
       cim_object_descriptor: an object descriptor or None.
     """
-    object_descriptor_match = None
-    for object_descriptor in self._object_descriptors:
-      if object_descriptor.identifier == record_identifier:
-        object_descriptor_match = object_descriptor
-        break
-
-    if not object_descriptor_match:
+    object_descriptor = self._object_descriptors.get(record_identifier, None)
+    if not object_descriptor:
       logging.warning('Object record data not found.')
       return None
 
-    if object_descriptor_match.data_size != data_size:
+    if object_descriptor.data_size != data_size:
       logging.warning('Object record data size mismatch.')
       return None
 
-    return object_descriptor_match
+    return object_descriptor
 
   def ReadPage(self, file_object, file_offset, data_page=False):
     """Reads a page.
@@ -776,33 +1216,17 @@ class ObjectsDataPage(data_format.BinaryDataFormat):
 
 
 class IndexBinaryTreeFile(data_format.BinaryDataFile):
-  """Index binary-tree (Index.btr) file."""
-
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'wmi_repository.yaml')
-
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
-
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
+  """Index binary-tree (Index.btr) file.
 
-  _UINT16LE = _DATA_TYPE_FABRIC.CreateDataTypeMap('uint16le')
+  Attributes:
+    page_cache (LRUCache): cache of the index binary-tree pages, keyed by
+        mapped page number.
+  """
 
-  _UINT16LE_SIZE = _UINT16LE.GetByteSize()
+  _DEFINITION_FILE = 'wmi_repository.yaml'
 
   _PAGE_SIZE = 8192
 
-  _PAGE_HEADER = _DATA_TYPE_FABRIC.CreateDataTypeMap('cim_page_header')
-
-  _PAGE_HEADER_SIZE = _PAGE_HEADER.GetByteSize()
-
-  _PAGE_BODY = _DATA_TYPE_FABRIC.CreateDataTypeMap('cim_page_body')
-
-  _PAGE_KEY = _DATA_TYPE_FABRIC.CreateDataTypeMap('cim_page_key')
-
-  _STRING = _DATA_TYPE_FABRIC.CreateDataTypeMap('string')
-
   _PAGE_TYPES = {
       0xaccc: 'Is active',
       0xaddd: 'Is administrative',
@@ -811,13 +1235,17 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
 
   _KEY_SEGMENT_SEPARATOR = '\\'
 
-  def __init__(self, index_mapping_file, debug=False, output_writer=None):
+  def __init__(
+      self, index_mapping_file, debug=False, output_writer=None,
+      page_cache_size=DEFAULT_PAGE_CACHE_SIZE):
     """Initializes an index binary-tree file.
 
     Args:
       index_mapping_file (MappingFile): an index mapping file.
       debug (Optional[bool]): True if debug information should be written.
       output_writer (Optional[OutputWriter]): output writer.
+      page_cache_size (Optional[int]): maximum number of pages in the page
+          cache, where 0 disables the page cache.
     """
     super(IndexBinaryTreeFile, self).__init__(
         debug=debug, output_writer=output_writer)
@@ -825,6 +1253,9 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
     self._first_mapped_page = None
     self._root_page = None
 
+    self.page_cache = memory.LRUCache(
+        page_cache_size, memory_budget=self._memory_budget)
+
   def _DebugPrintPageBody(self, page_body):
     """Prints page body debug information.
 
@@ -922,8 +1353,14 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
     if file_offset >= self._file_size:
       return None
 
-    # TODO: cache pages.
-    return self._ReadPage(self._file_object, file_offset)
+    index_page = self.page_cache.GetValue(page_number)
+    if not index_page:
+      index_page = self._ReadPage(self._file_object, file_offset)
+
+      # The size of a parsed page is approximated by the size of the page.
+      self.page_cache.SetValue(page_number, index_page, size=self._PAGE_SIZE)
+
+    return index_page
 
   def _ReadPage(self, file_object, file_offset):
     """Reads a page.
@@ -941,12 +1378,14 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
     page_data = self._ReadData(
         file_object, file_offset, self._PAGE_SIZE, 'index binary-tree page')
 
+    data_type_map = self._GetDataTypeMap('cim_page_header')
+    page_header_size = data_type_map.GetByteSize()
+
     if self._debug:
-      self._DebugPrintData(
-          'Page header data', page_data[:self._PAGE_HEADER_SIZE])
+      self._DebugPrintData('Page header data', page_data[:page_header_size])
 
     try:
-      page_header = self._PAGE_HEADER.MapByteStream(page_data)
+      page_header = data_type_map.MapByteStream(page_data)
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
           'Unable to map page header data at offset: 0x{0:08x} with error: '
@@ -959,13 +1398,14 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
     index_binary_tree_page.page_type = page_header.page_type
     index_binary_tree_page.root_page_number = page_header.root_page_number
 
-    page_data_size = self._PAGE_HEADER_SIZE
+    page_data_size = page_header_size
     if page_header.page_type == 0xaccc:
+      data_type_map = self._GetDataTypeMap('cim_page_body')
       context = dtfabric_data_maps.DataTypeMapContext()
 
       try:
-        page_body = self._PAGE_BODY.MapByteStream(
-            page_data[self._PAGE_HEADER_SIZE:], context=context)
+        page_body = data_type_map.MapByteStream(
+            page_data[page_header_size:], context=context)
       except dtfabric_errors.MappingError as exception:
         raise errors.ParseError((
             'Unable to map page body data at offset: 0x{0:08x} with error: '
@@ -975,7 +1415,7 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
 
       if self._debug:
         self._DebugPrintData(
-            'Page body data', page_data[self._PAGE_HEADER_SIZE:page_data_size])
+            'Page body data', page_data[page_header_size:page_data_size])
 
       if self._debug:
         self._DebugPrintPageBody(page_body)
@@ -1024,6 +1464,8 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
     """
     key_data = page_body.key_data
 
+    data_type_map = self._GetDataTypeMap('cim_page_key')
+
     for index, key_offset in enumerate(page_body.key_offsets):
       page_key_offset = key_offset * 2
 
@@ -1033,7 +1475,7 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
         self._DebugPrintValue(description, value_string)
 
       try:
-        page_key = self._PAGE_KEY.MapByteStream(key_data[page_key_offset:])
+        page_key = data_type_map.MapByteStream(key_data[page_key_offset:])
       except dtfabric_errors.MappingError as exception:
         raise errors.ParseError(
             'Unable to parse page key: {0:d} with error: {1:s}'.format(
@@ -1072,12 +1514,14 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
     """
     value_data = page_body.value_data
 
+    data_type_map = self._GetDataTypeMap('string')
+
     for index, page_value_offset in enumerate(
         index_binary_tree_page.page_value_offsets):
       # TODO: determine size
 
       try:
-        value_string = self._STRING.MapByteStream(
+        value_string = data_type_map.MapByteStream(
             value_data[page_value_offset:])
       except dtfabric_errors.MappingError as exception:
         raise errors.ParseError((
@@ -1093,6 +1537,13 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
     if self._debug and index_binary_tree_page.page_value_offsets:
       self._DebugPrintText('\n')
 
+  def Close(self):
+    """Closes the index binary-tree file."""
+    super(IndexBinaryTreeFile, self).Close()
+    self.page_cache.Clear()
+    self._first_mapped_page = None
+    self._root_page = None
+
   def GetFirstMappedPage(self):
     """Retrieves the first mapped page.
 
@@ -1109,6 +1560,8 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
             '{0:d}.').format(page_number))
         return None
 
+      index_page.page_number = 0
+
       if index_page.page_type != 0xaddd:
         logging.warning('First mapped index binary-tree page type mismatch.')
         return None
@@ -1135,8 +1588,50 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
               page_number))
       return None
 
+    index_page.page_number = page_number
     return index_page
 
+  def GetMappedPages(self, page_numbers):
+    """Retrieves specific mapped pages.
+
+    The pages are read in order of their mapped page number, such that
+    the pages are read sequentially from the file instead of in logical
+    order.
+
+    Args:
+      page_numbers (list[int]): page numbers.
+
+    Returns:
+      list[IndexBinaryTreePage]: index binary-tree pages, in order of the page
+          numbers, where None represents a page that could not be read.
+    """
+    mappings = self._index_mapping_file.mappings
+    number_of_mappings = len(mappings)
+
+    mapped_page_numbers = []
+    for index, page_number in enumerate(page_numbers):
+      if page_number >= number_of_mappings:
+        logging.warning(
+            'Index binary-tree page: {0:d} has no mapping.'.format(
+                page_number))
+        continue
+
+      mapped_page_numbers.append((mappings[page_number], index))
+
+    index_pages = [None] * len(page_numbers)
+    for mapped_page_number, index in sorted(mapped_page_numbers):
+      index_page = self._GetPage(mapped_page_number)
+      if not index_page:
+        logging.warning(
+            'Unable to read index binary-tree mapped page: {0:d}.'.format(
+                page_numbers[index]))
+      else:
+        index_page.page_number = page_numbers[index]
+
+      index_pages[index] = index_page
+
+    return index_pages
+
   def GetRootPage(self):
     """Retrieves the root page.
 
@@ -1148,8 +1643,8 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
       if not first_mapped_page:
         return None
 
-      page_number = self._index_mapping_file.mappings[
-          first_mapped_page.root_page_number]
+      root_page_number = first_mapped_page.root_page_number
+      page_number = self._index_mapping_file.mappings[root_page_number]
 
       index_page = self._GetPage(page_number)
       if not index_page:
@@ -1158,6 +1653,7 @@ class IndexBinaryTreeFile(data_format.BinaryDataFile):
                 page_number))
         return None
 
+      index_page.page_number = root_page_number
       self._root_page = index_page
 
     return self._root_page
@@ -1187,33 +1683,12 @@ class MappingFile(data_format.BinaryDataFile):
         or objects data file.
   """
 
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'wmi_repository.yaml')
-
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
-
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
-
-  _UINT32LE = _DATA_TYPE_FABRIC.CreateDataTypeMap('uint32le')
-
-  _UINT32LE_SIZE = _UINT32LE.GetByteSize()
+  _DEFINITION_FILE = 'wmi_repository.yaml'
 
   _FILE_HEADER_SIGNATURE = 0x0000abcd
 
-  _FILE_HEADER = _DATA_TYPE_FABRIC.CreateDataTypeMap('cim_map_header')
-
-  _FILE_HEADER_SIZE = _FILE_HEADER.GetByteSize()
-
   _FILE_FOOTER_SIGNATURE = 0x0000dcba
 
-  _FILE_FOOTER = _DATA_TYPE_FABRIC.CreateDataTypeMap('cim_map_footer')
-
-  _FILE_FOOTER_SIZE = _FILE_FOOTER.GetByteSize()
-
-  _PAGE_NUMBERS = _DATA_TYPE_FABRIC.CreateDataTypeMap('cim_map_page_numbers')
-
   def __init__(self, debug=False, output_writer=None):
     """Initializes a mappings file.
 
@@ -1301,8 +1776,10 @@ class MappingFile(data_format.BinaryDataFile):
     """
     file_offset = file_object.tell()
 
+    data_type_map = self._GetDataTypeMap('cim_map_footer')
+
     file_footer = self._ReadStructure(
-        file_object, file_offset, self._FILE_FOOTER_SIZE, self._FILE_FOOTER,
+        file_object, file_offset, data_type_map.GetByteSize(), data_type_map,
         'file footer')
 
     if self._debug:
@@ -1324,8 +1801,10 @@ class MappingFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the file header cannot be read.
     """
+    data_type_map = self._GetDataTypeMap('cim_map_header')
+
     file_header = self._ReadStructure(
-        file_object, file_offset, self._FILE_HEADER_SIZE, self._FILE_HEADER,
+        file_object, file_offset, data_type_map.GetByteSize(), data_type_map,
         'file header')
 
     if self._debug:
@@ -1371,6 +1850,9 @@ class MappingFile(data_format.BinaryDataFile):
     Raises:
       ParseError: if the page numbers table cannot be read.
     """
+    uint32le_map = self._GetDataTypeMap('uint32le')
+    uint32le_size = uint32le_map.GetByteSize()
+
     file_object.seek(file_offset, os.SEEK_SET)
 
     if self._debug:
@@ -1378,19 +1860,19 @@ class MappingFile(data_format.BinaryDataFile):
           description, file_offset))
 
     try:
-      number_of_entries_data = file_object.read(self._UINT32LE_SIZE)
+      number_of_entries_data = file_object.read(uint32le_size)
     except IOError as exception:
       raise errors.ParseError((
           'Unable to read number of entries data at offset: 0x{0:08x} '
           'with error: {1:s}').format(file_offset, exception))
 
-    if len(number_of_entries_data) != self._UINT32LE_SIZE:
+    if len(number_of_entries_data) != uint32le_size:
       raise errors.ParseError((
           'Unable to read number of entries data at offset: 0x{0:08x} '
           'with error: missing data').format(file_offset))
 
     try:
-      number_of_entries = self._UINT32LE.MapByteStream(number_of_entries_data)
+      number_of_entries = uint32le_map.MapByteStream(number_of_entries_data)
     except dtfabric_errors.MappingError as exception:
       raise errors.ParseError((
           'Unable to parse number of entries at offset: 0x{0:08x} with error '
@@ -1399,7 +1881,7 @@ class MappingFile(data_format.BinaryDataFile):
     if number_of_entries == 0:
       entries_data = b''
     else:
-      entries_data_size = number_of_entries * self._UINT32LE_SIZE
+      entries_data_size = number_of_entries * uint32le_size
 
       try:
         entries_data = file_object.read(entries_data_size)
@@ -1426,8 +1908,10 @@ class MappingFile(data_format.BinaryDataFile):
       context = dtfabric_data_maps.DataTypeMapContext(values={
           'number_of_entries': number_of_entries})
 
+      data_type_map = self._GetDataTypeMap('cim_map_page_numbers')
+
       try:
-        page_numbers = self._PAGE_NUMBERS.MapByteStream(
+        page_numbers = data_type_map.MapByteStream(
             entries_data, context=context)
 
       except dtfabric_errors.MappingError as exception:
@@ -1477,7 +1961,12 @@ class MappingFile(data_format.BinaryDataFile):
 
 
 class ObjectsDataFile(data_format.BinaryDataFile):
-  """An objects data (Objects.data) file."""
+  """An objects data (Objects.data) file.
+
+  Attributes:
+    page_cache (LRUCache): cache of the objects data pages that contain
+        object descriptors, keyed by mapped page number.
+  """
 
   _KEY_SEGMENT_SEPARATOR = '\\'
   _KEY_VALUE_SEPARATOR = '.'
@@ -1486,27 +1975,149 @@ class ObjectsDataFile(data_format.BinaryDataFile):
   _KEY_VALUE_RECORD_IDENTIFIER_INDEX = 2
   _KEY_VALUE_DATA_SIZE_INDEX = 3
 
-  def __init__(self, objects_mapping_file, debug=False, output_writer=None):
+  def __init__(
+      self, objects_mapping_file, debug=False, output_writer=None,
+      page_cache_size=DEFAULT_PAGE_CACHE_SIZE):
     """Initializes an objects data file.
 
     Args:
       objects_mapping_file (MappingFile): objects mapping file.
       debug (Optional[bool]): True if debug information should be written.
       output_writer (Optional[OutputWriter]): output writer.
+      page_cache_size (Optional[int]): maximum number of pages in the page
+          cache, where 0 disables the page cache.
     """
     super(ObjectsDataFile, self).__init__(
         debug=debug, output_writer=output_writer)
     self._objects_mapping_file = objects_mapping_file
 
-  def _GetKeyValues(self, key):
-    """Retrieves the key values from the key.
+    self.page_cache = memory.LRUCache(
+        page_cache_size, memory_budget=self._memory_budget)
+
+  def _GetPage(self, page_number, data_page=False):
+    """Retrieves a specific page.
 
     Args:
-      key (str): a CIM key.
+      page_number (int): page number.
+      data_page (Optional[bool]): True if the page is a data page.
 
     Returns:
-      tuple[str, int, int, int]: name of the key, corresponding page number,
-          record identifier and record data size or None.
+      ObjectsDataPage: objects data page or None.
+    """
+    file_offset = page_number * ObjectsDataPage.PAGE_SIZE
+    if file_offset >= self._file_size:
+      return None
+
+    # Data pages do not contain object descriptors and are not cached since
+    # reading them does not require parsing.
+    if data_page:
+      return self._ReadPage(file_offset, data_page=True)
+
+    objects_page = self.page_cache.GetValue(page_number)
+    if not objects_page:
+      objects_page = self._ReadPage(file_offset)
+
+      # The size of a parsed page is approximated by the size of the page.
+      self.page_cache.SetValue(
+          page_number, objects_page, size=ObjectsDataPage.PAGE_SIZE)
+
+    return objects_page
+
+  def _ReadObjectRecord(
+      self, data_type, page_number, record_identifier, data_size,
+      object_page=None):
+    """Reads an object record.
+
+    Args:
+      data_type (str): object record data type.
+      page_number (int): page number of the page that contains the object
+          descriptor.
+      record_identifier (int): object record identifier.
+      data_size (int): object record data size.
+      object_page (Optional[ObjectsDataPage]): page that contains the object
+          descriptor, where None represents that the page should be read.
+
+    Returns:
+      ObjectRecord: an object record.
+
+    Raises:
+      ParseError: if the object record cannot be read.
+    """
+    data_segments = []
+    data_page = False
+    data_segment_index = 0
+    while data_size > 0:
+      if not object_page:
+        object_page = self.GetMappedPage(page_number, data_page=data_page)
+      if not object_page:
+        raise errors.ParseError(
+            'Unable to read objects record: {0:d} data segment: {1:d}.'.format(
+                record_identifier, data_segment_index))
+
+      if not data_page:
+        object_descriptor = object_page.GetObjectDescriptor(
+            record_identifier, data_size)
+        if not object_descriptor:
+          raise errors.ParseError(
+              'Unable to read objects record: {0:d} descriptor.'.format(
+                  record_identifier))
+
+        data_offset = object_descriptor.data_offset
+        data_page = True
+      else:
+        data_offset = 0
+
+      data_segment = object_page.ReadObjectRecordData(
+          self._file_object, data_offset, data_size)
+      if not data_segment:
+        raise errors.ParseError(
+            'Unable to read objects record: {0:d} data segment: {1:d}.'.format(
+                record_identifier, data_segment_index))
+
+      data_segments.append(data_segment)
+      data_size -= len(data_segment)
+      data_segment_index += 1
+      object_page = None
+      page_number += 1
+
+    object_record_data = b''.join(data_segments)
+
+    return ObjectRecord(
+        data_type, object_record_data, debug=self._debug,
+        output_writer=self._output_writer)
+
+  def _ReadPage(self, file_offset, data_page=False):
+    """Reads a page.
+
+    Args:
+      file_offset (int): offset of the page relative to the start of the file.
+      data_page (Optional[bool]): True if the page is a data page.
+
+    Return:
+      ObjectsDataPage: objects data page or None.
+
+    Raises:
+      ParseError: if the page cannot be read.
+    """
+    objects_page = ObjectsDataPage(
+        debug=self._debug, output_writer=self._output_writer)
+    objects_page.ReadPage(self._file_object, file_offset, data_page=data_page)
+    return objects_page
+
+  def Close(self):
+    """Closes the objects data file."""
+    super(ObjectsDataFile, self).Close()
+    self.page_cache.Clear()
+
+  def GetKeyValues(self, key):
+    """Retrieves the key values from the key.
+
+    Args:
+      key (str): a CIM key.
+
+    Returns:
+      tuple[str, int, int, int]: name of the key, corresponding page number,
+          record identifier and record data size or None.
     """
     _, _, key = key.rpartition(self._KEY_SEGMENT_SEPARATOR)
 
@@ -1539,8 +2150,8 @@ class ObjectsDataFile(data_format.BinaryDataFile):
 
     return key_values[0], page_number, record_identifier, data_size
 
-  def _GetPage(self, page_number, data_page=False):
-    """Retrieves a specific page.
+  def GetMappedPage(self, page_number, data_page=False):
+    """Retrieves a specific mapped page.
 
     Args:
       page_number (int): page number.
@@ -1549,233 +2160,945 @@ class ObjectsDataFile(data_format.BinaryDataFile):
     Returns:
       ObjectsDataPage: objects data page or None.
     """
-    file_offset = page_number * ObjectsDataPage.PAGE_SIZE
-    if file_offset >= self._file_size:
+    mapped_page_number = self.GetMappedPageNumber(page_number)
+
+    objects_page = None
+    if mapped_page_number is not None:
+      objects_page = self._GetPage(mapped_page_number, data_page=data_page)
+
+    if not objects_page:
+      logging.warning(
+          'Unable to read objects data mapped page: {0:d}.'.format(
+              page_number))
       return None
 
-    # TODO: cache pages.
-    return self._ReadPage(file_offset, data_page=data_page)
+    return objects_page
 
-  def _ReadPage(self, file_offset, data_page=False):
-    """Reads a page.
+  def GetMappedPageNumber(self, page_number):
+    """Retrieves the mapped page number of a specific page.
 
     Args:
-      file_offset (int): offset of the page relative to the start of the file.
-      data_page (Optional[bool]): True if the page is a data page.
+      page_number (int): page number.
 
-    Return:
-      ObjectsDataPage: objects data page or None.
+    Returns:
+      int: mapped page number or None if the page number has no mapping.
+    """
+    if page_number >= len(self._objects_mapping_file.mappings):
+      return None
+
+    return self._objects_mapping_file.mappings[page_number]
+
+  def GetObjectRecordByKey(self, key):
+    """Retrieves a specific object record.
+
+    Args:
+      key (str): a CIM key.
+
+    Returns:
+      ObjectRecord: an object record or None.
 
     Raises:
-      ParseError: if the page cannot be read.
+      ParseError: if the object record cannot be retrieved.
     """
-    objects_page = ObjectsDataPage(
-        debug=self._debug, output_writer=self._output_writer)
-    objects_page.ReadPage(self._file_object, file_offset, data_page=data_page)
-    return objects_page
+    key_values = self.GetKeyValues(key)
+    if not key_values:
+      return None
 
-  def GetMappedPage(self, page_number, data_page=False):
-    """Retrieves a specific mapped page.
+    key, page_number, record_identifier, data_size = key_values
+
+    data_type, _, _ = key.partition('_')
+
+    return self._ReadObjectRecord(
+        data_type, page_number, record_identifier, data_size)
+
+  def GetObjectRecordsByKeys(self, keys):
+    """Retrieves the object records of multiple keys.
+
+    The page numbers and record identifiers of all the keys are resolved
+    in a single pass in page number order, such that every page that
+    contains object descriptors is read and parsed only once.
 
     Args:
-      page_number (int): page number.
-      data_page (Optional[bool]): True if the page is a data page.
+      keys (iterable[str]): CIM keys.
+
+    Object records that cannot be read are skipped, such that they do not
+    prevent the other object records from being retrieved.
+
+    Args:
+      keys (iterable[str]): CIM keys.
+
+    Yields:
+      tuple[str, ObjectRecord]: CIM key and object record, in order of page
+          number and record identifier.
+
+    Raises:
+      ParseError: if the key values cannot be retrieved.
+    """
+    key_values_per_page = {}
+    for key in keys:
+      key_values = self.GetKeyValues(key)
+      if not key_values:
+        continue
+
+      _, page_number, record_identifier, _ = key_values
+      key_values_per_page.setdefault(page_number, []).append(
+          (record_identifier, key, key_values))
+
+    for page_number in sorted(key_values_per_page.keys()):
+      # Note that GetMappedPage warns about a page that cannot be read.
+      object_page = self.GetMappedPage(page_number)
+      if not object_page:
+        continue
+
+      for _, key, key_values in sorted(key_values_per_page[page_number]):
+        key_name, _, record_identifier, data_size = key_values
+        data_type, _, _ = key_name.partition('_')
+
+        try:
+          object_record = self._ReadObjectRecord(
+              data_type, page_number, record_identifier, data_size,
+              object_page=object_page)
+        except errors.ParseError as exception:
+          logging.warning(
+              'Unable to read object record: {0:s} with error: {1!s}'.format(
+                  key, exception))
+          continue
+
+        yield key, object_record
+
+  def ReadFileObject(self, file_object):
+    """Reads an objects data file-like object.
+
+    Args:
+      file_object (file): file-like object.
+
+    Raises:
+      ParseError: if the file cannot be read.
+    """
+    self._file_object = file_object
+
+
+class SidecarIndex(object):
+  """SQLite database that indexes the keys of a CIM repository.
+
+  The sidecar index stores the keys in the order of the index binary-tree,
+  together with their namespace and class and the location of their object
+  record, such that the keys can be retrieved without reading the index
+  binary-tree. The state of the repository files the index was built from
+  is stored to determine if the index is still valid.
+  """
+
+  _SCHEMA_VERSION = 1
+
+  _CREATE_TABLE_QUERIES = [
+      ('CREATE TABLE IF NOT EXISTS metadata ('
+       'name TEXT PRIMARY KEY, value TEXT)'),
+      ('CREATE TABLE IF NOT EXISTS keys ('
+       'key TEXT UNIQUE, key_name TEXT, namespace_hash TEXT, '
+       'class_name_hash TEXT, class_name TEXT, data_type TEXT, '
+       'page_number INTEGER, mapped_page_number INTEGER, '
+       'record_identifier INTEGER, data_size INTEGER)'),
+      'CREATE INDEX IF NOT EXISTS keys_key_name ON keys (key_name)',
+      'CREATE INDEX IF NOT EXISTS keys_class_name ON keys (class_name)']
+
+  _INSERT_KEY_QUERY = (
+      'INSERT OR IGNORE INTO keys VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+
+  def __init__(self):
+    """Initializes a sidecar index."""
+    super(SidecarIndex, self).__init__()
+    self._connection = None
+
+  def _GetMetadataValue(self, name):
+    """Retrieves a metadata value.
+
+    Args:
+      name (str): name of the metadata value.
 
     Returns:
-      ObjectsDataPage: objects data page or None.
+      str: metadata value or None if not available.
     """
-    mapped_page_number = self._objects_mapping_file.mappings[page_number]
+    cursor = self._connection.execute(
+        'SELECT value FROM metadata WHERE name = ?', (name, ))
+    row = cursor.fetchone()
+    if not row:
+      return None
 
-    objects_page = self._GetPage(mapped_page_number, data_page=data_page)
-    if not objects_page:
-      logging.warning(
-          'Unable to read objects data mapped page: {0:d}.'.format(
-              page_number))
+    return row[0]
+
+  def Close(self):
+    """Closes the sidecar index."""
+    if self._connection:
+      self._connection.close()
+      self._connection = None
+
+  def FindKeysWithPrefix(self, prefix):
+    """Retrieves the keys with a specific prefix.
+
+    Args:
+      prefix (str): prefix of the CIM keys.
+
+    Yields:
+      str: a CIM key with the prefix, in sorted order.
+    """
+    cursor = self._connection.execute(
+        'SELECT key FROM keys WHERE key >= ? ORDER BY key', (prefix, ))
+    for row in cursor:
+      if not row[0].startswith(prefix):
+        break
+
+      yield row[0]
+
+  def GetKey(self, key):
+    """Retrieves a specific key.
+
+    Args:
+      key (str): a CIM key or the name of a CIM key, which is the key without
+          the key values, such as "\\NS_<...>\\CI_<...>\\IL_<...>".
+
+    Returns:
+      str: the CIM key or None if not available.
+    """
+    cursor = self._connection.execute(
+        'SELECT key FROM keys WHERE key = ? OR key_name = ? LIMIT 1',
+        (key, key))
+    row = cursor.fetchone()
+    if not row:
       return None
 
-    return objects_page
+    return row[0]
+
+  def GetKeys(self):
+    """Retrieves the keys.
+
+    Yields:
+      str: a CIM key, in the order of the index binary-tree.
+    """
+    cursor = self._connection.execute('SELECT key FROM keys ORDER BY rowid')
+    for row in cursor:
+      yield row[0]
+
+  def GetKeysByClassName(self, class_name):
+    """Retrieves the keys of the object records of a specific class.
+
+    Args:
+      class_name (str): name of the class.
+
+    Yields:
+      str: a CIM key of a class definition or instance of the class.
+    """
+    cursor = self._connection.execute(
+        'SELECT key FROM keys WHERE class_name = ? ORDER BY rowid',
+        (class_name, ))
+    for row in cursor:
+      yield row[0]
+
+  def IsValid(self, repository_state):
+    """Determines if the sidecar index is valid for the repository.
+
+    Args:
+      repository_state (str): state of the repository files.
+
+    Returns:
+      bool: True if the sidecar index was built from repository files with
+          the same state.
+    """
+    schema_version = self._GetMetadataValue('schema_version')
+    if schema_version != '{0:d}'.format(self._SCHEMA_VERSION):
+      return False
+
+    return self._GetMetadataValue('repository_state') == repository_state
+
+  def Open(self, path):
+    """Opens the sidecar index.
+
+    The database is created if it does not exist.
+
+    Args:
+      path (str): path of the sidecar index database file.
+
+    Raises:
+      IOError: if the sidecar index cannot be opened.
+      OSError: if the sidecar index cannot be opened.
+      ValueError: if SQLite is not supported.
+    """
+    if not sqlite3:
+      raise ValueError('Missing SQLite support.')
+
+    try:
+      self._connection = sqlite3.connect(path)
+      for query in self._CREATE_TABLE_QUERIES:
+        self._connection.execute(query)
+      self._connection.commit()
+
+    except sqlite3.Error as exception:
+      self.Close()
+      raise IOError(
+          'Unable to open sidecar index: {0:s} with error: {1!s}'.format(
+              path, exception))
+
+  def WriteKeys(self, key_values, repository_state):
+    """Replaces the keys in the sidecar index.
+
+    Args:
+      key_values (iterable[tuple[str, str, str, str, str, str, int, int, int,
+          int]]): CIM key, name of the key, namespace hash, class name hash,
+          class name, object record data type, page number, mapped page
+          number, record identifier and data size, in the order of the index
+          binary-tree, where values that are not available are None.
+      repository_state (str): state of the repository files the keys were
+          read from.
+    """
+    with self._connection:
+      self._connection.execute('DELETE FROM keys')
+      self._connection.executemany(self._INSERT_KEY_QUERY, key_values)
+      self._connection.executemany(
+          'INSERT OR REPLACE INTO metadata VALUES (?, ?)', [
+              ('repository_state', repository_state),
+              ('schema_version', '{0:d}'.format(self._SCHEMA_VERSION))])
+
+
+class CIMRepository(data_format.BinaryDataFormat):
+  """A CIM repository."""
+
+  _DEFINITION_FILE = 'wmi_repository.yaml'
+
+  _INSTANCE_KEY_CLASS_PREFIXES = frozenset(['CI_', 'KI_'])
+
+  # Files of which the state determines if a sidecar index is valid.
+  _REPOSITORY_FILENAME_RE = re.compile(
+      r'^(INDEX\.BTR|INDEX\.MAP|MAPPING\.VER|MAPPING[0-9]\.MAP|OBJECTS\.DATA|'
+      r'OBJECTS\.MAP)$', re.IGNORECASE)
+
+  def __init__(
+      self, debug=False, output_writer=None,
+      page_cache_size=DEFAULT_PAGE_CACHE_SIZE):
+    """Initializes a CIM repository.
+
+    Args:
+      debug (Optional[bool]): True if debug information should be written.
+      output_writer (Optional[OutputWriter]): output writer.
+      page_cache_size (Optional[int]): maximum number of pages in the page
+          cache of the index binary-tree and the objects data files, where
+          0 disables the page caches.
+    """
+    super(CIMRepository, self).__init__()
+    self._class_definitions = {}
+    self._debug = debug
+    self._index_binary_tree_file = None
+    self._index_mapping_file = None
+    self._objects_data_file = None
+    self._objects_mapping_file = None
+    self._output_writer = output_writer
+    self._page_cache_size = page_cache_size
+    self._resolved_class_definitions = {}
+    self._sidecar_index = None
+
+  @property
+  def index_page_cache(self):
+    """LRUCache: page cache of the index binary-tree file or None."""
+    if not self._index_binary_tree_file:
+      return None
+
+    return self._index_binary_tree_file.page_cache
+
+  @property
+  def objects_page_cache(self):
+    """LRUCache: page cache of the objects data file or None."""
+    if not self._objects_data_file:
+      return None
+
+    return self._objects_data_file.page_cache
+
+  def _DebugPrintText(self, text):
+    """Prints text for debugging.
+
+    Args:
+      text (str): text.
+    """
+    if self._output_writer:
+      self._output_writer.WriteText(text)
+
+  def _GetClassDefinitionByHash(self, namespace_hash, class_name_hash):
+    """Retrieves a class definition as stored in its object record.
+
+    The class definition object record of a class is only read and parsed
+    the first time the class definition is retrieved.
+
+    Args:
+      namespace_hash (str): hash of the namespace name.
+      class_name_hash (str): hash of the class name.
+
+    Returns:
+      ClassDefinition: class definition, which only contains the properties
+          defined by the class, or None if not available.
+
+    Raises:
+      ParseError: if the class definition cannot be read.
+    """
+    lookup_key = (namespace_hash, class_name_hash)
+    if lookup_key in self._class_definitions:
+      return self._class_definitions[lookup_key]
+
+    class_definition = None
+
+    key_prefix = '\\NS_{0:s}\\CD_{1:s}.'.format(
+        namespace_hash, class_name_hash)
+    for key in self.FindKeysWithPrefix(key_prefix):
+      object_record = self.GetObjectRecordByKey(key)
+      if object_record:
+        class_definition = object_record.ReadClassDefinition()
+        break
+
+    self._class_definitions[lookup_key] = class_definition
+
+    return class_definition
+
+  def _GetCurrentMappingFile(self, path):
+    """Retrieves the current mapping file.
+
+    Args:
+      path (str): path to the CIM repository.
+
+    Raises:
+      ParseError: if the current mapping file cannot be read.
+    """
+    mapping_file_glob = glob.glob(
+        os.path.join(path, '[Mm][Aa][Pp][Pp][Ii][Nn][Gg].[Vv][Ee][Rr]'))
+
+    active_mapping_file = 0
+    if mapping_file_glob:
+      data_type_map = self._GetDataTypeMap('uint32le')
+
+      with open(mapping_file_glob[0], 'rb') as file_object:
+        active_mapping_file = self._ReadStructure(
+            file_object, 0, data_type_map.GetByteSize(), data_type_map,
+            'Mapping.ver')
+
+      if self._debug:
+        self._DebugPrintText('Active mapping file: {0:d}'.format(
+            active_mapping_file))
+
+    if mapping_file_glob:
+      mapping_file_glob = glob.glob(os.path.join(
+          path, '[Mm][Aa][Pp][Pp][Ii][Nn][Gg]{0:d}.[Mm][Aa][Pp]'.format(
+              active_mapping_file)))
+    else:
+      mapping_file_glob = glob.glob(os.path.join(
+          path, '[Mm][Aa][Pp][Pp][Ii][Nn][Gg][1-3].[Mm][Aa][Pp]'))
+
+    # TODO: determine active mapping file for Windows Vista and later.
+    for mapping_file_path in mapping_file_glob:
+      if self._debug:
+        self._DebugPrintText('Reading: {0:s}'.format(mapping_file_path))
+
+      objects_mapping_file = MappingFile(
+          debug=self._debug, output_writer=self._output_writer)
+      objects_mapping_file.Open(mapping_file_path)
+
+      index_mapping_file = MappingFile(
+          debug=self._debug, output_writer=self._output_writer)
+      index_mapping_file.Open(mapping_file_path)
+      # TODO: pass file_offset=objects_mapping_file.data_size) ?
+
+  def _FindKeysWithPrefixInIndexPage(self, index_page, prefix):
+    """Retrieves the keys with a specific prefix from an index page.
+
+    The keys of a page are sorted and the keys of the sub page that precedes
+    a key are smaller than that key, hence only the sub pages that can
+    contain keys with the prefix are read. The index binary-tree is traversed
+    using a stack instead of recursion and every page is read at most once,
+    hence an index binary-tree that contains a cycle does not cause an
+    endless traversal.
+
+    Args:
+      index_page (IndexBinaryTreePage): index binary-tree page.
+      prefix (str): prefix of the CIM keys.
+
+    Yields:
+      str: a CIM key with the prefix.
+    """
+    visited_page_numbers = set()
+    if index_page.page_number is not None:
+      visited_page_numbers.add(index_page.page_number)
+
+    # Every stack entry contains a page and the index of the key of which
+    # the preceding sub page has been traversed, where None represents that
+    # the page has not been traversed yet.
+    index_pages = [(index_page, None)]
+    while index_pages:
+      index_page, key_index = index_pages.pop()
+
+      keys = index_page.keys
+      number_of_keys = len(keys)
+
+      if key_index is None:
+        # The sub pages of a page without a sub page for every key range
+        # cannot be matched with the keys, hence all keys of the page are
+        # compared.
+        if len(index_page.sub_pages) != number_of_keys + 1:
+          for key in self._GetKeysFromIndexPage(
+              index_page, visited_page_numbers=visited_page_numbers):
+            if key.startswith(prefix):
+              yield key
+          continue
+
+        key_index = bisect.bisect_left(keys, prefix)
+
+      else:
+        if (key_index == number_of_keys or
+            not keys[key_index].startswith(prefix)):
+          continue
+
+        yield keys[key_index]
+        key_index += 1
+
+      index_pages.append((index_page, key_index))
+
+      sub_page_number = index_page.sub_pages[key_index]
+      if sub_page_number in visited_page_numbers:
+        logging.warning((
+            'Index binary-tree page: {0:d} is referenced more than '
+            'once.').format(sub_page_number))
+        continue
+
+      visited_page_numbers.add(sub_page_number)
+
+      sub_index_page = self._index_binary_tree_file.GetMappedPage(
+          sub_page_number)
+      if sub_index_page:
+        index_pages.append((sub_index_page, None))
+
+  def _GetKeysFromIndexPage(self, index_page, visited_page_numbers=None):
+    """Retrieves the keys from an index page and its sub pages.
+
+    The index binary-tree is traversed using a stack instead of recursion.
+    The sub pages of a page are read together in order of their mapped page
+    number and every page is read at most once, hence an index binary-tree
+    that contains a cycle does not cause an endless traversal.
+
+    Args:
+      index_page (IndexBinaryTreePage): index binary-tree page.
+      visited_page_numbers (Optional[set[int]]): numbers of the pages that
+          have already been traversed, where None represents that no pages
+          have been traversed.
+
+    Yields:
+      str: a CIM key.
+    """
+    if visited_page_numbers is None:
+      visited_page_numbers = set()
+
+    if index_page.page_number is not None:
+      visited_page_numbers.add(index_page.page_number)
+
+    index_pages = [index_page]
+    while index_pages:
+      index_page = index_pages.pop()
+
+      for key in index_page.keys:
+        yield key
+
+      sub_page_numbers = []
+      for sub_page_number in index_page.sub_pages:
+        if sub_page_number in visited_page_numbers:
+          logging.warning((
+              'Index binary-tree page: {0:d} is referenced more than '
+              'once.').format(sub_page_number))
+          continue
+
+        visited_page_numbers.add(sub_page_number)
+        sub_page_numbers.append(sub_page_number)
+
+      sub_index_pages = self._index_binary_tree_file.GetMappedPages(
+          sub_page_numbers)
+
+      # The sub pages are pushed in reverse order so that their keys are
+      # retrieved in the order of the sub pages.
+      index_pages.extend([
+          sub_index_page for sub_index_page in reversed(sub_index_pages)
+          if sub_index_page])
+
+  def _GetNameHash(self, name, hash_length):
+    """Retrieves the hash of a name, as used in the keys.
+
+    The hash is calculated over the upper case UTF-16 little-endian name,
+    using MD5 in Windows XP format repositories and SHA-256 in Windows Vista
+    and later format repositories.
+
+    Args:
+      name (str): name, such as a class name.
+      hash_length (int): length of the hexadecimal hashes in the keys.
+
+    Returns:
+      str: upper case hexadecimal hash of the name.
+    """
+    name_data = name.upper().encode('utf-16-le')
+    if hash_length == 32:
+      hash_context = hashlib.md5()
+    else:
+      hash_context = hashlib.sha256()
+
+    hash_context.update(name_data)
+    return hash_context.hexdigest().upper()
+
+  def _GetRepositoryFilePath(self, path, filename_glob, description):
+    """Retrieves the path of a CIM repository file.
+
+    Args:
+      path (str): path to the CIM repository.
+      filename_glob (str): case-insensitive glob of the filename.
+      description (str): description of the file.
+
+    Returns:
+      str: path of the file.
+
+    Raises:
+      IOError: if the file does not exist.
+    """
+    file_paths = glob.glob(os.path.join(path, filename_glob))
+    if not file_paths:
+      raise IOError('Missing {0:s} file in: {1:s}'.format(description, path))
+
+    return file_paths[0]
+
+  def _GetRepositoryState(self, path):
+    """Retrieves the state of the repository files.
+
+    The state consists of the size and modification time of the repository
+    files, the active mapping file in Mapping.ver and the sequence numbers
+    stored in the headers of the mapping files.
+
+    Args:
+      path (str): path to the CIM repository.
+
+    Returns:
+      str: JSON serialized state of the repository files.
+
+    Raises:
+      ParseError: if the state of a repository file cannot be read.
+    """
+    file_states = []
+    for filename in sorted(os.listdir(path)):
+      if not self._REPOSITORY_FILENAME_RE.match(filename):
+        continue
+
+      file_path = os.path.join(path, filename)
+      stat_object = os.stat(file_path)
+
+      filename = filename.upper()
+      if filename == 'MAPPING.VER':
+        data_type_map = self._GetDataTypeMap('uint32le')
+      elif filename.endswith('.MAP'):
+        data_type_map = self._GetDataTypeMap('cim_map_header')
+      else:
+        data_type_map = None
+
+      sequence_number = None
+      if data_type_map and stat_object.st_size:
+        with open(file_path, 'rb') as file_object:
+          structure_values = self._ReadStructure(
+              file_object, 0, data_type_map.GetByteSize(), data_type_map,
+              filename)
+
+        if filename == 'MAPPING.VER':
+          sequence_number = structure_values
+        else:
+          sequence_number = structure_values.format_version
+
+      file_states.append([
+          filename, stat_object.st_size, stat_object.st_mtime,
+          sequence_number])
+
+    return json.dumps(file_states)
+
+  def _GetSidecarIndexKeyValues(self):
+    """Retrieves the values of the keys to store in a sidecar index.
+
+    Yields:
+      tuple[str, str, str, str, str, str, int, int, int, int]: CIM key, name
+          of the key, namespace hash, class name hash, class name, object
+          record data type, page number, mapped page number, record
+          identifier and data size, where values that are not available are
+          None.
+    """
+    class_names = {}
+
+    for key in self.GetKeys():
+      key_segments = key.split('\\')
+
+      namespace_hash = None
+      if len(key_segments) > 1 and key_segments[1].startswith('NS_'):
+        namespace_hash = key_segments[1][3:]
+
+      key_values = None
+      if self._objects_data_file and '.' in key_segments[-1]:
+        key_values = self._objects_data_file.GetKeyValues(key)
+
+      if not key_values:
+        yield (key, key, namespace_hash, None, None, None, None, None, None,
+               None)
+        continue
+
+      key_name, page_number, record_identifier, data_size = key_values
+      data_type, _, _ = key_name.partition('_')
+
+      key_segments[-1] = key_name
+      key_name = '\\'.join(key_segments)
+
+      class_name_hash = None
+      if data_type == ObjectRecord.DATA_TYPE_CLASS_DEFINITION:
+        class_name_hash = key_segments[-1][3:]
+      elif (len(key_segments) == 4 and
+            key_segments[2][:3] in self._INSTANCE_KEY_CLASS_PREFIXES):
+        class_name_hash = key_segments[2][3:]
+
+      class_name = None
+      if namespace_hash and class_name_hash:
+        lookup_key = (namespace_hash, class_name_hash)
+        if lookup_key not in class_names:
+          try:
+            class_definition = self._GetClassDefinitionByHash(
+                namespace_hash, class_name_hash)
+          except errors.ParseError as exception:
+            logging.warning((
+                'Unable to read definition of class: {0:s} with error: '
+                '{1!s}').format(class_name_hash, exception))
+            class_definition = None
+
+          class_names[lookup_key] = (
+              class_definition.name if class_definition else None)
+
+        class_name = class_names[lookup_key]
+
+      mapped_page_number = self._objects_data_file.GetMappedPageNumber(
+          page_number)
+
+      yield (key, key_name, namespace_hash, class_name_hash, class_name,
+             data_type, page_number, mapped_page_number, record_identifier,
+             data_size)
+
+  def Close(self):
+    """Closes the CIM repository."""
+    if self._index_binary_tree_file:
+      self._index_binary_tree_file.Close()
+      self._index_binary_tree_file = None
+
+    if self._index_mapping_file:
+      self._index_mapping_file.Close()
+      self._index_mapping_file = None
+
+    if self._objects_data_file:
+      self._objects_data_file.Close()
+      self._objects_data_file = None
+
+    if self._objects_mapping_file:
+      self._objects_mapping_file.Close()
+      self._objects_mapping_file = None
+
+    if self._sidecar_index:
+      self._sidecar_index.Close()
+      self._sidecar_index = None
+
+    self._class_definitions = {}
+    self._resolved_class_definitions = {}
+
+  def FindKeysWithPrefix(self, prefix):
+    """Retrieves the keys with a specific prefix.
+
+    Contrary to GetKeys() only the index pages that can contain keys with
+    the prefix are read.
+
+    Args:
+      prefix (str): prefix of the CIM keys, such as
+          "\\NS_<namespace hash>\\CI_<class name hash>".
+
+    Yields:
+      str: a CIM key with the prefix, in sorted order.
+    """
+    if self._sidecar_index:
+      for key in self._sidecar_index.FindKeysWithPrefix(prefix):
+        yield key
+
+    elif self._index_binary_tree_file:
+      index_page = self._index_binary_tree_file.GetRootPage()
+      if index_page:
+        for key in self._FindKeysWithPrefixInIndexPage(index_page, prefix):
+          yield key
 
-  def GetObjectRecordByKey(self, key):
-    """Retrieves a specific object record.
+  def GetClassDefinition(self, namespace_hash, class_name_hash):
+    """Retrieves a class definition including the inherited properties.
+
+    The super classes are resolved iteratively and the properties of
+    the class and its super classes are combined into a single layout
+    that is cached for subsequent instances of the class.
 
     Args:
-      key (str): a CIM key.
+      namespace_hash (str): hash of the namespace name.
+      class_name_hash (str): hash of the class name.
 
     Returns:
-      ObjectRecord: an object record or None.
+      ClassDefinition: class definition, including the properties of
+          the super classes, or None if not available.
 
     Raises:
-      ParseError: if the object record cannot be retrieved.
+      ParseError: if the class definition cannot be read or the class
+          hierarchy contains a cycle.
     """
-    key, page_number, record_identifier, data_size = self._GetKeyValues(key)
+    lookup_key = (namespace_hash, class_name_hash)
+    if lookup_key in self._resolved_class_definitions:
+      return self._resolved_class_definitions[lookup_key]
+
+    class_definitions = []
+    class_name_hashes = set([class_name_hash])
+
+    class_definition = self._GetClassDefinitionByHash(
+        namespace_hash, class_name_hash)
+    while class_definition:
+      class_definitions.append(class_definition)
+      if not class_definition.super_class_name:
+        break
 
-    data_segments = []
-    data_page = False
-    data_segment_index = 0
-    while data_size > 0:
-      object_page = self.GetMappedPage(page_number, data_page=data_page)
-      if not object_page:
-        errors.ParseError(
-            'Unable to read objects record: {0:d} data segment: {1:d}.'.format(
-                record_identifier, data_segment_index))
+      super_class_name_hash = self._GetNameHash(
+          class_definition.super_class_name, len(class_name_hash))
+      if super_class_name_hash in class_name_hashes:
+        raise errors.ParseError(
+            'Cycle in super classes of class: {0:s}.'.format(
+                class_definitions[0].name))
 
-      if not data_page:
-        object_descriptor = object_page.GetObjectDescriptor(
-            record_identifier, data_size)
+      class_name_hashes.add(super_class_name_hash)
 
-        data_offset = object_descriptor.data_offset
-        data_page = True
-      else:
-        data_offset = 0
+      class_definition = self._GetClassDefinitionByHash(
+          namespace_hash, super_class_name_hash)
+      if not class_definition:
+        logging.warning('Missing definition of super class: {0:s}.'.format(
+            class_definitions[-1].super_class_name))
 
-      data_segment = object_page.ReadObjectRecordData(
-          self._file_object, data_offset, data_size)
-      if not data_segment:
-        errors.ParseError(
-            'Unable to read objects record: {0:d} data segment: {1:d}.'.format(
-                record_identifier, data_segment_index))
+    resolved_class_definition = None
+    if class_definitions:
+      # A property that is redefined by a class overrides the definition of
+      # its super class.
+      properties = {}
+      for class_definition in reversed(class_definitions):
+        for name, property_type, index, value_offset in (
+            class_definition.GetProperties()):
+          properties[name] = (index, name, property_type, value_offset)
 
-      data_segments.append(data_segment)
-      data_size -= len(data_segment)
-      data_segment_index += 1
-      page_number += 1
+      resolved_class_definition = ClassDefinition(
+          name=class_definitions[0].name,
+          super_class_name=class_definitions[0].super_class_name)
 
-    data_type, _, _ = key.partition('_')
-    object_record_data = b''.join(data_segments)
+      for index, name, property_type, value_offset in sorted(
+          properties.values()):
+        resolved_class_definition.AddProperty(
+            name, property_type, index, value_offset)
 
-    return ObjectRecord(
-        data_type, object_record_data, debug=self._debug,
-        output_writer=self._output_writer)
+    self._resolved_class_definitions[lookup_key] = resolved_class_definition
 
-  def ReadFileObject(self, file_object):
-    """Reads an objects data file-like object.
+    return resolved_class_definition
+
+  def GetClassDefinitionByKey(self, key):
+    """Retrieves the class definition of an instance key.
 
     Args:
-      file_object (file): file-like object.
+      key (str): a CIM instance key, such as
+          "\\NS_<namespace hash>\\CI_<class name hash>\\IL_<...>".
+
+    Returns:
+      ClassDefinition: class definition, including the properties of
+          the super classes, or None if not available.
 
     Raises:
-      ParseError: if the file cannot be read.
+      ParseError: if the class definition cannot be read.
     """
-    self._file_object = file_object
-
-
-class CIMRepository(data_format.BinaryDataFormat):
-  """A CIM repository."""
-
-  _DATA_TYPE_FABRIC_DEFINITION_FILE = os.path.join(
-      os.path.dirname(__file__), 'wmi_repository.yaml')
+    key_segments = key.split('\\')
+    if len(key_segments) != 4 or not key_segments[1].startswith('NS_'):
+      return None
 
-  with open(_DATA_TYPE_FABRIC_DEFINITION_FILE, 'rb') as file_object:
-    _DATA_TYPE_FABRIC_DEFINITION = file_object.read()
+    class_key_segment = key_segments[2]
+    if class_key_segment[:3] not in self._INSTANCE_KEY_CLASS_PREFIXES:
+      return None
 
-  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
-      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
+    return self.GetClassDefinition(key_segments[1][3:], class_key_segment[3:])
 
-  _MAPPING_VER = _DATA_TYPE_FABRIC.CreateDataTypeMap('uint32le')
+  def GetInstanceByKey(self, key):
+    """Retrieves the property values of a specific instance.
 
-  _MAPPING_VER_SIZE = _MAPPING_VER.GetByteSize()
+    Args:
+      key (str): a CIM instance key, such as
+          "\\NS_<namespace hash>\\CI_<class name hash>\\IL_<...>".
 
-  def __init__(self, debug=False, output_writer=None):
-    """Initializes a CIM repository.
+    Returns:
+      collections.OrderedDict[str, object]: property values of the instance
+          per property name or None if not available.
 
-    Args:
-      debug (Optional[bool]): True if debug information should be written.
-      output_writer (Optional[OutputWriter]): output writer.
+    Raises:
+      ParseError: if the instance cannot be read.
     """
-    super(CIMRepository, self).__init__()
-    self._debug = debug
-    self._index_binary_tree_file = None
-    self._index_mapping_file = None
-    self._objects_data_file = None
-    self._objects_mapping_file = None
-    self._output_writer = output_writer
+    class_definition = self.GetClassDefinitionByKey(key)
+    if not class_definition:
+      return None
 
-  def _DebugPrintText(self, text):
-    """Prints text for debugging.
+    object_record = self.GetObjectRecordByKey(key)
+    if not object_record:
+      return None
 
-    Args:
-      text (str): text.
-    """
-    if self._output_writer:
-      self._output_writer.WriteText(text)
+    return object_record.ReadInstance(class_definition)
 
-  def _GetCurrentMappingFile(self, path):
-    """Retrieves the current mapping file.
+  def GetKey(self, key):
+    """Retrieves a specific key.
+
+    Only the index pages on the path from the root page to the key are read.
 
     Args:
-      path (str): path to the CIM repository.
+      key (str): a CIM key.
 
-    Raises:
-      ParseError: if the current mapping file cannot be read.
+    Returns:
+      str: the CIM key or None if not available.
     """
-    mapping_file_glob = glob.glob(
-        os.path.join(path, '[Mm][Aa][Pp][Pp][Ii][Nn][Gg].[Vv][Ee][Rr]'))
+    if self._sidecar_index:
+      found_key = self._sidecar_index.GetKey(key)
+      if found_key != key:
+        return None
+      return found_key
 
-    active_mapping_file = 0
-    if mapping_file_glob:
-      with open(mapping_file_glob[0], 'rb') as file_object:
-        active_mapping_file = self._ReadStructure(
-            file_object, 0, self._MAPPING_VER_SIZE, self._MAPPING_VER,
-            'Mapping.ver')
+    if not self._index_binary_tree_file:
+      return None
 
-      if self._debug:
-        self._DebugPrintText('Active mapping file: {0:d}'.format(
-            active_mapping_file))
+    visited_page_numbers = set()
 
-    if mapping_file_glob:
-      mapping_file_glob = glob.glob(os.path.join(
-          path, '[Mm][Aa][Pp][Pp][Ii][Nn][Gg]{0:d}.[Mm][Aa][Pp]'.format(
-              active_mapping_file)))
-    else:
-      mapping_file_glob = glob.glob(os.path.join(
-          path, '[Mm][Aa][Pp][Pp][Ii][Nn][Gg][1-3].[Mm][Aa][Pp]'))
+    index_page = self._index_binary_tree_file.GetRootPage()
+    while index_page:
+      if index_page.page_number is not None:
+        visited_page_numbers.add(index_page.page_number)
 
-    # TODO: determine active mapping file for Windows Vista and later.
-    for mapping_file_path in mapping_file_glob:
-      if self._debug:
-        self._DebugPrintText('Reading: {0:s}'.format(mapping_file_path))
+      keys = index_page.keys
+      number_of_keys = len(keys)
 
-      objects_mapping_file = MappingFile(
-          debug=self._debug, output_writer=self._output_writer)
-      objects_mapping_file.Open(mapping_file_path)
+      key_index = bisect.bisect_left(keys, key)
+      if key_index < number_of_keys and keys[key_index] == key:
+        return key
 
-      index_mapping_file = MappingFile(
-          debug=self._debug, output_writer=self._output_writer)
-      index_mapping_file.Open(mapping_file_path)
-      # TODO: pass file_offset=objects_mapping_file.data_size) ?
+      if not index_page.sub_pages:
+        break
 
-  def _GetKeysFromIndexPage(self, index_page):
-    """Retrieves the keys from an index page.
+      if len(index_page.sub_pages) != number_of_keys + 1:
+        for found_key in self._FindKeysWithPrefixInIndexPage(index_page, key):
+          if found_key == key:
+            return key
+        break
 
-    Yields:
-      str: a CIM key.
-    """
-    for key in index_page.keys:
-      yield key
+      sub_page_number = index_page.sub_pages[key_index]
+      if sub_page_number in visited_page_numbers:
+        logging.warning((
+            'Index binary-tree page: {0:d} is referenced more than '
+            'once.').format(sub_page_number))
+        break
 
-    for sub_page_number in index_page.sub_pages:
-      sub_index_page = self._index_binary_tree_file.GetMappedPage(
+      index_page = self._index_binary_tree_file.GetMappedPage(
           sub_page_number)
-      for key in self._GetKeysFromIndexPage(sub_index_page):
-        yield key
-
-  def Close(self):
-    """Closes the CIM repository."""
-    if self._index_binary_tree_file:
-      self._index_binary_tree_file.Close()
-      self._index_binary_tree_file = None
-
-    if self._index_mapping_file:
-      self._index_mapping_file.Close()
-      self._index_mapping_file = None
-
-    if self._objects_data_file:
-      self._objects_data_file.Close()
-      self._objects_data_file = None
 
-    if self._objects_mapping_file:
-      self._objects_mapping_file.Close()
-      self._objects_mapping_file = None
+    return None
 
   def GetKeys(self):
     """Retrieves the keys.
@@ -1783,16 +3106,22 @@ class CIMRepository(data_format.BinaryDataFormat):
     Yields:
       str: a CIM key.
     """
-    if self._index_binary_tree_file:
-      index_page = self._index_binary_tree_file.GetRootPage()
-      for key in self._GetKeysFromIndexPage(index_page):
+    if self._sidecar_index:
+      for key in self._sidecar_index.GetKeys():
         yield key
 
+    elif self._index_binary_tree_file:
+      index_page = self._index_binary_tree_file.GetRootPage()
+      if index_page:
+        for key in self._GetKeysFromIndexPage(index_page):
+          yield key
+
   def GetObjectRecordByKey(self, key):
     """Retrieves a specific object record.
 
     Args:
-      key (str): a CIM key.
+      key (str): a CIM key or if a sidecar index is used the name of a CIM
+          key, which is the key without the key values.
 
     Returns:
       ObjectRecord: an object record or None.
@@ -1800,41 +3129,107 @@ class CIMRepository(data_format.BinaryDataFormat):
     if not self._objects_data_file:
       return None
 
+    if self._sidecar_index:
+      key = self._sidecar_index.GetKey(key)
+      if not key:
+        return None
+
     return self._objects_data_file.GetObjectRecordByKey(key)
 
-  def Open(self, path):
+  def GetObjectRecordsByKeys(self, keys):
+    """Retrieves the object records of multiple keys.
+
+    Args:
+      keys (iterable[str]): CIM keys.
+
+    Yields:
+      tuple[str, ObjectRecord]: CIM key and object record, in order of page
+          number and record identifier.
+    """
+    if self._objects_data_file:
+      for key, object_record in self._objects_data_file.GetObjectRecordsByKeys(
+          keys):
+        yield key, object_record
+
+  def Open(self, path, use_mmap=False, sidecar_index_path=None):
     """Opens the CIM repository.
 
+    If a sidecar index is used, the keys are retrieved from the sidecar index
+    instead of the index binary-tree. The sidecar index is built when it does
+    not exist or when the repository files have changed since it was built.
+
     Args:
       path (str): path to the CIM repository.
+      use_mmap (Optional[bool]): True if the repository files should be
+          memory mapped.
+      sidecar_index_path (Optional[str]): path of the sidecar index database
+          file, where None represents that no sidecar index is used.
+
+    Raises:
+      IOError: if a repository file is missing or the sidecar index cannot be
+          opened.
+      OSError: if the sidecar index cannot be opened.
+      ParseError: if the state of the repository files cannot be read.
+      ValueError: if a sidecar index is not supported.
     """
     # TODO: self._GetCurrentMappingFile(path)
 
-    self.OpenIndexBinaryTree(path)
-    self.OpenObjectsData(path)
+    if not sidecar_index_path:
+      try:
+        self.OpenIndexBinaryTree(path, use_mmap=use_mmap)
+        self.OpenObjectsData(path, use_mmap=use_mmap)
+      except (IOError, OSError, errors.ParseError):
+        self.Close()
+        raise
+
+      return
+
+    sidecar_index = SidecarIndex()
+    sidecar_index.Open(sidecar_index_path)
+
+    try:
+      repository_state = self._GetRepositoryState(path)
+
+      self.OpenObjectsData(path, use_mmap=use_mmap)
+
+      if not sidecar_index.IsValid(repository_state):
+        self.OpenIndexBinaryTree(path, use_mmap=use_mmap)
+        sidecar_index.WriteKeys(
+            self._GetSidecarIndexKeyValues(), repository_state)
+
+    except (IOError, OSError, errors.ParseError):
+      sidecar_index.Close()
+      self.Close()
+      raise
+
+    self._sidecar_index = sidecar_index
 
-  def OpenIndexBinaryTree(self, path):
+  def OpenIndexBinaryTree(self, path, use_mmap=False):
     """Opens the CIM repository index binary tree.
 
     Args:
       path (str): path to the CIM repository.
+      use_mmap (Optional[bool]): True if the repository files should be
+          memory mapped.
+
+    Raises:
+      IOError: if the index mapping or binary-tree file is missing.
     """
     # Index mappings file.
-    index_mapping_file_glob = os.path.join(
-        path, '[Ii][Nn][Dd][Ee][Xx].[Mm][Aa][Pp]')
-    index_mapping_file_path = glob.glob(index_mapping_file_glob)[0]
+    index_mapping_file_path = self._GetRepositoryFilePath(
+        path, '[Ii][Nn][Dd][Ee][Xx].[Mm][Aa][Pp]', 'index mapping')
 
     if self._debug:
       self._DebugPrintText('Reading: {0:s}\n'.format(index_mapping_file_path))
 
     self._index_mapping_file = MappingFile(
         debug=self._debug, output_writer=self._output_writer)
-    self._index_mapping_file.Open(index_mapping_file_path)
+    self._index_mapping_file.Open(
+        index_mapping_file_path, use_mmap=use_mmap)
 
     # Index binary tree file.
-    index_binary_tree_file_glob = os.path.join(
-        path, '[Ii][Nn][Dd][Ee][Xx].[Bb][Tt][Rr]')
-    index_binary_tree_file_path = glob.glob(index_binary_tree_file_glob)[0]
+    index_binary_tree_file_path = self._GetRepositoryFilePath(
+        path, '[Ii][Nn][Dd][Ee][Xx].[Bb][Tt][Rr]', 'index binary-tree')
 
     if self._debug:
       self._DebugPrintText('Reading: {0:s}\n'.format(
@@ -1842,19 +3237,25 @@ class CIMRepository(data_format.BinaryDataFormat):
 
     self._index_binary_tree_file = IndexBinaryTreeFile(
         self._index_mapping_file, debug=self._debug,
-        output_writer=self._output_writer)
-    self._index_binary_tree_file.Open(index_binary_tree_file_path)
+        output_writer=self._output_writer,
+        page_cache_size=self._page_cache_size)
+    self._index_binary_tree_file.Open(
+        index_binary_tree_file_path, use_mmap=use_mmap)
 
-  def OpenObjectsData(self, path):
+  def OpenObjectsData(self, path, use_mmap=False):
     """Opens the CIM repository objects data.
 
     Args:
       path (str): path to the CIM repository.
+      use_mmap (Optional[bool]): True if the repository files should be
+          memory mapped.
+
+    Raises:
+      IOError: if the objects mapping or data file is missing.
     """
     # Objects mappings file.
-    objects_mapping_file_glob = os.path.join(
-        path, '[Oo][Bb][Jj][Ee][Cc][Tt][Ss].[Mm][Aa][Pp]')
-    objects_mapping_file_path = glob.glob(objects_mapping_file_glob)[0]
+    objects_mapping_file_path = self._GetRepositoryFilePath(
+        path, '[Oo][Bb][Jj][Ee][Cc][Tt][Ss].[Mm][Aa][Pp]', 'objects mapping')
 
     if self._debug:
       self._DebugPrintText('Reading: {0:s}\n'.format(
@@ -1862,17 +3263,269 @@ class CIMRepository(data_format.BinaryDataFormat):
 
     self._objects_mapping_file = MappingFile(
         debug=self._debug, output_writer=self._output_writer)
-    self._objects_mapping_file.Open(objects_mapping_file_path)
+    self._objects_mapping_file.Open(
+        objects_mapping_file_path, use_mmap=use_mmap)
 
     # Objects data file.
-    objects_data_file_glob = os.path.join(
-        path, '[Oo][Bb][Jj][Ee][Cc][Tt][Ss].[Da][Aa][Tt][Aa]')
-    objects_data_file_path = glob.glob(objects_data_file_glob)[0]
+    objects_data_file_path = self._GetRepositoryFilePath(
+        path, '[Oo][Bb][Jj][Ee][Cc][Tt][Ss].[Dd][Aa][Tt][Aa]', 'objects data')
 
     if self._debug:
       self._DebugPrintText('Reading: {0:s}\n'.format(objects_data_file_path))
 
     self._objects_data_file = ObjectsDataFile(
         self._objects_mapping_file, debug=self._debug,
-        output_writer=self._output_writer)
-    self._objects_data_file.Open(objects_data_file_path)
+        output_writer=self._output_writer,
+        page_cache_size=self._page_cache_size)
+    self._objects_data_file.Open(
+        objects_data_file_path, use_mmap=use_mmap)
+
+
+def _ExtractObjectRecordsInWorker(path, keys, decode_instances=False):
+  """Extracts the object records of a batch of keys in a worker process.
+
+  A worker process opens the repository once, where the objects data file
+  is memory mapped read-only, hence the pages of the file are shared with
+  the other worker processes and only the mapping tables are read per worker
+  process.
+
+  Args:
+    path (str): path of the directory containing the CIM repository files.
+    keys (list[str]): CIM keys.
+    decode_instances (Optional[bool]): True if the property values of
+        the instance object records should be decoded.
+
+  Returns:
+    list[tuple[str, str, bytes, str, collections.OrderedDict[str, object]]]:
+        CIM key, data type and data of the object record and class name and
+        property values of the instance, per object record in order of key,
+        where the class name and property values are None if not decoded.
+  """
+  lookup_key = (path, decode_instances)
+  cim_repository = _cim_repositories.get(lookup_key, None)
+  if not cim_repository:
+    cim_repository = _OpenCIMRepository(path, decode_instances)
+    _cim_repositories[lookup_key] = cim_repository
+
+  return ExtractObjectRecords(
+      cim_repository, keys, decode_instances=decode_instances)
+
+
+def _OpenCIMRepository(path, decode_instances):
+  """Opens a CIM repository for the extraction of object records.
+
+  Args:
+    path (str): path of the directory containing the CIM repository files.
+    decode_instances (bool): True if the property values of the instance
+        object records should be decoded.
+
+  Returns:
+    CIMRepository: CIM repository.
+
+  Raises:
+    IOError: if a repository file is missing.
+  """
+  cim_repository = CIMRepository()
+
+  # The index binary-tree is only needed to look up class definitions.
+  if decode_instances:
+    cim_repository.Open(path, use_mmap=True)
+  else:
+    try:
+      cim_repository.OpenObjectsData(path, use_mmap=True)
+    except (IOError, OSError, errors.ParseError):
+      cim_repository.Close()
+      raise
+
+  return cim_repository
+
+
+def ExtractObjectRecords(cim_repository, keys, decode_instances=False):
+  """Extracts the object records of a batch of keys.
+
+  Args:
+    cim_repository (CIMRepository): opened CIM repository.
+    keys (list[str]): CIM keys.
+    decode_instances (Optional[bool]): True if the property values of
+        the instance object records should be decoded.
+
+  Returns:
+    list[tuple[str, str, bytes, str, collections.OrderedDict[str, object]]]:
+        CIM key, data type and data of the object record and class name and
+        property values of the instance, per object record in order of key,
+        where the class name and property values are None if not decoded.
+  """
+  object_records = {}
+  try:
+    for key, object_record in cim_repository.GetObjectRecordsByKeys(keys):
+      object_records[key] = object_record
+
+  except errors.ParseError:
+    # Retrieve the remaining object records per key, such that an object
+    # record that cannot be read does not prevent extracting the others.
+    for key in keys:
+      if key in object_records:
+        continue
+
+      try:
+        object_record = cim_repository.GetObjectRecordByKey(key)
+      except errors.ParseError as exception:
+        logging.warning(
+            'Unable to read object record: {0:s} with error: {1!s}'.format(
+                key, exception))
+        continue
+
+      if object_record:
+        object_records[key] = object_record
+
+  results = []
+  for key in sorted(object_records.keys()):
+    object_record = object_records[key]
+
+    class_name = None
+    property_values = None
+    if (decode_instances and
+        object_record.data_type in ObjectRecord.DATA_TYPES_INSTANCE):
+      try:
+        class_definition = cim_repository.GetClassDefinitionByKey(key)
+        if class_definition:
+          class_name = class_definition.name
+          property_values = object_record.ReadInstance(class_definition)
+
+      except errors.ParseError as exception:
+        logging.warning(
+            'Unable to read instance: {0:s} with error: {1!s}'.format(
+                key, exception))
+
+    results.append((
+        key, object_record.data_type, object_record.data, class_name,
+        property_values))
+
+  return results
+
+
+class ObjectRecordExtractionRunner(object):
+  """Runner that extracts object records from a CIM repository.
+
+  The keys are sorted and partitioned into batches of consecutive keys,
+  which are extracted by a pool of worker processes. The results of
+  the batches are returned in order of the batches, hence in order of key.
+  The number of pending batches is bounded, such that the memory usage does
+  not depend on the size of the repository.
+
+  Attributes:
+    number_of_records (int): number of object records extracted.
+  """
+
+  _DEFAULT_BATCH_SIZE = 1024
+
+  def __init__(
+      self, batch_size=_DEFAULT_BATCH_SIZE, decode_instances=False,
+      number_of_workers=None):
+    """Initializes an object record extraction runner.
+
+    Args:
+      batch_size (Optional[int]): number of keys per batch.
+      decode_instances (Optional[bool]): True if the property values of
+          the instance object records should be decoded.
+      number_of_workers (Optional[int]): number of worker processes, where
+          None represents the number of CPUs and 1 or less extracts
+          the object records in the current process.
+
+    Raises:
+      ValueError: if the batch size is not supported.
+    """
+    if batch_size <= 0:
+      raise ValueError('Unsupported batch size: {0:d}'.format(batch_size))
+
+    if number_of_workers is None:
+      number_of_workers = multiprocessing.cpu_count()
+
+    super(ObjectRecordExtractionRunner, self).__init__()
+    self._batch_size = batch_size
+    self._decode_instances = decode_instances
+    self._number_of_workers = number_of_workers
+    self.number_of_records = 0
+
+  def _GetBatches(self, keys):
+    """Retrieves the batches of keys.
+
+    Args:
+      keys (iterable[str]): CIM keys.
+
+    Yields:
+      list[str]: consecutive CIM keys of object records in sorted order.
+    """
+    batch = []
+    for key in sorted(keys):
+      # Only the keys of object records contain key values.
+      if '.' not in key:
+        continue
+
+      batch.append(key)
+      if len(batch) >= self._batch_size:
+        yield batch
+        batch = []
+
+    if batch:
+      yield batch
+
+  def Extract(self, path, keys):
+    """Extracts object records.
+
+    Args:
+      path (str): path of the directory containing the CIM repository files.
+      keys (iterable[str]): CIM keys.
+
+    Yields:
+      tuple[str, str, bytes, str, collections.OrderedDict[str, object]]: CIM
+          key, data type and data of the object record and class name and
+          property values of the instance, in order of key, where the class
+          name and property values are None if not decoded.
+
+    Raises:
+      IOError: if a repository file is missing.
+    """
+    self.number_of_records = 0
+
+    if self._number_of_workers <= 1 or futures is None:
+      cim_repository = _OpenCIMRepository(path, self._decode_instances)
+
+      try:
+        for batch in self._GetBatches(keys):
+          for result in ExtractObjectRecords(
+              cim_repository, batch, decode_instances=self._decode_instances):
+            self.number_of_records += 1
+            yield result
+
+      finally:
+        cim_repository.Close()
+
+      return
+
+    maximum_number_of_pending_batches = self._number_of_workers * 2
+
+    executor = futures.ProcessPoolExecutor(
+        max_workers=self._number_of_workers)
+
+    try:
+      pending_futures = collections.deque()
+      for batch in self._GetBatches(keys):
+        if len(pending_futures) >= maximum_number_of_pending_batches:
+          future = pending_futures.popleft()
+          for result in future.result():
+            self.number_of_records += 1
+            yield result
+
+        pending_futures.append(executor.submit(
+            _ExtractObjectRecordsInWorker, path, batch,
+            decode_instances=self._decode_instances))
+
+      while pending_futures:
+        future = pending_futures.popleft()
+        for result in future.result():
+          self.number_of_records += 1
+          yield result
+
+    finally:
+      executor.shutdown(wait=True)
@@ -11,6 +11,7 @@ import sys
 
 from dtformats import asl
 from dtformats import output_writers
+from dtformats import script_helpers
 
 
 def Main():
@@ -26,6 +27,10 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser, follow_mode=True)
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Apple System Log file.')
@@ -39,9 +44,14 @@ def Main():
     print('')
     return False
 
+  if not script_helpers.CheckRecordOutputOptions(options):
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -55,11 +65,24 @@ def Main():
       debug=options.debug, output_writer=output_writer)
   asl_file.Open(options.source)
 
-  output_writer.WriteText('Apple System Log information:')
-  # TODO: print asl information.
+  if options.output_format:
+    if not script_helpers.WriteRecords(
+        asl_file, options.source, options.output_format,
+        path=options.output_file,
+        follow_state_file=options.follow_state_file):
+      asl_file.Close()
+      return False
+
+  else:
+    output_writer.WriteText('Apple System Log information:')
+    # TODO: print asl information.
 
   asl_file.Close()
 
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
@@ -11,6 +11,7 @@ import sys
 
 from dtformats import bsm
 from dtformats import output_writers
+from dtformats import script_helpers
 
 
 def Main():
@@ -26,6 +27,14 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser, follow_mode=True)
+
+  argument_parser.add_argument(
+      '--mmap', dest='use_mmap', action='store_true', default=False,
+      help='use memory mapped I/O to read the file.')
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the BSM event auditing file.')
@@ -39,9 +48,14 @@ def Main():
     print('')
     return False
 
+  if not script_helpers.CheckRecordOutputOptions(options):
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -54,13 +68,26 @@ def Main():
   log_file = bsm.BSMEventAuditingFile(
       debug=options.debug, output_writer=output_writer)
 
-  log_file.Open(options.source)
+  log_file.Open(options.source, use_mmap=options.use_mmap)
 
-  print('BSM event auditing information:')
-  print('')
+  if options.output_format:
+    if not script_helpers.WriteRecords(
+        log_file, options.source, options.output_format,
+        path=options.output_file,
+        follow_state_file=options.follow_state_file):
+      log_file.Close()
+      return False
+
+  else:
+    print('BSM event auditing information:')
+    print('')
 
   log_file.Close()
 
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to carve records from raw data, such as a storage media image."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import logging
+import os
+import sys
+
+from dtformats import carver
+from dtformats import output_writers
+from dtformats import script_helpers
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Carves records of the supported formats by their signatures from raw '
+      'data, such as a storage media image, unallocated data or a memory '
+      'dump.'))
+
+  argument_parser.add_argument(
+      '--carvers', dest='carvers', action='store', metavar='NAMES',
+      default=None, help=(
+          'comma separated names of the record carvers, by default all '
+          'record carvers are used, supported record carvers are: {0:s}.'
+          '').format(', '.join(sorted(carver.CARVER_CLASSES.keys()))))
+
+  argument_parser.add_argument(
+      '--chunk_size', '--chunk-size', dest='chunk_size', type=int,
+      action='store', metavar='SIZE', default=16 * 1024 * 1024, help=(
+          'size of a chunk of work in bytes.'))
+
+  argument_parser.add_argument(
+      '--format', dest='output_format', action='store', metavar='FORMAT',
+      choices=sorted(output_writers.RECORD_WRITER_CLASSES.keys()),
+      default='jsonl', help=(
+          'structured output format of the records, supported formats are: '
+          'columnar, csv and jsonl.'))
+
+  argument_parser.add_argument(
+      '-w', '--write', dest='output_file', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the file to write the records to, by default the records '
+          'are written to stdout.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='workers', type=int, action='store', metavar='NUMBER',
+      default=None, help=(
+          'number of worker processes, by default the number of CPUs.'))
+
+  argument_parser.add_argument(
+      'source', nargs='?', action='store', metavar='PATH',
+      default=None, help='path of the raw data.')
+
+  options = argument_parser.parse_args()
+
+  if not options.source:
+    print('Source file missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  if os.path.isdir(options.source):
+    print('Source: {0:s} is a directory.'.format(options.source))
+    print('')
+    return False
+
+  carver_names = None
+  if options.carvers:
+    carver_names = [
+        carver_name.strip() for carver_name in options.carvers.split(',')]
+
+  try:
+    carving_runner = carver.CarvingRunner(
+        carver_names=carver_names, chunk_size=options.chunk_size,
+        number_of_workers=options.workers)
+  except ValueError as exception:
+    print('{0!s}'.format(exception))
+    print('')
+    return False
+
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  record_writer = script_helpers.OpenRecordWriter(
+      options.output_format, path=options.output_file)
+  if not record_writer:
+    return False
+
+  try:
+    carving_runner.Carve(options.source, record_writer)
+  finally:
+    record_writer.Close()
+
+  logging.info('Carved: {0:d} records from: {1:d} signature hits.'.format(
+      carving_runner.number_of_records, carving_runner.number_of_hits))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -12,6 +12,7 @@ import sys
 
 from dtformats import chrome_cache
 from dtformats import output_writers
+from dtformats import script_helpers
 
 
 def Main():
@@ -27,6 +28,21 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--format', dest='output_format', action='store', metavar='FORMAT',
+      choices=sorted(output_writers.RECORD_WRITER_CLASSES.keys()),
+      default=None, help=(
+          'write the cache addresses of the index file in a structured output '
+          'format, supported formats are: columnar, csv and jsonl.'))
+
+  argument_parser.add_argument(
+      '-w', '--write', dest='output_file', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the file to write the records to, by default the records '
+          'are written to stdout.'))
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Chrome Cache file(s).')
@@ -43,6 +59,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -52,14 +70,36 @@ def Main():
     print('')
     return False
 
-  parser = chrome_cache.ChromeCacheParser(
-      debug=options.debug, output_writer=output_writer)
+  if options.output_format:
+    index_file_path = options.source
+    if os.path.isdir(index_file_path):
+      index_file_path = os.path.join(index_file_path, 'index')
 
-  if os.path.isdir(options.source):
-    parser.ParseDirectory(options.source)
+    index_file = chrome_cache.IndexFile(
+        debug=options.debug, output_writer=output_writer)
+    index_file.Open(index_file_path)
+
+    if not script_helpers.WriteRecords(
+        index_file, index_file_path, options.output_format,
+        path=options.output_file):
+      index_file.Close()
+      return False
+
+    index_file.Close()
 
   else:
-    parser.ParseFile(options.source)
+    parser = chrome_cache.ChromeCacheParser(
+        debug=options.debug, output_writer=output_writer)
+
+    if os.path.isdir(options.source):
+      parser.ParseDirectory(options.source)
+
+    else:
+      parser.ParseFile(options.source)
+
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
 
   output_writer.Close()
 
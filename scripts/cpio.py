@@ -24,6 +24,7 @@ except ImportError:
 from dtformats import cpio
 from dtformats import data_range
 from dtformats import output_writers
+from dtformats import script_helpers
 
 
 class CPIOArchiveFileHasher(object):
@@ -38,6 +39,8 @@ class CPIOArchiveFileHasher(object):
   _GZIP_SIGNATURE = b'\x1f\x8b'
   _XZ_SIGNATURE = b'\xfd7zXZ\x00'
 
+  _READ_BUFFER_SIZE = 65536
+
   def __init__(self, path, debug=False, output_writer=None):
     """Initializes the CPIO archive file hasher object.
 
@@ -60,6 +63,10 @@ class CPIOArchiveFileHasher(object):
     file_offset = 0
     file_size = stat_object.st_size
 
+    # The read buffer is reused for every file entry.
+    read_buffer = bytearray(self._READ_BUFFER_SIZE)
+    read_buffer_view = memoryview(read_buffer)
+
     # initrd files can consist of an uncompressed and compressed cpio archive.
     # Keeping the functionality in this script for now, but this likely
     # needs to be in a separate initrd hashing script.
@@ -114,10 +121,10 @@ class CPIOArchiveFileHasher(object):
           continue
 
         sha256_context = hashlib.sha256()
-        file_data = file_entry.read(4096)
-        while file_data:
-          sha256_context.update(file_data)
-          file_data = file_entry.read(4096)
+        number_of_bytes = file_entry.readinto(read_buffer)
+        while number_of_bytes:
+          sha256_context.update(read_buffer_view[:number_of_bytes])
+          number_of_bytes = file_entry.readinto(read_buffer)
 
         self._output_writer.WriteText('{0:s}\t{1:s}\n'.format(
             sha256_context.hexdigest(), file_entry.path))
@@ -144,10 +151,14 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser)
+
   argument_parser.add_argument(
       '--hash', dest='hash', action='store_true', default=False,
       help='calculate the SHA-256 sum of the file entries.')
 
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the CPIO archive file.')
@@ -164,6 +175,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -179,6 +192,19 @@ def Main():
 
     cpio_archive_file_hasher.HashFileEntries()
 
+  elif options.output_format:
+    cpio_archive_file = cpio.CPIOArchiveFile(
+        debug=options.debug, output_writer=output_writer)
+    cpio_archive_file.Open(options.source)
+
+    if not script_helpers.WriteRecords(
+        cpio_archive_file, options.source, options.output_format,
+        path=options.output_file):
+      cpio_archive_file.Close()
+      return False
+
+    cpio_archive_file.Close()
+
   else:
     # TODO: move functionality to CPIOArchiveFileInfo.
     cpio_archive_file = cpio.CPIOArchiveFile(
@@ -193,7 +219,15 @@ def Main():
 
     cpio_archive_file.Close()
 
-  output_writer.WriteText('\n')
+  # Note that the records written in a structured output format are not
+  # followed by an empty line.
+  if options.hash or not options.output_format:
+    output_writer.WriteText('\n')
+
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
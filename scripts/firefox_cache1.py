@@ -10,8 +10,9 @@ import logging
 import os
 import sys
 
-from dtformats import output_writers
 from dtformats import firefox_cache1
+from dtformats import output_writers
+from dtformats import script_helpers
 
 
 def Main():
@@ -27,6 +28,10 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser)
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Firefox cache version 1 file.')
@@ -43,6 +48,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -62,11 +69,23 @@ def Main():
 
   cache_file.Open(options.source)
 
-  print('Firefox cache version 1 information:')
-  print('')
+  if options.output_format:
+    if not script_helpers.WriteRecords(
+        cache_file, options.source, options.output_format,
+        path=options.output_file):
+      cache_file.Close()
+      return False
+
+  else:
+    print('Firefox cache version 1 information:')
+    print('')
 
   cache_file.Close()
 
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
@@ -15,6 +15,7 @@ import sys
 
 from dtformats import gzipfile
 from dtformats import output_writers
+from dtformats import script_helpers
 
 
 def Main():
@@ -30,6 +31,8 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the GZIP compressed stream file.')
@@ -46,6 +49,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -64,6 +69,8 @@ def Main():
 
   gzip_file.Close()
 
+  script_helpers.WriteStatistics(profiler, output_writer)
+
   output_writer.Close()
 
   return True
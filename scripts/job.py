@@ -11,6 +11,7 @@ import sys
 
 from dtformats import job
 from dtformats import output_writers
+from dtformats import script_helpers
 
 
 def Main():
@@ -26,6 +27,8 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Windows Job file.')
@@ -42,6 +45,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -60,6 +65,8 @@ def Main():
 
   job_file.Close()
 
+  script_helpers.WriteStatistics(profiler, output_writer)
+
   output_writer.Close()
 
   return True
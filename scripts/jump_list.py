@@ -16,6 +16,7 @@ import pyolecf
 
 from dtformats import jump_list
 from dtformats import output_writers
+from dtformats import script_helpers
 
 
 def Main():
@@ -31,6 +32,8 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Windows Jump List file.')
@@ -47,6 +50,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -81,6 +86,8 @@ def Main():
 
   jump_list_file.Close()
 
+  script_helpers.WriteStatistics(profiler, output_writer)
+
   output_writer.Close()
 
   return True
@@ -11,6 +11,7 @@ import sys
 
 from dtformats import keychain
 from dtformats import output_writers
+from dtformats import script_helpers
 
 
 ATTRIBUTE_DATA_TYPES = {
@@ -42,6 +43,8 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the keychain database file.')
@@ -58,6 +61,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -122,6 +127,8 @@ def Main():
 
   keychain_file.Close()
 
+  script_helpers.WriteStatistics(profiler, output_writer)
+
   output_writer.Close()
 
   return True
@@ -13,6 +13,7 @@ from dfdatetime import filetime as dfdatetime_filetime
 
 from dtformats import output_writers
 from dtformats import recycle_bin
+from dtformats import script_helpers
 
 
 def Main():
@@ -28,6 +29,8 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Recycle.Bin metadata ($I) file.')
@@ -44,6 +47,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -83,6 +88,8 @@ def Main():
 
   metadata_file.Close()
 
+  script_helpers.WriteStatistics(profiler, output_writer)
+
   output_writer.Close()
 
   return True
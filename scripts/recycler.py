@@ -11,6 +11,7 @@ import sys
 
 from dtformats import output_writers
 from dtformats import recycler
+from dtformats import script_helpers
 
 
 def Main():
@@ -26,6 +27,10 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser)
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Recycler INFO2 file.')
@@ -42,6 +47,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -56,15 +63,27 @@ def Main():
 
   info2_file.Open(options.source)
 
-  print('Recycler INFO2 file information:')
+  if options.output_format:
+    if not script_helpers.WriteRecords(
+        info2_file, options.source, options.output_format,
+        path=options.output_file):
+      info2_file.Close()
+      return False
 
-  # TODO: print file information.
-  # TODO: print file entries.
+  else:
+    print('Recycler INFO2 file information:')
 
-  print('')
+    # TODO: print file information.
+    # TODO: print file entries.
+
+    print('')
 
   info2_file.Close()
 
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
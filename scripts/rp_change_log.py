@@ -11,6 +11,7 @@ import sys
 
 from dtformats import output_writers
 from dtformats import rp_change_log
+from dtformats import script_helpers
 
 
 def Main():
@@ -26,6 +27,10 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser)
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Windows Restore Point change.log file.')
@@ -42,6 +47,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -56,32 +63,44 @@ def Main():
 
   change_log_file.Open(options.source)
 
-  print('Windows Restore Point change.log information:')
-  print('Volume path:\t{0:s}'.format(change_log_file.volume_path))
-  print('')
+  if options.output_format:
+    if not script_helpers.WriteRecords(
+        change_log_file, options.source, options.output_format,
+        path=options.output_file):
+      change_log_file.Close()
+      return False
+
+  else:
+    print('Windows Restore Point change.log information:')
+    print('Volume path:\t{0:s}'.format(change_log_file.volume_path))
+    print('')
 
-  for change_log_entry in change_log_file.entries:
-    flags = []
-    for flag, description in change_log_file.LOG_ENTRY_TYPES.items():
-      if change_log_entry.entry_type & flag:
-        flags.append(description)
+    for change_log_entry in change_log_file.ReadRecords():
+      flags = []
+      for flag, description in change_log_file.LOG_ENTRY_TYPES.items():
+        if change_log_entry.entry_type & flag:
+          flags.append(description)
 
-    print('Entry type:\t\t{0:s}'.format(', '.join(flags)))
+      print('Entry type:\t\t{0:s}'.format(', '.join(flags)))
 
-    flags = []
-    for flag, description in change_log_file.LOG_ENTRY_FLAGS.items():
-      if change_log_entry.entry_flags & flag:
-        flags.append(description)
+      flags = []
+      for flag, description in change_log_file.LOG_ENTRY_FLAGS.items():
+        if change_log_entry.entry_flags & flag:
+          flags.append(description)
 
-    print('Entry flags:\t\t{0:s}'.format(', '.join(flags)))
+      print('Entry flags:\t\t{0:s}'.format(', '.join(flags)))
 
-    print('Sequence number:\t{0:d}'.format(change_log_entry.sequence_number))
-    print('Process name:\t\t{0:s}'.format(change_log_entry.process_name))
+      print('Sequence number:\t{0:d}'.format(change_log_entry.sequence_number))
+      print('Process name:\t\t{0:s}'.format(change_log_entry.process_name))
 
-    print('')
+      print('')
 
   change_log_file.Close()
 
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
@@ -11,6 +11,7 @@ import sys
 
 from dtformats import output_writers
 from dtformats import safari_cookies
+from dtformats import script_helpers
 
 
 def Main():
@@ -26,6 +27,10 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser)
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Cookies.binarycookies file.')
@@ -42,6 +47,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -55,11 +62,23 @@ def Main():
       debug=options.debug, output_writer=output_writer)
   binary_cookies_file.Open(options.source)
 
-  output_writer.WriteText('Safari Cookies information:\n')
-  # TODO: print cookies information.
+  if options.output_format:
+    if not script_helpers.WriteRecords(
+        binary_cookies_file, options.source, options.output_format,
+        path=options.output_file):
+      binary_cookies_file.Close()
+      return False
+
+  else:
+    output_writer.WriteText('Safari Cookies information:\n')
+    # TODO: print cookies information.
 
   binary_cookies_file.Close()
 
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Script to triage the artifacts in a directory tree."""
+
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import logging
+import os
+import sys
+
+from dtformats import output_writers
+from dtformats import script_helpers
+from dtformats import triage
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    bool: True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      'Identifies and parses the supported artifacts in a directory tree, '
+      'such as a mounted storage media image.'))
+
+  argument_parser.add_argument(
+      '--batch_size', '--batch-size', dest='batch_size', type=int,
+      action='store', metavar='NUMBER', default=64, help=(
+          'number of files per batch of work.'))
+
+  argument_parser.add_argument(
+      '--format', dest='output_format', action='store', metavar='FORMAT',
+      choices=sorted(output_writers.RECORD_WRITER_CLASSES.keys()),
+      default='jsonl', help=(
+          'structured output format of the records, supported formats are: '
+          'columnar, csv and jsonl.'))
+
+  argument_parser.add_argument(
+      '--memory_budget', '--memory-budget', dest='memory_budget', type=int,
+      action='store', metavar='SIZE', default=None, help=(
+          'size of the memory budget of the parsers of every worker process '
+          'in bytes, by default the memory usage is not bounded. State that '
+          'exceeds the budget is spilled to temporary files or read again '
+          'when needed.'))
+
+  argument_parser.add_argument(
+      '-w', '--write', dest='output_file', action='store', metavar='PATH',
+      default=None, help=(
+          'path of the file to write the records to, by default the records '
+          'are written to stdout.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='workers', type=int, action='store', metavar='NUMBER',
+      default=None, help=(
+          'number of worker processes, by default the number of CPUs.'))
+
+  argument_parser.add_argument(
+      'source', nargs='?', action='store', metavar='PATH',
+      default=None, help='path of the directory tree.')
+
+  options = argument_parser.parse_args()
+
+  if not options.source:
+    print('Source directory missing.')
+    print('')
+    argument_parser.print_help()
+    print('')
+    return False
+
+  if not os.path.isdir(options.source):
+    print('Source: {0:s} is not a directory.'.format(options.source))
+    print('')
+    return False
+
+  logging.basicConfig(
+      level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+  record_writer = script_helpers.OpenRecordWriter(
+      options.output_format, path=options.output_file)
+  if not record_writer:
+    return False
+
+  triage_runner = triage.TriageRunner(
+      batch_size=options.batch_size, memory_budget_size=options.memory_budget,
+      number_of_workers=options.workers)
+
+  try:
+    triage_runner.Triage(options.source, record_writer)
+  finally:
+    record_writer.Close()
+
+  logging.info((
+      'Triaged: {0:d} artifacts with: {1:d} records and: {2:d} '
+      'errors.').format(
+          triage_runner.number_of_artifacts, triage_runner.number_of_records,
+          triage_runner.number_of_errors))
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -9,7 +9,9 @@ import argparse
 import logging
 import sys
 
+from dtformats import format_registry
 from dtformats import output_writers
+from dtformats import script_helpers
 from dtformats import tracev3
 from dtformats import uuidtext
 
@@ -28,6 +30,8 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH', default=None, help=(
           'path of the Apple Unified Logging and Activity Tracing file.'))
@@ -44,6 +48,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -53,10 +59,9 @@ def Main():
     print('')
     return False
 
-  with open(options.source, 'rb') as file_object:
-    file_signature = file_object.read(4)
+  format_names = format_registry.FormatRegistry.IdentifyFile(options.source)
 
-  if file_signature == b'\x99\x88\x77\x66':
+  if 'uuidtext' in format_names:
     unified_logging_file = uuidtext.UUIDTextFile(
         debug=options.debug, output_writer=output_writer)
   else:
@@ -70,6 +75,8 @@ def Main():
 
   unified_logging_file.Close()
 
+  script_helpers.WriteStatistics(profiler, output_writer)
+
   output_writer.Close()
 
   return True
@@ -7,10 +7,11 @@ from __future__ import unicode_literals
 
 import argparse
 import logging
-import os
 import sys
 
+from dtformats import format_registry
 from dtformats import output_writers
+from dtformats import script_helpers
 from dtformats import utmp
 
 
@@ -27,6 +28,10 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser, follow_mode=True)
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the utmp file.')
@@ -40,9 +45,14 @@ def Main():
     print('')
     return False
 
+  if not script_helpers.CheckRecordOutputOptions(options):
+    return False
+
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -52,11 +62,9 @@ def Main():
     print('')
     return False
 
-  with open(options.source, 'rb') as file_object:
-    file_object.seek(0, os.SEEK_SET)
-    utmp_signature = file_object.read(11)
+  format_names = format_registry.FormatRegistry.IdentifyFile(options.source)
 
-  if utmp_signature == b'utmpx-1.00\x00':
+  if 'utmpx' in format_names:
     utmp_file = utmp.MacOSXUtmpxFile(
         debug=options.debug, output_writer=output_writer)
   else:
@@ -65,11 +73,25 @@ def Main():
 
   utmp_file.Open(options.source)
 
-  output_writer.WriteText('utmp information:')
+  if options.output_format:
+    if not script_helpers.WriteRecords(
+        utmp_file, options.source, options.output_format,
+        path=options.output_file,
+        follow_state_file=options.follow_state_file):
+      utmp_file.Close()
+      return False
+
+  else:
+    output_writer.WriteText('utmp information:')
 
   utmp_file.Close()
 
   output_writer.WriteText('')
+
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
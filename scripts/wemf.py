@@ -7,10 +7,11 @@ from __future__ import unicode_literals
 
 import argparse
 import logging
-import os
 import sys
 
+from dtformats import format_registry
 from dtformats import output_writers
+from dtformats import script_helpers
 from dtformats import wemf
 
 
@@ -27,6 +28,10 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  script_helpers.AddRecordOutputOptions(argument_parser)
+
+  script_helpers.AddProfileOption(argument_parser)
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help='path of the Windows (Enhanced) Metafile file.')
@@ -43,6 +48,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -52,22 +59,32 @@ def Main():
     print('')
     return False
 
-  with open(options.source, 'rb') as file_object:
-    file_object.seek(40, os.SEEK_SET)
-    file_signature = file_object.read(4)
+  format_names = format_registry.FormatRegistry.IdentifyFile(options.source)
 
-  if file_signature == b'FME ':
+  if 'emf' in format_names:
     wemf_file = wemf.EMFFile(debug=options.debug, output_writer=output_writer)
   else:
     wemf_file = wemf.WMFFile(debug=options.debug, output_writer=output_writer)
 
   wemf_file.Open(options.source)
 
-  description = '{0:s} information:'.format(wemf_file.FILE_TYPE)
-  output_writer.WriteText(description)
+  if options.output_format:
+    if not script_helpers.WriteRecords(
+        wemf_file, options.source, options.output_format,
+        path=options.output_file):
+      wemf_file.Close()
+      return False
+
+  else:
+    description = '{0:s} information:'.format(wemf_file.FILE_TYPE)
+    output_writer.WriteText(description)
 
   wemf_file.Close()
 
+  script_helpers.WriteStatistics(
+      profiler, output_writer, output_format=options.output_format,
+      path=options.output_file)
+
   output_writer.Close()
 
   return True
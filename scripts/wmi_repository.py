@@ -10,10 +10,26 @@ import logging
 import os
 import sys
 
+from dtformats import errors
 from dtformats import output_writers
+from dtformats import script_helpers
 from dtformats import wmi_repository
 
 
+def PrintInstance(class_name, property_values):
+  """Prints the property values of an instance.
+
+  Args:
+    class_name (str): name of the class of the instance.
+    property_values (collections.OrderedDict[str, object]): property values
+        of the instance per property name.
+  """
+  print('Class: {0:s}'.format(class_name))
+  for name, value in property_values.items():
+    print('  {0:s}: {1!s}'.format(name, value))
+  print('')
+
+
 def Main():
   """The main program function.
 
@@ -28,6 +44,47 @@ def Main():
       '-d', '--debug', dest='debug', action='store_true', default=False,
       help='enable debug output.')
 
+  argument_parser.add_argument(
+      '--instances', dest='instances', action='store_true', default=False,
+      help=(
+          'decode the property values of the instance object records using '
+          'the definitions of their classes.'))
+
+  argument_parser.add_argument(
+      '--key_prefix', '--key-prefix', dest='key_prefix', action='store',
+      metavar='PREFIX', default=None, help=(
+          'only process the keys with the prefix, such as '
+          '"\\NS_<namespace hash>\\CI_<class name hash>", which are looked '
+          'up in the index binary-tree.'))
+
+  argument_parser.add_argument(
+      '--mmap', dest='use_mmap', action='store_true', default=False,
+      help='use memory mapped I/O to read the repository files.')
+
+  argument_parser.add_argument(
+      '--page_cache_size', '--page-cache-size', dest='page_cache_size',
+      type=int, action='store', metavar='NUMBER',
+      default=wmi_repository.DEFAULT_PAGE_CACHE_SIZE, help=(
+          'maximum number of pages in the page cache of the index '
+          'binary-tree and the objects data files, where 0 disables '
+          'the page caches.'))
+
+  script_helpers.AddProfileOption(argument_parser)
+
+  argument_parser.add_argument(
+      '--sidecar_index', '--sidecar-index', dest='sidecar_index',
+      action='store', metavar='PATH', default=None, help=(
+          'path of a sidecar index database file to retrieve the keys from '
+          'instead of the index binary-tree, the sidecar index is built if '
+          'it does not exist or the repository files have changed.'))
+
+  argument_parser.add_argument(
+      '--workers', dest='workers', type=int, action='store', metavar='NUMBER',
+      default=None, help=(
+          'number of worker processes to extract the object records with, '
+          'where 0 represents the number of CPUs, by default the object '
+          'records are extracted in the current process.'))
+
   argument_parser.add_argument(
       'source', nargs='?', action='store', metavar='PATH',
       default=None, help=(
@@ -46,6 +103,8 @@ def Main():
   logging.basicConfig(
       level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+  profiler = script_helpers.EnableProfiling(options)
+
   output_writer = output_writers.StdoutWriter()
 
   try:
@@ -59,36 +118,102 @@ def Main():
   source_basename = source_basename.upper()
 
   cim_repository = wmi_repository.CIMRepository(
-      debug=options.debug, output_writer=output_writer)
+      debug=options.debug, output_writer=output_writer,
+      page_cache_size=options.page_cache_size)
 
   if source_basename == 'INDEX.BTR':
     source = os.path.dirname(options.source)
-    cim_repository.OpenIndexBinaryTree(source)
-
-  else:
-    cim_repository.Open(options.source)
 
-    object_record_keys = {}
-    for key in cim_repository.GetKeys():
-      if '.' not in key:
-        continue
+    try:
+      cim_repository.OpenIndexBinaryTree(source, use_mmap=options.use_mmap)
+    except (IOError, OSError, errors.ParseError) as exception:
+      print('Unable to open CIM repository with error: {0!s}'.format(
+          exception))
+      print('')
+      return False
 
-      _, _, key_name = key.rpartition('\\')
-      key_name, _, _ = key_name.partition('.')
+  else:
+    try:
+      cim_repository.Open(
+          options.source, use_mmap=options.use_mmap,
+          sidecar_index_path=options.sidecar_index)
+    except (IOError, OSError, ValueError, errors.ParseError) as exception:
+      print('Unable to open CIM repository with error: {0!s}'.format(
+          exception))
+      print('')
+      return False
+
+    if options.key_prefix:
+      keys = cim_repository.FindKeysWithPrefix(options.key_prefix)
+    else:
+      keys = cim_repository.GetKeys()
+
+    if options.workers is not None:
+      extraction_runner = wmi_repository.ObjectRecordExtractionRunner(
+          decode_instances=options.instances,
+          number_of_workers=options.workers or None)
+
+      for key, data_type, data, class_name, property_values in (
+          extraction_runner.Extract(options.source, keys)):
+        print(key)
+        object_record = wmi_repository.ObjectRecord(
+            data_type, data, debug=options.debug, output_writer=output_writer)
+        object_record.Read()
 
-      if key_name not in object_record_keys:
-        object_record_keys[key_name] = []
+        if property_values:
+          PrintInstance(class_name, property_values)
 
-      object_record_keys[key_name].append(key)
+    else:
+      # Only the keys of object records contain key values. The object
+      # records of all the keys are retrieved at once, such that every page
+      # with object descriptors is read only once.
+      object_record_keys = [key for key in keys if '.' in key]
 
-    for key_name, keys in iter(object_record_keys.items()):
-      for key in keys:
+      for key, object_record in cim_repository.GetObjectRecordsByKeys(
+          object_record_keys):
         print(key)
-        object_record = cim_repository.GetObjectRecordByKey(key)
-        object_record.Read()
+
+        try:
+          object_record.Read()
+        except errors.ParseError as exception:
+          logging.warning((
+              'Unable to read object record: {0:s} with error: {1!s}').format(
+                  key, exception))
+          continue
+
+        if (options.instances and object_record.data_type in
+            wmi_repository.ObjectRecord.DATA_TYPES_INSTANCE):
+          try:
+            class_definition = cim_repository.GetClassDefinitionByKey(key)
+            property_values = None
+            if class_definition:
+              property_values = object_record.ReadInstance(class_definition)
+
+          except errors.ParseError as exception:
+            logging.warning((
+                'Unable to read instance: {0:s} with error: {1!s}').format(
+                    key, exception))
+            property_values = None
+
+          if property_values:
+            PrintInstance(class_definition.name, property_values)
+
+  page_caches = [
+      ('Index binary-tree', cim_repository.index_page_cache),
+      ('Objects data', cim_repository.objects_page_cache)]
 
   cim_repository.Close()
 
+  if profiler:
+    profiler.WriteStatistics(output_writer)
+
+    for description, page_cache in page_caches:
+      if page_cache is not None:
+        output_writer.WriteText((
+            '{0:s} page cache hits: {1:d}, misses: {2:d}\n').format(
+                description, page_cache.number_of_hits,
+                page_cache.number_of_misses))
+
   output_writer.Close()
 
   return True
@@ -248,7 +248,7 @@ setup(
         'Programming Language :: Python',
     ],
     packages=find_packages('.', exclude=[
-        'scripts', 'tests', 'tests.*', 'utils']),
+        'benchmarks', 'scripts', 'tests', 'tests.*', 'utils']),
     package_dir={
         'dtformats': 'dtformats'
     },
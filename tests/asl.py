@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 import unittest
 
 from dtformats import asl
+from dtformats import follow
 
 from tests import test_lib
 
@@ -62,6 +63,64 @@ class AppleSystemLogFileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['applesystemlog.asl'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['applesystemlog.asl'])
+  def testReadAppendedRecords(self):
+    """Tests the ReadAppendedRecords function."""
+    test_file = asl.AppleSystemLogFile()
+
+    test_file_path = self._GetTestFilePath(['applesystemlog.asl'])
+    test_file.Open(test_file_path)
+
+    try:
+      # Test with a follow state of the first record.
+      follow_state = follow.FollowState()
+      generator = test_file.ReadAppendedRecords(follow_state)
+      asl_record = next(generator)
+      generator.close()
+
+      self.assertEqual(asl_record.message_identifier, 101406)
+      self.assertIsNotNone(follow_state.fingerprint)
+
+      asl_records = list(test_file.ReadAppendedRecords(follow_state))
+      self.assertEqual(len(asl_records), 1)
+      self.assertNotEqual(asl_records[0].message_identifier, 101406)
+
+      asl_records = list(test_file.ReadAppendedRecords(follow_state))
+      self.assertEqual(len(asl_records), 0)
+
+      # Test with a follow state of another file.
+      follow_state.fingerprint = 'bogus'
+
+      asl_records = list(test_file.ReadAppendedRecords(follow_state))
+      self.assertEqual(len(asl_records), 2)
+
+    finally:
+      test_file.Close()
+
+  @test_lib.skipUnlessHasTestFile(['applesystemlog.asl'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = asl.AppleSystemLogFile()
+
+    test_file_path = self._GetTestFilePath(['applesystemlog.asl'])
+    test_file.Open(test_file_path)
+
+    try:
+      asl_records = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(asl_records), 2)
+
+    asl_record = asl_records[0]
+    self.assertIsInstance(asl_record, asl.AppleSystemLogRecord)
+    self.assertEqual(asl_record.facility, 'com.apple.locationd')
+    self.assertEqual(asl_record.hostname, 'DarkTemplar-2.local')
+    self.assertEqual(asl_record.message_identifier, 101406)
+    self.assertEqual(asl_record.sender, 'locationd')
+    self.assertEqual(asl_record.written_time, 1385372735)
+    self.assertEqual(asl_record.extra_fields['CFLog Thread'], '1007')
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Tests for the asynchronous parser."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+try:
+  import asyncio
+  from dtformats import async_parser
+except (ImportError, SyntaxError):
+  async_parser = None
+
+from dtformats import chrome_cache
+from dtformats import errors
+from dtformats import utmp
+
+from tests import test_lib
+
+
+def _ReadRecords(event_loop, async_generator, maximum_number_of_records=None):
+  """Reads records from an asynchronous generator.
+
+  Args:
+    event_loop (asyncio.AbstractEventLoop): event loop.
+    async_generator (async_generator): asynchronous generator.
+    maximum_number_of_records (Optional[int]): maximum number of records to
+        read, where None represents all records.
+
+  Returns:
+    list[dict[str, object]]: records.
+  """
+  records = []
+  try:
+    while (maximum_number_of_records is None or
+           len(records) < maximum_number_of_records):
+      records.append(event_loop.run_until_complete(
+          async_generator.__anext__()))
+
+  except StopAsyncIteration:  # pylint: disable=undefined-variable
+    pass
+
+  finally:
+    event_loop.run_until_complete(async_generator.aclose())
+
+  return records
+
+
+@unittest.skipIf(async_parser is None, 'requires Python 3.6 or later')
+class AsyncParserTest(test_lib.BaseTestCase):
+  """Tests for the asynchronous parser."""
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._event_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(self._event_loop)
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    asyncio.set_event_loop(None)
+    self._event_loop.close()
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    with self.assertRaises(ValueError):
+      async_parser.AsyncParser(batch_size=0)
+
+    with self.assertRaises(ValueError):
+      async_parser.AsyncParser(maximum_number_of_concurrent_files=0)
+
+    with self.assertRaises(ValueError):
+      async_parser.AsyncParser(maximum_number_of_pending_batches=0)
+
+  @test_lib.skipUnlessHasTestFile(['utmp-linux_libc6'])
+  def testParseFileAsync(self):
+    """Tests the ParseFileAsync function."""
+    test_parser = async_parser.AsyncParser()
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    records = self._event_loop.run_until_complete(test_parser.ParseFileAsync(
+        test_file_path, format_class=utmp.LinuxLibc6UtmpFile))
+    self.assertEqual(len(records), 14)
+    self.assertIn('type', records[0])
+
+    test_file_paths = [
+        self._GetTestFilePath(['utmpx-macosx10.5']),
+        self._GetTestFilePath(['applesystemlog.asl'])]
+
+    results = self._event_loop.run_until_complete(asyncio.gather(*[
+        test_parser.ParseFileAsync(path) for path in test_file_paths]))
+    self.assertEqual(len(results), 2)
+    self.assertEqual(len(results[0]), 6)
+
+    test_file_path = self._GetTestFilePath(['rp.log'])
+    with self.assertRaises(errors.ParseError):
+      self._event_loop.run_until_complete(test_parser.ParseFileAsync(
+          test_file_path))
+
+    # Test a format that does not support reading records.
+    test_file_path = self._GetTestFilePath(['chrome_cache', 'data_1'])
+    with self.assertRaises(errors.ParseError):
+      self._event_loop.run_until_complete(test_parser.ParseFileAsync(
+          test_file_path, format_class=chrome_cache.DataBlockFile))
+
+  @test_lib.skipUnlessHasTestFile(['utmp-linux_libc6'])
+  def testParseRecordsAsync(self):
+    """Tests the ParseRecordsAsync function."""
+    test_parser = async_parser.AsyncParser(
+        batch_size=1, maximum_number_of_pending_batches=1)
+
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    records = _ReadRecords(self._event_loop, test_parser.ParseRecordsAsync(
+        test_file_path, format_class=utmp.LinuxLibc6UtmpFile))
+    self.assertEqual(len(records), 14)
+
+    # Test stopping before all the records have been consumed.
+    records = _ReadRecords(self._event_loop, test_parser.ParseRecordsAsync(
+        test_file_path, format_class=utmp.LinuxLibc6UtmpFile),
+        maximum_number_of_records=1)
+    self.assertEqual(len(records), 1)
+
+    test_file_path = self._GetTestFilePath(['rp.log'])
+    with self.assertRaises(errors.ParseError):
+      _ReadRecords(self._event_loop, test_parser.ParseRecordsAsync(
+          test_file_path))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -3,10 +3,14 @@
 
 from __future__ import unicode_literals
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from dtformats import bsm
 from dtformats import errors
+from dtformats import follow
 
 from tests import test_lib
 
@@ -60,6 +64,48 @@ class BSMEventAuditingFileTest(test_lib.BaseTestCase):
     formatted_string = test_file._FormatString('string\x00')
     self.assertEqual(formatted_string, 'string')
 
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  @test_lib.skipUnlessHasTestFile(['apple.bsm'])
+  def testReadAppendedRecords(self):
+    """Tests the ReadAppendedRecords function."""
+    test_file_path = self._GetTestFilePath(['apple.bsm'])
+    with open(test_file_path, 'rb') as file_object:
+      data = file_object.read()
+
+    path = os.path.join(self._temporary_directory, 'audit.bsm')
+
+    follow_state = follow.FollowState()
+    number_of_event_records = 0
+
+    # Test with event records that are partially written.
+    for data_size in (1000, 1001, 4000, len(data)):
+      with open(path, 'wb') as file_object:
+        file_object.write(data[:data_size])
+
+      test_file = bsm.BSMEventAuditingFile()
+      test_file.Open(path)
+
+      try:
+        event_records = list(test_file.ReadAppendedRecords(follow_state))
+      finally:
+        test_file.Close()
+
+      if event_records:
+        self.assertEqual(event_records[0].offset, follow_state.offset - sum(
+            event_record.size for event_record in event_records))
+
+      number_of_event_records += len(event_records)
+
+    self.assertEqual(number_of_event_records, 54)
+    self.assertEqual(follow_state.offset, len(data))
+
   @test_lib.skipUnlessHasTestFile(['openbsm.bsm'])
   def testReadRecord(self):
     """Tests the _ReadRecord function."""
@@ -68,7 +114,34 @@ class BSMEventAuditingFileTest(test_lib.BaseTestCase):
 
     test_file_path = self._GetTestFilePath(['openbsm.bsm'])
     with open(test_file_path, 'rb') as file_object:
-      test_file._ReadRecord(file_object, 0)
+      event_record = test_file._ReadRecord(file_object, 0)
+
+    self.assertEqual(event_record.offset, 0)
+    self.assertEqual(event_record.size, 50)
+    self.assertEqual(event_record.timestamp, 1230477138)
+    self.assertEqual(event_record.token_types, [20, 45, 19])
+
+  @test_lib.skipUnlessHasTestFile(['apple.bsm'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = bsm.BSMEventAuditingFile()
+
+    test_file_path = self._GetTestFilePath(['apple.bsm'])
+    test_file.Open(test_file_path)
+
+    try:
+      event_records = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(event_records), 54)
+
+    event_record = event_records[0]
+    self.assertIsInstance(event_record, bsm.BSMEventRecord)
+    self.assertEqual(event_record.event_type, 45029)
+    self.assertEqual(event_record.microseconds, 381)
+    self.assertEqual(event_record.timestamp, 1383590180)
+    self.assertEqual(event_record.token_types, [20, 40, 35, 39, 19])
 
   @test_lib.skipUnlessHasTestFile(['openbsm.bsm'])
   def testReadToken(self):
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""Tests for the signature based carving of records."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from dtformats import carver
+
+from tests import test_lib
+
+
+class TestRecordWriter(object):
+  """Test record output writer.
+
+  Attributes:
+    records (list[dict[str, object]]): records written.
+  """
+
+  def __init__(self):
+    """Initializes a test record output writer."""
+    super(TestRecordWriter, self).__init__()
+    self.records = []
+
+  def WriteRecords(self, records):
+    """Writes a batch of records.
+
+    Args:
+      records (iterable[dict[str, object]]): records.
+    """
+    self.records.extend(records)
+
+
+class BSMEventRecordCarverTest(test_lib.BaseTestCase):
+  """Basic Security Module (BSM) event record carver tests."""
+
+  @test_lib.skipUnlessHasTestFile(['apple.bsm'])
+  def testCarveRecords(self):
+    """Tests the CarveRecords function."""
+    test_carver = carver.BSMEventRecordCarver()
+
+    test_file_path = self._GetTestFilePath(['apple.bsm'])
+    with open(test_file_path, 'rb') as file_object:
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 0, 6566)
+      self.assertEqual(carved_data_size, 6566)
+      self.assertEqual(len(records), 54)
+
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 1, 6565)
+      self.assertEqual(carved_data_size, 0)
+      self.assertEqual(records, [])
+
+      # Test with a maximum size of the carved data that exceeds the data.
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 0, 6566 + 1024)
+      self.assertEqual(carved_data_size, 6566)
+      self.assertEqual(len(records), 54)
+
+  def testCarveRecordsWithoutTrailerToken(self):
+    """Tests the CarveRecords function without a trailer token."""
+    test_carver = carver.BSMEventRecordCarver()
+
+    # A header token with a record size of 32 bytes followed by data that
+    # does not contain a trailer token.
+    data = b'\x14\x00\x00\x00\x20\x0b' + b'\xff' * 26
+    file_object = io.BytesIO(data)
+
+    carved_data_size, records = test_carver.CarveRecords(
+        file_object, 0, len(data))
+    self.assertEqual(carved_data_size, 0)
+    self.assertEqual(records, [])
+
+    # A header token with a record size that exceeds the data.
+    data = b'\x14\xff\xff\xff\xff\x0b' + b'\x00' * 26
+    file_object = io.BytesIO(data)
+
+    carved_data_size, records = test_carver.CarveRecords(
+        file_object, 0, len(data))
+    self.assertEqual(carved_data_size, 0)
+    self.assertEqual(records, [])
+
+    # A header token with a record size smaller than the header and trailer.
+    data = b'\x14\x00\x00\x00\x07\x0b\x00\x13\xb1\x05\x00\x00\x00\x07'
+    file_object = io.BytesIO(data)
+
+    carved_data_size, records = test_carver.CarveRecords(
+        file_object, 0, len(data))
+    self.assertEqual(carved_data_size, 0)
+    self.assertEqual(records, [])
+
+
+class ChromeCacheEntryCarverTest(test_lib.BaseTestCase):
+  """Chrome Cache entry carver tests."""
+
+  @test_lib.skipUnlessHasTestFile(['chrome_cache', 'data_1'])
+  def testCarveRecords(self):
+    """Tests the CarveRecords function."""
+    test_carver = carver.ChromeCacheEntryCarver()
+
+    test_file_path = self._GetTestFilePath(['chrome_cache', 'data_1'])
+    with open(test_file_path, 'rb') as file_object:
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 8704, 4096)
+      self.assertEqual(carved_data_size, 256)
+      self.assertEqual(len(records), 1)
+      self.assertEqual(
+          records[0].key, 'http://tools.google.com/chrome/intl/en/welcome.html')
+
+      # Test with data that is not a cache entry.
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 8192, 4096)
+      self.assertEqual(carved_data_size, 0)
+      self.assertEqual(records, [])
+
+
+class IndexBinaryTreePageCarverTest(test_lib.BaseTestCase):
+  """WMI CIM repository index binary-tree page carver tests."""
+
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.BTR'])
+  def testCarveRecords(self):
+    """Tests the CarveRecords function."""
+    test_carver = carver.IndexBinaryTreePageCarver()
+
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    with open(test_file_path, 'rb') as file_object:
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 0, 16384)
+      self.assertEqual(carved_data_size, 8192)
+      self.assertEqual(len(records), 1)
+      self.assertEqual(records[0].number_of_keys, 74)
+
+      # Test with data that is smaller than a page.
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 0, 4096)
+      self.assertEqual(carved_data_size, 0)
+      self.assertEqual(records, [])
+
+
+class LNKFileHeaderCarverTest(test_lib.BaseTestCase):
+  """Windows Shortcut (LNK) file header carver tests."""
+
+  @test_lib.skipUnlessHasTestFile(['5afe4de1b92fc382.customDestinations-ms'])
+  def testCarveRecords(self):
+    """Tests the CarveRecords function."""
+    test_carver = carver.LNKFileHeaderCarver()
+
+    test_file_path = self._GetTestFilePath([
+        '5afe4de1b92fc382.customDestinations-ms'])
+    with open(test_file_path, 'rb') as file_object:
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 36, 4096)
+      self.assertEqual(carved_data_size, 76)
+      self.assertEqual(len(records), 1)
+      self.assertEqual(records[0].file_size, 11776)
+
+      # Test with data that is not a file header.
+      carved_data_size, records = test_carver.CarveRecords(
+          file_object, 0, 4096)
+      self.assertEqual(carved_data_size, 0)
+      self.assertEqual(records, [])
+
+
+class MacOSXUtmpxFileCarverTest(test_lib.BaseTestCase):
+  """Mac OS X 10.5 utmpx file carver tests."""
+
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testCarveRecords(self):
+    """Tests the CarveRecords function."""
+    test_carver = carver.MacOSXUtmpxFileCarver()
+
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+    with open(test_file_path, 'rb') as file_object:
+      test_data = file_object.read()
+
+    # Test that zero-filled data that follows the file is not carved.
+    file_object = io.BytesIO(test_data + b'\x00' * 4096)
+
+    carved_data_size, records = test_carver.CarveRecords(
+        file_object, 0, len(test_data) + 4096)
+    self.assertEqual(carved_data_size, 4396)
+    self.assertEqual(len(records), 6)
+    self.assertEqual(records[3].type, 0)
+
+
+class CarverTestCase(test_lib.BaseTestCase):
+  """Shared functionality for carving tests."""
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def _CreateRawData(self, path_segments_per_file, padding_size):
+    """Creates raw data that contains the data of test files.
+
+    Args:
+      path_segments_per_file (list[list[str]]): path segments of the test
+          files.
+      padding_size (int): size of the padding that precedes the data of
+          every test file.
+
+    Returns:
+      str: path of the raw data.
+    """
+    path = os.path.join(self._temporary_directory, 'raw_data')
+    with open(path, 'wb') as raw_data_file_object:
+      for path_segments in path_segments_per_file:
+        raw_data_file_object.write(b'\xff' * padding_size)
+        with open(self._GetTestFilePath(path_segments), 'rb') as file_object:
+          raw_data_file_object.write(file_object.read())
+
+    return path
+
+
+class CarveChunkTest(CarverTestCase):
+  """Tests for the CarveChunk function."""
+
+  _CARVER_NAMES = sorted(carver.CARVER_CLASSES.keys())
+
+  @test_lib.skipUnlessHasTestFile(['apple.bsm'])
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testCarveChunk(self):
+    """Tests the CarveChunk function."""
+    path = self._CreateRawData([['apple.bsm'], ['utmpx-macosx10.5']], 1000)
+
+    hits = carver.CarveChunk(path, 0, 16384, self._CARVER_NAMES)
+    self.assertEqual(len(hits), 2)
+
+    carver_name, carved_data_offset, carved_data_size, records = hits[0]
+    self.assertEqual(carver_name, 'bsm')
+    self.assertEqual(carved_data_offset, 1000)
+    self.assertEqual(carved_data_size, 6566)
+    self.assertEqual(len(records), 54)
+    self.assertEqual(records[0]['carved_format'], 'bsm')
+    self.assertEqual(records[0]['carved_offset'], 1000)
+    self.assertEqual(records[0]['timestamp'], '2013-11-04 18:36:20')
+
+    carver_name, carved_data_offset, carved_data_size, records = hits[1]
+    self.assertEqual(carver_name, 'utmpx')
+    self.assertEqual(carved_data_offset, 8566)
+    self.assertEqual(len(records), 6)
+
+    # Test with a chunk that ends within the utmpx file signature.
+    hits = carver.CarveChunk(path, 7000, 1570, self._CARVER_NAMES)
+    carver_names = [carver_name for carver_name, _, _, _ in hits]
+    self.assertIn('utmpx', carver_names)
+
+    # Test with a chunk that starts after the utmpx file signature.
+    hits = carver.CarveChunk(path, 8570, 4096, self._CARVER_NAMES)
+    carver_names = [carver_name for carver_name, _, _, _ in hits]
+    self.assertNotIn('utmpx', carver_names)
+
+
+class CarvingRunnerTest(CarverTestCase):
+  """Tests for the carving runner."""
+
+  # pylint: disable=protected-access
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    test_runner = carver.CarvingRunner(carver_names=['bsm', 'asl'])
+    self.assertEqual(test_runner._carver_names, ['asl', 'bsm'])
+
+    with self.assertRaises(ValueError):
+      carver.CarvingRunner(carver_names=['bogus'])
+
+    with self.assertRaises(ValueError):
+      carver.CarvingRunner(chunk_size=0)
+
+  @test_lib.skipUnlessHasTestFile(['apple.bsm'])
+  def testGetChunks(self):
+    """Tests the _GetChunks function."""
+    test_runner = carver.CarvingRunner(chunk_size=4096, number_of_workers=1)
+
+    test_file_path = self._GetTestFilePath(['apple.bsm'])
+    chunks = list(test_runner._GetChunks(test_file_path))
+    self.assertEqual(chunks, [(0, 4096), (4096, 2470)])
+
+  @test_lib.skipUnlessHasTestFile(['apple.bsm'])
+  @test_lib.skipUnlessHasTestFile(['applesystemlog.asl'])
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testCarve(self):
+    """Tests the Carve function."""
+    path = self._CreateRawData([
+        ['apple.bsm'], ['applesystemlog.asl'], ['utmpx-macosx10.5']], 1000)
+
+    # Test with chunks that are smaller than the carved data, such that
+    # the event records of the BSM data are carved by multiple chunks.
+    test_runner = carver.CarvingRunner(chunk_size=1024, number_of_workers=1)
+    record_writer = TestRecordWriter()
+    test_runner.Carve(path, record_writer)
+
+    self.assertEqual(test_runner.number_of_hits, 3)
+    self.assertEqual(test_runner.number_of_records, 62)
+    self.assertEqual(len(record_writer.records), 62)
+
+    carved_formats = [
+        record['carved_format'] for record in record_writer.records]
+    self.assertEqual(carved_formats, ['bsm'] * 54 + ['asl'] * 2 + ['utmpx'] * 6)
+
+  @test_lib.skipUnlessHasTestFile(['apple.bsm'])
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testCarveWithWorkers(self):
+    """Tests the Carve function with worker processes."""
+    path = self._CreateRawData([['apple.bsm'], ['utmpx-macosx10.5']], 1000)
+
+    test_runner = carver.CarvingRunner(chunk_size=1024, number_of_workers=2)
+    record_writer = TestRecordWriter()
+    test_runner.Carve(path, record_writer)
+
+    self.assertEqual(test_runner.number_of_hits, 2)
+    self.assertEqual(test_runner.number_of_records, 60)
+
+    carved_offsets = sorted(set([
+        record['carved_offset'] for record in record_writer.records]))
+    self.assertEqual(carved_offsets, [1000, 8566])
+
+
+if __name__ == '__main__':
+  unittest.main()
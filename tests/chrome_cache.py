@@ -6,6 +6,8 @@ from __future__ import unicode_literals
 import unittest
 
 from dtformats import chrome_cache
+from dtformats import errors
+from dtformats import memory
 
 from tests import test_lib
 
@@ -124,12 +126,52 @@ class IndexFileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['chrome_cache', 'index'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['chrome_cache', 'index'])
+  def testReadRecordsWithMemoryBudget(self):
+    """Tests the ReadRecords function with a memory budget."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = chrome_cache.IndexFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['chrome_cache', 'index'])
+    test_file.Open(test_file_path)
+
+    expected_values = [
+        cache_address.value for cache_address in test_file.ReadRecords()]
+    test_file.Close()
+
+    memory_budget = memory.MemoryBudget(1024)
+    chrome_cache.IndexFile.SetMemoryBudget(memory_budget)
+    try:
+      test_file.Open(test_file_path)
+    finally:
+      chrome_cache.IndexFile.SetMemoryBudget(None)
+
+    self.assertTrue(test_file.index_table.is_spilled)
+
+    values = [cache_address.value for cache_address in test_file.ReadRecords()]
+    self.assertEqual(values, expected_values)
+
+    test_file.Close()
+    self.assertEqual(memory_budget.used_size, 0)
+
 
 class ChromeCacheParserTest(test_lib.BaseTestCase):
   """Chrome Cache parser tests."""
 
   # TODO: add tests for ParseDirectory.
-  # TODO: add tests for ParseFile.
+
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testParseFileWithUnsupportedSignature(self):
+    """Tests the ParseFile function with an unsupported signature."""
+    output_writer = test_lib.TestOutputWriter()
+    test_parser = chrome_cache.ChromeCacheParser(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    with self.assertRaises(errors.ParseError) as context:
+      test_parser.ParseFile(test_file_path)
+
+    self.assertEqual(
+        '{0!s}'.format(context.exception), 'Unsupported signature: 0x00000005')
 
 
 if __name__ == '__main__':
@@ -7,6 +7,7 @@ import io
 import unittest
 
 from dtformats import cpio
+from dtformats import memory
 
 from tests import test_lib
 
@@ -141,6 +142,20 @@ class CPIOArchiveFileTest(test_lib.BaseTestCase):
 
     self.assertEqual(len(test_file._file_entries), 1)
 
+  @test_lib.skipUnlessHasTestFile(['cpio', 'syslog.bin.cpio'])
+  def testReadRecordsOnBinary(self):
+    """Tests the _ReadRecords function on binary format."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = cpio.CPIOArchiveFile(output_writer=output_writer)
+    test_file.file_format = 'bin-little-endian'
+
+    test_file_path = self._GetTestFilePath(['cpio', 'syslog.bin.cpio'])
+    with open(test_file_path, 'rb') as file_object:
+      file_entries = list(test_file._ReadRecords(file_object))
+
+    self.assertEqual(len(file_entries), 1)
+    self.assertEqual(file_entries[0].path, 'syslog')
+
   @test_lib.skipUnlessHasTestFile(['cpio', 'syslog.bin.cpio'])
   def testFileEntryExistsByPathOnBinary(self):
     """Tests the FileEntryExistsByPath function on binary format."""
@@ -192,6 +207,33 @@ class CPIOArchiveFileTest(test_lib.BaseTestCase):
 
     test_file.Close()
 
+  @test_lib.skipUnlessHasTestFile(['cpio', 'syslog.bin.cpio'])
+  def testGetFileEntryByPathWithMemoryBudget(self):
+    """Tests the GetFileEntryByPath function with an exhausted budget."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = cpio.CPIOArchiveFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['cpio', 'syslog.bin.cpio'])
+
+    memory_budget = memory.MemoryBudget(1)
+    cpio.CPIOArchiveFile.SetMemoryBudget(memory_budget)
+    try:
+      test_file.Open(test_file_path)
+    finally:
+      cpio.CPIOArchiveFile.SetMemoryBudget(None)
+
+    # The file entry is read again since it was not kept in memory.
+    self.assertEqual(test_file._file_entries, {'syslog': 0})
+
+    file_entry = test_file.GetFileEntryByPath('syslog')
+    self.assertIsNotNone(file_entry)
+    self.assertEqual(file_entry.path, 'syslog')
+
+    file_entries = list(test_file.GetFileEntries())
+    self.assertEqual(len(file_entries), 1)
+
+    test_file.Close()
+
   @test_lib.skipUnlessHasTestFile(['cpio', 'syslog.bin.cpio'])
   def testReadFileObjectOnBinary(self):
     """Tests the ReadFileObject function on binary format."""
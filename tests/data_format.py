@@ -12,6 +12,8 @@ from dtfabric.runtime import fabric as dtfabric_fabric
 
 from dtformats import data_format
 from dtformats import errors
+from dtformats import memory_mapped_file
+from dtformats import profiling
 
 from tests import test_lib
 
@@ -39,6 +41,35 @@ class ErrorBytesIO(io.BytesIO):
     raise IOError('Unable to read for testing purposes.')
 
 
+class ReadCountingBytesIO(io.BytesIO):
+  """Bytes IO that counts the number of reads."""
+
+  def __init__(self, initial_bytes):
+    """Initializes a bytes IO that counts the number of reads.
+
+    Args:
+      initial_bytes (bytes): initial data of the bytes IO.
+    """
+    super(ReadCountingBytesIO, self).__init__(initial_bytes)
+    self.number_of_reads = 0
+
+  # The following methods are part of the file-like object interface.
+  # pylint: disable=invalid-name
+
+  def read(self, size=None):
+    """Reads bytes.
+
+    Args:
+      size (Optional[int]): number of bytes to read, where None represents
+          all remaining bytes.
+
+    Returns:
+      bytes: bytes read.
+    """
+    self.number_of_reads += 1
+    return super(ReadCountingBytesIO, self).read(size)
+
+
 class ErrorDataTypeMap(dtfabric_data_maps.DataTypeMap):
   """Data type map that errors."""
 
@@ -75,6 +106,12 @@ class ErrorDataTypeMap(dtfabric_data_maps.DataTypeMap):
         'Unable to map byte stream for testing purposes.')
 
 
+class TestBinaryDataFormat(data_format.BinaryDataFormat):
+  """Binary data format for testing."""
+
+  _DEFINITION_FILE = 'utmp.yaml'
+
+
 class BinaryDataFormatTest(test_lib.BaseTestCase):
   """Binary data format tests."""
 
@@ -215,6 +252,31 @@ members:
     formatted_data = test_format._FormatDataInHexadecimal(data)
     self.assertEqual(formatted_data, expected_formatted_data)
 
+  def testFormatDataInHexadecimalChunks(self):
+    """Tests the _FormatDataInHexadecimalChunks function."""
+    test_format = data_format.BinaryDataFormat()
+    test_format._HEXDUMP_LINES_PER_CHUNK = 2
+
+    data = (
+        b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
+        b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
+        b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
+        b'\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f'
+        b'\x41\x42\x43')
+    expected_chunks = [
+        ('0x00000000  00 01 02 03 04 05 06 07  08 09 0a 0b 0c 0d 0e 0f  '
+         '................\n'
+         '...\n'),
+        '',
+        ('0x00000040  41 42 43                                          '
+         'ABC\n'
+         '\n')]
+    chunks = list(test_format._FormatDataInHexadecimalChunks(data))
+    self.assertEqual(chunks, expected_chunks)
+
+    chunks = list(test_format._FormatDataInHexadecimalChunks(b''))
+    self.assertEqual(chunks, ['\n'])
+
   def testFormatPackedIPv4Address(self):
     """Tests the _FormatPackedIPv4Address function."""
     test_format = data_format.BinaryDataFormat()
@@ -231,7 +293,19 @@ members:
         0x00, 0x42, 0x83, 0x29])
     self.assertEqual(ip_address, '2001:0db8:0000:0000:0000:ff00:0042:8329')
 
-  # TODO: add tests for _GetDataTypeMap
+  def testGetDataTypeMap(self):
+    """Tests the _GetDataTypeMap function."""
+    test_format = TestBinaryDataFormat()
+
+    data_type_map = test_format._GetDataTypeMap('linux_libc6_utmp_entry')
+    self.assertIsNotNone(data_type_map)
+
+    # Test that the data type map is shared between instances.
+    test_format = TestBinaryDataFormat()
+
+    data_type_map_again = test_format._GetDataTypeMap(
+        'linux_libc6_utmp_entry')
+    self.assertIs(data_type_map_again, data_type_map)
 
   def testReadData(self):
     """Tests the _ReadData function."""
@@ -262,7 +336,89 @@ members:
     with self.assertRaises(errors.ParseError):
       test_format._ReadData(file_object, 0, self._POINT3D_SIZE, 'point3d')
 
-  # TODO: add tests for _ReadDefinitionFile
+  def testReadDataIntoReadAheadBuffer(self):
+    """Tests the _ReadDataIntoReadAheadBuffer function."""
+    test_format = data_format.BinaryDataFormat()
+    test_format.SetReadAheadWindowSize(16)
+
+    file_object = ReadCountingBytesIO(bytes(bytearray(range(64))))
+
+    buffer_data_offset = test_format._ReadDataIntoReadAheadBuffer(
+        file_object, 4, 4, 'data')
+    self.assertEqual(buffer_data_offset, 0)
+    self.assertEqual(test_format._read_ahead_buffer, bytes(bytearray(
+        range(4, 20))))
+    self.assertEqual(file_object.number_of_reads, 1)
+
+    # Test that data in the read-ahead buffer is not read again.
+    buffer_data_offset = test_format._ReadDataIntoReadAheadBuffer(
+        file_object, 8, 12, 'data')
+    self.assertEqual(buffer_data_offset, 4)
+    self.assertEqual(file_object.number_of_reads, 1)
+
+    # Test that only the missing data is read.
+    buffer_data_offset = test_format._ReadDataIntoReadAheadBuffer(
+        file_object, 12, 24, 'data')
+    self.assertEqual(buffer_data_offset, 0)
+    self.assertEqual(test_format._read_ahead_buffer, bytes(bytearray(
+        range(12, 36))))
+    self.assertEqual(file_object.number_of_reads, 2)
+
+    # Test with data that is not contiguous with the read-ahead buffer.
+    buffer_data_offset = test_format._ReadDataIntoReadAheadBuffer(
+        file_object, 56, 4, 'data')
+    self.assertEqual(buffer_data_offset, 0)
+    self.assertEqual(test_format._read_ahead_buffer, bytes(bytearray(
+        range(56, 64))))
+    self.assertEqual(file_object.number_of_reads, 3)
+
+    # Test with file-like object that raises an IOError.
+    file_object = ErrorBytesIO(b'\x01\x00\x00\x00')
+
+    with self.assertRaises(errors.ParseError):
+      test_format._ReadDataIntoReadAheadBuffer(file_object, 0, 4, 'data')
+
+    self.assertEqual(test_format._read_ahead_buffer, b'')
+
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testReadDataWithMemoryMappedFile(self):
+    """Tests the _ReadData function with mmap."""
+    test_format = data_format.BinaryDataFormat()
+
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    with open(test_file_path, 'rb') as file_object:
+      expected_data = file_object.read()
+      test_file = memory_mapped_file.MemoryMappedFile(file_object)
+
+    try:
+      data = test_format._ReadData(test_file, 4, 8, 'data')
+      self.assertEqual(data, expected_data[4:12])
+      self.assertEqual(test_file.tell(), 12)
+
+      # Test that the read-ahead buffer is not used.
+      self.assertEqual(test_format._read_ahead_buffer, b'')
+
+      # Test with data that exceeds the end of the file.
+      file_size = test_file.get_size()
+      with self.assertRaises(errors.ParseError):
+        test_format._ReadData(test_file, file_size - 4, 8, 'data')
+
+    finally:
+      test_file.close()
+
+  def testReadDefinitionFile(self):
+    """Tests the _ReadDefinitionFile function."""
+    test_format = data_format.BinaryDataFormat()
+
+    data_type_fabric = test_format._ReadDefinitionFile(None)
+    self.assertIsNone(data_type_fabric)
+
+    data_type_fabric = test_format._ReadDefinitionFile('utmp.yaml')
+    self.assertIsNotNone(data_type_fabric)
+
+    # Test that the data type fabric is shared between instances.
+    test_format = TestBinaryDataFormat()
+    self.assertIs(test_format._fabric, data_type_fabric)
 
   def testReadStructure(self):
     """Tests the _ReadStructure function."""
@@ -326,10 +482,132 @@ members:
     test_format._ReadStructureFromFileObject(
         file_object, 0, self._SHAPE3D, "shape3d")
 
+    # Test that successive structures are read with a single read.
+    test_format = data_format.BinaryDataFormat()
+
+    file_object = ReadCountingBytesIO(
+        b'\x01\x00\x00\x00'
+        b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00'
+        b'\x02\x00\x00\x00'
+        b'\x04\x00\x00\x00\x05\x00\x00\x00\x06\x00\x00\x00'
+        b'\x07\x00\x00\x00\x08\x00\x00\x00\x09\x00\x00\x00')
+
+    shape3d, data_size = test_format._ReadStructureFromFileObject(
+        file_object, 0, self._SHAPE3D, 'shape3d')
+    self.assertEqual(data_size, 16)
+    self.assertEqual(shape3d.number_of_points, 1)
+    self.assertEqual(file_object.tell(), 16)
+
+    shape3d, data_size = test_format._ReadStructureFromFileObject(
+        file_object, 16, self._SHAPE3D, 'shape3d')
+    self.assertEqual(data_size, 28)
+    self.assertEqual(shape3d.number_of_points, 2)
+    self.assertEqual(shape3d.points[1].z, 9)
+    self.assertEqual(file_object.tell(), 44)
+
+    self.assertEqual(file_object.number_of_reads, 1)
+
+    # Test with the read-ahead buffer disabled.
+    test_format.SetReadAheadWindowSize(0)
+
+    shape3d, data_size = test_format._ReadStructureFromFileObject(
+        file_object, 16, self._SHAPE3D, 'shape3d')
+    self.assertEqual(data_size, 28)
+    self.assertEqual(shape3d.points[0].x, 4)
+    self.assertEqual(file_object.tell(), 44)
+
+    # Test with data that exceeds the end of the file.
+    with self.assertRaises(errors.ParseError):
+      test_format._ReadStructureFromFileObject(
+          file_object, 20, self._SHAPE3D, 'shape3d')
+
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testReadStructureFromFileObjectWithMemoryMappedFile(self):
+    """Tests the _ReadStructureFromFileObject function with mmap."""
+    output_writer = test_lib.TestOutputWriter()
+    test_format = data_format.BinaryDataFormat(
+        debug=True, output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    with open(test_file_path, 'rb') as file_object:
+      test_file = memory_mapped_file.MemoryMappedFile(file_object)
+
+    try:
+      point3d, data_size = test_format._ReadStructureFromFileObject(
+          test_file, 0, self._POINT3D, 'point3d')
+      self.assertEqual(data_size, 12)
+      self.assertEqual(point3d.x, 5)
+      self.assertEqual(point3d.y, 4)
+      self.assertEqual(point3d.z, 4)
+      self.assertEqual(test_file.tell(), 12)
+
+      # Test with data that exceeds the end of the file.
+      file_size = test_file.get_size()
+      with self.assertRaises(errors.ParseError):
+        test_format._ReadStructureFromFileObject(
+            test_file, file_size - 8, self._POINT3D, 'point3d')
+
+    finally:
+      test_file.close()
+
+  def testSetProfiler(self):
+    """Tests the SetProfiler function."""
+    test_profiler = profiling.ReadProfiler()
+
+    TestBinaryDataFormat.SetProfiler(test_profiler)
+
+    try:
+      test_format = TestBinaryDataFormat()
+
+      file_object = io.BytesIO(
+          b'\x02\x00\x00\x00'
+          b'\x01\x00\x00\x00\x02\x00\x00\x00\x03\x00\x00\x00'
+          b'\x04\x00\x00\x00\x05\x00\x00\x00\x06\x00\x00\x00')
+
+      test_format._ReadStructureFromFileObject(
+          file_object, 0, self._SHAPE3D, 'shape3d')
+      test_format._ReadStructure(
+          file_object, 4, self._POINT3D_SIZE, self._POINT3D, 'point3d')
+
+    finally:
+      TestBinaryDataFormat.SetProfiler(None)
+
+    statistics = {
+        (read_statistics.data_type, read_statistics.description):
+        read_statistics for read_statistics in test_profiler.GetStatistics()}
+    self.assertEqual(len(statistics), 3)
+
+    read_statistics = statistics[('shape3d', 'shape3d')]
+    self.assertEqual(read_statistics.number_of_calls, 1)
+    self.assertEqual(read_statistics.number_of_bytes, 28)
+
+    read_statistics = statistics[(None, 'point3d')]
+    self.assertEqual(read_statistics.number_of_calls, 1)
+    self.assertEqual(read_statistics.number_of_bytes, 12)
+
+    read_statistics = statistics[('point3d', 'point3d')]
+    self.assertEqual(read_statistics.number_of_calls, 1)
+    self.assertEqual(read_statistics.number_of_bytes, 12)
+
+    # Test that the profiler is not used by other formats.
+    self.assertIsNone(data_format.BinaryDataFormat._profiler)
+
+  def testSetReadAheadWindowSize(self):
+    """Tests the SetReadAheadWindowSize function."""
+    test_format = data_format.BinaryDataFormat()
+
+    test_format.SetReadAheadWindowSize(4096)
+    self.assertEqual(test_format._read_ahead_window_size, 4096)
+
+    with self.assertRaises(ValueError):
+      test_format.SetReadAheadWindowSize(-1)
+
 
 class BinaryDataFileTest(test_lib.BaseTestCase):
   """Binary data file tests."""
 
+  # pylint: disable=protected-access
+
   @test_lib.skipUnlessHasTestFile(['cpio', 'syslog.bin.cpio'])
   def testOpenClose(self):
     """Tests the Open and Close functions."""
@@ -346,6 +624,48 @@ class BinaryDataFileTest(test_lib.BaseTestCase):
     with self.assertRaises(IOError):
       test_file.Close()
 
+    # Test with memory mapped I/O.
+    test_file.Open(test_file_path, use_mmap=True)
+    self.assertIsInstance(
+        test_file._file_object, memory_mapped_file.MemoryMappedFile)
+    test_file.Close()
+
+  @test_lib.skipUnlessHasTestFile(['cpio', 'syslog.bin.cpio'])
+  def testOpenFileObject(self):
+    """Tests the OpenFileObject function."""
+    test_file = data_format.BinaryDataFile()
+
+    test_file_path = self._GetTestFilePath(['cpio', 'syslog.bin.cpio'])
+    with open(test_file_path, 'rb') as file_object:
+      test_file.OpenFileObject(file_object)
+      self.assertEqual(test_file._file_size, 1536)
+
+      with self.assertRaises(IOError):
+        test_file.OpenFileObject(file_object)
+
+      test_file.Close()
+
+      # Test that the file-like object is not closed.
+      self.assertFalse(file_object.closed)
+
+  @test_lib.skipUnlessHasTestFile(['cpio', 'syslog.bin.cpio'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = data_format.BinaryDataFile()
+
+    with self.assertRaises(IOError):
+      list(test_file.ReadRecords())
+
+    test_file_path = self._GetTestFilePath(['cpio', 'syslog.bin.cpio'])
+    test_file.Open(test_file_path)
+
+    try:
+      with self.assertRaises(NotImplementedError):
+        list(test_file.ReadRecords())
+
+    finally:
+      test_file.Close()
+
 
 if __name__ == '__main__':
   unittest.main()
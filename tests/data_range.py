@@ -12,6 +12,31 @@ from dtformats import data_range
 from tests import test_lib
 
 
+class ReadCountingFileObject(io.BytesIO):
+  """Test file-like object that counts the number of reads."""
+
+  def __init__(self, initial_bytes):
+    """Initializes a read counting file-like object.
+
+    Args:
+      initial_bytes (bytes): data of the file-like object.
+    """
+    super(ReadCountingFileObject, self).__init__(initial_bytes)
+    self.number_of_reads = 0
+
+  def read(self, size=-1):
+    """Reads a byte string from the file-like object at the current offset.
+
+    Args:
+      size (Optional[int]): number of bytes to read.
+
+    Returns:
+      bytes: data read.
+    """
+    self.number_of_reads += 1
+    return super(ReadCountingFileObject, self).read(size)
+
+
 class DataRangeTest(test_lib.BaseTestCase):
   """In-file data range file-like object tests."""
 
@@ -46,6 +71,101 @@ class DataRangeTest(test_lib.BaseTestCase):
 
     test_range.data_offset = 64
 
+  def testReadWithReadAhead(self):
+    """Tests the read function with the read-ahead buffer."""
+    file_object = ReadCountingFileObject(self._FILE_DATA)
+    test_range = data_range.DataRange(
+        file_object, data_offset=32, data_size=64)
+
+    for offset in range(32, 96, 4):
+      byte_stream = test_range.read(size=4)
+      self.assertEqual(byte_stream, self._FILE_DATA[offset:offset + 4])
+
+    self.assertEqual(file_object.number_of_reads, 1)
+
+    test_range.seek(8, os.SEEK_SET)
+    byte_stream = test_range.read(size=8)
+    self.assertEqual(byte_stream, self._FILE_DATA[40:48])
+
+    self.assertEqual(file_object.number_of_reads, 1)
+
+    # Changing the data offset should not return stale buffered data.
+    test_range.data_offset = 0
+    test_range.seek(0, os.SEEK_SET)
+    byte_stream = test_range.read(size=8)
+    self.assertEqual(byte_stream, self._FILE_DATA[0:8])
+
+  def testReadNested(self):
+    """Tests the read function with a nested data range."""
+    file_object = ReadCountingFileObject(self._FILE_DATA)
+    parent_range = data_range.DataRange(
+        file_object, data_offset=32, data_size=64)
+    test_range = data_range.DataRange(
+        parent_range, data_offset=16, data_size=96)
+
+    byte_stream = test_range.read(size=4)
+    self.assertEqual(byte_stream, self._FILE_DATA[48:52])
+
+    # The nested data range is bounded by the parent data range.
+    byte_stream = test_range.read()
+    self.assertEqual(byte_stream, self._FILE_DATA[52:96])
+
+    test_range.seek(0, os.SEEK_SET)
+    test_range = data_range.DataRange(
+        test_range, data_offset=8, data_size=8)
+
+    byte_stream = test_range.read()
+    self.assertEqual(byte_stream, self._FILE_DATA[56:64])
+
+  def testReadInto(self):
+    """Tests the readinto function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_range = data_range.DataRange(
+        file_object, data_offset=32, data_size=64)
+
+    read_buffer = bytearray(48)
+
+    number_of_bytes = test_range.readinto(read_buffer)
+    self.assertEqual(number_of_bytes, 48)
+    self.assertEqual(bytes(read_buffer), self._FILE_DATA[32:80])
+
+    number_of_bytes = test_range.readinto(read_buffer)
+    self.assertEqual(number_of_bytes, 16)
+    self.assertEqual(bytes(read_buffer[:16]), self._FILE_DATA[80:96])
+
+    number_of_bytes = test_range.readinto(read_buffer)
+    self.assertEqual(number_of_bytes, 0)
+
+    # Test a read larger than the read-ahead size.
+    file_data = bytes(bytearray(range(256))) * 512
+    file_object = io.BytesIO(file_data)
+    test_range = data_range.DataRange(
+        file_object, data_offset=1, data_size=len(file_data) - 2)
+
+    read_buffer = bytearray(len(file_data))
+
+    number_of_bytes = test_range.readinto(read_buffer)
+    self.assertEqual(number_of_bytes, len(file_data) - 2)
+    self.assertEqual(bytes(read_buffer[:number_of_bytes]), file_data[1:-1])
+
+  def testPeek(self):
+    """Tests the peek function."""
+    file_object = io.BytesIO(self._FILE_DATA)
+    test_range = data_range.DataRange(
+        file_object, data_offset=32, data_size=64)
+
+    byte_stream = test_range.peek(size=4)
+    self.assertEqual(byte_stream, b'\x20\x21\x22\x23')
+    self.assertEqual(test_range.get_offset(), 0)
+
+    test_range.seek(62, os.SEEK_SET)
+    byte_stream = test_range.peek(size=4)
+    self.assertEqual(byte_stream, b'\x5e\x5f')
+
+    test_range.seek(0, os.SEEK_END)
+    byte_stream = test_range.peek(size=4)
+    self.assertEqual(byte_stream, b'')
+
   def testSeek(self):
     """Tests the seek function."""
     file_object = io.BytesIO(self._FILE_DATA)
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Tests for the data type fabric registry."""
+
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from dtformats import fabric_registry
+
+from tests import test_lib
+
+
+class DataTypeFabricRegistryTest(test_lib.BaseTestCase):
+  """Data type fabric registry tests."""
+
+  _DEFINITION_FILE = os.path.join(
+      os.path.dirname(os.path.dirname(__file__)), 'dtformats', 'utmp.yaml')
+
+  def testGetDefaultCacheDirectory(self):
+    """Tests the _GetDefaultCacheDirectory function."""
+    # pylint: disable=protected-access
+    environment_value = os.environ.pop('DTFORMATS_CACHE_DIR', None)
+    try:
+      cache_directory = fabric_registry._GetDefaultCacheDirectory()
+      self.assertIsNone(cache_directory)
+
+      os.environ['DTFORMATS_CACHE_DIR'] = '/tmp/dtformats'
+      cache_directory = fabric_registry._GetDefaultCacheDirectory()
+      self.assertEqual(cache_directory, '/tmp/dtformats')
+
+    finally:
+      if environment_value is None:
+        os.environ.pop('DTFORMATS_CACHE_DIR', None)
+      else:
+        os.environ['DTFORMATS_CACHE_DIR'] = environment_value
+
+  def testGetDataTypeFabric(self):
+    """Tests the GetDataTypeFabric function."""
+    data_type_fabric = (
+        fabric_registry.DataTypeFabricRegistry.GetDataTypeFabric(
+            self._DEFINITION_FILE))
+    self.assertIsNotNone(data_type_fabric)
+
+    data_type_fabric_again = (
+        fabric_registry.DataTypeFabricRegistry.GetDataTypeFabric(
+            self._DEFINITION_FILE))
+    self.assertIs(data_type_fabric_again, data_type_fabric)
+
+  def testGetDataTypeMap(self):
+    """Tests the GetDataTypeMap function."""
+    data_type_map = fabric_registry.DataTypeFabricRegistry.GetDataTypeMap(
+        self._DEFINITION_FILE, 'linux_libc6_utmp_entry')
+    self.assertIsNotNone(data_type_map)
+
+    data_type_map_again = (
+        fabric_registry.DataTypeFabricRegistry.GetDataTypeMap(
+            self._DEFINITION_FILE, 'linux_libc6_utmp_entry'))
+    self.assertIs(data_type_map_again, data_type_map)
+
+  def testClear(self):
+    """Tests the Clear function."""
+    data_type_map = fabric_registry.DataTypeFabricRegistry.GetDataTypeMap(
+        self._DEFINITION_FILE, 'linux_libc6_utmp_entry')
+
+    fabric_registry.DataTypeFabricRegistry.Clear()
+
+    data_type_map_again = (
+        fabric_registry.DataTypeFabricRegistry.GetDataTypeMap(
+            self._DEFINITION_FILE, 'linux_libc6_utmp_entry'))
+    self.assertIsNot(data_type_map_again, data_type_map)
+
+
+class DataTypeFabricRegistryCacheTest(test_lib.BaseTestCase):
+  """Data type fabric registry compiled definitions cache tests."""
+
+  # pylint: disable=protected-access
+
+  _DEFINITION_FILE = os.path.join(
+      os.path.dirname(os.path.dirname(__file__)), 'dtformats', 'utmp.yaml')
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._cache_directory = (
+        fabric_registry.DataTypeFabricRegistry.GetCacheDirectory())
+    self._temporary_directory = tempfile.mkdtemp()
+
+    fabric_registry.DataTypeFabricRegistry.SetCacheDirectory(
+        self._temporary_directory)
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    fabric_registry.DataTypeFabricRegistry.SetCacheDirectory(
+        self._cache_directory)
+
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testGetCacheFilePath(self):
+    """Tests the _GetCacheFilePath function."""
+    cache_file_path = (
+        fabric_registry.DataTypeFabricRegistry._GetCacheFilePath(b'test'))
+    self.assertEqual(
+        os.path.dirname(cache_file_path), self._temporary_directory)
+
+    cache_file_path_again = (
+        fabric_registry.DataTypeFabricRegistry._GetCacheFilePath(b'test'))
+    self.assertEqual(cache_file_path_again, cache_file_path)
+
+    cache_file_path_other = (
+        fabric_registry.DataTypeFabricRegistry._GetCacheFilePath(b'other'))
+    self.assertNotEqual(cache_file_path_other, cache_file_path)
+
+    fabric_registry.DataTypeFabricRegistry.SetCacheDirectory(None)
+
+    cache_file_path = (
+        fabric_registry.DataTypeFabricRegistry._GetCacheFilePath(b'test'))
+    self.assertIsNone(cache_file_path)
+
+  def testReadDefinitionFile(self):
+    """Tests the _ReadDefinitionFile function."""
+    data_type_fabric = (
+        fabric_registry.DataTypeFabricRegistry._ReadDefinitionFile(
+            self._DEFINITION_FILE))
+    self.assertIsNotNone(data_type_fabric)
+
+    cache_filenames = sorted(os.listdir(self._temporary_directory))
+    self.assertEqual(len(cache_filenames), 2)
+    self.assertTrue(cache_filenames[0].endswith('.pickle'))
+    self.assertEqual(cache_filenames[1], 'cache.key')
+
+    # Read the data type fabric from the cache file.
+    data_type_fabric = (
+        fabric_registry.DataTypeFabricRegistry._ReadDefinitionFile(
+            self._DEFINITION_FILE))
+    data_type_map = data_type_fabric.CreateDataTypeMap(
+        'linux_libc6_utmp_entry')
+    self.assertEqual(data_type_map.GetByteSize(), 384)
+
+    # Fall back to reading the definition file if the cache file is invalid.
+    cache_file_path = os.path.join(
+        self._temporary_directory, cache_filenames[0])
+    with open(cache_file_path, 'wb') as file_object:
+      file_object.write(b'bogus')
+
+    data_type_fabric = (
+        fabric_registry.DataTypeFabricRegistry._ReadDefinitionFile(
+            self._DEFINITION_FILE))
+    data_type_map = data_type_fabric.CreateDataTypeMap(
+        'linux_libc6_utmp_entry')
+    self.assertEqual(data_type_map.GetByteSize(), 384)
+
+  def testReadCacheFile(self):
+    """Tests the _ReadCacheFile function."""
+    data_type_fabric = (
+        fabric_registry.DataTypeFabricRegistry._ReadDefinitionFile(
+            self._DEFINITION_FILE))
+
+    with open(self._DEFINITION_FILE, 'rb') as file_object:
+      definition = file_object.read()
+
+    cache_file_path = (
+        fabric_registry.DataTypeFabricRegistry._GetCacheFilePath(definition))
+
+    data_type_fabric = fabric_registry.DataTypeFabricRegistry._ReadCacheFile(
+        cache_file_path)
+    self.assertIsNotNone(data_type_fabric)
+
+    # Test with a cache file that is writable by others.
+    os.chmod(cache_file_path, 0o666)
+
+    data_type_fabric = fabric_registry.DataTypeFabricRegistry._ReadCacheFile(
+        cache_file_path)
+    self.assertIsNone(data_type_fabric)
+
+    os.chmod(cache_file_path, 0o600)
+
+    # Test with a cache file of which the data was changed.
+    with open(cache_file_path, 'ab') as file_object:
+      file_object.write(b'.')
+
+    data_type_fabric = fabric_registry.DataTypeFabricRegistry._ReadCacheFile(
+        cache_file_path)
+    self.assertIsNone(data_type_fabric)
+
+  def testReadDefinitionFileWithoutCache(self):
+    """Tests the _ReadDefinitionFile function without cache."""
+    fabric_registry.DataTypeFabricRegistry.SetCacheDirectory(None)
+
+    data_type_fabric = (
+        fabric_registry.DataTypeFabricRegistry._ReadDefinitionFile(
+            self._DEFINITION_FILE))
+    self.assertIsNotNone(data_type_fabric)
+
+    self.assertEqual(os.listdir(self._temporary_directory), [])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Tests for the follow mode of append-only log files."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from dtformats import follow
+
+from tests import test_lib
+
+
+class FollowStateTest(test_lib.BaseTestCase):
+  """Follow state tests."""
+
+  def testCopyFromDictAndCopyToDict(self):
+    """Tests the CopyFromDict and CopyToDict functions."""
+    follow_state = follow.FollowState()
+    follow_state.file_size = 768
+    follow_state.fingerprint = 'abcdef'
+    follow_state.offset = 384
+    follow_state.values['last_record_offset'] = 256
+
+    json_dict = follow_state.CopyToDict()
+    self.assertEqual(json_dict, {
+        'file_size': 768,
+        'fingerprint': 'abcdef',
+        'offset': 384,
+        'values': {'last_record_offset': 256}})
+
+    follow_state = follow.FollowState()
+    follow_state.CopyFromDict(json_dict)
+    self.assertEqual(follow_state.file_size, 768)
+    self.assertEqual(follow_state.fingerprint, 'abcdef')
+    self.assertEqual(follow_state.offset, 384)
+    self.assertEqual(follow_state.values, {'last_record_offset': 256})
+
+  def testReset(self):
+    """Tests the Reset function."""
+    follow_state = follow.FollowState()
+    follow_state.file_size = 768
+    follow_state.fingerprint = 'abcdef'
+    follow_state.offset = 384
+    follow_state.values['last_record_offset'] = 256
+
+    follow_state.Reset()
+    self.assertEqual(follow_state.file_size, 0)
+    self.assertIsNone(follow_state.fingerprint)
+    self.assertIsNone(follow_state.offset)
+    self.assertEqual(follow_state.values, {})
+
+
+class FollowStateStoreTest(test_lib.BaseTestCase):
+  """Follow state store tests."""
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testReadWrite(self):
+    """Tests the Read and Write functions."""
+    path = os.path.join(self._temporary_directory, 'follow.json')
+
+    follow_state_store = follow.FollowStateStore(path)
+    follow_state_store.Read()
+
+    follow_state = follow_state_store.GetState('wtmp', 'LinuxLibc6UtmpFile')
+    self.assertIsNone(follow_state.offset)
+
+    follow_state.file_size = 768
+    follow_state.fingerprint = 'abcdef'
+    follow_state.offset = 768
+    follow_state_store.SetState('wtmp', 'LinuxLibc6UtmpFile', follow_state)
+    follow_state_store.Write()
+
+    # Test that the existing file is replaced.
+    follow_state_store.Write()
+
+    follow_state_store = follow.FollowStateStore(path)
+    follow_state_store.Read()
+
+    follow_state = follow_state_store.GetState('wtmp', 'LinuxLibc6UtmpFile')
+    self.assertEqual(follow_state.offset, 768)
+
+    follow_state = follow_state_store.GetState('wtmp', 'MacOSXUtmpxFile')
+    self.assertIsNone(follow_state.offset)
+
+    self.assertEqual(os.listdir(self._temporary_directory), ['follow.json'])
+
+  def testReadWithInvalidFile(self):
+    """Tests the Read function with an invalid file."""
+    path = os.path.join(self._temporary_directory, 'follow.json')
+    with io.open(path, 'w', encoding='utf-8') as file_object:
+      file_object.write('{invalid')
+
+    follow_state_store = follow.FollowStateStore(path)
+    follow_state_store.Read()
+
+    follow_state = follow_state_store.GetState('wtmp', 'LinuxLibc6UtmpFile')
+    self.assertIsNone(follow_state.offset)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Tests for the format registry."""
+
+from __future__ import unicode_literals
+
+import io
+import unittest
+
+from dtformats import cpio  # pylint: disable=unused-import
+from dtformats import format_registry
+from dtformats import wemf  # pylint: disable=unused-import
+
+from tests import test_lib
+
+
+class TestFormat(object):
+  """Test format."""
+
+  SIGNATURES = [(0, b'test'), (8, b'test-format')]
+
+
+class TestUnsupportedFormat(object):
+  """Test format with an unsupported signature."""
+
+  SIGNATURES = [(62, b'test')]
+
+
+class FormatRegistryTest(test_lib.BaseTestCase):
+  """Tests for the format registry."""
+
+  # pylint: disable=protected-access
+
+  def testRegisterAndDeregisterFormat(self):
+    """Tests the RegisterFormat and DeregisterFormat functions."""
+    number_of_formats = len(format_registry.FormatRegistry._format_classes)
+
+    format_registry.FormatRegistry.RegisterFormat('test', TestFormat)
+
+    try:
+      self.assertEqual(
+          len(format_registry.FormatRegistry._format_classes),
+          number_of_formats + 1)
+
+      with self.assertRaises(KeyError):
+        format_registry.FormatRegistry.RegisterFormat('test', TestFormat)
+
+    finally:
+      format_registry.FormatRegistry.DeregisterFormat('test')
+
+    self.assertEqual(
+        len(format_registry.FormatRegistry._format_classes), number_of_formats)
+
+    with self.assertRaises(KeyError):
+      format_registry.FormatRegistry.DeregisterFormat('test')
+
+    with self.assertRaises(ValueError):
+      format_registry.FormatRegistry.RegisterFormat(
+          'test', TestUnsupportedFormat)
+
+  def testGetFormatClass(self):
+    """Tests the GetFormatClass function."""
+    format_class = format_registry.FormatRegistry.GetFormatClass('cpio')
+    self.assertEqual(format_class, cpio.CPIOArchiveFile)
+
+    format_class = format_registry.FormatRegistry.GetFormatClass('bogus')
+    self.assertIsNone(format_class)
+
+  def testGetFormatNames(self):
+    """Tests the GetFormatNames function."""
+    format_names = format_registry.FormatRegistry.GetFormatNames()
+    self.assertIn('cpio', format_names)
+    self.assertIn('emf', format_names)
+
+  def testIdentifyData(self):
+    """Tests the IdentifyData function."""
+    format_registry.FormatRegistry.RegisterFormat('test', TestFormat)
+
+    try:
+      format_names = format_registry.FormatRegistry.IdentifyData(
+          b'test\x00\x00\x00\x00test-format')
+      self.assertEqual(format_names, ['test'])
+
+      format_names = format_registry.FormatRegistry.IdentifyData(b'test')
+      self.assertEqual(format_names, ['test'])
+
+      format_names = format_registry.FormatRegistry.IdentifyData(
+          b'\x00\x00\x00\x00\x00\x00\x00\x00test-format')
+      self.assertEqual(format_names, ['test'])
+
+      format_names = format_registry.FormatRegistry.IdentifyData(b'tes')
+      self.assertEqual(format_names, [])
+
+    finally:
+      format_registry.FormatRegistry.DeregisterFormat('test')
+
+  @test_lib.skipUnlessHasTestFile(['Memo.emf'])
+  def testIdentifyFile(self):
+    """Tests the IdentifyFile function."""
+    test_file_path = self._GetTestFilePath(['Memo.emf'])
+    format_names = format_registry.FormatRegistry.IdentifyFile(test_file_path)
+    self.assertEqual(format_names, ['emf'])
+
+    test_file_path = self._GetTestFilePath(['grid.wmf'])
+    format_names = format_registry.FormatRegistry.IdentifyFile(test_file_path)
+    self.assertEqual(format_names, ['wmf'])
+
+    test_file_path = self._GetTestFilePath(['rp.log'])
+    format_names = format_registry.FormatRegistry.IdentifyFile(test_file_path)
+    self.assertEqual(format_names, [])
+
+  def testIdentifyFileObject(self):
+    """Tests the IdentifyFileObject function."""
+    file_object = io.BytesIO(b'070701')
+    file_object.seek(3)
+
+    format_names = format_registry.FormatRegistry.IdentifyFileObject(
+        file_object)
+    self.assertEqual(format_names, ['cpio'])
+    self.assertEqual(file_object.tell(), 3)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -46,7 +46,9 @@ class WindowsTaskSchedularJobFileTest(test_lib.BaseTestCase):
 
     test_file_path = self._GetTestFilePath(['wintask.job'])
     with open(test_file_path, 'rb') as file_object:
-      file_object.seek(test_file._FIXED_LENGTH_DATA_SECTION_SIZE, os.SEEK_SET)
+      data_type_map = test_file._GetDataTypeMap(
+          'job_fixed_length_data_section')
+      file_object.seek(data_type_map.GetByteSize(), os.SEEK_SET)
 
       test_file._ReadVariableLengthDataSection(file_object)
 
@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 import unittest
 
 from dtformats import keychain
+from dtformats import memory
 
 from tests import test_lib
 
@@ -48,6 +49,34 @@ class KeychainDatabaseFileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['login.keychain'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['login.keychain'])
+  def testReadFileObjectWithMemoryBudget(self):
+    """Tests the ReadFileObject function with a memory budget."""
+    output_writer = test_lib.TestOutputWriter()
+    test_file = keychain.KeychainDatabaseFile(output_writer=output_writer)
+
+    test_file_path = self._GetTestFilePath(['login.keychain'])
+    test_file.Open(test_file_path)
+
+    expected_number_of_records = [
+        len(list(table.records)) for table in test_file.tables]
+    test_file.Close()
+
+    memory_budget = memory.MemoryBudget(1024)
+    keychain.KeychainDatabaseFile.SetMemoryBudget(memory_budget)
+    try:
+      test_file.Open(test_file_path)
+    finally:
+      keychain.KeychainDatabaseFile.SetMemoryBudget(None)
+
+    number_of_records = [
+        len(list(table.records)) for table in test_file.tables]
+    self.assertEqual(number_of_records, expected_number_of_records)
+    self.assertLessEqual(memory_budget.used_size, 1024)
+
+    test_file.Close()
+    self.assertEqual(memory_budget.used_size, 0)
+
 
 if __name__ == '__main__':
   unittest.main()
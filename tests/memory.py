@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""Tests for the memory budget and the collections bounded by it."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from dtformats import memory
+
+from tests import test_lib
+
+
+class GetObjectSizeTest(test_lib.BaseTestCase):
+  """Tests for the GetObjectSize function."""
+
+  def testGetObjectSize(self):
+    """Tests the GetObjectSize function."""
+    size = memory.GetObjectSize(b'\x00' * 1024)
+    self.assertGreaterEqual(size, 1024)
+
+    size = memory.GetObjectSize({'key': b'\x00' * 1024})
+    self.assertGreaterEqual(size, 1024)
+
+    size = memory.GetObjectSize([b'\x00' * 1024, b'\x00' * 1024])
+    self.assertGreaterEqual(size, 2048)
+
+    test_object = memory.MemoryBudget(1)
+    test_object.value = b'\x00' * 1024
+    size = memory.GetObjectSize(test_object)
+    self.assertGreaterEqual(size, 1024)
+
+
+class LRUCacheTest(test_lib.BaseTestCase):
+  """Tests for the least recently used (LRU) cache."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    cache = memory.LRUCache(16)
+    self.assertEqual(cache.maximum_number_of_values, 16)
+
+    with self.assertRaises(ValueError):
+      memory.LRUCache(-1)
+
+  def testGetValueAndSetValue(self):
+    """Tests the GetValue and SetValue functions."""
+    cache = memory.LRUCache(2)
+
+    self.assertIsNone(cache.GetValue(1))
+
+    cache.SetValue(1, 'value1')
+    cache.SetValue(2, 'value2')
+    self.assertEqual(cache.GetValue(1), 'value1')
+
+    # Value 2 is the least recently used value and is evicted.
+    cache.SetValue(3, 'value3')
+    self.assertEqual(len(cache), 2)
+    self.assertIsNone(cache.GetValue(2))
+    self.assertEqual(cache.GetValue(1), 'value1')
+    self.assertEqual(cache.GetValue(3), 'value3')
+
+    self.assertEqual(cache.number_of_hits, 3)
+    self.assertEqual(cache.number_of_misses, 2)
+
+    cache.Clear()
+    self.assertEqual(len(cache), 0)
+
+    cache = memory.LRUCache(0)
+    cache.SetValue(1, 'value1')
+    self.assertIsNone(cache.GetValue(1))
+
+  def testSetValueWithMemoryBudget(self):
+    """Tests the SetValue function with a memory budget."""
+    memory_budget = memory.MemoryBudget(1024)
+
+    cache = memory.LRUCache(16, memory_budget=memory_budget)
+    cache.SetValue(1, 'value1', size=512)
+    cache.SetValue(2, 'value2', size=512)
+    cache.SetValue(3, 'value3', size=512)
+
+    self.assertEqual(len(cache), 2)
+    self.assertIsNone(cache.GetValue(1))
+    self.assertEqual(memory_budget.used_size, 1024)
+
+    # A value that exceeds the budget is not cached.
+    cache.SetValue(4, 'value4', size=2048)
+    self.assertEqual(len(cache), 0)
+    self.assertEqual(memory_budget.used_size, 0)
+
+
+class MemoryBudgetTest(test_lib.BaseTestCase):
+  """Tests for the memory budget."""
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    memory_budget = memory.MemoryBudget(1024)
+    self.assertEqual(memory_budget.maximum_size, 1024)
+    self.assertEqual(memory_budget.used_size, 0)
+
+    with self.assertRaises(ValueError):
+      memory.MemoryBudget(0)
+
+  def testAllocateAndRelease(self):
+    """Tests the Allocate and Release functions."""
+    memory_budget = memory.MemoryBudget(1024)
+
+    self.assertTrue(memory_budget.Allocate(1000))
+    self.assertEqual(memory_budget.available_size, 24)
+
+    self.assertFalse(memory_budget.Allocate(100))
+    self.assertEqual(memory_budget.used_size, 1000)
+
+    memory_budget.Release(1000)
+    self.assertEqual(memory_budget.used_size, 0)
+
+    memory_budget.Release(1000)
+    self.assertEqual(memory_budget.used_size, 0)
+
+
+class SpillableDictTest(test_lib.BaseTestCase):
+  """Tests for the spillable dictionary."""
+
+  def testWithoutMemoryBudget(self):
+    """Tests the dictionary without a memory budget."""
+    test_dict = memory.SpillableDict()
+    for index in range(16):
+      test_dict[index] = 'value{0:d}'.format(index)
+
+    self.assertFalse(test_dict.is_spilled)
+    self.assertEqual(len(test_dict), 16)
+    self.assertEqual(test_dict[5], 'value5')
+
+  def testWithMemoryBudget(self):
+    """Tests the dictionary with a memory budget."""
+    memory_budget = memory.MemoryBudget(4096)
+
+    test_dict = memory.SpillableDict(memory_budget=memory_budget)
+    for index in range(256):
+      test_dict[index] = 'value{0:d}'.format(index)
+
+    self.assertTrue(test_dict.is_spilled)
+    self.assertLessEqual(memory_budget.used_size, 4096)
+
+    self.assertEqual(len(test_dict), 256)
+    self.assertIn(255, test_dict)
+    self.assertNotIn(256, test_dict)
+    self.assertEqual(test_dict[0], 'value0')
+    self.assertEqual(test_dict[255], 'value255')
+    self.assertEqual(test_dict.get(255), 'value255')
+    self.assertIsNone(test_dict.get(256))
+
+    with self.assertRaises(KeyError):
+      test_dict[256]  # pylint: disable=pointless-statement
+
+    test_dict[255] = 'other'
+    self.assertEqual(test_dict[255], 'other')
+    self.assertEqual(len(test_dict), 256)
+
+    self.assertEqual(sorted(test_dict.keys()), list(range(256)))
+    self.assertEqual(len(list(test_dict.values())), 256)
+    self.assertEqual(dict(test_dict.items())[128], 'value128')
+
+    test_dict.Close()
+    self.assertFalse(test_dict.is_spilled)
+    self.assertEqual(len(test_dict), 0)
+    self.assertEqual(memory_budget.used_size, 0)
+
+  def testOverwriteWithMemoryBudget(self):
+    """Tests overwriting values of the dictionary with a memory budget."""
+    memory_budget = memory.MemoryBudget(4096)
+
+    test_dict = memory.SpillableDict(memory_budget=memory_budget)
+    test_dict['key'] = 'value'
+    used_size = memory_budget.used_size
+    self.assertGreater(used_size, 0)
+
+    for _ in range(256):
+      test_dict['key'] = 'value'
+
+    self.assertFalse(test_dict.is_spilled)
+    self.assertEqual(memory_budget.used_size, used_size)
+
+    test_dict.Close()
+    self.assertEqual(memory_budget.used_size, 0)
+
+
+class SpillableListTest(test_lib.BaseTestCase):
+  """Tests for the spillable list."""
+
+  def testWithoutMemoryBudget(self):
+    """Tests the list without a memory budget."""
+    test_list = memory.SpillableList()
+    for index in range(16):
+      test_list.append({'index': index})
+
+    self.assertFalse(test_list.is_spilled)
+    self.assertEqual(len(test_list), 16)
+    self.assertEqual(list(test_list)[5], {'index': 5})
+
+  def testWithMemoryBudget(self):
+    """Tests the list with a memory budget."""
+    memory_budget = memory.MemoryBudget(4096)
+
+    test_list = memory.SpillableList(memory_budget=memory_budget)
+    for index in range(256):
+      test_list.append({'index': index})
+
+    self.assertTrue(test_list.is_spilled)
+    self.assertLessEqual(memory_budget.used_size, 4096)
+
+    self.assertEqual(len(test_list), 256)
+    values = [value['index'] for value in test_list]
+    self.assertEqual(values, list(range(256)))
+
+    test_list.Close()
+    self.assertEqual(len(test_list), 0)
+    self.assertEqual(memory_budget.used_size, 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
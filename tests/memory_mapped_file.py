@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Tests for the memory mapped file-like object."""
+
+from __future__ import unicode_literals
+
+import io
+import os
+import unittest
+
+from dtformats import memory_mapped_file
+
+from tests import test_lib
+
+
+class MemoryMappedFileTest(test_lib.BaseTestCase):
+  """Memory mapped file-like object tests."""
+
+  # pylint: disable=protected-access
+
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testClose(self):
+    """Tests the close function."""
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    with open(test_file_path, 'rb') as file_object:
+      test_file = memory_mapped_file.MemoryMappedFile(file_object)
+
+    view = test_file.GetView(0, 4)
+
+    # Test that closing with a view in use does not raise.
+    test_file.close()
+
+    with self.assertRaises(IOError):
+      test_file.read()
+
+    self.assertEqual(view.tobytes(), b'\x05\x00\x00\x00')
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    file_object = io.BytesIO(b'\x00' * 16)
+
+    with self.assertRaises((IOError, OSError)):
+      memory_mapped_file.MemoryMappedFile(file_object)
+
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testRead(self):
+    """Tests the read function."""
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    with open(test_file_path, 'rb') as file_object:
+      test_file = memory_mapped_file.MemoryMappedFile(file_object)
+
+    try:
+      byte_stream = test_file.read(size=4)
+      self.assertEqual(byte_stream, b'\x05\x00\x00\x00')
+      self.assertIsInstance(byte_stream, bytes)
+
+      byte_stream = test_file.read()
+      self.assertEqual(len(byte_stream), test_file.get_size() - 4)
+
+      byte_stream = test_file.read()
+      self.assertEqual(byte_stream, b'')
+
+    finally:
+      test_file.close()
+
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testSeek(self):
+    """Tests the seek function."""
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    with open(test_file_path, 'rb') as file_object:
+      test_file = memory_mapped_file.MemoryMappedFile(file_object)
+
+    try:
+      file_size = test_file.get_size()
+
+      test_file.seek(0, os.SEEK_SET)
+      offset = test_file.get_offset()
+      self.assertEqual(offset, 0)
+
+      test_file.seek(0, os.SEEK_END)
+      offset = test_file.get_offset()
+      self.assertEqual(offset, file_size)
+
+      test_file.seek(-32, os.SEEK_CUR)
+      offset = test_file.tell()
+      self.assertEqual(offset, file_size - 32)
+
+      with self.assertRaises(IOError):
+        test_file.seek(0, -1)
+
+      with self.assertRaises(IOError):
+        test_file.seek(-1, os.SEEK_SET)
+
+    finally:
+      test_file.close()
+
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testGetView(self):
+    """Tests the GetView function."""
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    with open(test_file_path, 'rb') as file_object:
+      test_file = memory_mapped_file.MemoryMappedFile(file_object)
+
+    try:
+      file_size = test_file.get_size()
+
+      view = test_file.GetView(0, 4)
+      self.assertIsInstance(view, memoryview)
+      self.assertEqual(view.tobytes(), b'\x05\x00\x00\x00')
+
+      view = test_file.GetView(file_size - 2, 4)
+      self.assertEqual(len(view), 2)
+
+      view = None
+
+    finally:
+      test_file.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
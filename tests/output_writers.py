@@ -3,6 +3,12 @@
 
 from __future__ import unicode_literals
 
+import io
+import json
+import os
+import shutil
+import struct
+import tempfile
 import unittest
 
 from dtformats import output_writers
@@ -10,6 +16,28 @@ from dtformats import output_writers
 from tests import test_lib
 
 
+class StderrWriterTest(test_lib.BaseTestCase):
+  """Stderr output writer tests."""
+
+  def testClose(self):
+    """Tests the Close function."""
+    test_writer = output_writers.StderrWriter()
+
+    test_writer.Close()
+
+  def testOpen(self):
+    """Tests the Open function."""
+    test_writer = output_writers.StderrWriter()
+
+    test_writer.Open()
+
+  def testWriteText(self):
+    """Tests the WriteText function."""
+    test_writer = output_writers.StderrWriter()
+
+    test_writer.WriteText('')
+
+
 class StdoutWriterTest(test_lib.BaseTestCase):
   """Stdout output writer tests."""
 
@@ -32,5 +60,314 @@ class StdoutWriterTest(test_lib.BaseTestCase):
     test_writer.WriteText('')
 
 
+class SampleRecord(object):
+  """Sample record.
+
+  Attributes:
+    data (bytes): data.
+    name (str): name.
+    number (int): number.
+  """
+
+  def __init__(self, data=None, name=None, number=None):
+    """Initializes a sample record.
+
+    Args:
+      data (Optional[bytes]): data.
+      name (Optional[str]): name.
+      number (Optional[int]): number.
+    """
+    super(SampleRecord, self).__init__()
+    self._private = 'private'
+    self.data = data
+    self.name = name
+    self.number = number
+
+
+class BufferedRecordWriterTest(test_lib.BaseTestCase):
+  """Buffered record output writer tests."""
+
+  # pylint: disable=protected-access
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    with self.assertRaises(ValueError):
+      output_writers.JSONLinesRecordWriter(batch_size=0)
+
+    with self.assertRaises(ValueError):
+      output_writers.JSONLinesRecordWriter(flush_size=-1)
+
+  def testFormatValueAsString(self):
+    """Tests the _FormatValueAsString function."""
+    test_writer = output_writers.JSONLinesRecordWriter()
+
+    self.assertEqual(test_writer._FormatValueAsString(None), '')
+    self.assertEqual(test_writer._FormatValueAsString('text'), 'text')
+    self.assertEqual(test_writer._FormatValueAsString(b'\x01\xff'), '01ff')
+    self.assertEqual(test_writer._FormatValueAsString(12), '12')
+    self.assertEqual(test_writer._FormatValueAsString([1, 2]), '[1, 2]')
+
+  def testGetJSONValue(self):
+    """Tests the _GetJSONValue function."""
+    test_writer = output_writers.JSONLinesRecordWriter()
+
+    json_value = test_writer._GetJSONValue(
+        {'data': b'\x01\xff', 'list': (1, 'text'), 'number': 1.5})
+    self.assertEqual(
+        json_value, {'data': '01ff', 'list': [1, 'text'], 'number': 1.5})
+
+  def testOpenClose(self):
+    """Tests the Open and Close functions."""
+    path = os.path.join(self._temporary_directory, 'output.jsonl')
+    test_writer = output_writers.JSONLinesRecordWriter(path=path)
+
+    with self.assertRaises(IOError):
+      test_writer.Close()
+
+    test_writer.Open()
+
+    with self.assertRaises(IOError):
+      test_writer.Open()
+
+    test_writer.Close()
+
+    self.assertTrue(os.path.exists(path))
+
+  def testWriteRecord(self):
+    """Tests the WriteRecord and Flush functions."""
+    path = os.path.join(self._temporary_directory, 'output.jsonl')
+    test_writer = output_writers.JSONLinesRecordWriter(
+        path=path, batch_size=2, flush_size=1024)
+    test_writer.Open()
+
+    try:
+      test_writer.WriteRecord({'number': 1})
+      self.assertEqual(len(test_writer._records), 1)
+
+      test_writer.WriteRecord({'number': 2})
+      self.assertEqual(len(test_writer._records), 0)
+      self.assertEqual(len(test_writer._buffer), 1)
+      self.assertEqual(os.path.getsize(path), 0)
+
+      test_writer.Flush()
+      self.assertEqual(len(test_writer._buffer), 0)
+      self.assertEqual(os.path.getsize(path), 28)
+
+    finally:
+      test_writer.Close()
+
+  def testWriteRecords(self):
+    """Tests the WriteRecords function."""
+    path = os.path.join(self._temporary_directory, 'output.jsonl')
+    test_writer = output_writers.JSONLinesRecordWriter(
+        path=path, batch_size=10, flush_size=0)
+    test_writer.Open()
+
+    try:
+      test_writer.WriteRecords([{'number': index} for index in range(25)])
+      self.assertEqual(len(test_writer._records), 5)
+      self.assertEqual(len(test_writer._buffer), 0)
+
+    finally:
+      test_writer.Close()
+
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      lines = file_object.readlines()
+
+    self.assertEqual(len(lines), 25)
+
+
+  def testWriteRecordsWithTimestampTypes(self):
+    """Tests the WriteRecords function with timestamp types."""
+    path = os.path.join(self._temporary_directory, 'output.jsonl')
+    test_writer = output_writers.JSONLinesRecordWriter(
+        path=path, batch_size=2, timestamp_types={'number': 'posix'})
+    test_writer.Open()
+
+    try:
+      test_writer.WriteRecords([
+          SampleRecord(name='first', number=1281643591),
+          {'name': 'second', 'number': None},
+          {'name': 'third'}])
+
+    finally:
+      test_writer.Close()
+
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      lines = file_object.readlines()
+
+    self.assertEqual(len(lines), 3)
+    self.assertEqual(json.loads(lines[0]), {
+        'data': None, 'name': 'first', 'number': '2010-08-12 20:06:31'})
+    self.assertEqual(json.loads(lines[1]), {'name': 'second', 'number': None})
+    self.assertEqual(json.loads(lines[2]), {'name': 'third'})
+
+
+class ColumnarRecordWriterTest(test_lib.BaseTestCase):
+  """Binary columnar record output writer tests."""
+
+  # pylint: disable=protected-access
+
+  def testFormatRecords(self):
+    """Tests the _FormatRecords function."""
+    test_writer = output_writers.ColumnarRecordWriter()
+
+    records = [
+        SampleRecord(data=b'\x01\x02', name='first', number=1),
+        SampleRecord(name='second', number=2)]
+
+    data = test_writer._FormatRecords(records)
+
+    number_of_records, number_of_columns = struct.unpack_from('<II', data, 0)
+    self.assertEqual(number_of_records, 2)
+    self.assertEqual(number_of_columns, 3)
+
+    data_offset = 8
+    columns = {}
+    for _ in range(number_of_columns):
+      name_size = struct.unpack_from('<H', data, data_offset)[0]
+      data_offset += 2
+      name = data[data_offset:data_offset + name_size].decode('utf-8')
+      data_offset += name_size
+      value_type, bitmap = struct.unpack_from('<BB', data, data_offset)
+      data_offset += 2
+
+      number_of_values = bin(bitmap).count('1')
+      if value_type == test_writer.VALUE_TYPE_INTEGER:
+        values = list(struct.unpack_from(
+            '<{0:d}q'.format(number_of_values), data, data_offset))
+        data_offset += number_of_values * 8
+
+      else:
+        sizes = struct.unpack_from(
+            '<{0:d}I'.format(number_of_values), data, data_offset)
+        data_offset += number_of_values * 4
+
+        values = []
+        for size in sizes:
+          values.append(data[data_offset:data_offset + size])
+          data_offset += size
+
+      columns[name] = (value_type, bitmap, values)
+
+    self.assertEqual(data_offset, len(data))
+    self.assertEqual(columns['data'], (
+        test_writer.VALUE_TYPE_BINARY_DATA, 0x01, [b'\x01\x02']))
+    self.assertEqual(columns['name'], (
+        test_writer.VALUE_TYPE_STRING, 0x03, [b'first', b'second']))
+    self.assertEqual(columns['number'], (
+        test_writer.VALUE_TYPE_INTEGER, 0x03, [1, 2]))
+
+  def testGetColumnValueType(self):
+    """Tests the _GetColumnValueType function."""
+    test_writer = output_writers.ColumnarRecordWriter()
+
+    value_type = test_writer._GetColumnValueType([])
+    self.assertEqual(value_type, test_writer.VALUE_TYPE_NONE)
+
+    value_type = test_writer._GetColumnValueType([True, False])
+    self.assertEqual(value_type, test_writer.VALUE_TYPE_BOOLEAN)
+
+    value_type = test_writer._GetColumnValueType([1, 2])
+    self.assertEqual(value_type, test_writer.VALUE_TYPE_INTEGER)
+
+    value_type = test_writer._GetColumnValueType([1, 1 << 64])
+    self.assertEqual(value_type, test_writer.VALUE_TYPE_STRING)
+
+    value_type = test_writer._GetColumnValueType([1, 2.5])
+    self.assertEqual(value_type, test_writer.VALUE_TYPE_FLOATING_POINT)
+
+    value_type = test_writer._GetColumnValueType([b'data'])
+    self.assertEqual(value_type, test_writer.VALUE_TYPE_BINARY_DATA)
+
+    value_type = test_writer._GetColumnValueType(['text', 1])
+    self.assertEqual(value_type, test_writer.VALUE_TYPE_STRING)
+
+
+class CSVRecordWriterTest(test_lib.BaseTestCase):
+  """CSV record output writer tests."""
+
+  # pylint: disable=protected-access
+
+  def testFormatRecords(self):
+    """Tests the _FormatRecords function."""
+    test_writer = output_writers.CSVRecordWriter(
+        field_names=['name', 'number'])
+
+    records = [
+        SampleRecord(name='first, "quoted"', number=1),
+        SampleRecord(name='second\nline')]
+
+    data = test_writer._FormatRecords(records)
+    self.assertEqual(data, (
+        b'"first, ""quoted""",1\r\n'
+        b'"second\nline",\r\n'))
+
+  def testFormatRecordsWithoutFieldNames(self):
+    """Tests the _FormatRecords function without field names."""
+    test_writer = output_writers.CSVRecordWriter()
+
+    data = test_writer._FormatRecords([{'name': 'first'}])
+    self.assertEqual(data, b'name\r\nfirst\r\n')
+
+    data = test_writer._FormatRecords([{'name': 'second'}])
+    self.assertEqual(data, b'second\r\n')
+
+
+class JSONLinesRecordWriterTest(test_lib.BaseTestCase):
+  """JSON Lines record output writer tests."""
+
+  # pylint: disable=protected-access
+
+  def testFormatRecords(self):
+    """Tests the _FormatRecords function."""
+    test_writer = output_writers.JSONLinesRecordWriter()
+
+    records = [SampleRecord(data=b'\x01', name='first', number=1), {}]
+
+    data = test_writer._FormatRecords(records)
+    lines = data.decode('utf-8').split('\n')
+    self.assertEqual(len(lines), 3)
+    self.assertEqual(
+        json.loads(lines[0]), {'data': '01', 'name': 'first', 'number': 1})
+    self.assertEqual(json.loads(lines[1]), {})
+    self.assertEqual(lines[2], '')
+
+
+class CreateRecordWriterTest(test_lib.BaseTestCase):
+  """Tests for the CreateRecordWriter function."""
+
+  def testCreateRecordWriter(self):
+    """Tests the CreateRecordWriter function."""
+    test_writer = output_writers.CreateRecordWriter('csv')
+    self.assertIsInstance(test_writer, output_writers.CSVRecordWriter)
+
+    with self.assertRaises(ValueError):
+      output_writers.CreateRecordWriter('bogus')
+
+
+class GetRecordValuesTest(test_lib.BaseTestCase):
+  """Tests for the GetRecordValues function."""
+
+  def testGetRecordValues(self):
+    """Tests the GetRecordValues function."""
+    record_values = output_writers.GetRecordValues({'name': 'test'})
+    self.assertEqual(record_values, [('name', 'test')])
+
+    test_record = SampleRecord(name='test', number=1)
+    record_values = output_writers.GetRecordValues(test_record)
+    self.assertEqual(
+        sorted(record_values), [('data', None), ('name', 'test'),
+                                ('number', 1)])
+
+
 if __name__ == '__main__':
   unittest.main()
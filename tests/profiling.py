@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Tests for the profiling of reads."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from dtformats import profiling
+
+from tests import test_lib
+
+
+class ReadProfilerTest(test_lib.BaseTestCase):
+  """Read profiler tests."""
+
+  def testAddRead(self):
+    """Tests the AddRead function."""
+    test_profiler = profiling.ReadProfiler()
+
+    test_profiler.AddRead('point3d', 'point3d', 12, mapping_time=0.5)
+    test_profiler.AddRead(
+        'point3d', 'point3d', 12, mapping_time=0.25, number_of_retries=1)
+    test_profiler.AddRead(None, 'point3d', 12)
+
+    statistics = test_profiler.GetStatistics()
+    self.assertEqual(len(statistics), 2)
+
+    self.assertEqual(statistics[0].data_type, 'point3d')
+    self.assertEqual(statistics[0].description, 'point3d')
+    self.assertEqual(statistics[0].mapping_time, 0.75)
+    self.assertEqual(statistics[0].number_of_bytes, 24)
+    self.assertEqual(statistics[0].number_of_calls, 2)
+    self.assertEqual(statistics[0].number_of_retries, 1)
+
+    self.assertIsNone(statistics[1].data_type)
+    self.assertEqual(statistics[1].number_of_calls, 1)
+
+  def testGetStatistics(self):
+    """Tests the GetStatistics function."""
+    test_profiler = profiling.ReadProfiler()
+
+    test_profiler.AddRead('uint32', 'first', 4, mapping_time=0.1)
+    test_profiler.AddRead('uint32', 'second', 4, mapping_time=0.2)
+
+    statistics = test_profiler.GetStatistics()
+    self.assertEqual(
+        [read_statistics.description for read_statistics in statistics],
+        ['second', 'first'])
+
+  def testReset(self):
+    """Tests the Reset function."""
+    test_profiler = profiling.ReadProfiler()
+
+    test_profiler.AddRead('uint32', 'first', 4)
+    test_profiler.Reset()
+
+    self.assertEqual(test_profiler.GetStatistics(), [])
+
+  def testWriteStatistics(self):
+    """Tests the WriteStatistics function."""
+    output_writer = test_lib.TestOutputWriter()
+    test_profiler = profiling.ReadProfiler()
+
+    test_profiler.AddRead('uint32', 'first', 4, number_of_retries=2)
+    test_profiler.AddRead(None, 'data', 16)
+    test_profiler.WriteStatistics(output_writer)
+
+    expected_output = [
+        'Read statistics:\n',
+        'Data type\tDescription\tCalls\tBytes\tMapping time (s)\tRetries\n',
+        '-\tdata\t1\t16\t0.000000\t0\n',
+        'uint32\tfirst\t1\t4\t0.000000\t2\n',
+        '\n']
+    self.assertEqual(output_writer.output, expected_output)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -38,6 +38,51 @@ class RecyclerInfo2FileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['INFO2'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = recycler.RecyclerInfo2File()
+
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    test_file.Open(test_file_path)
+
+    try:
+      file_entries = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(file_entries), 4)
+
+    file_entry = file_entries[0]
+    self.assertIsInstance(file_entry, recycler.RecyclerInfo2FileEntry)
+    self.assertEqual(file_entry.deletion_time, 127379243052370000)
+    self.assertEqual(file_entry.drive_number, 2)
+    self.assertEqual(file_entry.index, 1)
+    self.assertEqual(file_entry.original_file_size, 2160128)
+    self.assertEqual(
+        file_entry.original_filename,
+        'C:\\Documents and Settings\\Mr. Evil\\Desktop\\lalsetup250.exe')
+
+  @test_lib.skipUnlessHasTestFile(['INFO2'])
+  def testReadRecordBatches(self):
+    """Tests the ReadRecordBatches function."""
+    test_file = recycler.RecyclerInfo2File()
+
+    test_file_path = self._GetTestFilePath(['INFO2'])
+    test_file.Open(test_file_path)
+
+    try:
+      batches = list(test_file.ReadRecordBatches(batch_size=3))
+    finally:
+      test_file.Close()
+
+    self.assertEqual([len(batch) for batch in batches], [3, 1])
+
+    record_values = batches[0][0]
+    self.assertEqual(
+        record_values['deletion_time'], '2004-08-25 16:18:25.2370000')
+    self.assertEqual(record_values['index'], 1)
+
 
 if __name__ == '__main__':
   unittest.main()
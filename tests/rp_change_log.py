@@ -92,6 +92,27 @@ class RestorePointChangeLogFileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['change.log.1'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['change.log.1'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = rp_change_log.RestorePointChangeLogFile()
+
+    test_file_path = self._GetTestFilePath(['change.log.1'])
+    test_file.Open(test_file_path)
+
+    try:
+      change_log_entries = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(change_log_entries), 187)
+
+    change_log_entry = change_log_entries[0]
+    self.assertIsInstance(change_log_entry, rp_change_log.ChangeLogEntry)
+    self.assertEqual(change_log_entry.entry_flags, 4)
+    self.assertEqual(change_log_entry.entry_type, 2)
+    self.assertEqual(change_log_entry.sequence_number, 1)
+
 
 if __name__ == '__main__':
   unittest.main()
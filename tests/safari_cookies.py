@@ -178,6 +178,29 @@ class BinaryCookiesFileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['Cookies.binarycookies'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['Cookies.binarycookies'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = safari_cookies.BinaryCookiesFile()
+
+    test_file_path = self._GetTestFilePath(['Cookies.binarycookies'])
+    test_file.Open(test_file_path)
+
+    try:
+      cookie_records = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(cookie_records), 91)
+
+    cookie_record = cookie_records[0]
+    self.assertIsInstance(cookie_record, safari_cookies.BinaryCookieRecord)
+    self.assertEqual(cookie_record.creation_time, 394997068.0)
+    self.assertEqual(cookie_record.name, 'centralnotice_bucket')
+    self.assertEqual(cookie_record.path, '/')
+    self.assertEqual(cookie_record.url, 'en.wikipedia.org')
+    self.assertEqual(cookie_record.value, '0-4.2')
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Tests for the helper functions shared by the scripts."""
+
+from __future__ import unicode_literals
+
+import argparse
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from dtformats import data_format
+from dtformats import output_writers
+from dtformats import profiling
+from dtformats import script_helpers
+from dtformats import utmp
+
+from tests import test_lib
+
+
+class ScriptHelpersTest(test_lib.BaseTestCase):
+  """Tests for the helper functions shared by the scripts."""
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    data_format.BinaryDataFormat.SetProfiler(None)
+    shutil.rmtree(self._temporary_directory, True)
+
+  def _ReadJSONLines(self, path):
+    """Reads a JSON Lines file.
+
+    Args:
+      path (str): path of the JSON Lines file.
+
+    Returns:
+      list[dict[str, object]]: records.
+    """
+    with io.open(path, 'r', encoding='utf-8') as file_object:
+      return [json.loads(line) for line in file_object]
+
+  def testAddProfileOption(self):
+    """Tests the AddProfileOption function."""
+    argument_parser = argparse.ArgumentParser()
+    script_helpers.AddProfileOption(argument_parser)
+
+    options = argument_parser.parse_args([])
+    self.assertFalse(options.profile)
+
+    options = argument_parser.parse_args(['--profile'])
+    self.assertTrue(options.profile)
+
+  def testAddRecordOutputOptions(self):
+    """Tests the AddRecordOutputOptions function."""
+    argument_parser = argparse.ArgumentParser()
+    script_helpers.AddRecordOutputOptions(argument_parser)
+
+    options = argument_parser.parse_args(['--format', 'jsonl', '-w', 'out'])
+    self.assertEqual(options.output_format, 'jsonl')
+    self.assertEqual(options.output_file, 'out')
+    self.assertFalse(hasattr(options, 'follow_state_file'))
+
+    argument_parser = argparse.ArgumentParser()
+    script_helpers.AddRecordOutputOptions(argument_parser, follow_mode=True)
+
+    options = argument_parser.parse_args(['--follow', 'state'])
+    self.assertIsNone(options.output_format)
+    self.assertEqual(options.follow_state_file, 'state')
+
+  def testCheckRecordOutputOptions(self):
+    """Tests the CheckRecordOutputOptions function."""
+    options = argparse.Namespace(output_format=None)
+    self.assertTrue(script_helpers.CheckRecordOutputOptions(options))
+
+    options = argparse.Namespace(
+        follow_state_file='state', output_format='jsonl')
+    self.assertTrue(script_helpers.CheckRecordOutputOptions(options))
+
+    options = argparse.Namespace(
+        follow_state_file='state', output_format=None)
+    self.assertFalse(script_helpers.CheckRecordOutputOptions(options))
+
+  def testEnableProfiling(self):
+    """Tests the EnableProfiling function."""
+    options = argparse.Namespace(profile=False)
+    profiler = script_helpers.EnableProfiling(options)
+    self.assertIsNone(profiler)
+
+    options = argparse.Namespace(profile=True)
+    profiler = script_helpers.EnableProfiling(options)
+    self.assertIsInstance(profiler, profiling.ReadProfiler)
+
+  def testOpenRecordWriter(self):
+    """Tests the OpenRecordWriter function."""
+    path = os.path.join(self._temporary_directory, 'output.jsonl')
+    record_writer = script_helpers.OpenRecordWriter('jsonl', path=path)
+    self.assertIsInstance(record_writer, output_writers.JSONLinesRecordWriter)
+    record_writer.Close()
+
+    path = os.path.join(self._temporary_directory, 'bogus', 'output.jsonl')
+    record_writer = script_helpers.OpenRecordWriter('jsonl', path=path)
+    self.assertIsNone(record_writer)
+
+  @test_lib.skipUnlessHasTestFile(['utmp-linux_libc6'])
+  def testWriteRecords(self):
+    """Tests the WriteRecords function."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    output_path = os.path.join(self._temporary_directory, 'output.jsonl')
+
+    test_file = utmp.LinuxLibc6UtmpFile()
+    test_file.Open(test_file_path)
+
+    try:
+      result = script_helpers.WriteRecords(
+          test_file, test_file_path, 'jsonl', path=output_path)
+    finally:
+      test_file.Close()
+
+    self.assertTrue(result)
+
+    records = self._ReadJSONLines(output_path)
+    self.assertEqual(len(records), 14)
+
+  @test_lib.skipUnlessHasTestFile(['utmp-linux_libc6'])
+  def testWriteRecordsWithFollowState(self):
+    """Tests the WriteRecords function with a follow state."""
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    output_path = os.path.join(self._temporary_directory, 'output.jsonl')
+    state_path = os.path.join(self._temporary_directory, 'state.json')
+
+    for expected_number_of_records in (14, 0):
+      test_file = utmp.LinuxLibc6UtmpFile()
+      test_file.Open(test_file_path)
+
+      try:
+        result = script_helpers.WriteRecords(
+            test_file, test_file_path, 'jsonl', path=output_path,
+            follow_state_file=state_path)
+      finally:
+        test_file.Close()
+
+      self.assertTrue(result)
+
+      records = self._ReadJSONLines(output_path)
+      self.assertEqual(len(records), expected_number_of_records)
+
+  def testWriteStatistics(self):
+    """Tests the WriteStatistics function."""
+    output_writer = test_lib.TestOutputWriter()
+    script_helpers.WriteStatistics(None, output_writer)
+    self.assertEqual(output_writer.output, [])
+
+    profiler = profiling.ReadProfiler()
+    script_helpers.WriteStatistics(profiler, output_writer)
+    self.assertEqual(output_writer.output[0], 'Read statistics:\n')
+
+    output_writer = test_lib.TestOutputWriter()
+    script_helpers.WriteStatistics(
+        profiler, output_writer, output_format='jsonl', path='output.jsonl')
+    self.assertEqual(output_writer.output[0], 'Read statistics:\n')
+
+    output_writer = test_lib.TestOutputWriter()
+    script_helpers.WriteStatistics(
+        profiler, output_writer, output_format='jsonl')
+    self.assertEqual(output_writer.output, [])
+
+
+if __name__ == '__main__':
+  unittest.main()
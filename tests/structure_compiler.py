@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""Tests for the structure compiler."""
+
+from __future__ import unicode_literals
+
+import unittest
+import uuid
+
+from dtfabric import errors as dtfabric_errors
+from dtfabric.runtime import data_maps as dtfabric_data_maps
+from dtfabric.runtime import fabric as dtfabric_fabric
+
+from dtformats import structure_compiler
+
+from tests import test_lib
+
+
+class StructureCompilerTest(test_lib.BaseTestCase):
+  """Structure compiler tests."""
+
+  _DATA_TYPE_FABRIC_DEFINITION = b"""\
+name: byte
+type: integer
+attributes:
+  format: unsigned
+  size: 1
+  units: bytes
+---
+name: uint16be
+type: integer
+attributes:
+  byte_order: big-endian
+  format: unsigned
+  size: 2
+  units: bytes
+---
+name: uint32
+type: integer
+attributes:
+  format: unsigned
+  size: 4
+  units: bytes
+---
+name: uint32le
+type: integer
+attributes:
+  byte_order: little-endian
+  format: unsigned
+  size: 4
+  units: bytes
+---
+name: wchar16
+type: character
+attributes:
+  size: 2
+  units: bytes
+---
+name: uuid
+type: uuid
+attributes:
+  byte_order: little-endian
+---
+name: point3d
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: x
+  data_type: uint32
+- name: y
+  data_type: uint32
+- name: z
+  data_type: uint32
+---
+name: fixed_size_record
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: identifier
+  data_type: uuid
+- name: number_of_values
+  data_type: uint32
+- name: values
+  type: sequence
+  element_data_type: byte
+  number_of_elements: 4
+- name: data
+  type: stream
+  element_data_type: byte
+  elements_data_size: 4
+- name: name
+  type: string
+  encoding: utf-16-le
+  element_data_type: wchar16
+  elements_data_size: 4
+---
+name: mixed_byte_order
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: value1
+  data_type: uint32le
+- name: value2
+  data_type: uint16be
+---
+name: variable_size_record
+type: structure
+attributes:
+  byte_order: little-endian
+members:
+- name: data_size
+  data_type: uint32
+- name: data
+  type: stream
+  element_data_type: byte
+  elements_data_size: variable_size_record.data_size
+"""
+
+  _DATA_TYPE_FABRIC = dtfabric_fabric.DataTypeFabric(
+      yaml_definition=_DATA_TYPE_FABRIC_DEFINITION)
+
+  _FIXED_SIZE_RECORD_DATA = b''.join([
+      b'\x33\x22\x11\x00\x55\x44\x77\x66\x88\x99\xaa\xbb\xcc\xdd\xee\xff',
+      b'\x04\x00\x00\x00',
+      b'\x01\x02\x03\x04',
+      b'data',
+      b'a\x00b\x00'])
+
+  def testGetCompiledMap(self):
+    """Tests the GetCompiledMap function."""
+    data_type_map = self._DATA_TYPE_FABRIC.CreateDataTypeMap('point3d')
+
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+    self.assertIsNotNone(compiled_map)
+    self.assertEqual(compiled_map.GetByteSize(), 12)
+
+    compiled_map_again = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+    self.assertIs(compiled_map_again, compiled_map)
+
+    data_type_map = self._DATA_TYPE_FABRIC.CreateDataTypeMap(
+        'fixed_size_record')
+
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+    self.assertIsNotNone(compiled_map)
+    self.assertEqual(compiled_map.GetByteSize(), 32)
+
+    # Test with a structure with mixed byte orders.
+    data_type_map = self._DATA_TYPE_FABRIC.CreateDataTypeMap(
+        'mixed_byte_order')
+
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+    self.assertIsNone(compiled_map)
+
+    # Test with a structure with a variable size.
+    data_type_map = self._DATA_TYPE_FABRIC.CreateDataTypeMap(
+        'variable_size_record')
+
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+    self.assertIsNone(compiled_map)
+
+    # Test with a data type map that is not a structure.
+    data_type_map = self._DATA_TYPE_FABRIC.CreateDataTypeMap('uint32le')
+
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+    self.assertIsNone(compiled_map)
+
+
+class CompiledStructureMapTest(test_lib.BaseTestCase):
+  """Compiled structure map tests."""
+
+  # pylint: disable=protected-access
+
+  def testMapByteStream(self):
+    """Tests the MapByteStream function."""
+    data_type_map = StructureCompilerTest._DATA_TYPE_FABRIC.CreateDataTypeMap(
+        'fixed_size_record')
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+
+    byte_stream = StructureCompilerTest._FIXED_SIZE_RECORD_DATA
+
+    context = dtfabric_data_maps.DataTypeMapContext()
+    structure_values = compiled_map.MapByteStream(
+        byte_stream, context=context)
+    self.assertEqual(context.byte_size, 32)
+
+    expected_identifier = uuid.UUID('00112233-4455-6677-8899-aabbccddeeff')
+    self.assertEqual(structure_values.identifier, expected_identifier)
+    self.assertEqual(structure_values.number_of_values, 4)
+    self.assertEqual(structure_values.values, (1, 2, 3, 4))
+    self.assertEqual(structure_values.data, b'data')
+    self.assertEqual(structure_values.name, 'ab')
+
+    # Test that the values are the same as mapped by dtFabric.
+    expected_structure_values = data_type_map.MapByteStream(byte_stream)
+    for attribute_name in structure_values.__slots__:
+      self.assertEqual(
+          getattr(structure_values, attribute_name),
+          getattr(expected_structure_values, attribute_name))
+
+    # Test with byte offset.
+    structure_values = compiled_map.MapByteStream(
+        b''.join([b'\xff\xff', byte_stream]), byte_offset=2)
+    self.assertEqual(structure_values.number_of_values, 4)
+
+    # Test with byte stream that is too small.
+    with self.assertRaises(dtfabric_errors.ByteStreamTooSmallError):
+      compiled_map.MapByteStream(byte_stream[:-1])
+
+    # Test with string that cannot be decoded.
+    byte_stream = b''.join([byte_stream[:-4], b'\x00\xd8\x00\x00'])
+
+    with self.assertRaises(dtfabric_errors.MappingError):
+      compiled_map.MapByteStream(byte_stream)
+
+  def testCreateStructureValues(self):
+    """Tests the CreateStructureValues function."""
+    data_type_map = StructureCompilerTest._DATA_TYPE_FABRIC.CreateDataTypeMap(
+        'point3d')
+    compiled_map = structure_compiler.StructureCompiler.GetCompiledMap(
+        data_type_map)
+
+    structure_values = compiled_map.CreateStructureValues(1, z=3)
+    self.assertEqual(structure_values.x, 1)
+    self.assertIsNone(structure_values.y)
+    self.assertEqual(structure_values.z, 3)
+
+    with self.assertRaises(AttributeError):
+      structure_values.unknown = 1
+
+
+if __name__ == '__main__':
+  unittest.main()
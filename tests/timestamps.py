@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Tests for the batch conversion of timestamps."""
+
+from __future__ import unicode_literals
+
+import datetime
+import unittest
+
+from dtformats import timestamps
+
+from tests import test_lib
+
+
+class TimestampsTest(test_lib.BaseTestCase):
+  """Batch conversion of timestamps tests."""
+
+  # pylint: disable=protected-access
+
+  def testGetTimestampTypeDefinition(self):
+    """Tests the _GetTimestampTypeDefinition function."""
+    definition = timestamps._GetTimestampTypeDefinition(
+        timestamps.TIMESTAMP_TYPE_FILETIME)
+    self.assertEqual(definition, (
+        10000000, 11644473600, 7, 0, 0xffffffffffffffff))
+
+    with self.assertRaises(ValueError):
+      timestamps._GetTimestampTypeDefinition('bogus')
+
+  @unittest.skipIf(timestamps.numpy is None, 'missing numpy')
+  def testCopyToDateTimeStringsWithNumPy(self):
+    """Tests the _CopyToDateTimeStringsWithNumPy function."""
+    date_time_strings = timestamps._CopyToDateTimeStringsWithNumPy(
+        [127379243052370000, 0, 0x7fffffffffffffff],
+        timestamps.TIMESTAMP_TYPE_FILETIME)
+    self.assertEqual(date_time_strings, [
+        '2004-08-25 16:18:25.2370000', '1601-01-01 00:00:00.0000000', None])
+
+    date_time_strings = timestamps._CopyToDateTimeStringsWithNumPy(
+        [1281643591, -1, 253402300800], timestamps.TIMESTAMP_TYPE_POSIX)
+    self.assertEqual(date_time_strings, [
+        '2010-08-12 20:06:31', '1969-12-31 23:59:59', None])
+
+    # Test with timestamps that cannot be represented as 64-bit integers.
+    date_time_strings = timestamps._CopyToDateTimeStringsWithNumPy(
+        [0xffffffffffffffff], timestamps.TIMESTAMP_TYPE_FILETIME)
+    self.assertIsNone(date_time_strings)
+
+  def testCopyToDateTimeStringsWithPython(self):
+    """Tests the _CopyToDateTimeStringsWithPython function."""
+    date_time_strings = timestamps._CopyToDateTimeStringsWithPython(
+        [127379243052370000, 0, 0x7fffffffffffffff, None],
+        timestamps.TIMESTAMP_TYPE_FILETIME)
+    self.assertEqual(date_time_strings, [
+        '2004-08-25 16:18:25.2370000', '1601-01-01 00:00:00.0000000', None,
+        None])
+
+    date_time_strings = timestamps._CopyToDateTimeStringsWithPython(
+        [1281643591, -1, 253402300800], timestamps.TIMESTAMP_TYPE_POSIX)
+    self.assertEqual(date_time_strings, [
+        '2010-08-12 20:06:31', '1969-12-31 23:59:59', None])
+
+  def testCopyToDatetimes(self):
+    """Tests the CopyToDatetimes function."""
+    datetimes = timestamps.CopyToDatetimes(
+        [127379243052370000, -1], timestamps.TIMESTAMP_TYPE_FILETIME)
+    self.assertEqual(len(datetimes), 2)
+
+    if timestamps.numpy:
+      self.assertEqual(
+          datetimes[0], timestamps.numpy.datetime64('2004-08-25T16:18:25.237'))
+      self.assertTrue(timestamps.numpy.isnat(datetimes[1]))
+    else:
+      self.assertEqual(
+          datetimes[0], datetime.datetime(2004, 8, 25, 16, 18, 25, 237000))
+      self.assertIsNone(datetimes[1])
+
+    with self.assertRaises(ValueError):
+      timestamps.CopyToDatetimes([0], 'bogus')
+
+  def testCopyToDateTimeStrings(self):
+    """Tests the CopyToDateTimeStrings function."""
+    date_time_strings = timestamps.CopyToDateTimeStrings(
+        [0, 3600], timestamps.TIMESTAMP_TYPE_HFS)
+    self.assertEqual(date_time_strings, [
+        '1904-01-01 00:00:00', '1904-01-01 01:00:00'])
+
+    date_time_strings = timestamps.CopyToDateTimeStrings(
+        [1281643591546742], timestamps.TIMESTAMP_TYPE_POSIX_MICROSECONDS)
+    self.assertEqual(date_time_strings, ['2010-08-12 20:06:31.546742'])
+
+    date_time_strings = timestamps.CopyToDateTimeStrings(
+        [13042293567861000, 5], timestamps.TIMESTAMP_TYPE_WEBKIT)
+    self.assertEqual(date_time_strings, [
+        '2014-04-18 11:19:27.861000', '1601-01-01 00:00:00.000005'])
+
+    # Test with timestamps that cannot be represented as 64-bit integers.
+    date_time_strings = timestamps.CopyToDateTimeStrings(
+        [0xffffffffffffffff, None], timestamps.TIMESTAMP_TYPE_FILETIME)
+    self.assertEqual(date_time_strings, [None, None])
+
+    with self.assertRaises(ValueError):
+      timestamps.CopyToDateTimeStrings([0, 1], 'bogus')
+
+  def testCopyRecordTimestampsToDateTimeStrings(self):
+    """Tests the CopyRecordTimestampsToDateTimeStrings function."""
+    records_values = [
+        {'name': 'first', 'timestamp': 1281643591},
+        {'name': 'second', 'timestamp': None},
+        {'name': 'third'},
+        {'name': 'fourth', 'timestamp': 253402300800}]
+
+    timestamps.CopyRecordTimestampsToDateTimeStrings(
+        records_values, {'timestamp': timestamps.TIMESTAMP_TYPE_POSIX})
+
+    self.assertEqual(records_values, [
+        {'name': 'first', 'timestamp': '2010-08-12 20:06:31'},
+        {'name': 'second', 'timestamp': None},
+        {'name': 'third'},
+        {'name': 'fourth', 'timestamp': 253402300800}])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""Tests for the triage of artifacts."""
+
+from __future__ import unicode_literals
+
+import unittest
+
+from dtformats import output_writers
+from dtformats import triage
+
+from tests import test_lib
+
+
+class TestRecordWriter(output_writers.BufferedRecordWriter):
+  """Test record output writer.
+
+  Attributes:
+    records (list[object]): records written.
+  """
+
+  def __init__(self):
+    """Initializes a test record output writer."""
+    super(TestRecordWriter, self).__init__()
+    self.records = []
+
+  def _FormatRecords(self, records):
+    """Formats records.
+
+    Args:
+      records (list[object]): records.
+
+    Returns:
+      bytes: formatted records.
+    """
+    return b''
+
+  def WriteRecords(self, records):
+    """Writes a batch of records.
+
+    Args:
+      records (iterable[dict[str, object]|object]): records.
+    """
+    self.records.extend(records)
+
+
+class FailingRecordWriter(TestRecordWriter):
+  """Test record output writer that fails to write records."""
+
+  def WriteRecords(self, records):
+    """Writes a batch of records.
+
+    Args:
+      records (iterable[dict[str, object]|object]): records.
+
+    Raises:
+      IOError: always.
+    """
+    raise IOError('Unable to write records.')
+
+
+class TriageFilesTest(test_lib.BaseTestCase):
+  """Tests for the TriageFiles function."""
+
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testTriageFiles(self):
+    """Tests the TriageFiles function."""
+    test_file_paths = [
+        self._GetTestFilePath(['rp.log']),
+        self._GetTestFilePath(['utmpx-macosx10.5'])]
+
+    results = list(triage.TriageFiles(test_file_paths))
+    self.assertEqual(len(results), 1)
+
+    number_of_artifacts, records, triage_errors = results[0]
+    self.assertEqual(number_of_artifacts, 1)
+    self.assertEqual(len(records), 6)
+    self.assertEqual(triage_errors, [])
+
+    record = records[0]
+    self.assertEqual(record['artifact_format'], 'utmpx')
+    self.assertEqual(record['artifact_path'], test_file_paths[1])
+    self.assertEqual(record['pid'], 1)
+
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testTriageFilesInChunks(self):
+    """Tests the TriageFiles function with records in chunks."""
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+
+    maximum_number_of_records = triage.MAXIMUM_NUMBER_OF_RECORDS_PER_RESULT
+    triage.MAXIMUM_NUMBER_OF_RECORDS_PER_RESULT = 4
+    try:
+      results = list(triage.TriageFiles([test_file_path, test_file_path]))
+    finally:
+      triage.MAXIMUM_NUMBER_OF_RECORDS_PER_RESULT = maximum_number_of_records
+
+    self.assertEqual(len(results), 4)
+
+    number_of_artifacts = [result[0] for result in results]
+    self.assertEqual(number_of_artifacts, [1, 0, 1, 0])
+
+    number_of_records = [len(result[1]) for result in results]
+    self.assertEqual(number_of_records, [4, 2, 4, 2])
+
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testTriageFilesWithMemoryBudget(self):
+    """Tests the TriageFiles function with a memory budget."""
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+
+    # pylint: disable=protected-access
+    try:
+      results = list(triage.TriageFiles(
+          [test_file_path], memory_budget_size=1024))
+
+      self.assertIsNotNone(triage._memory_budget)
+      self.assertEqual(triage._memory_budget.maximum_size, 1024)
+      self.assertEqual(triage._memory_budget.used_size, 0)
+
+    finally:
+      triage._SetMemoryBudget(None)
+
+    self.assertIsNone(triage._memory_budget)
+
+    # The records that exceed the memory budget are passed on in smaller
+    # chunks.
+    self.assertGreater(len(results), 1)
+
+    number_of_records = sum([len(result[1]) for result in results])
+    self.assertEqual(number_of_records, 6)
+
+  @test_lib.skipUnlessHasTestFile(['localtime.tzif'])
+  def testTriageFilesWithoutRecords(self):
+    """Tests the TriageFiles function on a format without records."""
+    test_file_path = self._GetTestFilePath(['localtime.tzif'])
+
+    results = list(triage.TriageFiles([test_file_path]))
+    self.assertEqual(results, [(1, [{
+        'artifact_format': 'tzif', 'artifact_path': test_file_path}], [])])
+
+
+class TriageRunnerTest(test_lib.BaseTestCase):
+  """Tests for the triage runner."""
+
+  # pylint: disable=protected-access
+
+  @test_lib.skipUnlessHasTestFile(['cpio'])
+  def testGetFilePathBatches(self):
+    """Tests the _GetFilePathBatches function."""
+    test_runner = triage.TriageRunner(batch_size=3, number_of_workers=1)
+
+    test_path = self._GetTestFilePath(['cpio'])
+    batches = list(test_runner._GetFilePathBatches(test_path))
+    self.assertEqual(len(batches), 2)
+    self.assertEqual(len(batches[0]), 3)
+    self.assertEqual(len(batches[1]), 1)
+
+  @test_lib.skipUnlessHasTestFile(['cpio'])
+  def testTriage(self):
+    """Tests the Triage function."""
+    test_path = self._GetTestFilePath(['cpio'])
+
+    test_runner = triage.TriageRunner(batch_size=1, number_of_workers=1)
+    record_writer = TestRecordWriter()
+    test_runner.Triage(test_path, record_writer)
+
+    self.assertEqual(test_runner.number_of_artifacts, 4)
+    self.assertEqual(test_runner.number_of_errors, 0)
+    self.assertEqual(test_runner.number_of_records, 4)
+    self.assertEqual(len(record_writer.records), 4)
+
+  @test_lib.skipUnlessHasTestFile(['cpio'])
+  def testTriageWithMemoryBudget(self):
+    """Tests the Triage function with a memory budget."""
+    test_path = self._GetTestFilePath(['cpio'])
+
+    test_runner = triage.TriageRunner(
+        batch_size=1, memory_budget_size=65536, number_of_workers=1)
+    record_writer = TestRecordWriter()
+    test_runner.Triage(test_path, record_writer)
+
+    self.assertEqual(test_runner.number_of_records, 4)
+
+    # The memory budget is reset after the run.
+    self.assertIsNone(triage._memory_budget)  # pylint: disable=protected-access
+
+  @test_lib.skipUnlessHasTestFile(['cpio'])
+  def testTriageWithWorkers(self):
+    """Tests the Triage function with worker processes."""
+    test_path = self._GetTestFilePath(['cpio'])
+
+    test_runner = triage.TriageRunner(batch_size=1, number_of_workers=2)
+    record_writer = TestRecordWriter()
+    test_runner.Triage(test_path, record_writer)
+
+    self.assertEqual(test_runner.number_of_artifacts, 4)
+    self.assertEqual(test_runner.number_of_records, 4)
+
+    paths = sorted([
+        record['artifact_path'] for record in record_writer.records])
+    self.assertEqual(paths, [
+        self._GetTestFilePath(['cpio', 'syslog.bin.cpio']),
+        self._GetTestFilePath(['cpio', 'syslog.crc.cpio']),
+        self._GetTestFilePath(['cpio', 'syslog.newc.cpio']),
+        self._GetTestFilePath(['cpio', 'syslog.odc.cpio'])])
+
+  def testTriageWithWorkersAndWriteError(self):
+    """Tests the Triage function with worker processes and a write error."""
+    test_path = self._GetTestFilePath([])
+
+    test_runner = triage.TriageRunner(batch_size=1, number_of_workers=2)
+    record_writer = FailingRecordWriter()
+
+    with self.assertRaises(IOError):
+      test_runner.Triage(test_path, record_writer)
+
+
+if __name__ == '__main__':
+  unittest.main()
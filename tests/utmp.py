@@ -3,8 +3,12 @@
 
 from __future__ import unicode_literals
 
+import os
+import shutil
+import tempfile
 import unittest
 
+from dtformats import follow
 from dtformats import utmp
 
 from tests import test_lib
@@ -47,24 +51,112 @@ class LinuxLibc6UtmpFileTest(test_lib.BaseTestCase):
     self.assertEqual(string, 'test')
 
   @test_lib.skipUnlessHasTestFile(['utmp-linux_libc6'])
-  def testReadEntries(self):
-    """Tests the _ReadEntries function."""
+  def testReadFileObject(self):
+    """Tests the ReadFileObject."""
     output_writer = test_lib.TestOutputWriter()
-    test_file = utmp.LinuxLibc6UtmpFile(output_writer=output_writer)
+    test_file = utmp.LinuxLibc6UtmpFile(debug=True, output_writer=output_writer)
 
+    test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
+    test_file.Open(test_file_path)
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def _ReadAppendedRecords(self, path, follow_state):
+    """Reads the appended records of a Linux libc6 utmp file.
+
+    Args:
+      path (str): path of the utmp file.
+      follow_state (FollowState): follow state.
+
+    Returns:
+      list[UtmpEntry]: entries.
+    """
+    test_file = utmp.LinuxLibc6UtmpFile()
+    test_file.Open(path)
+
+    try:
+      return list(test_file.ReadAppendedRecords(follow_state))
+    finally:
+      test_file.Close()
+
+  @test_lib.skipUnlessHasTestFile(['utmp-linux_libc6'])
+  def testReadAppendedRecords(self):
+    """Tests the ReadAppendedRecords function."""
     test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
     with open(test_file_path, 'rb') as file_object:
-      test_file._ReadEntries(file_object)
+      data = file_object.read()
+
+    path = os.path.join(self._temporary_directory, 'wtmp')
+    with open(path, 'wb') as file_object:
+      file_object.write(data[:10 * 384])
+
+    follow_state = follow.FollowState()
+
+    utmp_entries = self._ReadAppendedRecords(path, follow_state)
+    self.assertEqual(len(utmp_entries), 10)
+    self.assertEqual(follow_state.offset, 10 * 384)
+
+    utmp_entries = self._ReadAppendedRecords(path, follow_state)
+    self.assertEqual(len(utmp_entries), 0)
+
+    # Test with a partially written entry.
+    with open(path, 'ab') as file_object:
+      file_object.write(data[10 * 384:12 * 384 + 100])
+
+    utmp_entries = self._ReadAppendedRecords(path, follow_state)
+    self.assertEqual(len(utmp_entries), 2)
+    self.assertEqual(follow_state.offset, 12 * 384)
+
+    with open(path, 'ab') as file_object:
+      file_object.write(data[12 * 384 + 100:])
+
+    utmp_entries = self._ReadAppendedRecords(path, follow_state)
+    self.assertEqual(len(utmp_entries), 2)
+    self.assertEqual(follow_state.offset, 14 * 384)
+
+    # Test with a truncated file.
+    with open(path, 'wb') as file_object:
+      file_object.write(data[:5 * 384])
+
+    utmp_entries = self._ReadAppendedRecords(path, follow_state)
+    self.assertEqual(len(utmp_entries), 5)
+
+    # Test with a rotated file of the same size.
+    with open(path, 'wb') as file_object:
+      file_object.write(data[5 * 384:10 * 384])
+
+    utmp_entries = self._ReadAppendedRecords(path, follow_state)
+    self.assertEqual(len(utmp_entries), 5)
 
   @test_lib.skipUnlessHasTestFile(['utmp-linux_libc6'])
-  def testReadFileObject(self):
-    """Tests the ReadFileObject."""
-    output_writer = test_lib.TestOutputWriter()
-    test_file = utmp.LinuxLibc6UtmpFile(debug=True, output_writer=output_writer)
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = utmp.LinuxLibc6UtmpFile()
 
     test_file_path = self._GetTestFilePath(['utmp-linux_libc6'])
     test_file.Open(test_file_path)
 
+    try:
+      utmp_entries = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(utmp_entries), 14)
+
+    utmp_entry = utmp_entries[0]
+    self.assertIsInstance(utmp_entry, utmp.UtmpEntry)
+    self.assertEqual(utmp_entry.hostname, '3.8.0-33-generic')
+    self.assertEqual(utmp_entry.ip_address, '192.168.204.98')
+    self.assertEqual(utmp_entry.timestamp, 1386945909)
+    self.assertEqual(utmp_entry.type, 2)
+    self.assertEqual(utmp_entry.username, 'reboot')
+
 
 class MacOSXUtmpxFileTest(test_lib.BaseTestCase):
   """Mac OS X 10.5 utmpx file tests."""
@@ -100,14 +192,16 @@ class MacOSXUtmpxFileTest(test_lib.BaseTestCase):
     self.assertEqual(string, 'test')
 
   @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
-  def testReadEntries(self):
-    """Tests the _ReadEntries function."""
+  def testReadFileHeader(self):
+    """Tests the _ReadFileHeader function."""
     output_writer = test_lib.TestOutputWriter()
     test_file = utmp.MacOSXUtmpxFile(output_writer=output_writer)
 
     test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
     with open(test_file_path, 'rb') as file_object:
-      test_file._ReadEntries(file_object)
+      file_header_size = test_file._ReadFileHeader(file_object)
+
+    self.assertEqual(file_header_size, 628)
 
   @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
   def testReadFileObject(self):
@@ -118,6 +212,49 @@ class MacOSXUtmpxFileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testReadAppendedRecords(self):
+    """Tests the ReadAppendedRecords function."""
+    test_file = utmp.MacOSXUtmpxFile()
+
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+    test_file.Open(test_file_path)
+
+    try:
+      follow_state = follow.FollowState()
+      utmp_entries = list(test_file.ReadAppendedRecords(follow_state))
+      self.assertEqual(len(utmp_entries), 6)
+      self.assertEqual(follow_state.offset, 4396)
+
+      utmp_entries = list(test_file.ReadAppendedRecords(follow_state))
+      self.assertEqual(len(utmp_entries), 0)
+
+    finally:
+      test_file.Close()
+
+  @test_lib.skipUnlessHasTestFile(['utmpx-macosx10.5'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = utmp.MacOSXUtmpxFile()
+
+    test_file_path = self._GetTestFilePath(['utmpx-macosx10.5'])
+    test_file.Open(test_file_path)
+
+    try:
+      utmp_entries = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(utmp_entries), 6)
+
+    utmp_entry = utmp_entries[5]
+    self.assertIsInstance(utmp_entry, utmp.UtmpEntry)
+    self.assertEqual(utmp_entry.pid, 6343)
+    self.assertEqual(utmp_entry.terminal, 'ttys003')
+    self.assertEqual(utmp_entry.timestamp, 1384400234)
+    self.assertEqual(utmp_entry.type, 8)
+    self.assertEqual(utmp_entry.username, 'moxilo')
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -20,7 +20,7 @@ class EMFFileTest(test_lib.BaseTestCase):
     output_writer = test_lib.TestOutputWriter()
     test_file = wemf.EMFFile(output_writer=output_writer)
 
-    data_type_map = test_file._FILE_HEADER
+    data_type_map = test_file._GetDataTypeMap('emf_file_header')
     file_header = data_type_map.CreateStructureValues(
         description_string_offset=0,
         description_string_size=1,
@@ -40,7 +40,7 @@ class EMFFileTest(test_lib.BaseTestCase):
     output_writer = test_lib.TestOutputWriter()
     test_file = wemf.EMFFile(output_writer=output_writer)
 
-    data_type_map = test_file._RECORD_HEADER
+    data_type_map = test_file._GetDataTypeMap('emf_record_header')
     record_header = data_type_map.CreateStructureValues(
         record_size=0,
         record_type=1)
@@ -60,6 +60,28 @@ class EMFFileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['Memo.emf'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['Memo.emf'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = wemf.EMFFile()
+
+    test_file_path = self._GetTestFilePath(['Memo.emf'])
+    test_file.Open(test_file_path)
+
+    try:
+      records = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(records), 7189)
+
+    record = records[0]
+    self.assertIsInstance(record, wemf.Record)
+    self.assertEqual(record.data_offset, 116)
+    self.assertEqual(record.data_size, 16)
+    self.assertEqual(record.record_type, 70)
+    self.assertEqual(record.size, 24)
+
 
 class WMFFileTest(test_lib.BaseTestCase):
   """Windows Metafile Format (WMF) file tests."""
@@ -71,7 +93,7 @@ class WMFFileTest(test_lib.BaseTestCase):
     output_writer = test_lib.TestOutputWriter()
     test_file = wemf.WMFFile(output_writer=output_writer)
 
-    data_type_map = test_file._HEADER
+    data_type_map = test_file._GetDataTypeMap('wmf_header')
     file_header = data_type_map.CreateStructureValues(
         file_size_lower=0,
         file_size_upper=1,
@@ -91,7 +113,7 @@ class WMFFileTest(test_lib.BaseTestCase):
     output_writer = test_lib.TestOutputWriter()
     test_file = wemf.WMFFile(output_writer=output_writer)
 
-    data_type_map = test_file._RECORD_HEADER
+    data_type_map = test_file._GetDataTypeMap('wmf_record_header')
     record_header = data_type_map.CreateStructureValues(
         record_size=0,
         record_type=1)
@@ -112,6 +134,28 @@ class WMFFileTest(test_lib.BaseTestCase):
     test_file_path = self._GetTestFilePath(['grid.wmf'])
     test_file.Open(test_file_path)
 
+  @test_lib.skipUnlessHasTestFile(['grid.wmf'])
+  def testReadRecords(self):
+    """Tests the ReadRecords function."""
+    test_file = wemf.WMFFile()
+
+    test_file_path = self._GetTestFilePath(['grid.wmf'])
+    test_file.Open(test_file_path)
+
+    try:
+      records = list(test_file.ReadRecords())
+    finally:
+      test_file.Close()
+
+    self.assertEqual(len(records), 154)
+
+    record = records[0]
+    self.assertIsInstance(record, wemf.Record)
+    self.assertEqual(record.data_offset, 46)
+    self.assertEqual(record.data_size, 2)
+    self.assertEqual(record.record_type, 259)
+    self.assertEqual(record.size, 8)
+
 
 if __name__ == '__main__':
   unittest.main()
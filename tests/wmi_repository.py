@@ -4,8 +4,12 @@
 from __future__ import unicode_literals
 
 import os
+import shutil
+import struct
+import tempfile
 import unittest
 
+from dtformats import errors
 from dtformats import wmi_repository
 
 from tests import test_lib
@@ -25,7 +29,176 @@ class PropertyDescriptorTest(test_lib.BaseTestCase):
 
 
 # TODO: add tests for IndexBinaryTreePage
-# TODO: add tests for ObjectRecord
+
+
+class ClassDefinitionTest(test_lib.BaseTestCase):
+  """Class definition tests."""
+
+  def testAddPropertyAndGetProperties(self):
+    """Tests the AddProperty and GetProperties functions."""
+    class_definition = wmi_repository.ClassDefinition(
+        name='Test', super_class_name='Base')
+    self.assertEqual(class_definition.number_of_properties, 0)
+
+    class_definition.AddProperty('Name', 0x00000008, 0, 0)
+    class_definition.AddProperty('Size', 0x00000013, 1, 4)
+    self.assertEqual(class_definition.number_of_properties, 2)
+
+    properties = list(class_definition.GetProperties())
+    self.assertEqual(properties, [
+        ('Name', 0x00000008, 0, 0), ('Size', 0x00000013, 1, 4)])
+
+
+class ObjectRecordTest(test_lib.BaseTestCase):
+  """Object record tests."""
+
+  # pylint: disable=protected-access
+
+  # Properties of the test class: name, type, index and value offset.
+  _PROPERTIES = [
+      ('Name', 0x00000008, 0, 0),
+      ('Enabled', 0x0000000b, 1, 4),
+      ('Size', 0x00000013, 2, 6),
+      ('Values', 0x00002012, 3, 10),
+      ('Description', 0x00000008, 4, 14)]
+
+  def _CreateClassDefinitionRecordData(
+      self, class_name, super_class_name, properties):
+    """Creates class definition object record data.
+
+    Args:
+      class_name (str): name of the class.
+      super_class_name (str): name of the super class.
+      properties (list[tuple[str, int, int, int]]): name, type, index and
+          value offset of the properties.
+
+    Returns:
+      bytes: class definition object record data.
+    """
+    properties_block_data = b''.join([
+        b'\x00', class_name.encode('ascii'), b'\x00'])
+
+    property_descriptors_data = []
+    for name, property_type, index, value_offset in properties:
+      name_offset = len(properties_block_data)
+      properties_block_data += b''.join([
+          b'\x00', name.encode('ascii'), b'\x00'])
+
+      definition_offset = len(properties_block_data)
+      properties_block_data += struct.pack(
+          '<IHIII', property_type, index, value_offset, 0, 4)
+
+      property_descriptors_data.append(
+          struct.pack('<II', name_offset, definition_offset))
+
+    class_definition_data = b''.join([
+        struct.pack('<BIIII', 0, 0, 0, 4, 4),
+        struct.pack('<I', len(properties)),
+        b''.join(property_descriptors_data),
+        struct.pack('<I', len(properties_block_data) | 0x80000000),
+        properties_block_data])
+
+    return b''.join([
+        struct.pack('<I', len(super_class_name)),
+        super_class_name.encode('utf-16-le'),
+        struct.pack('<QI', 0, len(class_definition_data) + 4),
+        class_definition_data,
+        struct.pack('<I', 4)])
+
+  def _CreateInstanceRecordData(self):
+    """Creates instance object record data of the test class.
+
+    Returns:
+      bytes: instance object record data.
+    """
+    property_heap_data = b''.join([
+        b'\x00Test\x00',
+        b'\x00test1\x00',
+        b'\x01', 'Unicode \xe9'.encode('utf-16-le'), b'\x00\x00',
+        struct.pack('<IHH', 2, 1, 2)])
+
+    property_values_data = struct.pack(
+        '<IHIII', 6, 0xffff, 1024, 34, 0)
+
+    # The Description property (index 4) is NULL.
+    property_states_data = struct.pack('<BB', 0x00, 0x01)
+
+    instance_block_data = b''.join([
+        struct.pack('<IB', 0, 0),
+        property_states_data,
+        property_values_data,
+        struct.pack('<I', 4),
+        b'\x01',
+        struct.pack('<I', len(property_heap_data) | 0x80000000),
+        property_heap_data])
+
+    return b''.join([
+        '0123'.encode('utf-16-le') * 8,
+        struct.pack('<QQI', 0, 0, len(instance_block_data) + 4),
+        instance_block_data])
+
+  def testReadClassDefinition(self):
+    """Tests the ReadClassDefinition function."""
+    object_record_data = self._CreateClassDefinitionRecordData(
+        'Test', 'Base', self._PROPERTIES)
+
+    object_record = wmi_repository.ObjectRecord('CD', object_record_data)
+    class_definition = object_record.ReadClassDefinition()
+
+    self.assertEqual(class_definition.name, 'Test')
+    self.assertEqual(class_definition.super_class_name, 'Base')
+    self.assertEqual(
+        list(class_definition.GetProperties()), self._PROPERTIES)
+
+    object_record_data = self._CreateClassDefinitionRecordData(
+        'Base', '', [])
+
+    object_record = wmi_repository.ObjectRecord('CD', object_record_data)
+    class_definition = object_record.ReadClassDefinition()
+
+    self.assertEqual(class_definition.name, 'Base')
+    self.assertIsNone(class_definition.super_class_name)
+    self.assertEqual(class_definition.number_of_properties, 0)
+
+    object_record = wmi_repository.ObjectRecord('R', object_record_data)
+    with self.assertRaises(errors.ParseError):
+      object_record.ReadClassDefinition()
+
+  def testReadHeapString(self):
+    """Tests the _ReadHeapString function."""
+    object_record = wmi_repository.ObjectRecord('I', b'')
+
+    heap_data = b'\x00ascii\x00\x01u\x00n\x00i\x00\x00\x00'
+    self.assertEqual(object_record._ReadHeapString(heap_data, 0), 'ascii')
+    self.assertEqual(object_record._ReadHeapString(heap_data, 7), 'uni')
+
+    with self.assertRaises(errors.ParseError):
+      object_record._ReadHeapString(heap_data, 64)
+
+  def testReadInstance(self):
+    """Tests the ReadInstance function."""
+    class_definition = wmi_repository.ClassDefinition(name='Test')
+    for name, property_type, index, value_offset in self._PROPERTIES:
+      class_definition.AddProperty(name, property_type, index, value_offset)
+
+    object_record = wmi_repository.ObjectRecord(
+        'IL', self._CreateInstanceRecordData())
+    property_values = object_record.ReadInstance(class_definition)
+
+    self.assertEqual(list(property_values.keys()), [
+        'Name', 'Enabled', 'Size', 'Values', 'Description'])
+    self.assertEqual(property_values['Name'], 'test1')
+    self.assertTrue(property_values['Enabled'])
+    self.assertEqual(property_values['Size'], 1024)
+    self.assertEqual(property_values['Values'], [1, 2])
+    self.assertIsNone(property_values['Description'])
+
+    object_record = wmi_repository.ObjectRecord(
+        'CD', self._CreateInstanceRecordData())
+    with self.assertRaises(errors.ParseError):
+      object_record.ReadInstance(class_definition)
+
+
 # TODO: add tests for ObjectsDataPage
 
 
@@ -48,13 +221,88 @@ class IndexBinaryTreeFileTest(test_lib.BaseTestCase):
     test_file._DebugPrintPageNumber(
         'Page number', 0xffffffff, unavailable_page_numbers=set([0xffffffff]))
 
-  # TODO: add tests for _GetPage
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.BTR'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.MAP'])
+  def testGetPage(self):
+    """Tests the _GetPage function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.MAP'])
+    mapping_file = wmi_repository.MappingFile()
+    mapping_file.Open(test_file_path)
+
+    output_writer = test_lib.TestOutputWriter()
+    test_file = wmi_repository.IndexBinaryTreeFile(
+        mapping_file, output_writer=output_writer, page_cache_size=1)
+
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    test_file.Open(test_file_path)
+
+    index_page = test_file._GetPage(1)
+    self.assertIsNotNone(index_page)
+    self.assertEqual(test_file.page_cache.number_of_misses, 1)
+
+    cached_index_page = test_file._GetPage(1)
+    self.assertIs(cached_index_page, index_page)
+    self.assertEqual(test_file.page_cache.number_of_hits, 1)
+
+    test_file._GetPage(2)
+    self.assertEqual(len(test_file.page_cache), 1)
+    self.assertIsNot(test_file._GetPage(1), index_page)
+
+    index_page = test_file._GetPage(0xffffff)
+    self.assertIsNone(index_page)
+
+    test_file.Close()
+    self.assertEqual(len(test_file.page_cache), 0)
+
+    mapping_file.Close()
+
   # TODO: add tests for _ReadPage
   # TODO: add tests for _ReadPageKeyData
   # TODO: add tests for _ReadPageValueData
   # TODO: add tests for _ReadSubPages
   # TODO: add tests for GetFirstMappedPage
   # TODO: add tests for GetMappedPage
+
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.BTR'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.MAP'])
+  def testGetMappedPages(self):
+    """Tests the GetMappedPages function."""
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.MAP'])
+    mapping_file = wmi_repository.MappingFile()
+    mapping_file.Open(test_file_path)
+
+    test_file = wmi_repository.IndexBinaryTreeFile(mapping_file)
+
+    test_file_path = self._GetTestFilePath(['cim', 'INDEX.BTR'])
+    test_file.Open(test_file_path)
+
+    read_page_numbers = []
+    get_page_function = test_file._GetPage
+
+    def _GetPage(page_number):
+      read_page_numbers.append(page_number)
+      return get_page_function(page_number)
+
+    test_file._GetPage = _GetPage
+
+    page_numbers = list(test_file.GetRootPage().sub_pages)
+    read_page_numbers = []
+
+    index_pages = test_file.GetMappedPages(page_numbers)
+    self.assertEqual(len(index_pages), len(page_numbers))
+
+    # The pages are read in order of mapped page number.
+    self.assertEqual(read_page_numbers, sorted(read_page_numbers))
+
+    for page_number, index_page in zip(page_numbers, index_pages):
+      self.assertIs(index_page, test_file.GetMappedPage(page_number))
+
+    index_pages = test_file.GetMappedPages([0xffffff])
+    self.assertEqual(index_pages, [None])
+
+    test_file.Close()
+    mapping_file.Close()
+
   # TODO: add tests for GetRootPage
 
   @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.BTR'])
@@ -84,7 +332,7 @@ class MappingFileTest(test_lib.BaseTestCase):
     output_writer = test_lib.TestOutputWriter()
     test_file = wmi_repository.MappingFile(output_writer=output_writer)
 
-    data_type_map = test_file._FILE_FOOTER
+    data_type_map = test_file._GetDataTypeMap('cim_map_footer')
     file_footer = data_type_map.CreateStructureValues(
         signature=0x0000dcba)
 
@@ -95,7 +343,7 @@ class MappingFileTest(test_lib.BaseTestCase):
     output_writer = test_lib.TestOutputWriter()
     test_file = wmi_repository.MappingFile(output_writer=output_writer)
 
-    data_type_map = test_file._FILE_HEADER
+    data_type_map = test_file._GetDataTypeMap('cim_map_header')
     file_header = data_type_map.CreateStructureValues(
         format_version=1,
         number_of_pages=2,
@@ -123,7 +371,8 @@ class MappingFileTest(test_lib.BaseTestCase):
 
     test_file_path = self._GetTestFilePath(['cim', 'INDEX.MAP'])
     with open(test_file_path, 'rb') as file_object:
-      file_offset = -1 * test_file._FILE_FOOTER_SIZE
+      data_type_map = test_file._GetDataTypeMap('cim_map_footer')
+      file_offset = -1 * data_type_map.GetByteSize()
       file_object.seek(file_offset, os.SEEK_END)
 
       test_file._ReadFileFooter(file_object)
@@ -146,7 +395,8 @@ class MappingFileTest(test_lib.BaseTestCase):
 
     test_file_path = self._GetTestFilePath(['cim', 'INDEX.MAP'])
     with open(test_file_path, 'rb') as file_object:
-      file_offset = test_file._FILE_HEADER_SIZE
+      data_type_map = test_file._GetDataTypeMap('cim_map_header')
+      file_offset = data_type_map.GetByteSize()
       file_object.seek(file_offset, os.SEEK_SET)
 
       test_file._ReadMappings(file_object)
@@ -159,7 +409,8 @@ class MappingFileTest(test_lib.BaseTestCase):
 
     test_file_path = self._GetTestFilePath(['cim', 'INDEX.MAP'])
     with open(test_file_path, 'rb') as file_object:
-      file_offset = test_file._FILE_HEADER_SIZE
+      data_type_map = test_file._GetDataTypeMap('cim_map_header')
+      file_offset = data_type_map.GetByteSize()
       test_file._ReadPageNumbersTable(file_object, file_offset, 'mappings')
 
   @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.MAP'])
@@ -186,14 +437,155 @@ class MappingFileTest(test_lib.BaseTestCase):
     test_file.Close()
 
 
-class ObjectsDataFileTest(test_lib.BaseTestCase):
-  """Index binary-tree (Index.btr) file tests."""
+class TestMappingFile(object):
+  """Test mappings file.
+
+  Attributes:
+    mappings (list[int]): mappings of page numbers to mapped page numbers.
+  """
+
+  def __init__(self, mappings):
+    """Initializes a test mappings file.
+
+    Args:
+      mappings (list[int]): mappings of page numbers to mapped page numbers.
+    """
+    super(TestMappingFile, self).__init__()
+    self.mappings = mappings
+
+
+class ObjectsDataTestCase(test_lib.BaseTestCase):
+  """Shared functionality for objects data tests."""
+
+  _KEY_PREFIX = '\\NS_0E275507EB154D8A9953FFC0338321EF\\CI_0123'
 
-  # TODO: add tests _GetKeyValues
-  # TODO: add tests _GetPage
-  # TODO: add tests _ReadPage
-  # TODO: add tests GetMappedPage
-  # TODO: add tests GetObjectRecordByKey
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def _CreateObjectsDataFile(self):
+    """Creates an objects data file.
+
+    The file contains 3 pages, where page 0 contains the object descriptors
+    and the data of the object records and page 1 is mapped onto page 2 and
+    contains the remainder of the data of object record 12.
+
+    Returns:
+      str: path of the objects data file.
+    """
+    page_data = bytearray(wmi_repository.ObjectsDataPage.PAGE_SIZE)
+
+    object_descriptors = [(10, 64, 16), (11, 80, 8), (12, 8160, 40)]
+    for index, (identifier, data_offset, data_size) in enumerate(
+        object_descriptors):
+      page_data[index * 16:(index + 1) * 16] = struct.pack(
+          '<IIII', identifier, data_offset, data_size, 0)
+
+    page_data[64:80] = b'A' * 16
+    page_data[80:88] = b'B' * 8
+    page_data[8160:8192] = b'C' * 32
+
+    data_page_data = bytearray(wmi_repository.ObjectsDataPage.PAGE_SIZE)
+    data_page_data[0:8] = b'D' * 8
+
+    path = os.path.join(self._temporary_directory, 'OBJECTS.DATA')
+    with open(path, 'wb') as file_object:
+      file_object.write(bytes(page_data))
+      file_object.write(b'\xff' * wmi_repository.ObjectsDataPage.PAGE_SIZE)
+      file_object.write(bytes(data_page_data))
+
+    return path
+
+  def _CreateObjectsMappingFile(self, mappings):
+    """Creates an objects mapping file.
+
+    Args:
+      mappings (list[int]): mappings of page numbers to mapped page numbers.
+
+    Returns:
+      str: path of the objects mapping file.
+    """
+    path = os.path.join(self._temporary_directory, 'OBJECTS.MAP')
+    with open(path, 'wb') as file_object:
+      file_object.write(struct.pack('<III', 0x0000abcd, 1, len(mappings)))
+      file_object.write(struct.pack('<I', len(mappings)))
+      for mapped_page_number in mappings:
+        file_object.write(struct.pack('<I', mapped_page_number))
+      file_object.write(struct.pack('<II', 0, 0x0000dcba))
+
+    return path
+
+
+class ObjectsDataFileTest(ObjectsDataTestCase):
+  """Objects data (Objects.data) file tests."""
+
+  # pylint: disable=protected-access
+
+  def testGetKeyValues(self):
+    """Tests the GetKeyValues function."""
+    test_file = wmi_repository.ObjectsDataFile(TestMappingFile([0]))
+
+    key_values = test_file.GetKeyValues(
+        '{0:s}\\I_4567.1.12.40'.format(self._KEY_PREFIX))
+    self.assertEqual(key_values, ('I_4567', 1, 12, 40))
+
+    key_values = test_file.GetKeyValues(self._KEY_PREFIX)
+    self.assertIsNone(key_values)
+
+  def testGetObjectRecordByKey(self):
+    """Tests the GetObjectRecordByKey function."""
+    test_file = wmi_repository.ObjectsDataFile(TestMappingFile([0, 2, 1]))
+    test_file.Open(self._CreateObjectsDataFile())
+
+    object_record = test_file.GetObjectRecordByKey(
+        '{0:s}\\I_4567.0.10.16'.format(self._KEY_PREFIX))
+    self.assertEqual(object_record.data_type, 'I')
+    self.assertEqual(object_record.data, b'A' * 16)
+
+    object_record = test_file.GetObjectRecordByKey(
+        '{0:s}\\I_4567.0.12.40'.format(self._KEY_PREFIX))
+    self.assertEqual(object_record.data, b'C' * 32 + b'D' * 8)
+
+    with self.assertRaises(errors.ParseError):
+      test_file.GetObjectRecordByKey(
+          '{0:s}\\I_4567.0.13.8'.format(self._KEY_PREFIX))
+
+    self.assertEqual(test_file.page_cache.number_of_misses, 1)
+    self.assertEqual(test_file.page_cache.number_of_hits, 2)
+
+    test_file.Close()
+
+  def testGetObjectRecordsByKeys(self):
+    """Tests the GetObjectRecordsByKeys function."""
+    test_file = wmi_repository.ObjectsDataFile(
+        TestMappingFile([0, 2, 1]), page_cache_size=0)
+    test_file.Open(self._CreateObjectsDataFile())
+
+    keys = [
+        '{0:s}\\I_4567.0.12.40'.format(self._KEY_PREFIX),
+        '{0:s}\\I_4567.0.10.16'.format(self._KEY_PREFIX),
+        '{0:s}\\I_4567.0.11.8'.format(self._KEY_PREFIX),
+        self._KEY_PREFIX,
+        '{0:s}\\I_4567.0.9.8'.format(self._KEY_PREFIX)]
+
+    # The object record without an object descriptor is skipped.
+    results = list(test_file.GetObjectRecordsByKeys(keys))
+    self.assertEqual(len(results), 3)
+
+    # The object records are returned in order of record identifier.
+    self.assertEqual([key for key, _ in results], [keys[1], keys[2], keys[0]])
+    self.assertEqual(results[0][1].data, b'A' * 16)
+    self.assertEqual(results[1][1].data, b'B' * 8)
+    self.assertEqual(results[2][1].data, b'C' * 32 + b'D' * 8)
+
+    # The page with the object descriptors is read once for all the keys.
+    self.assertEqual(test_file.page_cache.number_of_misses, 1)
+
+    test_file.Close()
 
   @test_lib.skipUnlessHasTestFile(['cim', 'OBJECTS.DATA'])
   @test_lib.skipUnlessHasTestFile(['cim', 'OBJECTS.MAP'])
@@ -210,7 +602,532 @@ class ObjectsDataFileTest(test_lib.BaseTestCase):
     test_file.Open(test_file_path)
 
 
-# TODO: add tests for CIMRepository
+class SidecarIndexTest(test_lib.BaseTestCase):
+  """Sidecar index tests."""
+
+  _KEY_PREFIX = '\\NS_0E275507EB154D8A9953FFC0338321EF'
+
+  def setUp(self):
+    """Makes preparations before running an individual test."""
+    self._temporary_directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    """Cleans up after running an individual test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def testWriteKeysAndGetKeys(self):
+    """Tests the WriteKeys and GetKeys functions."""
+    path = os.path.join(self._temporary_directory, 'sidecar.db')
+
+    key_values = [
+        ('{0:s}\\CI_0123\\IL_4567.2.10.16'.format(self._KEY_PREFIX),
+         '{0:s}\\CI_0123\\IL_4567'.format(self._KEY_PREFIX),
+         '0E275507EB154D8A9953FFC0338321EF', '0123', 'Test', 'IL', 2, 5, 10,
+         16),
+        ('{0:s}\\CD_0123.1.11.8'.format(self._KEY_PREFIX),
+         '{0:s}\\CD_0123'.format(self._KEY_PREFIX),
+         '0E275507EB154D8A9953FFC0338321EF', '0123', 'Test', 'CD', 1, 4, 11,
+         8),
+        (self._KEY_PREFIX, self._KEY_PREFIX,
+         '0E275507EB154D8A9953FFC0338321EF', None, None, None, None, None,
+         None, None)]
+    keys = [values[0] for values in key_values]
+
+    sidecar_index = wmi_repository.SidecarIndex()
+    sidecar_index.Open(path)
+
+    self.assertFalse(sidecar_index.IsValid('state'))
+
+    sidecar_index.WriteKeys(key_values, 'state')
+    self.assertTrue(sidecar_index.IsValid('state'))
+    self.assertFalse(sidecar_index.IsValid('other'))
+
+    sidecar_index.Close()
+
+    sidecar_index = wmi_repository.SidecarIndex()
+    sidecar_index.Open(path)
+
+    self.assertTrue(sidecar_index.IsValid('state'))
+
+    # The keys are retrieved in the order they were written.
+    self.assertEqual(list(sidecar_index.GetKeys()), keys)
+
+    self.assertEqual(sidecar_index.GetKey(keys[0]), keys[0])
+    self.assertEqual(sidecar_index.GetKey(key_values[0][1]), keys[0])
+    self.assertIsNone(sidecar_index.GetKey('\\bogus'))
+
+    found_keys = list(sidecar_index.FindKeysWithPrefix(
+        '{0:s}\\C'.format(self._KEY_PREFIX)))
+    self.assertEqual(found_keys, [keys[1], keys[0]])
+
+    found_keys = list(sidecar_index.GetKeysByClassName('Test'))
+    self.assertEqual(found_keys, keys[:2])
+
+    # Test that writing the keys replaces the existing keys.
+    sidecar_index.WriteKeys(key_values[2:], 'other')
+    self.assertTrue(sidecar_index.IsValid('other'))
+    self.assertEqual(list(sidecar_index.GetKeys()), keys[2:])
+
+    sidecar_index.Close()
+
+
+class CIMRepositorySidecarIndexTest(ObjectsDataTestCase):
+  """CIM repository with sidecar index tests."""
+
+  # pylint: disable=protected-access
+
+  _REPOSITORY_FILENAMES = [
+      'INDEX.BTR', 'INDEX.MAP', 'MAPPING.VER', 'MAPPING1.MAP', 'MAPPING2.MAP']
+
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.BTR'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.MAP'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'MAPPING.VER'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'MAPPING1.MAP'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'MAPPING2.MAP'])
+  def testOpenWithSidecarIndex(self):
+    """Tests the Open function with a sidecar index."""
+    for filename in self._REPOSITORY_FILENAMES:
+      shutil.copy(
+          self._GetTestFilePath(['cim', filename]), self._temporary_directory)
+
+    self._CreateObjectsDataFile()
+    self._CreateObjectsMappingFile([0, 2, 1])
+
+    sidecar_index_path = os.path.join(self._temporary_directory, 'sidecar.db')
+
+    test_repository = wmi_repository.CIMRepository()
+    test_repository.Open(self._temporary_directory)
+    expected_keys = list(test_repository.GetKeys())
+    test_repository.Close()
+
+    # Test that the sidecar index is built.
+    test_repository = wmi_repository.CIMRepository()
+    test_repository.Open(
+        self._temporary_directory, sidecar_index_path=sidecar_index_path)
+    self.assertIsNotNone(test_repository._index_binary_tree_file)
+    self.assertEqual(list(test_repository.GetKeys()), expected_keys)
+    test_repository.Close()
+
+    # Test that the keys are retrieved from the sidecar index without
+    # reading the index binary-tree.
+    test_repository = wmi_repository.CIMRepository()
+    test_repository.Open(
+        self._temporary_directory, sidecar_index_path=sidecar_index_path)
+    self.assertIsNone(test_repository._index_binary_tree_file)
+    self.assertEqual(list(test_repository.GetKeys()), expected_keys)
+
+    key = expected_keys[100]
+    self.assertEqual(test_repository.GetKey(key), key)
+    self.assertIsNone(test_repository.GetKey('{0:s}x'.format(key)))
+
+    prefix = key[:38]
+    found_keys = list(test_repository.FindKeysWithPrefix(prefix))
+    self.assertEqual(found_keys, sorted([
+        found_key for found_key in expected_keys
+        if found_key.startswith(prefix)]))
+
+    test_repository.Close()
+
+    # Test that the sidecar index is rebuilt if a repository file changed.
+    path = os.path.join(self._temporary_directory, 'MAPPING.VER')
+    stat_object = os.stat(path)
+    os.utime(path, (stat_object.st_atime, stat_object.st_mtime + 10))
+
+    test_repository = wmi_repository.CIMRepository()
+    test_repository.Open(
+        self._temporary_directory, sidecar_index_path=sidecar_index_path)
+    self.assertIsNotNone(test_repository._index_binary_tree_file)
+    test_repository.Close()
+
+  def testGetObjectRecordByKeyWithSidecarIndex(self):
+    """Tests the GetObjectRecordByKey function with a sidecar index."""
+    self._CreateObjectsDataFile()
+    self._CreateObjectsMappingFile([0, 2, 1])
+
+    key = '{0:s}\\I_4567.0.12.40'.format(self._KEY_PREFIX)
+    key_name = '{0:s}\\I_4567'.format(self._KEY_PREFIX)
+
+    sidecar_index_path = os.path.join(self._temporary_directory, 'sidecar.db')
+    sidecar_index = wmi_repository.SidecarIndex()
+    sidecar_index.Open(sidecar_index_path)
+    sidecar_index.WriteKeys(
+        [(key, key_name, None, None, None, 'I', 0, 0, 12, 40)], 'state')
+
+    test_repository = wmi_repository.CIMRepository()
+    test_repository.OpenObjectsData(self._temporary_directory)
+    test_repository._sidecar_index = sidecar_index
+
+    object_record = test_repository.GetObjectRecordByKey(key_name)
+    self.assertEqual(object_record.data, b'C' * 32 + b'D' * 8)
+
+    object_record = test_repository.GetObjectRecordByKey(key)
+    self.assertEqual(object_record.data, b'C' * 32 + b'D' * 8)
+
+    self.assertIsNone(test_repository.GetObjectRecordByKey('\\bogus'))
+
+    test_repository.Close()
+
+
+class TestIndexBinaryTreeFile(object):
+  """Test index binary-tree file.
+
+  Attributes:
+    index_pages (dict[int, IndexBinaryTreePage]): index binary-tree pages
+        per page number.
+  """
+
+  def __init__(self, index_pages):
+    """Initializes a test index binary-tree file.
+
+    Args:
+      index_pages (dict[int, IndexBinaryTreePage]): index binary-tree pages
+          per page number, where page number 0 is the root page.
+    """
+    super(TestIndexBinaryTreeFile, self).__init__()
+    self.index_pages = index_pages
+
+  def GetMappedPage(self, page_number):
+    """Retrieves a specific mapped page.
+
+    Args:
+      page_number (int): page number.
+
+    Returns:
+      IndexBinaryTreePage: an index binary-tree page or None.
+    """
+    return self.index_pages.get(page_number, None)
+
+  def GetMappedPages(self, page_numbers):
+    """Retrieves specific mapped pages.
+
+    Args:
+      page_numbers (list[int]): page numbers.
+
+    Returns:
+      list[IndexBinaryTreePage]: index binary-tree pages.
+    """
+    return [
+        self.index_pages.get(page_number, None)
+        for page_number in page_numbers]
+
+  def GetRootPage(self):
+    """Retrieves the root page.
+
+    Returns:
+      IndexBinaryTreePage: an index binary-tree page.
+    """
+    return self.index_pages[0]
+
+
+class CIMRepositoryTest(test_lib.BaseTestCase):
+  """CIM repository tests."""
+
+  _NAMESPACE_KEY_PREFIX = '\\NS_0E275507EB154D8A9953FFC0338321EF'
+
+  # pylint: disable=protected-access
+
+  def _CreateClassDefinition(self, name, super_class_name, properties):
+    """Creates a class definition.
+
+    Args:
+      name (str): name of the class.
+      super_class_name (str): name of the super class.
+      properties (list[tuple[str, int, int, int]]): name, type, index and
+          value offset of the properties.
+
+    Returns:
+      ClassDefinition: class definition.
+    """
+    class_definition = wmi_repository.ClassDefinition(
+        name=name, super_class_name=super_class_name)
+    for property_name, property_type, index, value_offset in properties:
+      class_definition.AddProperty(
+          property_name, property_type, index, value_offset)
+
+    return class_definition
+
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.BTR'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.MAP'])
+  def testFindKeysWithPrefix(self):
+    """Tests the FindKeysWithPrefix function."""
+    test_repository = wmi_repository.CIMRepository()
+
+    test_path = self._GetTestFilePath(['cim'])
+    test_repository.OpenIndexBinaryTree(test_path)
+
+    keys = list(test_repository.GetKeys())
+    self.assertEqual(len(keys), 10288)
+
+    prefix = '{0:s}\\CI_644C0907A53790A09D448C09530D58E6'.format(
+        self._NAMESPACE_KEY_PREFIX)
+
+    test_repository.index_page_cache.Clear()
+    number_of_misses = test_repository.index_page_cache.number_of_misses
+
+    expected_keys = sorted([key for key in keys if key.startswith(prefix)])
+    found_keys = list(test_repository.FindKeysWithPrefix(prefix))
+    self.assertEqual(found_keys, expected_keys)
+
+    # Only the pages that can contain keys with the prefix are read.
+    number_of_misses = (
+        test_repository.index_page_cache.number_of_misses - number_of_misses)
+    self.assertEqual(number_of_misses, 2)
+
+    found_keys = list(test_repository.FindKeysWithPrefix('\\NS_'))
+    self.assertEqual(found_keys, sorted(keys))
+
+    found_keys = list(test_repository.FindKeysWithPrefix('\\bogus'))
+    self.assertEqual(found_keys, [])
+
+    test_repository.Close()
+
+  def testGetClassDefinition(self):
+    """Tests the GetClassDefinition function."""
+    test_repository = wmi_repository.CIMRepository()
+
+    namespace_hash = self._NAMESPACE_KEY_PREFIX[4:]
+    base_hash = test_repository._GetNameHash('Base', 32)
+    test_hash = test_repository._GetNameHash('Test', 32)
+
+    # Class definitions are read once, hence the cache can be prefilled.
+    test_repository._class_definitions = {
+        (namespace_hash, base_hash): self._CreateClassDefinition(
+            'Base', None, [('Name', 0x00000008, 0, 0)]),
+        (namespace_hash, test_hash): self._CreateClassDefinition(
+            'Test', 'Base', [('Size', 0x00000013, 1, 4)])}
+
+    class_definition = test_repository.GetClassDefinition(
+        namespace_hash, test_hash)
+    self.assertEqual(class_definition.name, 'Test')
+    self.assertEqual(list(class_definition.GetProperties()), [
+        ('Name', 0x00000008, 0, 0), ('Size', 0x00000013, 1, 4)])
+
+    # Test that the resolved class definition is cached.
+    self.assertIs(test_repository.GetClassDefinition(
+        namespace_hash, test_hash), class_definition)
+
+    key = '{0:s}\\CI_{1:s}\\IL_0123.1.2.3'.format(
+        self._NAMESPACE_KEY_PREFIX, test_hash)
+    self.assertIs(
+        test_repository.GetClassDefinitionByKey(key), class_definition)
+
+    key = '{0:s}\\CD_{1:s}.1.2.3'.format(
+        self._NAMESPACE_KEY_PREFIX, test_hash)
+    self.assertIsNone(test_repository.GetClassDefinitionByKey(key))
+
+    # Test with a class hierarchy that contains a cycle.
+    test_repository._class_definitions[(namespace_hash, base_hash)] = (
+        self._CreateClassDefinition('Base', 'Test', []))
+    test_repository._resolved_class_definitions = {}
+
+    with self.assertRaises(errors.ParseError):
+      test_repository.GetClassDefinition(namespace_hash, test_hash)
+
+  def _CreateTestIndexBinaryTreeFile(self, index_page_values):
+    """Creates a test index binary-tree file.
+
+    Args:
+      index_page_values (list[tuple[int, list[str], list[int]]]): page number,
+          keys and sub page numbers of the index binary-tree pages.
+
+    Returns:
+      TestIndexBinaryTreeFile: test index binary-tree file.
+    """
+    index_pages = {}
+    for page_number, keys, sub_pages in index_page_values:
+      index_page = wmi_repository.IndexBinaryTreePage()
+      index_page.keys = keys
+      index_page.page_number = page_number
+      index_page.sub_pages = sub_pages
+      index_pages[page_number] = index_page
+
+    return TestIndexBinaryTreeFile(index_pages)
+
+  def testFindKeysWithPrefixWithCycle(self):
+    """Tests the FindKeysWithPrefix function with a cycle."""
+    test_repository = wmi_repository.CIMRepository()
+    test_repository._index_binary_tree_file = (
+        self._CreateTestIndexBinaryTreeFile([
+            (0, ['b'], [1, 2]), (1, ['a'], [0, 2]), (2, ['c'], [1, 0])]))
+
+    keys = list(test_repository.FindKeysWithPrefix(''))
+    self.assertEqual(keys, ['a', 'c', 'b'])
+
+    test_repository._index_binary_tree_file = (
+        self._CreateTestIndexBinaryTreeFile([
+            (0, ['b'], [1]), (1, ['a'], [0])]))
+
+    keys = list(test_repository.FindKeysWithPrefix(''))
+    self.assertEqual(keys, ['b', 'a'])
+
+  def testGetKeyWithCycle(self):
+    """Tests the GetKey function with an index binary-tree with a cycle."""
+    test_repository = wmi_repository.CIMRepository()
+    test_repository._index_binary_tree_file = (
+        self._CreateTestIndexBinaryTreeFile([
+            (0, ['m'], [1, 2]), (1, ['f'], [0, 0]), (2, ['s'], [0, 0])]))
+
+    self.assertEqual(test_repository.GetKey('f'), 'f')
+    self.assertIsNone(test_repository.GetKey('a'))
+    self.assertIsNone(test_repository.GetKey('z'))
+
+  def testGetKeysWithCycle(self):
+    """Tests the GetKeys function with an index binary-tree with a cycle."""
+    test_repository = wmi_repository.CIMRepository()
+    test_repository._index_binary_tree_file = (
+        self._CreateTestIndexBinaryTreeFile([
+            (0, ['b'], [1, 2]), (1, ['a'], [0]), (2, ['c'], [1])]))
+
+    keys = list(test_repository.GetKeys())
+    self.assertEqual(keys, ['b', 'a', 'c'])
+
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.BTR'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.MAP'])
+  def testGetKey(self):
+    """Tests the GetKey function."""
+    test_repository = wmi_repository.CIMRepository()
+
+    test_path = self._GetTestFilePath(['cim'])
+    test_repository.OpenIndexBinaryTree(test_path)
+
+    keys = list(test_repository.GetKeys())
+    for key in keys[::100]:
+      self.assertEqual(test_repository.GetKey(key), key)
+
+    self.assertIsNone(test_repository.GetKey('{0:s}x'.format(keys[0])))
+    self.assertIsNone(test_repository.GetKey('\\bogus'))
+
+    test_repository.Close()
+
+  def testGetNameHash(self):
+    """Tests the _GetNameHash function."""
+    test_repository = wmi_repository.CIMRepository()
+
+    name_hash = test_repository._GetNameHash('root', 32)
+    self.assertEqual(name_hash, 'C82638BEBD36E6F8E4573C4F475C62BF')
+
+    name_hash = test_repository._GetNameHash('root', 64)
+    self.assertEqual(len(name_hash), 64)
+
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.BTR'])
+  @test_lib.skipUnlessHasTestFile(['cim', 'INDEX.MAP'])
+  def testOpenWithMissingFile(self):
+    """Tests the Open function with a missing repository file."""
+    test_repository = wmi_repository.CIMRepository()
+
+    # Note that the test repository does not contain an OBJECTS.DATA file.
+    test_path = self._GetTestFilePath(['cim'])
+    with self.assertRaises(IOError):
+      test_repository.Open(test_path)
+
+    with self.assertRaises(IOError):
+      test_repository.OpenObjectsData(test_path)
+
+    test_path = self._GetTestFilePath(['cpio'])
+    with self.assertRaises(IOError):
+      test_repository.OpenIndexBinaryTree(test_path)
+
+    test_repository.Close()
+
+
+class ExtractObjectRecordsTest(ObjectsDataTestCase):
+  """Tests for the ExtractObjectRecords function."""
+
+  def testExtractObjectRecords(self):
+    """Tests the ExtractObjectRecords function."""
+    self._CreateObjectsDataFile()
+    self._CreateObjectsMappingFile([0, 2, 1])
+
+    keys = [
+        '{0:s}\\I_4567.0.11.8'.format(self._KEY_PREFIX),
+        '{0:s}\\I_4567.0.12.40'.format(self._KEY_PREFIX),
+        '{0:s}\\I_4567.0.13.8'.format(self._KEY_PREFIX)]
+
+    test_repository = wmi_repository.CIMRepository()
+    test_repository.OpenObjectsData(self._temporary_directory)
+
+    try:
+      results = wmi_repository.ExtractObjectRecords(test_repository, keys)
+    finally:
+      test_repository.Close()
+
+    # The object record without an object descriptor is skipped.
+    self.assertEqual(len(results), 2)
+    self.assertEqual(results[0], (keys[0], 'I', b'B' * 8, None, None))
+    self.assertEqual(
+        results[1], (keys[1], 'I', b'C' * 32 + b'D' * 8, None, None))
+
+
+class ObjectRecordExtractionRunnerTest(ObjectsDataTestCase):
+  """Tests for the object record extraction runner."""
+
+  # pylint: disable=protected-access
+
+  def _GetKeys(self):
+    """Retrieves the keys of the object records of the test repository.
+
+    Returns:
+      list[str]: CIM keys in sorted order.
+    """
+    return [
+        '{0:s}\\I_4567.0.10.16'.format(self._KEY_PREFIX),
+        '{0:s}\\I_4567.0.11.8'.format(self._KEY_PREFIX),
+        '{0:s}\\I_4567.0.12.40'.format(self._KEY_PREFIX)]
+
+  def testInitialize(self):
+    """Tests the __init__ function."""
+    test_runner = wmi_repository.ObjectRecordExtractionRunner(batch_size=16)
+    self.assertEqual(test_runner._batch_size, 16)
+
+    with self.assertRaises(ValueError):
+      wmi_repository.ObjectRecordExtractionRunner(batch_size=0)
+
+  def testGetBatches(self):
+    """Tests the _GetBatches function."""
+    test_runner = wmi_repository.ObjectRecordExtractionRunner(batch_size=2)
+
+    keys = self._GetKeys()
+    batches = list(test_runner._GetBatches(
+        [keys[2], self._KEY_PREFIX, keys[0], keys[1]]))
+    self.assertEqual(batches, [keys[:2], keys[2:]])
+
+  def testExtract(self):
+    """Tests the Extract function."""
+    self._CreateObjectsDataFile()
+    self._CreateObjectsMappingFile([0, 2, 1])
+
+    keys = self._GetKeys()
+
+    test_runner = wmi_repository.ObjectRecordExtractionRunner(
+        batch_size=1, number_of_workers=1)
+    results = list(test_runner.Extract(
+        self._temporary_directory, reversed(keys)))
+
+    self.assertEqual(test_runner.number_of_records, 3)
+    self.assertEqual([result[0] for result in results], keys)
+    self.assertEqual(results[2][2], b'C' * 32 + b'D' * 8)
+
+    # The repository is not cached by the current process.
+    self.assertEqual(wmi_repository._cim_repositories, {})
+
+  def testExtractWithWorkers(self):
+    """Tests the Extract function with worker processes."""
+    self._CreateObjectsDataFile()
+    self._CreateObjectsMappingFile([0, 2, 1])
+
+    keys = self._GetKeys()
+
+    test_runner = wmi_repository.ObjectRecordExtractionRunner(
+        batch_size=1, number_of_workers=2)
+    results = list(test_runner.Extract(
+        self._temporary_directory, reversed(keys)))
+
+    # The results are merged in order of key.
+    self.assertEqual(test_runner.number_of_records, 3)
+    self.assertEqual([result[0] for result in results], keys)
+    self.assertEqual(
+        [result[2] for result in results],
+        [b'A' * 16, b'B' * 8, b'C' * 32 + b'D' * 8])
 
 
 if __name__ == '__main__':